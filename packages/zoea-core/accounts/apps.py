@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     name = 'accounts'
+
+    def ready(self):
+        """Import signals when the app is ready."""
+        import accounts.signals  # noqa: F401
@@ -0,0 +1,334 @@
+"""
+Per-request organization context: the user's organization, account and
+default project, resolved once and cached per process.
+
+Nearly every API handler starts by looking up the user's organization, and
+many then fetch the Account and the default Project as well. The context
+bundles the three so they come from one lookup, and the process-wide
+OrganizationContextCache keeps it for ORGANIZATION_CONTEXT_CACHE_TTL seconds
+so repeated requests skip the queries entirely (and async callers skip the
+thread hop on a hit).
+
+Invalidation (accounts.signals):
+- OrganizationUser changes drop that user's entry
+- Organization/Account and Project changes drop every entry for the
+  organization
+- every such change also bumps OrganizationContextVersion; other processes
+  compare it with the version their entries were loaded under at most every
+  ORGANIZATION_CONTEXT_CACHE_CHECK_INTERVAL seconds and drop all entries
+  when it moved
+
+Cached model instances are never handed out directly: each lookup returns
+copies, so callers may modify or save them.
+
+Usage:
+    from accounts.context import aget_request_context
+
+    context = await aget_request_context(request)  # memoized on the request
+    if context.organization is None:
+        raise HttpError(403, "User is not associated with any organization")
+
+OrganizationContextMiddleware also exposes it as ``request.org_context``
+(lazy, sync code) and ``await request.aorg_context()``.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject, empty
+from organizations.models import OrganizationUser
+
+if TYPE_CHECKING:
+    from organizations.models import Organization
+
+    from accounts.models import Account
+    from projects.models import Project
+
+
+@dataclass(frozen=True)
+class OrganizationContext:
+    """A user's organization, its Account row and the default project."""
+
+    user_id: int | None = None
+    organization: Organization | None = None
+    account: Account | None = None
+    default_project: Project | None = None
+
+    def copy(self) -> OrganizationContext:
+        """Return a context whose model instances are private copies."""
+        return OrganizationContext(
+            user_id=self.user_id,
+            organization=copy.copy(self.organization),
+            account=copy.copy(self.account),
+            default_project=copy.copy(self.default_project),
+        )
+
+
+ANONYMOUS_CONTEXT = OrganizationContext()
+
+
+class OrganizationContextCache:
+    """Thread-safe LRU of organization contexts per user with a TTL."""
+
+    def __init__(self, ttl: float = 30.0, check_interval: float = 5.0, maxsize: int = 4096):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[float, OrganizationContext]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def version_check_due(self) -> bool:
+        """Whether the next current_version() call queries the database."""
+        with self._lock:
+            return (
+                self._version is None
+                or time.monotonic() - self._checked_at >= self.check_interval
+            )
+
+    def current_version(self) -> int:
+        """
+        The OrganizationContextVersion the cached entries belong to.
+
+        Re-read at most every ``check_interval`` seconds; when another
+        process bumped it, every entry is dropped.
+        """
+        if not self.enabled:
+            return 0
+        if not self.version_check_due():
+            return self._version
+
+        version = get_context_version()
+        with self._lock:
+            self.version_checks += 1
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = time.monotonic()
+            return version
+
+    def get(self, user_id: int) -> OrganizationContext | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1].copy()
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, context: OrganizationContext, version: int) -> None:
+        """Cache ``context`` if it was loaded under the current ``version``."""
+        if not self.enabled or context.user_id is None:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[context.user_id] = (time.monotonic() + self.ttl, context.copy())
+            self._entries.move_to_end(context.user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_organization(self, organization_id: int) -> None:
+        """Drop every entry whose organization is ``organization_id``."""
+        with self._lock:
+            stale = [
+                user_id
+                for user_id, (_, context) in self._entries.items()
+                if context.organization is not None and context.organization.pk == organization_id
+            ]
+            for user_id in stale:
+                del self._entries[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            self.hits = self.misses = self.version_checks = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: OrganizationContextCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_context_cache() -> OrganizationContextCache:
+    """Return the process-wide context cache configured from settings."""
+    global _cache
+
+    ttl = float(getattr(settings, "ORGANIZATION_CONTEXT_CACHE_TTL", 30))
+    check_interval = float(getattr(settings, "ORGANIZATION_CONTEXT_CACHE_CHECK_INTERVAL", 5))
+
+    with _cache_lock:
+        if _cache is None or _cache.ttl != ttl or _cache.check_interval != check_interval:
+            _cache = OrganizationContextCache(ttl, check_interval)
+        return _cache
+
+
+def get_context_version() -> int:
+    """Return the organization context version (0 if nothing changed yet)."""
+    from accounts.models import OrganizationContextVersion
+
+    version = OrganizationContextVersion.objects.values_list("version", flat=True).first()
+    return version or 0
+
+
+def bump_context_version() -> None:
+    """
+    Record a membership/organization/project change so every process drops
+    its cached contexts.
+
+    Callers drop the affected entries in this process themselves; see
+    invalidate_after_commit().
+    """
+    from accounts.models import OrganizationContextVersion
+
+    updated = OrganizationContextVersion.objects.update(version=F("version") + 1)
+    if not updated:
+        _, created = OrganizationContextVersion.objects.get_or_create(
+            pk=1, defaults={"version": 1}
+        )
+        if not created:
+            OrganizationContextVersion.objects.update(version=F("version") + 1)
+
+
+def invalidate_after_commit(invalidate) -> None:
+    """
+    Run a local invalidation now and again once the surrounding transaction
+    commits, so a context reloaded mid-transaction is not kept.
+    """
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def get_organization_context(user) -> OrganizationContext:
+    """Resolve a user's organization context, using the cache when possible."""
+    if not user or not user.is_authenticated:
+        return ANONYMOUS_CONTEXT
+
+    cache = get_context_cache()
+    version = cache.current_version()
+    context = cache.get(user.pk)
+    if context is None:
+        context = _load_context(user)
+        cache.put(context, version)
+    return context
+
+
+async def aget_organization_context(user) -> OrganizationContext:
+    """
+    Async version of get_organization_context().
+
+    A cache hit for an already-loaded user needs no thread hop (unless the
+    context version is due for a check); otherwise the user check and the
+    queries share one.
+    """
+    if user is None:
+        return ANONYMOUS_CONTEXT
+    resolved = _loaded_user(user)
+    if resolved is not None:
+        if not resolved.is_authenticated:
+            return ANONYMOUS_CONTEXT
+        cache = get_context_cache()
+        if not cache.version_check_due():
+            context = cache.get(resolved.pk)
+            if context is not None:
+                return context
+    return await sync_to_async(get_organization_context)(user)
+
+
+def get_request_context(request) -> OrganizationContext:
+    """Return the request's organization context, resolving it once per request."""
+    context = getattr(request, "_cached_org_context", None)
+    if context is None:
+        context = get_organization_context(request.user)
+        request._cached_org_context = context
+    return context
+
+
+async def aget_request_context(request) -> OrganizationContext:
+    """Async version of get_request_context()."""
+    context = getattr(request, "_cached_org_context", None)
+    if context is None:
+        auser = getattr(request, "auser", None)
+        user = await auser() if auser is not None else request.user
+        context = await aget_organization_context(user)
+        request._cached_org_context = context
+    return context
+
+
+class OrganizationContextMiddleware(MiddlewareMixin):
+    """
+    Expose the organization context on the request.
+
+    Sets ``request.org_context`` (resolved lazily on first access) and
+    ``request.aorg_context()`` for async views, mirroring Django's
+    ``request.user`` / ``request.auser()``. Must come after
+    AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request.org_context = SimpleLazyObject(partial(get_request_context, request))
+        request.aorg_context = partial(aget_request_context, request)
+
+
+def _load_context(user) -> OrganizationContext:
+    from accounts.models import Account
+    from projects.models import Project
+
+    org_user = (
+        OrganizationUser.objects.filter(user=user)
+        .select_related("organization", "organization__account")
+        .first()
+    )
+    if org_user is None:
+        return OrganizationContext(user_id=user.pk)
+
+    organization = org_user.organization
+    try:
+        account = organization.account
+    except Account.DoesNotExist:
+        account = None
+
+    return OrganizationContext(
+        user_id=user.pk,
+        organization=organization,
+        account=account,
+        default_project=Project.objects.filter(organization=organization).first(),
+    )
+
+
+def _loaded_user(user):
+    """The user object if it can be inspected without a query, else None."""
+    if isinstance(user, SimpleLazyObject):
+        wrapped = user._wrapped
+        return None if wrapped is empty else wrapped
+    return user
@@ -52,3 +52,24 @@ class Account(Organization):
     def can_add_user(self):
         """Check if a new user can be added to this account."""
         return not self.is_at_user_limit()
+
+
+class OrganizationContextVersion(models.Model):
+    """
+    Change counter for cached organization contexts (a single row).
+
+    Every membership, organization, account or project change bumps
+    ``version``. Per-process context caches (see accounts.context) compare it
+    with the version their entries were loaded under, so a change made in
+    any process reaches every worker.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Organization Context Version"
+        verbose_name_plural = "Organization Context Versions"
+
+    def __str__(self):
+        return f"OrganizationContextVersion(v{self.version})"
@@ -0,0 +1,44 @@
+"""
+Signals that keep the organization context cache (accounts.context) fresh:
+this process drops the affected entries, and the context version bump
+tells the other processes to drop theirs.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from organizations.models import Organization, OrganizationUser
+
+from projects.models import Project
+
+from .context import bump_context_version, get_context_cache, invalidate_after_commit
+from .models import Account
+
+
+@receiver(post_save, sender=OrganizationUser)
+@receiver(post_delete, sender=OrganizationUser)
+def invalidate_member_context(sender, instance, **kwargs):
+    """Membership changes can change which organization a user resolves to."""
+    cache = get_context_cache()
+    invalidate_after_commit(lambda: cache.invalidate_user(instance.user_id))
+    bump_context_version()
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_organization_context(sender, instance, **kwargs):
+    _invalidate_organization(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_context(sender, instance, **kwargs):
+    """A new, renamed or deleted project can change the default project."""
+    _invalidate_organization(instance.organization_id)
+
+
+def _invalidate_organization(organization_id):
+    cache = get_context_cache()
+    invalidate_after_commit(lambda: cache.invalidate_organization(organization_id))
+    bump_context_version()
@@ -0,0 +1,140 @@
+"""
+Tests for the cached per-request organization context.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import RequestFactory
+from organizations.models import OrganizationUser
+
+from accounts.context import (
+    OrganizationContextMiddleware,
+    aget_organization_context,
+    get_context_cache,
+    get_organization_context,
+)
+from accounts.models import Account, OrganizationContextVersion
+from accounts.utils import get_user_default_project, get_user_organization
+from projects.models import Project
+
+User = get_user_model()
+
+
+@pytest.fixture
+def account(db):
+    return Account.objects.create(name="Test Org", subscription_plan="pro")
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="testuser", password="testpass123")
+
+
+@pytest.fixture
+def member(account, user):
+    # Joining creates the organization's default project (projects.signals)
+    OrganizationUser.objects.create(organization=account, user=user, is_admin=True)
+    return user
+
+
+@pytest.mark.django_db
+class TestOrganizationContext:
+    def test_resolves_organization_account_and_project(self, account, member):
+        context = get_organization_context(member)
+
+        assert context.organization.id == account.id
+        assert context.account.subscription_plan == "pro"
+        assert context.default_project == Project.objects.get(organization=account)
+
+    def test_second_lookup_is_served_from_cache(self, member, django_assert_num_queries):
+        get_organization_context(member)
+
+        with django_assert_num_queries(0):
+            assert get_user_organization(member) is not None
+            assert get_user_default_project(member) is not None
+
+    def test_membership_change_invalidates(self, account, user):
+        assert get_user_organization(user) is None
+
+        OrganizationUser.objects.create(organization=account, user=user)
+
+        assert get_user_organization(user).id == account.id
+
+    def test_project_change_invalidates_default_project(self, account, member):
+        first = get_user_default_project(member)
+
+        newer = Project.objects.create(
+            organization=account, name="Newer", working_directory="/tmp/newer", created_by=member
+        )
+
+        assert get_user_default_project(member) == newer
+        newer.delete()
+        assert get_user_default_project(member) == first
+
+    def test_lookups_return_private_copies(self, account, member):
+        get_user_organization(member).name = "Changed"
+
+        assert get_user_organization(member).name == "Test Org"
+
+    def test_ttl_zero_disables_cache(self, member, settings):
+        settings.ORGANIZATION_CONTEXT_CACHE_TTL = 0
+
+        get_organization_context(member)
+
+        assert len(get_context_cache()) == 0
+
+    def test_change_in_another_process_is_seen_after_version_check(
+        self, account, member, settings, django_assert_num_queries
+    ):
+        settings.ORGANIZATION_CONTEXT_CACHE_CHECK_INTERVAL = 0
+        get_organization_context(member)
+        # Another process renames the organization and bumps the version;
+        # this process's signals never ran
+        Account.objects.filter(pk=account.pk).update(name="Renamed")
+        OrganizationContextVersion.objects.update(version=F("version") + 1)
+
+        assert get_user_organization(member).name == "Renamed"
+        with django_assert_num_queries(1):  # version check only
+            get_organization_context(member)
+
+    def test_changes_bump_the_context_version(self, account, member):
+        before = OrganizationContextVersion.objects.get().version
+
+        Project.objects.create(
+            organization=account, name="Other", working_directory="/tmp/other", created_by=member
+        )
+
+        assert OrganizationContextVersion.objects.get().version == before + 1
+
+    def test_middleware_exposes_lazy_context(self, account, member):
+        request = RequestFactory().get("/")
+        request.user = member
+        OrganizationContextMiddleware(lambda request: None).process_request(request)
+
+        assert request.org_context.account.id == account.id
+        assert request._cached_org_context is not None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncOrganizationContext:
+    @pytest.mark.asyncio
+    async def test_cache_hit_needs_no_thread_hop(self, account, member):
+        await sync_to_async(get_organization_context)(member)
+
+        with patch("accounts.context.sync_to_async", side_effect=AssertionError("thread hop")):
+            context = await aget_organization_context(member)
+
+        assert context.organization.id == account.id
+
+    @pytest.mark.asyncio
+    async def test_anonymous_user_has_empty_context(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        context = await aget_organization_context(AnonymousUser())
+
+        assert context.organization is None
+        assert context.default_project is None
@@ -6,12 +6,16 @@ checking permissions, and managing organization context.
 
 Note: This module provides both sync and async versions of key functions.
 Use async versions (prefixed with 'a') when calling from async views/endpoints.
+
+The organization and default project lookups are served from the
+per-process organization context cache (see accounts.context).
 """
 
-from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from organizations.models import Organization, OrganizationUser
 
+from .context import aget_organization_context, get_organization_context
+
 User = get_user_model()
 
 
@@ -34,14 +38,7 @@ def get_user_organization(user):
         if org:
             messages = ChatMessage.objects.for_organization(org)
     """
-    if not user or not user.is_authenticated:
-        return None
-
-    try:
-        org_user = OrganizationUser.objects.filter(user=user).select_related('organization').first()
-        return org_user.organization if org_user else None
-    except OrganizationUser.DoesNotExist:
-        return None
+    return get_organization_context(user).organization
 
 
 async def aget_user_organization(user):
@@ -62,24 +59,8 @@ async def aget_user_organization(user):
             # Use organization
             pass
     """
-    # Check if user is authenticated (this might trigger lazy loading)
-    @sync_to_async
-    def _check_user():
-        return user and user.is_authenticated
-
-    if not await _check_user():
-        return None
-
-    # Query the database for organization
-    @sync_to_async
-    def _get_org():
-        try:
-            org_user = OrganizationUser.objects.filter(user=user).select_related('organization').first()
-            return org_user.organization if org_user else None
-        except OrganizationUser.DoesNotExist:
-            return None
-
-    return await _get_org()
+    context = await aget_organization_context(user)
+    return context.organization
 
 
 def require_organization(user):
@@ -238,13 +219,7 @@ def get_user_default_project(user):
             # No projects - user needs to create one
             pass
     """
-    from projects.models import Project
-
-    organization = get_user_organization(user)
-    if not organization:
-        return None
-
-    return Project.objects.filter(organization=organization).first()
+    return get_organization_context(user).default_project
 
 
 async def aget_user_default_project(user):
@@ -257,7 +232,8 @@ async def aget_user_default_project(user):
     Returns:
         Project instance or None if no projects exist
     """
-    return await sync_to_async(get_user_default_project)(user)
+    context = await aget_organization_context(user)
+    return context.default_project
 
 
 def initialize_user_organization(
@@ -11,3 +11,5 @@ class AgentsConfig(AppConfig):
         from agents.registry import ToolRegistry
 
         ToolRegistry.get_instance()
+
+        from agents import signals  # noqa: F401
@@ -0,0 +1,40 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0001_initial'),
+        ('projects', '0013_add_email_alias_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ToolSetVersion',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                (
+                    'project',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='tool_set_version',
+                        to='projects.project',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Tool Set Version',
+                'verbose_name_plural': 'Tool Set Versions',
+            },
+        ),
+    ]
@@ -89,6 +89,32 @@ class ProjectToolConfig(models.Model):
         return f"{self.tool_name} ({status}) - {self.project.name}"
 
 
+class ToolSetVersion(models.Model):
+    """
+    Change counter for the state a project's agent tools are built from.
+
+    Every ProjectToolConfig save or delete and every Project save bumps
+    ``version``. Per-process tool set caches (see agents.registry) compare it
+    with the version their sets were built from, so a change made in any
+    process reaches every worker.
+    """
+
+    project = models.OneToOneField(
+        "projects.Project",
+        on_delete=models.CASCADE,
+        related_name="tool_set_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Tool Set Version"
+        verbose_name_plural = "Tool Set Versions"
+
+    def __str__(self):
+        return f"ToolSetVersion(project={self.project_id}, v{self.version})"
+
+
 class ToolExecutionLog(models.Model):
     """
     Audit log for tool executions.
@@ -6,13 +6,35 @@ Central registry for all available smolagents tools with support for:
 - Per-project enablement checking
 - Context-based filtering
 - Factory pattern for tool instantiation
+- Per-project caching of instantiated tool sets
+
+Tool sets are cached per (project, context, ToolSetVersion, file search
+store, available API keys): tools that create HTTP clients or SDK objects in
+__init__ are built once and reused. Each get_enabled_tools() call hands out
+per-run copies of tools that keep per-run state (PER_RUN_ATTRIBUTES, e.g.
+ZoeaTool's output collection and telemetry counters); tools without such
+state are shared as-is. Each set is built from a private copy of the
+Project, so cached tools never share the caller's instance.
+
+Invalidation (agents.signals):
+- ProjectToolConfig saves/deletes and Project saves drop the project's
+  entries in this process and bump its ToolSetVersion
+- other processes notice the new version the next time they check it, at
+  most every TOOL_SET_CACHE_CHECK_INTERVAL seconds
 """
 
+import copy
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from smolagents import Tool
 
 if TYPE_CHECKING:
@@ -20,6 +42,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Instance attributes a tool run may change; copied fresh for every run
+PER_RUN_ATTRIBUTES = ("telemetry", "_output_collection", "last_retrieved_sources")
+
 
 @dataclass
 class ToolDefinition:
@@ -35,6 +60,107 @@ class ToolDefinition:
     factory: Optional[Callable[..., Tool]] = None
 
 
+@dataclass
+class _CachedTool:
+    tool: Tool
+    # Per-run attributes as they were right after construction
+    initial_state: dict[str, Any]
+
+    def for_run(self) -> Tool:
+        """The tool itself if it has no per-run state, else a copy with fresh state."""
+        if not self.initial_state:
+            return self.tool
+        run_tool = copy.copy(self.tool)
+        for name, value in self.initial_state.items():
+            setattr(run_tool, name, copy.deepcopy(value))
+        return run_tool
+
+
+class ToolSetCache:
+    """Thread-safe LRU of instantiated tool sets per (project, context, version) with a TTL."""
+
+    def __init__(self, ttl: float = 300.0, check_interval: float = 5.0, maxsize: int = 256):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[float, list[_CachedTool]]] = OrderedDict()
+        # project id -> (ToolSetVersion, monotonic time it was read)
+        self._versions: dict[int, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def version(self, project_id: int) -> int:
+        """
+        The project's ToolSetVersion, re-read at most every ``check_interval``
+        seconds. Entries built from an older version are dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            known = self._versions.get(project_id)
+            if known is not None and now - known[1] < self.check_interval:
+                return known[0]
+
+        version = get_tool_set_version(project_id)
+        with self._lock:
+            self.version_checks += 1
+            known = self._versions.get(project_id)
+            if known is not None and known[0] != version:
+                self._drop_project(project_id)
+            self._versions[project_id] = (version, now)
+        return version
+
+    def get(self, key: tuple) -> list[_CachedTool] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, tools: list[_CachedTool]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, tools)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_project(self, project_id: int) -> None:
+        """
+        Drop a project's tool sets and re-read its version on the next lookup.
+
+        Sets still being built for the old version are stored under a key no
+        lookup uses anymore.
+        """
+        with self._lock:
+            self._versions.pop(project_id, None)
+            self._drop_project(project_id)
+
+    def _drop_project(self, project_id: int) -> None:
+        for key in [key for key in self._entries if key[0] == project_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class ToolRegistry:
     """
     Central registry for all available smolagents tools.
@@ -61,6 +187,10 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: dict[str, ToolDefinition] = {}
+        self.tool_set_cache = ToolSetCache(
+            ttl=float(getattr(settings, "TOOL_SET_CACHE_TTL", 300)),
+            check_interval=float(getattr(settings, "TOOL_SET_CACHE_CHECK_INTERVAL", 5)),
+        )
 
     @classmethod
     def get_instance(cls) -> "ToolRegistry":
@@ -290,6 +420,7 @@ class ToolRegistry:
             supported_contexts=supported_contexts or ["*"],
             factory=factory,
         )
+        self.tool_set_cache.clear()
         logger.debug(f"Registered tool: {name}")
 
     def get_tool_definition(self, name: str) -> Optional[ToolDefinition]:
@@ -308,6 +439,9 @@ class ToolRegistry:
         """
         Get instantiated tools that are enabled for a project.
 
+        Tool sets are cached per project and context (see the module
+        docstring); every call returns a new list of per-run tools.
+
         Args:
             project: Project to check enablement for
             context: Optional context to filter tools
@@ -315,8 +449,54 @@ class ToolRegistry:
         Returns:
             List of instantiated Tool objects
         """
+        cache = self.tool_set_cache
+        # Tools are only offered when their API key is set, so key on which are
+        project_id = getattr(project, "pk", None)
+        available_keys = tuple(
+            sorted(
+                {
+                    definition.requires_api_key
+                    for definition in self._tools.values()
+                    if definition.requires_api_key and os.getenv(definition.requires_api_key)
+                }
+            )
+        )
+        key = None
+        if project_id is not None and cache.enabled:
+            # Factories read Project state (e.g. the document search store)
+            key = (
+                project_id,
+                context,
+                cache.version(project_id),
+                getattr(project, "gemini_store_id", None),
+                available_keys,
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                return [entry.for_run() for entry in cached]
+
+        start = time.perf_counter()
+        entries = self._build_tool_set(project, context)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            "Built tool set for project %s (context=%s): %d tools in %.1f ms",
+            project_id,
+            context,
+            len(entries),
+            elapsed_ms,
+        )
+
+        if key is not None:
+            cache.put(key, entries)
+        return [entry.for_run() for entry in entries]
+
+    def _build_tool_set(self, project: "Project", context: str | None) -> list[_CachedTool]:
+        """Instantiate the enabled tools for a project and context."""
         from agents.models import ProjectToolConfig
 
+        # Cached tools keep their project; give them one no caller shares
+        project = copy.copy(project)
+
         # Get project-specific overrides
         overrides = {
             config.tool_name: config
@@ -353,7 +533,12 @@ class ToolRegistry:
             try:
                 tool = self._create_tool(definition, config_overrides, project=project)
                 if tool is not None:
-                    enabled_tools.append(tool)
+                    initial_state = {
+                        attr: copy.deepcopy(value)
+                        for attr, value in vars(tool).items()
+                        if attr in PER_RUN_ATTRIBUTES
+                    }
+                    enabled_tools.append(_CachedTool(tool=tool, initial_state=initial_state))
             except Exception as e:
                 logger.error(f"Failed to instantiate tool {name}: {e}")
 
@@ -425,3 +610,49 @@ class ToolRegistry:
         if definition.factory:
             return definition.factory(project=project, **config)
         return definition.tool_class(**config) if config else definition.tool_class()
+
+
+def get_tool_set_version(project_id: int) -> int:
+    """Return a project's tool set version (0 if its tool state never changed)."""
+    from agents.models import ToolSetVersion
+
+    version = (
+        ToolSetVersion.objects.filter(project_id=project_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_tool_set_version(project_id: int) -> None:
+    """
+    Record a tool config or project change so every process rebuilds the
+    project's tool sets.
+
+    This process drops its entries immediately and again once the
+    surrounding transaction commits, so a set rebuilt mid-transaction is not
+    kept.
+    """
+    from agents.models import ToolSetVersion
+
+    updated = ToolSetVersion.objects.filter(project_id=project_id).update(
+        version=F("version") + 1
+    )
+    if not updated:
+        _, created = ToolSetVersion.objects.get_or_create(
+            project_id=project_id, defaults={"version": 1}
+        )
+        if not created:
+            ToolSetVersion.objects.filter(project_id=project_id).update(
+                version=F("version") + 1
+            )
+
+    invalidate_local_tool_sets(project_id)
+    transaction.on_commit(lambda: invalidate_local_tool_sets(project_id))
+
+
+def invalidate_local_tool_sets(project_id: int) -> None:
+    """Drop this process's tool sets for a project (no-op before the registry loads)."""
+    registry = ToolRegistry._instance
+    if registry is not None:
+        registry.tool_set_cache.invalidate_project(project_id)
@@ -0,0 +1,38 @@
+"""
+Signals that keep the tool set cache (agents.registry) fresh.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from organizations.models import Organization
+
+from projects.models import Project
+
+from .models import ProjectToolConfig
+from .registry import bump_tool_set_version, invalidate_local_tool_sets
+
+
+@receiver(post_save, sender=ProjectToolConfig)
+def invalidate_tool_sets_on_config_save(sender, instance, **kwargs):
+    bump_tool_set_version(instance.project_id)
+
+
+@receiver(post_delete, sender=ProjectToolConfig)
+def invalidate_tool_sets_on_config_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (Project, Organization)):
+        # Cascade from deleting the project (or its organization); its
+        # version row goes with it
+        invalidate_local_tool_sets(instance.project_id)
+        return
+    bump_tool_set_version(instance.project_id)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_tool_sets_on_project_save(sender, instance, **kwargs):
+    """Tool factories read project state, e.g. its file search store."""
+    bump_tool_set_version(instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+def invalidate_tool_sets_on_project_delete(sender, instance, **kwargs):
+    invalidate_local_tool_sets(instance.pk)
@@ -3,12 +3,29 @@ Agent Skills registry and prompt helpers.
 
 Discovers Agent Skills on disk, validates SKILL.md frontmatter, and
 provides helpers for listing skills and building prompt metadata.
+
+Discovery is incremental: the registry rechecks the disk at most every
+AGENT_SKILLS_RESCAN_INTERVAL seconds, lists a root again only when its
+mtime changed, and re-parses a SKILL.md only when its mtime or size did.
+Rendered prompt blocks (<available_skills> per context, and blocks built
+through cached_prompt_block()) are kept until a SKILL.md changes, and skill
+file contents are kept in a byte-bounded LRU (AGENT_SKILLS_FILE_CACHE_BYTES)
+validated against each file's stat.
+
+Usage:
+    registry = SkillRegistry.get_instance()
+    prompt = registry.build_available_skills_prompt(context="chat")
+    instructions = registry.read_skill_file("pdf-processing")
 """
 
 from __future__ import annotations
 
 import logging
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -54,20 +71,94 @@ class SkillMetadata:
     supported_contexts: list[str] = field(default_factory=lambda: ["*"])
 
 
+class SkillFileCache:
+    """Thread-safe LRU of skill file contents, bounded by total size."""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # path -> ((mtime_ns, size), content)
+        self._entries: OrderedDict[Path, tuple[tuple[int, int], str]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, path: Path) -> str:
+        """Return a file's text, reading the disk only if it changed since cached."""
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        content = path.read_text(encoding="utf-8", errors="replace")
+        if stat.st_size <= self.max_bytes:
+            with self._lock:
+                previous = self._entries.pop(path, None)
+                if previous is not None:
+                    self._size -= previous[0][1]
+                self._entries[path] = (stamp, content)
+                self._size += stat.st_size
+                while self._size > self.max_bytes:
+                    _, ((_, evicted), _) = self._entries.popitem(last=False)
+                    self._size -= evicted
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class SkillRegistry:
     """
     Registry for skills discovered on disk.
 
     Uses configured roots from Django settings to discover skill directories
-    containing a SKILL.md file. Results are cached per process.
+    containing a SKILL.md file. Results are cached per process and kept in
+    step with the disk incrementally (see the module docstring).
     """
 
     _instance: Optional["SkillRegistry"] = None
 
-    def __init__(self, roots: list[Path]):
+    def __init__(
+        self,
+        roots: list[Path],
+        *,
+        rescan_interval: float | None = None,
+        file_cache_bytes: int | None = None,
+    ):
         self._roots = roots
         self._skills: dict[str, SkillMetadata] = {}
         self._loaded = False
+        self.rescan_interval = (
+            rescan_interval
+            if rescan_interval is not None
+            else float(getattr(settings, "AGENT_SKILLS_RESCAN_INTERVAL", 2))
+        )
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        # root -> (mtime_ns, skill directories)
+        self._root_listings: dict[Path, tuple[int, list[Path]]] = {}
+        # SKILL.md path -> ((mtime_ns, size), parsed metadata or None if invalid)
+        self._parsed: dict[Path, tuple[tuple[int, int], SkillMetadata | None]] = {}
+        # Bumped whenever the skill set or a SKILL.md file changes
+        self.generation = 0
+        self._files_changed = False
+        self._prompt_cache: dict[tuple, str | None] = {}
+        self.file_cache = SkillFileCache(
+            file_cache_bytes
+            if file_cache_bytes is not None
+            else int(getattr(settings, "AGENT_SKILLS_FILE_CACHE_BYTES", 8 * 1024 * 1024))
+        )
 
     @classmethod
     def get_instance(cls) -> "SkillRegistry":
@@ -131,10 +222,13 @@ class SkillRegistry:
         root_path = skill.root.resolve()
         if not full_path.is_relative_to(root_path):
             raise SkillFileError("Skill file path escapes skill directory")
-        if not full_path.exists() or not full_path.is_file():
+        if not full_path.is_file():
             raise SkillFileError("Skill file does not exist")
 
-        return full_path.read_text(encoding="utf-8", errors="replace")
+        try:
+            return self.file_cache.read(full_path)
+        except OSError as exc:
+            raise SkillFileError(f"Skill file could not be read: {exc}") from exc
 
     def build_available_skills_prompt(
         self,
@@ -145,11 +239,53 @@ class SkillRegistry:
         """
         Build an <available_skills> XML block for prompt injection.
 
+        Blocks are cached per context until the skill set changes.
+
         Args:
             context: Optional context name for filtering.
             include_locations: Include absolute SKILL.md paths.
         """
-        skills = self.list_skills(context=context)
+        self._ensure_loaded()
+        key = (self.generation, context.lower() if context else None, include_locations)
+        try:
+            return self._prompt_cache[key]
+        except KeyError:
+            pass
+
+        block = self._render_available_skills(
+            self.list_skills(context=context), include_locations=include_locations
+        )
+        with self._lock:
+            if key[0] == self.generation:
+                self._prompt_cache[key] = block
+        return block
+
+    def cached_prompt_block(self, key: tuple, build) -> str:
+        """
+        Return a prompt block derived from the skill set, built at most once per generation.
+
+        Args:
+            key: Identifies the block among those derived from the skills
+            build: Callable producing the block when it is not cached
+        """
+        self._ensure_loaded()
+        full_key = (self.generation, "block", *key)
+        try:
+            return self._prompt_cache[full_key]
+        except KeyError:
+            pass
+        block = build()
+        with self._lock:
+            if full_key[0] == self.generation:
+                self._prompt_cache[full_key] = block
+        return block
+
+    def _render_available_skills(
+        self,
+        skills: list[SkillMetadata],
+        *,
+        include_locations: bool,
+    ) -> str | None:
         if not skills:
             return None
 
@@ -168,29 +304,31 @@ class SkillRegistry:
         return "\n".join(lines)
 
     def _ensure_loaded(self, refresh: bool = False) -> None:
-        if not self._loaded or refresh:
-            self._skills = self._discover_skills()
+        now = time.monotonic()
+        if self._loaded and not refresh and now - self._checked_at < self.rescan_interval:
+            return
+        with self._lock:
+            if self._loaded and not refresh and now - self._checked_at < self.rescan_interval:
+                return
+            self._files_changed = False
+            skills = self._discover_skills(force=refresh)
+            # Any SKILL.md change counts: cached blocks may embed instructions
+            if not self._loaded or self._files_changed or skills != self._skills:
+                self._skills = skills
+                self.generation += 1
+                self._prompt_cache.clear()
             self._loaded = True
+            self._checked_at = time.monotonic()
 
-    def _discover_skills(self) -> dict[str, SkillMetadata]:
+    def _discover_skills(self, force: bool = False) -> dict[str, SkillMetadata]:
         skills: dict[str, SkillMetadata] = {}
+        seen: set[Path] = set()
         for root in self._roots:
-            if not root.exists():
-                logger.debug("Skill root does not exist: %s", root)
-                continue
-            if not root.is_dir():
-                logger.warning("Skill root is not a directory: %s", root)
-                continue
-
-            for child in root.iterdir():
-                if not child.is_dir():
-                    continue
+            for child in self._list_skill_dirs(root, force=force):
                 skill_path = child / "SKILL.md"
-                if not skill_path.exists():
-                    continue
-
-                metadata = _parse_skill_metadata(skill_path)
-                if not metadata:
+                seen.add(skill_path)
+                metadata = self._parse_if_changed(skill_path, force=force)
+                if metadata is None:
                     continue
 
                 if metadata.name in skills:
@@ -203,8 +341,54 @@ class SkillRegistry:
 
                 skills[metadata.name] = metadata
 
+        # Forget skills whose directories went away
+        for path in [path for path in self._parsed if path not in seen]:
+            del self._parsed[path]
+            self._files_changed = True
         return skills
 
+    def _list_skill_dirs(self, root: Path, *, force: bool) -> list[Path]:
+        """A root's subdirectories, listed again only when the root's mtime changes."""
+        try:
+            stat = root.stat()
+        except OSError:
+            logger.debug("Skill root does not exist: %s", root)
+            self._root_listings.pop(root, None)
+            return []
+        if not root.is_dir():
+            logger.warning("Skill root is not a directory: %s", root)
+            return []
+
+        cached = self._root_listings.get(root)
+        if cached is not None and cached[0] == stat.st_mtime_ns and not force:
+            return cached[1]
+
+        children = sorted(
+            Path(entry.path)
+            for entry in os.scandir(root)
+            if entry.is_dir()
+        )
+        self._root_listings[root] = (stat.st_mtime_ns, children)
+        return children
+
+    def _parse_if_changed(self, skill_path: Path, *, force: bool) -> SkillMetadata | None:
+        """Parsed SKILL.md metadata, re-parsed only when the file's mtime or size changes."""
+        try:
+            stat = skill_path.stat()
+        except OSError:
+            self._parsed.pop(skill_path, None)
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._parsed.get(skill_path)
+        if cached is not None and cached[0] == stamp and not force:
+            return cached[1]
+
+        metadata = _parse_skill_metadata(skill_path)
+        self._parsed[skill_path] = (stamp, metadata)
+        self._files_changed = True
+        return metadata
+
 
 def build_skills_context_block(
     *,
@@ -215,9 +399,28 @@ def build_skills_context_block(
     """
     Build a prompt block describing available skills and how to load them.
 
-    Returns an empty string when skills are unavailable.
+    Returns an empty string when skills are unavailable. Blocks are cached
+    per (context, tool name) until the skill set changes.
     """
     registry = SkillRegistry.get_instance()
+    return registry.cached_prompt_block(
+        ("context", context.lower() if context else None, tool_name, include_locations),
+        lambda: _render_skills_context_block(
+            registry,
+            context=context,
+            tool_name=tool_name,
+            include_locations=include_locations,
+        ),
+    )
+
+
+def _render_skills_context_block(
+    registry: SkillRegistry,
+    *,
+    context: str | None,
+    tool_name: str | None,
+    include_locations: bool,
+) -> str:
     skills_prompt = registry.build_available_skills_prompt(
         context=context,
         include_locations=include_locations,
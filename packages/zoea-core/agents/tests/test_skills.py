@@ -1,8 +1,13 @@
 """Tests for Agent Skills registry and helpers."""
 
+import os
+import shutil
+from unittest.mock import patch
+
 from django.test import override_settings
 
 from agents.skills import SkillFileError, SkillRegistry
+from agents.skills.registry import _parse_skill_metadata
 
 
 def _write_skill(path, name="pdf-processing", description="Handle PDFs"):
@@ -67,3 +72,54 @@ def test_skill_registry_read_file_guardrails(tmp_path):
         else:
             raise AssertionError("Expected SkillFileError for path traversal")
     SkillRegistry.reset_instance()
+
+
+def test_skill_registry_reparses_only_changed_skills(tmp_path):
+    _write_skill(tmp_path / "pdf-processing")
+    _write_skill(tmp_path / "csv-cleanup", name="csv-cleanup", description="Clean CSVs")
+    registry = SkillRegistry([tmp_path], rescan_interval=0)
+
+    with patch("agents.skills.registry._parse_skill_metadata", wraps=_parse_skill_metadata) as parse:
+        first = registry.build_available_skills_prompt()
+        assert parse.call_count == 2
+
+        # Nothing changed: no parsing, same cached block
+        assert registry.build_available_skills_prompt() is first
+        assert parse.call_count == 2
+
+        skill_md = tmp_path / "csv-cleanup" / "SKILL.md"
+        skill_md.write_text(skill_md.read_text().replace("Clean CSVs", "Tidy CSV files"))
+        os.utime(skill_md, ns=(0, 10**18))
+        prompt = registry.build_available_skills_prompt()
+
+    assert parse.call_count == 3
+    assert "Tidy CSV files" in prompt
+
+
+def test_skill_registry_picks_up_added_and_removed_skills(tmp_path):
+    _write_skill(tmp_path / "pdf-processing")
+    registry = SkillRegistry([tmp_path], rescan_interval=0)
+    assert [skill.name for skill in registry.list_skills()] == ["pdf-processing"]
+
+    _write_skill(tmp_path / "csv-cleanup", name="csv-cleanup", description="Clean CSVs")
+    os.utime(tmp_path, ns=(0, 10**18))
+    assert [skill.name for skill in registry.list_skills()] == ["csv-cleanup", "pdf-processing"]
+
+    shutil.rmtree(tmp_path / "pdf-processing")
+    os.utime(tmp_path, ns=(0, 2 * 10**18))
+    assert [skill.name for skill in registry.list_skills()] == ["csv-cleanup"]
+
+
+def test_skill_registry_caches_file_contents(tmp_path):
+    _write_skill(tmp_path / "pdf-processing")
+    registry = SkillRegistry([tmp_path], rescan_interval=0)
+
+    registry.read_skill_file("pdf-processing")
+    content = registry.read_skill_file("pdf-processing")
+
+    assert "# Skill" in content
+    assert (registry.file_cache.misses, registry.file_cache.hits) == (1, 1)
+
+    skill_md = tmp_path / "pdf-processing" / "SKILL.md"
+    skill_md.write_text(skill_md.read_text() + "More\n")
+    assert registry.read_skill_file("pdf-processing").endswith("More\n")
@@ -9,6 +9,7 @@ import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+from smolagents import Tool
 
 from agents.models import ProjectToolConfig
 from agents.registry import ToolRegistry
@@ -242,6 +243,156 @@ class TestToolRegistry:
         assert definition is None
 
 
+class _ArtifactTool(ZoeaTool):
+    name = "artifact_tool"
+    description = "Creates artifacts"
+    inputs = {}
+    output_type = "string"
+
+    def forward(self) -> str:
+        return "ok"
+
+
+class _PlainTool(Tool):
+    name = "plain_tool"
+    description = "Keeps no per-run state"
+    inputs = {}
+    output_type = "string"
+
+    def forward(self) -> str:
+        return "ok"
+
+
+@pytest.mark.django_db
+class TestToolSetCache:
+    """Tests for per-project caching of instantiated tool sets."""
+
+    @pytest.fixture
+    def registry(self):
+        registry = ToolRegistry()
+        self.factory_calls = 0
+
+        def factory(project=None, **config):
+            self.factory_calls += 1
+            return _ArtifactTool()
+
+        registry.register(
+            "artifact_tool", "Creates artifacts", _ArtifactTool, "test", factory=factory
+        )
+        registry.register("plain_tool", "Keeps no per-run state", _PlainTool, "test")
+        ToolRegistry._instance = registry
+        yield registry
+        ToolRegistry.reset_instance()
+
+    @pytest.fixture
+    def project(self, django_user_model):
+        from organizations.models import Organization
+
+        from projects.models import Project
+
+        organization = Organization.objects.create(name="Tools Org")
+        user = django_user_model.objects.create_user(username="tools", password="testpass123")
+        return Project.objects.create(organization=organization, name="Tools", created_by=user)
+
+    def test_reuses_instances_with_fresh_per_run_state(self, registry, project):
+        first = {tool.name: tool for tool in registry.get_enabled_tools(project, context="chat")}
+        first["artifact_tool"].output_collection = InMemoryArtifactCollection()
+        first["artifact_tool"].record_call(0.5)
+
+        second = {tool.name: tool for tool in registry.get_enabled_tools(project, context="chat")}
+
+        assert self.factory_calls == 1
+        assert second["plain_tool"] is first["plain_tool"]
+        assert second["artifact_tool"] is not first["artifact_tool"]
+        assert second["artifact_tool"].output_collection is None
+        assert second["artifact_tool"].telemetry["calls"] == 0
+
+    def test_contexts_are_cached_separately(self, registry, project):
+        registry.get_enabled_tools(project, context="chat")
+        registry.get_enabled_tools(project, context="excalidraw")
+
+        assert self.factory_calls == 2
+        assert len(registry.tool_set_cache) == 2
+
+    def test_config_change_invalidates_project(self, registry, project):
+        registry.get_enabled_tools(project)
+
+        ProjectToolConfig.objects.create(
+            organization=project.organization,
+            project=project,
+            tool_name="artifact_tool",
+            is_enabled=False,
+        )
+
+        assert [tool.name for tool in registry.get_enabled_tools(project)] == ["plain_tool"]
+
+    def test_version_bump_from_another_process_rebuilds(self, registry, project):
+        from agents.models import ToolSetVersion
+
+        registry.tool_set_cache.check_interval = 0
+        registry.get_enabled_tools(project)
+
+        # Another worker changed the config: only the shared row moves here
+        ToolSetVersion.objects.update_or_create(project=project, defaults={"version": 99})
+        registry.get_enabled_tools(project)
+
+        assert self.factory_calls == 2
+        assert len(registry.tool_set_cache) == 1
+
+    def test_version_is_rechecked_after_interval(self, registry, project):
+        from agents.models import ToolSetVersion
+
+        registry.get_enabled_tools(project)
+        ToolSetVersion.objects.update_or_create(project=project, defaults={"version": 99})
+        registry.get_enabled_tools(project)
+
+        assert self.factory_calls == 1
+
+        registry.tool_set_cache.check_interval = 0
+        registry.get_enabled_tools(project)
+
+        assert self.factory_calls == 2
+
+    def test_project_save_bumps_version(self, registry, project):
+        from agents.registry import get_tool_set_version
+
+        before = get_tool_set_version(project.id)
+        project.gemini_store_id = "fileSearchStores/new"
+        project.save()
+
+        assert get_tool_set_version(project.id) == before + 1
+
+    def test_store_id_is_part_of_the_key(self, registry, project):
+        registry.get_enabled_tools(project)
+
+        # An instance whose store changed without a save in this process
+        project.gemini_store_id = "fileSearchStores/recreated"
+        registry.get_enabled_tools(project)
+
+        assert self.factory_calls == 2
+
+    def test_cached_tools_do_not_share_the_callers_project(self, registry, project):
+        received = []
+
+        def factory(project=None, **config):
+            received.append(project)
+            return _PlainTool()
+
+        registry.register("project_tool", "Keeps its project", _PlainTool, "test", factory=factory)
+        registry.get_enabled_tools(project)
+
+        assert received[0] is not project
+        assert received[0].pk == project.pk
+
+    def test_ttl_zero_disables_cache(self, registry, project):
+        registry.tool_set_cache.ttl = 0
+
+        registry.get_enabled_tools(project)
+        registry.get_enabled_tools(project)
+
+        assert self.factory_calls == 2
+
+
 class TestWebSearchTool:
     """Tests for WebSearchTool."""
 
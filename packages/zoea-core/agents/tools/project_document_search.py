@@ -15,6 +15,7 @@ from typing import TYPE_CHECKING
 from smolagents import Tool
 
 from file_search import FileSearchRegistry
+from file_search.query_cache import cached_search
 
 if TYPE_CHECKING:
     from projects.models import Project
@@ -103,7 +104,8 @@ Use declarative statements rather than questions for better results."""
             if self.project_id:
                 filters["project_id"] = str(self.project_id)
 
-            result = self.file_search_store.search(
+            result = cached_search(
+                self.file_search_store,
                 store_id=self.store_id,
                 query=query,
                 max_results=max_results or 5,
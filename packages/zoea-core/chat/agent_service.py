@@ -109,22 +109,7 @@ class ChatAgentService:
                 instructions="You are a helpful AI assistant for Zoea Studio.",
             )
 
-        # Build messages list
-        messages = [ChatMessage(role="system", content=self.instructions)]
-
-        # Add conversation history (may include multimodal content with images)
-        if conversation_messages:
-            for msg in conversation_messages:
-                messages.append(ChatMessage(role=msg["role"], content=msg["content"]))
-
-        # Add current user message
-        # For vision models with image_contents, use multimodal format
-        if image_contents:
-            # Multimodal format: content is a list of text + images
-            multimodal_content = [{"type": "text", "text": message}] + image_contents
-            messages.append(ChatMessage(role="user", content=multimodal_content))
-        else:
-            messages.append(ChatMessage(role="user", content=message))
+        messages = self._build_messages(message, conversation_messages, image_contents)
 
         logger.debug(
             "Dispatching %s messages to %s/%s",
@@ -145,6 +130,7 @@ class ChatAgentService:
         self,
         message: str,
         conversation_messages: list[dict] | None = None,
+        image_contents: list[dict] | None = None,
     ) -> AsyncGenerator[str, None]:
         """
         Send a message and stream the response.
@@ -152,6 +138,7 @@ class ChatAgentService:
         Args:
             message: User message to send
             conversation_messages: Optional list of prior messages for context
+            image_contents: Optional list of image content parts (OpenAI format)
 
         Yields:
             Chunks of agent's response text
@@ -162,14 +149,7 @@ class ChatAgentService:
                 instructions="You are a helpful AI assistant for Zoea Studio.",
             )
 
-        # Build messages list
-        messages = [ChatMessage(role="system", content=self.instructions)]
-
-        if conversation_messages:
-            for msg in conversation_messages:
-                messages.append(ChatMessage(role=msg["role"], content=msg["content"]))
-
-        messages.append(ChatMessage(role="user", content=message))
+        messages = self._build_messages(message, conversation_messages, image_contents)
 
         logger.debug(
             "Streaming %s messages to %s/%s",
@@ -178,10 +158,42 @@ class ChatAgentService:
             self.model_id,
         )
 
-        # Use provider's async streaming method
-        async for chunk in self.provider.chat_stream_async(messages, model_id=self.model_id):
-            if chunk.content:
-                yield chunk.content
+        # Use provider's async streaming method; closing this generator (e.g.
+        # when the client disconnects) closes the provider stream with it
+        stream = self.provider.chat_stream_async(messages, model_id=self.model_id)
+        try:
+            async for chunk in stream:
+                if chunk.content:
+                    yield chunk.content
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def _build_messages(
+        self,
+        message: str,
+        conversation_messages: list[dict] | None,
+        image_contents: list[dict] | None,
+    ) -> list[ChatMessage]:
+        """Build the provider message list: system prompt, history, then the user message."""
+        messages = [ChatMessage(role="system", content=self.instructions)]
+
+        # Add conversation history (may include multimodal content with images)
+        if conversation_messages:
+            for msg in conversation_messages:
+                messages.append(ChatMessage(role=msg["role"], content=msg["content"]))
+
+        # Add current user message
+        # For vision models with image_contents, use multimodal format
+        if image_contents:
+            # Multimodal format: content is a list of text + images
+            multimodal_content = [{"type": "text", "text": message}] + image_contents
+            messages.append(ChatMessage(role="user", content=multimodal_content))
+        else:
+            messages.append(ChatMessage(role="user", content=message))
+
+        return messages
 
     @property
     def provider_name(self) -> str:
@@ -5,20 +5,20 @@ Supports context-aware agent routing based on view type, document context,
 and requested capabilities. Uses the AgentRouter for intelligent dispatch.
 """
 
-import base64
+import asyncio
+import json
 import logging
 import mimetypes
+from contextlib import aclosing
 
 from asgiref.sync import sync_to_async
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from ninja import Router
 from ninja.errors import HttpError
 
+from accounts.context import aget_request_context
 from accounts.models import Account
-from accounts.utils import (
-    aget_user_organization,
-    get_user_default_project,
-)
 from agents.context import AgentContext, AgentType, ViewContext
 from agents.router import AgentRouter
 from agents.skills import SKILL_LOADER_TOOL_NAME, build_skills_context_block
@@ -27,6 +27,7 @@ from projects.models import Project
 
 from .agent_service import ChatAgentService
 from .code_block_extractor import create_artifacts_from_tool_outputs
+from .history import build_history
 from .models import Conversation, Message
 from .schemas import (
     ArtifactListResponse,
@@ -67,16 +68,228 @@ async def chat(request, payload: ChatRequest):
     Raises:
         HttpError: If user is not authenticated or not associated with an organization
     """
-    # Get user's organization (async)
-    organization = await aget_user_organization(request.user)
-    if not organization:
+    turn = await _prepare_chat_turn(request, payload)
+    conversation = turn["conversation"]
+    conversation_messages = turn["conversation_messages"]
+    user_message_content = turn["user_message_content"]
+    enhanced_instructions = turn["enhanced_instructions"]
+    project = turn["project"]
+
+    # Choose service based on available tools (but use ChatAgentService if images present)
+    tools_called = []
+    tool_artifacts = []  # Artifacts from tool execution (Issue #107) - for API response
+    raw_tool_artifacts = []  # Raw ToolArtifactData for persistence
+    if turn["use_tools"]:
+        # Use ToolAgentService when tools are available (smolagents CodeAgent)
+        tool_service = ToolAgentService(
+            project=project,
+            tools=turn["available_tools"],
+            context=payload.view_type or "chat",
+        )
+
+        # Build full prompt with conversation history for context
+        full_prompt = _build_tool_agent_prompt(
+            user_message_content,
+            conversation_messages,
+            enhanced_instructions,
+        )
+
+        result = await tool_service.chat(full_prompt, system_prompt=enhanced_instructions)
+        response_text = result.response
+        tools_called = result.tools_called
+        model_used = tool_service.model_used
+
+        # Extract tool artifacts (Issue #107)
+        if result.artifacts:
+            raw_tool_artifacts = result.artifacts  # Keep raw for persistence
+            tool_artifacts = await _convert_artifacts_to_response(
+                result.artifacts, request
+            )
+            logger.info(f"Tool generated {len(tool_artifacts)} artifacts")
+    else:
+        service = ChatAgentService(project=project)
+        service.create_agent(name=payload.agent_name, instructions=enhanced_instructions)
+
+        response_text = await service.chat(
+            user_message_content,
+            conversation_messages=conversation_messages,
+            image_contents=turn["image_contents"],
+        )
+        model_used = service.model_used
+
+    assistant_message = await _save_assistant_message(
+        conversation,
+        payload.agent_name,
+        response_text,
+        model_used,
+        tool_artifacts=raw_tool_artifacts,
+    )
+    logger.info(
+        "Saved assistant message %s for conversation %s",
+        assistant_message.id,
+        conversation.id,
+    )
+
+    return ChatResponse(
+        **_build_response_data(payload, turn, response_text, tool_artifacts, tools_called)
+    )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request, payload: ChatRequest):
+    """
+    Send a message to the chat agent and stream the reply as Server-Sent Events.
+
+    Takes the same payload and routing as POST /chat. Events, in order:
+    - ``start``: conversation_id and agent_type, sent before the model is called
+    - ``token``: response text as the model produces it (``{"text": ...}``)
+    - ``thought``: tool agent only - the model's reasoning and code as it is
+      generated; its final answer arrives in ``done``
+    - ``step``: tool agent progress after each step (tools called, errors)
+    - ``done``: the ChatResponse payload plus ``message_id``, sent once the
+      assistant message and its artifacts are saved
+    - ``error``: the agent failed; nothing is saved
+
+    If the client disconnects mid-stream, generation is cancelled and no
+    assistant message is saved.
+
+    Raises:
+        HttpError: Same conditions as POST /chat, before streaming starts
+    """
+    turn = await _prepare_chat_turn(request, payload)
+
+    response = StreamingHttpResponse(
+        _stream_chat_events(request, payload, turn),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _stream_chat_events(request, payload: ChatRequest, turn: dict):
+    """Run the routed agent for a prepared turn, yielding SSE-formatted events."""
+    conversation = turn["conversation"]
+    project = turn["project"]
+    tools_called = []
+    raw_tool_artifacts = []
+
+    yield _sse(
+        "start",
+        {"conversation_id": conversation.id, "agent_type": turn["agent_type"].value},
+    )
+
+    try:
+        if turn["use_tools"]:
+            tool_service = ToolAgentService(
+                project=project,
+                tools=turn["available_tools"],
+                context=payload.view_type or "chat",
+            )
+            full_prompt = _build_tool_agent_prompt(
+                turn["user_message_content"],
+                turn["conversation_messages"],
+                turn["enhanced_instructions"],
+            )
+            result = None
+            events = tool_service.chat_stream(
+                full_prompt, system_prompt=turn["enhanced_instructions"]
+            )
+            async with aclosing(events):
+                async for event in events:
+                    if event.type == "delta":
+                        yield _sse("thought", event.data)
+                    elif event.type == "step":
+                        yield _sse("step", event.data)
+                    elif event.type == "final":
+                        result = event.response
+
+            if "error" in result.telemetry:
+                yield _sse("error", {"detail": result.response})
+                return
+            response_text = result.response
+            tools_called = result.tools_called
+            raw_tool_artifacts = result.artifacts
+            model_used = tool_service.model_used
+        else:
+            service = ChatAgentService(project=project)
+            service.create_agent(
+                name=payload.agent_name, instructions=turn["enhanced_instructions"]
+            )
+            chunks = []
+            stream = service.chat_stream(
+                turn["user_message_content"],
+                conversation_messages=turn["conversation_messages"],
+                image_contents=turn["image_contents"],
+            )
+            async with aclosing(stream):
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield _sse("token", {"text": chunk})
+            response_text = "".join(chunks)
+            model_used = service.model_used
+    except asyncio.CancelledError:
+        logger.info(
+            "Client disconnected from chat stream for conversation %s; reply discarded",
+            conversation.id,
+        )
+        raise
+    except Exception as e:
+        logger.error(f"Chat stream error: {e}", exc_info=True)
+        yield _sse("error", {"detail": str(e)})
+        return
+
+    # Persist only once the reply is complete
+    assistant_message = await _save_assistant_message(
+        conversation,
+        payload.agent_name,
+        response_text,
+        model_used,
+        tool_artifacts=raw_tool_artifacts,
+    )
+    logger.info(
+        "Saved streamed assistant message %s for conversation %s",
+        assistant_message.id,
+        conversation.id,
+    )
+
+    tool_artifacts = []
+    if raw_tool_artifacts:
+        tool_artifacts = await _convert_artifacts_to_response(raw_tool_artifacts, request)
+
+    done = ChatResponse(
+        **_build_response_data(payload, turn, response_text, tool_artifacts, tools_called)
+    ).model_dump(exclude_none=True)
+    done["message_id"] = assistant_message.id
+    yield _sse("done", done)
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _prepare_chat_turn(request, payload: ChatRequest) -> dict:
+    """
+    Resolve everything a chat turn needs before the agent runs.
+
+    Saves the user message, loads history, routes the request and builds
+    the agent instructions. Shared by the regular and streaming endpoints.
+
+    Raises:
+        HttpError: If the user has no organization, or the request routes to
+            document RAG (which has its own endpoints)
+    """
+    # Organization, account and default project for this request (cached)
+    org_context = await aget_request_context(request)
+    if not org_context.organization:
         raise HttpError(403, "User is not associated with any organization")
 
-    context = await sync_to_async(_prepare_chat_context)(request, organization, payload)
+    context = await sync_to_async(_prepare_chat_context)(request, org_context, payload)
     account = context["account"]
     conversation = context["conversation"]
     conversation_messages = context["conversation_messages"]
-    user_message_content = context["user_message_content"]
     image_contents = context["image_contents"]
     project = context["project"]
 
@@ -149,72 +362,34 @@ async def chat(request, payload: ChatRequest):
 
     has_images = _has_images_in_conversation(conversation_messages, image_contents)
 
-    # Choose service based on available tools (but use ChatAgentService if images present)
-    tools_called = []
-    tool_artifacts = []  # Artifacts from tool execution (Issue #107) - for API response
-    raw_tool_artifacts = []  # Raw ToolArtifactData for persistence
-    if available_tools and not has_images:
-        # Use ToolAgentService when tools are available (smolagents CodeAgent)
-        logger.info(f"Using ToolAgentService with tools: {[t.name for t in available_tools]}")
-        tool_service = ToolAgentService(
-            project=project,
-            tools=available_tools,
-            context=payload.view_type or "chat",
-        )
-
-        # Build full prompt with conversation history for context
-        full_prompt = _build_tool_agent_prompt(
-            user_message_content,
-            conversation_messages,
-            enhanced_instructions,
-        )
-
-        result = await tool_service.chat(full_prompt, system_prompt=enhanced_instructions)
-        response_text = result.response
-        tools_called = result.tools_called
-        model_used = tool_service.model_used
-
-        # Extract tool artifacts (Issue #107)
-        if result.artifacts:
-            raw_tool_artifacts = result.artifacts  # Keep raw for persistence
-            tool_artifacts = await _convert_artifacts_to_response(
-                result.artifacts, request
-            )
-            logger.info(f"Tool generated {len(tool_artifacts)} artifacts")
+    # Use ToolAgentService when tools are available, ChatAgentService for
+    # simple chat or when images are present (vision support)
+    use_tools = bool(available_tools) and not has_images
+    if use_tools:
+        logger.info(f"Using ToolAgentService with tools: {tool_names}")
+    elif has_images:
+        logger.info("Using ChatAgentService for vision (images present in conversation)")
     else:
-        # Use ChatAgentService for simple chat or when images are present (vision support)
-        if has_images:
-            logger.info("Using ChatAgentService for vision (images present in conversation)")
-        else:
-            logger.info("Using ChatAgentService (no tools)")
-        service = ChatAgentService(project=project)
-        service.create_agent(name=payload.agent_name, instructions=enhanced_instructions)
-
-        response_text = await service.chat(
-            user_message_content,
-            conversation_messages=conversation_messages,
-            image_contents=image_contents,
-        )
-        model_used = service.model_used
+        logger.info("Using ChatAgentService (no tools)")
+
+    return {
+        **context,
+        "agent_type": agent_type,
+        "available_tools": available_tools,
+        "tool_names": tool_names,
+        "enhanced_instructions": enhanced_instructions,
+        "use_tools": use_tools,
+    }
 
-    assistant_message = await _save_assistant_message(
-        conversation,
-        payload.agent_name,
-        response_text,
-        model_used,
-        tool_artifacts=raw_tool_artifacts,
-    )
-    logger.info(
-        "Saved assistant message %s for conversation %s",
-        assistant_message.id,
-        conversation.id,
-    )
 
-    # Build response with optional debug info
+def _build_response_data(
+    payload: ChatRequest, turn: dict, response_text: str, tool_artifacts: list, tools_called: list
+) -> dict:
+    """Build ChatResponse fields, with debug info if requested."""
     response_data = {
         "response": response_text,
         "agent_name": payload.agent_name,
-        "conversation_id": conversation.id,
+        "conversation_id": turn["conversation"].id,
     }
 
     # Include tool artifacts if any were generated (Issue #107)
@@ -223,13 +398,14 @@ async def chat(request, payload: ChatRequest):
 
     # Include debug information if requested
     if payload.debug:
-        response_data["system_instructions"] = enhanced_instructions
-        response_data["organization"] = account.name
-        response_data["agent_type"] = agent_type.value
-        response_data["tools_available"] = tool_names
+        response_data["system_instructions"] = turn["enhanced_instructions"]
+        response_data["organization"] = turn["account"].name
+        response_data["agent_type"] = turn["agent_type"].value
+        response_data["tools_available"] = turn["tool_names"]
         response_data["tools_called"] = tools_called
+        response_data["prompt_tokens_saved"] = turn["prompt_tokens_saved"]
 
-    return ChatResponse(**response_data)
+    return response_data
 
 
 async def _convert_artifacts_to_response(
@@ -460,7 +636,7 @@ async def list_conversations(request, project_id: int = None):
         HttpError: If user is not authenticated or not associated with an organization
     """
     # Get user's organization (async)
-    organization = await aget_user_organization(request.user)
+    organization = (await aget_request_context(request)).organization
     if not organization:
         raise HttpError(403, "User is not associated with any organization")
 
@@ -524,7 +700,7 @@ async def get_conversation(request, conversation_id: int):
     from documents.models import CollectionItemSourceChannel
 
     # Get user's organization (async)
-    organization = await aget_user_organization(request.user)
+    organization = (await aget_request_context(request)).organization
     if not organization:
         raise HttpError(403, "User is not associated with any organization")
 
@@ -654,7 +830,7 @@ async def delete_conversation(request, conversation_id: int):
         HttpError: If conversation not found or user doesn't have access
     """
     # Get user's organization (async)
-    organization = await aget_user_organization(request.user)
+    organization = (await aget_request_context(request)).organization
     if not organization:
         raise HttpError(403, "User is not associated with any organization")
 
@@ -685,14 +861,15 @@ def health_check(request):
         Status information
     """
     return {"status": "ok", "service": "chat"}
-def _prepare_chat_context(request, organization, payload):
+def _prepare_chat_context(request, org_context, payload):
     """
     Perform all database operations for a chat request inside a single transaction.
     """
     user = request.user
+    organization = org_context.organization
 
     with transaction.atomic():
-        account = Account.objects.select_related().get(id=organization.id)
+        account = org_context.account or Account.objects.get(id=organization.id)
 
         if payload.project_id:
             try:
@@ -702,7 +879,7 @@ def _prepare_chat_context(request, organization, payload):
                     404, f"Project {payload.project_id} not found or access denied"
                 )
         else:
-            project = get_user_default_project(user)
+            project = org_context.default_project
             if not project:
                 raise HttpError(400, "No projects found. Please create a project first.")
 
@@ -740,54 +917,15 @@ def _prepare_chat_context(request, organization, payload):
             content=processed_message,
         )
 
-        historical_messages = list(
-            Message.objects.filter(conversation=conversation)
-            .exclude(id=user_message.id)
-            .order_by("created_at")
-            .values("id", "role", "content")  # Include id for email attachment lookup
-        )
-
-        # Build mapping of message_id -> image data URLs for email attachments
-        from email_gateway.models import EmailMessage as EmailMsg
-
-        message_ids = [msg["id"] for msg in historical_messages]
-        email_msgs = EmailMsg.objects.filter(
-            chat_message_id__in=message_ids
-        ).prefetch_related("stored_attachments")
-
-        message_images: dict[int, list[dict]] = {}
-        for email_msg in email_msgs:
-            images = []
-            for att in email_msg.stored_attachments.all():
-                if att.file and att.content_type and att.content_type.startswith("image/"):
-                    try:
-                        with open(att.file.path, "rb") as f:
-                            b64 = base64.b64encode(f.read()).decode("utf-8")
-                        images.append({
-                            "type": "image_url",
-                            "image_url": {"url": f"data:{att.content_type};base64,{b64}"}
-                        })
-                    except Exception:
-                        continue
-            if images:
-                message_images[email_msg.chat_message_id] = images
-
-        # Build conversation_messages with multimodal content for messages with images
-        conversation_messages = []
-        for msg in historical_messages:
-            msg_id = msg["id"]
-            if msg_id in message_images:
-                # Multimodal format: content is a list of text + images
-                content = [{"type": "text", "text": msg["content"]}] + message_images[msg_id]
-            else:
-                content = msg["content"]
-            conversation_messages.append({"role": msg["role"], "content": content})
+        # Recent messages within the token budget, older ones summarized
+        history = build_history(conversation, exclude_message_id=user_message.id)
 
         return {
             "account": account,
             "project": project,
             "conversation": conversation,
-            "conversation_messages": conversation_messages,
+            "conversation_messages": history.messages,
+            "prompt_tokens_saved": history.tokens_saved,
             "created_new_conversation": created_new,
             "user_message_content": processed_message,
             "image_contents": image_contents,
@@ -853,7 +991,7 @@ async def get_conversation_artifacts(request, conversation_id: int):
     Raises:
         HttpError: If conversation not found or user doesn't have access
     """
-    organization = await aget_user_organization(request.user)
+    organization = (await aget_request_context(request)).organization
     if not organization:
         raise HttpError(403, "User is not associated with any organization")
 
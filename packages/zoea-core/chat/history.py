@@ -0,0 +1,534 @@
+"""
+Token-budgeted conversation history for chat turns.
+
+Sending a conversation's full history on every turn makes long threads
+(e.g. email threads with photos) slow and expensive. build_history()
+instead selects the most recent messages that fit CHAT_HISTORY_TOKEN_BUDGET
+and stands in for everything older with a summary:
+
+- Conversation.history_summary is a rolling summary of the messages up to
+  Conversation.history_summary_through. It is extended in the background
+  (update_history_summary) as messages fall out of the window, so the
+  request never waits for a summarization call.
+- Older messages the stored summary does not cover yet are condensed into
+  a short digest inline until the background update catches up. Only the
+  newest of them that fit the summary budget are loaded, and at most one
+  update task is queued per conversation at a time.
+- Image attachments are base64-encoded into data URL parts once and kept in
+  a per-process LRU keyed by attachment id (bounded by
+  CHAT_HISTORY_IMAGE_CACHE_BYTES).
+
+Token counts are estimates (characters / 4, a fixed cost per image).
+HistoryWindow.tokens_saved is the estimated prompt tokens a turn saves
+compared to sending the full history; get_history_stats() keeps totals.
+
+Usage:
+    from chat.history import build_history
+
+    window = build_history(conversation, exclude_message_id=user_message.id)
+    service.chat(message, conversation_messages=window.messages)
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Left, Length
+from django.utils import timezone
+
+from .models import Conversation, Message
+
+if TYPE_CHECKING:
+    from projects.models import Project
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token for estimates (no tokenizer needed)
+CHARS_PER_TOKEN = 4
+# Per-message overhead (role, separators) in the provider's chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an AI "
+    "assistant. Update the summary with the new messages below. Keep names, "
+    "decisions, open questions and facts the assistant may need later; drop "
+    "pleasantries. Reply with the updated summary only, in at most {max_tokens} tokens."
+)
+DIGEST_LINE_CHARS = 200
+
+
+@dataclass
+class HistoryWindow:
+    """The history sent to the model for one turn."""
+
+    messages: list[dict[str, Any]]
+    included: int = 0
+    dropped: int = 0
+    full_tokens: int = 0
+    prompt_tokens: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved compared to sending the full history."""
+        return max(0, self.full_tokens - self.prompt_tokens)
+
+
+@dataclass
+class HistoryStats:
+    """Process-wide totals for build_history()."""
+
+    turns: int = 0
+    trimmed_turns: int = 0
+    tokens_saved: int = 0
+    image_cache_hits: int = 0
+    image_cache_misses: int = 0
+
+
+@dataclass
+class _HistoryEntry:
+    id: int
+    role: str
+    chars: int
+    images: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return (
+            _tokens_for_chars(self.chars)
+            + MESSAGE_OVERHEAD_TOKENS
+            + len(self.images) * _setting("CHAT_HISTORY_IMAGE_TOKENS", 765)
+        )
+
+
+class ImagePartCache:
+    """Thread-safe LRU of encoded image content parts, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[int, tuple[int, dict[str, Any]]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, attachment_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(attachment_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(attachment_id)
+            return entry[1]
+
+    def put(self, attachment_id: int, part: dict[str, Any]) -> None:
+        size = len(part["image_url"]["url"])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(attachment_id, None)
+            if previous is not None:
+                self._size -= previous[0]
+            self._entries[attachment_id] = (size, part)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_image_cache: ImagePartCache | None = None
+_image_cache_lock = threading.Lock()
+_stats = HistoryStats()
+_stats_lock = threading.Lock()
+
+
+def get_image_part_cache() -> ImagePartCache:
+    """Return the process-wide image part cache configured from settings."""
+    global _image_cache
+
+    max_bytes = _setting("CHAT_HISTORY_IMAGE_CACHE_BYTES", 64 * 1024 * 1024)
+
+    with _image_cache_lock:
+        if _image_cache is None or _image_cache.max_bytes != max_bytes:
+            _image_cache = ImagePartCache(max_bytes)
+        return _image_cache
+
+
+def get_history_stats() -> HistoryStats:
+    """Return a snapshot of the process-wide history counters."""
+    with _stats_lock:
+        return HistoryStats(**vars(_stats))
+
+
+def reset_history_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = HistoryStats()
+
+
+def build_history(
+    conversation: Conversation,
+    *,
+    exclude_message_id: int | None = None,
+    token_budget: int | None = None,
+) -> HistoryWindow:
+    """
+    Build the model-facing history for a conversation.
+
+    Args:
+        conversation: Conversation whose messages to include
+        exclude_message_id: Message to leave out (the turn's own user message)
+        token_budget: Override for CHAT_HISTORY_TOKEN_BUDGET
+
+    Returns:
+        HistoryWindow with messages in the provider chat format: an optional
+        summary message first, then the recent messages, oldest first
+    """
+    budget = token_budget
+    if budget is None:
+        budget = _setting("CHAT_HISTORY_TOKEN_BUDGET", 8000)
+
+    # Sizes only: message bodies are loaded for the selected window
+    rows = Message.objects.filter(conversation=conversation).order_by("created_at", "id")
+    if exclude_message_id is not None:
+        rows = rows.exclude(id=exclude_message_id)
+    entries = [
+        _HistoryEntry(id=row["id"], role=row["role"], chars=row["chars"] or 0)
+        for row in rows.annotate(chars=Length("content")).values("id", "role", "chars")
+    ]
+    _attach_images(entries)
+
+    full_tokens = sum(entry.tokens for entry in entries)
+
+    # Newest messages first until the budget is spent (always keep the last one)
+    start = len(entries)
+    used = 0
+    while start > 0:
+        cost = entries[start - 1].tokens
+        if used + cost > budget and start < len(entries):
+            break
+        used += cost
+        start -= 1
+
+    window = entries[start:]
+    dropped = entries[:start]
+
+    messages: list[dict[str, Any]] = []
+    summary = _summary_for(conversation, dropped)
+    if summary:
+        messages.append({"role": "system", "content": SUMMARY_PREFIX + summary})
+
+    contents = dict(
+        Message.objects.filter(id__in=[entry.id for entry in window]).values_list("id", "content")
+    )
+    for entry in window:
+        text = contents.get(entry.id, "")
+        if entry.images:
+            # Multimodal format: content is a list of text + images
+            content: Any = [{"type": "text", "text": text}] + _image_parts(entry.images)
+        else:
+            content = text
+        messages.append({"role": entry.role, "content": content})
+
+    result = HistoryWindow(
+        messages=messages,
+        included=len(window),
+        dropped=len(dropped),
+        full_tokens=full_tokens,
+        prompt_tokens=used + (_tokens_for_chars(len(messages[0]["content"])) if summary else 0),
+    )
+
+    with _stats_lock:
+        _stats.turns += 1
+        if dropped:
+            _stats.trimmed_turns += 1
+        _stats.tokens_saved += result.tokens_saved
+
+    if dropped:
+        logger.info(
+            "Conversation %s history: %d of %d messages, ~%d prompt tokens (~%d saved)",
+            conversation.id,
+            result.included,
+            len(entries),
+            result.prompt_tokens,
+            result.tokens_saved,
+        )
+    return result
+
+
+def update_history_summary(conversation_id: int, through_message_id: int) -> bool:
+    """
+    Fold messages up to ``through_message_id`` into a conversation's summary.
+
+    Runs as a background task. Only the messages after the current
+    history_summary_through are sent to the model, along with the previous
+    summary, and at most CHAT_HISTORY_SUMMARY_INPUT_TOKENS of them per run; a
+    longer backlog is folded in by follow-up runs.
+
+    Returns:
+        True if the summary was updated
+    """
+    conversation = Conversation.objects.select_related("project").filter(id=conversation_id).first()
+    if conversation is None:
+        return False
+
+    continued = False
+    try:
+        previous_through = conversation.history_summary_through
+        if previous_through is not None and previous_through >= through_message_id:
+            return False
+
+        messages = Message.objects.filter(conversation=conversation, id__lte=through_message_id)
+        if previous_through is not None:
+            messages = messages.filter(id__gt=previous_through)
+        new_messages = _summary_slice(messages)
+        if not new_messages:
+            return False
+
+        summary = summarize_turns(
+            conversation.history_summary, new_messages, project=conversation.project
+        )
+
+        # Skip the write if another worker moved the summary on meanwhile
+        last_id = new_messages[-1]["id"]
+        updated = Conversation.objects.filter(
+            id=conversation_id, history_summary_through=previous_through
+        ).update(history_summary=summary, history_summary_through=last_id)
+        if updated and messages.filter(id__gt=last_id).exists():
+            continued = _enqueue_summary_update(conversation_id, through_message_id)
+        return bool(updated)
+    finally:
+        if not continued:
+            Conversation.objects.filter(id=conversation_id).update(
+                history_summary_requested_at=None
+            )
+
+
+def summarize_turns(
+    summary: str,
+    messages: list[dict[str, Any]],
+    *,
+    project: Project | None = None,
+) -> str:
+    """
+    Extend a running summary with new messages using the project's LLM.
+
+    Falls back to appending a plain digest of the messages when the model
+    call fails.
+    """
+    from llm_providers import ChatMessage, LLMProviderRegistry, resolve_llm_config
+
+    max_tokens = _setting("CHAT_HISTORY_SUMMARY_MAX_TOKENS", 500)
+    transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+    prompt = f"Current summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"
+
+    try:
+        config = resolve_llm_config(project=project)
+        provider = LLMProviderRegistry.get(config.provider, config=config)
+        response = provider.chat(
+            [
+                ChatMessage(role="system", content=SUMMARY_PROMPT.format(max_tokens=max_tokens)),
+                ChatMessage(role="user", content=prompt),
+            ],
+            model_id=config.model_id,
+        )
+        if response.content and response.content.strip():
+            return response.content.strip()
+    except Exception as exc:  # noqa: BLE001 - fall back to a plain digest
+        logger.warning("History summarization failed, using digest: %s", exc)
+
+    return _trim_to_tokens("\n".join(filter(None, [summary, _digest(messages)])), max_tokens)
+
+
+def _summary_for(conversation: Conversation, dropped: list[_HistoryEntry]) -> str:
+    """Stored summary plus a digest of dropped messages it does not cover yet."""
+    if not dropped:
+        return ""
+
+    max_tokens = _setting("CHAT_HISTORY_SUMMARY_MAX_TOKENS", 500) * 2
+    summarized_through = conversation.history_summary_through or 0
+    pending = [entry for entry in dropped if entry.id > summarized_through]
+    parts = []
+    if conversation.history_summary and summarized_through:
+        parts.append(conversation.history_summary)
+    if pending:
+        parts.append(_digest(_digest_rows(pending, max_tokens * CHARS_PER_TOKEN)))
+        _schedule_summary_update(conversation.id, pending[-1].id)
+    return _trim_to_tokens("\n".join(parts), max_tokens)
+
+
+def _digest_rows(pending: list[_HistoryEntry], max_chars: int) -> list[dict[str, Any]]:
+    """Load truncated bodies for the newest pending messages whose digest lines fit."""
+    selected: list[int] = []
+    used = 0
+    for entry in reversed(pending):
+        used += min(entry.chars, DIGEST_LINE_CHARS) + len(entry.role) + 4
+        if used > max_chars and selected:
+            break
+        selected.append(entry.id)
+
+    # Extra room so whitespace collapsing still leaves a full line
+    rows = (
+        Message.objects.filter(id__in=selected)
+        .annotate(head=Left("content", DIGEST_LINE_CHARS * 4))
+        .order_by("created_at", "id")
+        .values("role", "head")
+    )
+    return [{"role": row["role"], "content": row["head"]} for row in rows]
+
+
+def _summary_slice(messages) -> list[dict[str, Any]]:
+    """
+    The oldest messages of ``messages`` that fit CHAT_HISTORY_SUMMARY_INPUT_TOKENS.
+
+    Always includes at least one message; bodies are cut to the budget.
+    """
+    max_chars = _setting("CHAT_HISTORY_SUMMARY_INPUT_TOKENS", 4000) * CHARS_PER_TOKEN
+    selected: list[int] = []
+    used = 0
+    sizes = messages.order_by("created_at", "id").annotate(chars=Length("content"))
+    for row in sizes.values("id", "chars").iterator():
+        used += min(row["chars"] or 0, max_chars) + MESSAGE_OVERHEAD_TOKENS * CHARS_PER_TOKEN
+        if used > max_chars and selected:
+            break
+        selected.append(row["id"])
+
+    rows = (
+        Message.objects.filter(id__in=selected)
+        .annotate(head=Left("content", max_chars))
+        .order_by("created_at", "id")
+        .values("id", "role", "head")
+    )
+    return [{"id": row["id"], "role": row["role"], "content": row["head"]} for row in rows]
+
+
+def _schedule_summary_update(conversation_id: int, through_message_id: int) -> None:
+    """
+    Queue update_history_summary() once the surrounding transaction commits.
+
+    At most one update is queued per conversation: the request is recorded
+    on Conversation.history_summary_requested_at and only re-queued once the
+    task clears it or it is older than CHAT_HISTORY_SUMMARY_TASK_TIMEOUT.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=_setting("CHAT_HISTORY_SUMMARY_TASK_TIMEOUT", 600))
+    claimed = (
+        Conversation.objects.filter(id=conversation_id)
+        .filter(
+            Q(history_summary_requested_at__isnull=True)
+            | Q(history_summary_requested_at__lt=stale)
+        )
+        .update(history_summary_requested_at=now)
+    )
+    if claimed:
+        transaction.on_commit(lambda: _enqueue_summary_update(conversation_id, through_message_id))
+
+
+def _enqueue_summary_update(conversation_id: int, through_message_id: int) -> bool:
+    try:
+        from django_q.tasks import async_task
+
+        async_task(
+            "chat.history.update_history_summary",
+            conversation_id,
+            through_message_id,
+            task_name=f"summarize_conversation_{conversation_id}_{through_message_id}",
+        )
+        return True
+    except Exception as exc:  # noqa: BLE001 - the inline digest covers the gap
+        logger.warning(
+            "Failed to queue history summary for conversation %s: %s", conversation_id, exc
+        )
+        Conversation.objects.filter(id=conversation_id).update(history_summary_requested_at=None)
+        return False
+
+
+def _attach_images(entries: list[_HistoryEntry]) -> None:
+    """Attach image attachment refs (id, content type, path) to email-backed messages."""
+    if not entries:
+        return
+
+    from email_gateway.models import EmailAttachment
+
+    by_message = {entry.id: entry for entry in entries}
+    attachments = (
+        EmailAttachment.objects.filter(
+            email_message__chat_message_id__in=list(by_message),
+            content_type__startswith="image/",
+        )
+        .exclude(file="")
+        .order_by("created_at", "id")
+        .values("id", "email_message__chat_message_id", "content_type", "file")
+    )
+    for attachment in attachments:
+        by_message[attachment["email_message__chat_message_id"]].images.append(attachment)
+
+
+def _image_parts(images: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return image_url content parts for attachments, encoding each at most once."""
+    from email_gateway.models import EmailAttachment
+
+    cache = get_image_part_cache()
+    storage = EmailAttachment._meta.get_field("file").storage
+    parts = []
+    for image in images:
+        part = cache.get(image["id"])
+        if part is None:
+            try:
+                with storage.open(image["file"], "rb") as f:
+                    b64 = base64.b64encode(f.read()).decode("utf-8")
+            except Exception:  # noqa: BLE001 - skip unreadable attachments
+                continue
+            part = {
+                "type": "image_url",
+                "image_url": {"url": f"data:{image['content_type']};base64,{b64}"},
+            }
+            cache.put(image["id"], part)
+            with _stats_lock:
+                _stats.image_cache_misses += 1
+        else:
+            with _stats_lock:
+                _stats.image_cache_hits += 1
+        parts.append(part)
+    return parts
+
+
+def _digest(messages: list[dict[str, Any]]) -> str:
+    """One truncated line per message."""
+    lines = []
+    for msg in messages:
+        text = " ".join(str(msg["content"]).split())
+        if len(text) > DIGEST_LINE_CHARS:
+            text = text[: DIGEST_LINE_CHARS - 3] + "..."
+        lines.append(f"- {msg['role']}: {text}")
+    return "\n".join(lines)
+
+
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the end of ``text`` (the most recent turns) within ``max_tokens``."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return "..." + text[-(max_chars - 3):]
+
+
+def _tokens_for_chars(chars: int) -> int:
+    """Estimated tokens for ``chars`` characters of text."""
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+def _setting(name: str, default: int) -> int:
+    return int(getattr(settings, name, default))
@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-16 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_add_artifacts_fk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='history_summary',
+            field=models.TextField(blank=True, help_text='Rolling summary of messages older than the history window (see chat.history)'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='history_summary_through',
+            field=models.BigIntegerField(blank=True, help_text='ID of the last message included in history_summary', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_conversation_history_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='history_summary_requested_at',
+            field=models.DateTimeField(blank=True, help_text='When a background summary update was queued (cleared when it finishes)', null=True),
+        ),
+    ]
@@ -61,6 +61,20 @@ class Conversation(models.Model):
         related_name='conversations',
         help_text="Collection of artifacts (code blocks, files, etc.) from this conversation"
     )
+    history_summary = models.TextField(
+        blank=True,
+        help_text="Rolling summary of messages older than the history window (see chat.history)"
+    )
+    history_summary_through = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="ID of the last message included in history_summary"
+    )
+    history_summary_requested_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a background summary update was queued (cleared when it finishes)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -107,6 +107,12 @@ class ChatResponse(BaseModel):
         default=None,
         description="Tools that were available to the agent",
     )
+    prompt_tokens_saved: int | None = Field(
+        default=None,
+        description=(
+            "Estimated prompt tokens saved by trimming the history (only included if debug=true)"
+        ),
+    )
 
     # Tool-generated artifacts (Issue #107)
     tool_artifacts: list[ToolArtifactItem] | None = Field(
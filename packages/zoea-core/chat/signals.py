@@ -19,8 +19,8 @@ def index_chat_message_on_save(sender, instance: Message, created: bool, **kwarg
         return
 
     def _index():
-        from file_search.indexing import index_chat_message
+        from file_search.queue import enqueue_chat_message_index
 
-        index_chat_message(instance)
+        enqueue_chat_message_index(instance)
 
     transaction.on_commit(_index)
@@ -244,16 +244,15 @@ class SkillsAgentService:
             "",
         ]
 
-        for skill in self.loaded_skills:
-            parts.append(f"### Skill: {skill.name}")
-            parts.append(f"**Description:** {skill.metadata.description}")
-            parts.append("")
-            parts.append("#### Instructions")
-            parts.append("")
-            parts.append(skill.instructions)
-            parts.append("")
-            parts.append("---")
-            parts.append("")
+        # Rendered once per skill set; the registry drops it when a SKILL.md changes
+        registry = SkillRegistry.get_instance()
+        if self.loaded_skills:
+            parts.append(
+                registry.cached_prompt_block(
+                    ("loaded_skills", tuple(self.skills_used)),
+                    self._render_loaded_skills,
+                )
+            )
 
         parts.append("## Processing Guidelines")
         parts.append("")
@@ -277,6 +276,21 @@ class SkillsAgentService:
 
         return "\n".join(parts)
 
+    def _render_loaded_skills(self) -> str:
+        """Render each loaded skill's description and instructions."""
+        parts = []
+        for skill in self.loaded_skills:
+            parts.append(f"### Skill: {skill.name}")
+            parts.append(f"**Description:** {skill.metadata.description}")
+            parts.append("")
+            parts.append("#### Instructions")
+            parts.append("")
+            parts.append(skill.instructions)
+            parts.append("")
+            parts.append("---")
+            parts.append("")
+        return "\n".join(parts)
+
     def _create_smolagents_model(self, project: Project | None):
         """
         Create the appropriate smolagents model based on provider configuration.
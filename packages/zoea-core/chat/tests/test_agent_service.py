@@ -402,6 +402,105 @@ class TestAPIEndpoints:
             assert messages[1]['conversation_id'] == conversation.id
             assert messages[1]['model_used'] == "gpt-4o-mini"  # Uses service.model_used
 
+    @staticmethod
+    async def _read_sse(response):
+        """Collect (event, data) pairs from a streaming SSE response."""
+        import json
+
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_endpoint_streams_then_persists(self, user_with_org, organization):
+        """Tokens are streamed as they arrive and the reply is saved before done."""
+        from django.test import AsyncClient
+        from chat.models import Message
+        from agents.context import AgentType
+
+        client = AsyncClient()
+        await client.aforce_login(user_with_org)
+
+        mock_route_result = MagicMock()
+        mock_route_result.agent_type = AgentType.CHAT
+        mock_route_result.tools = []
+
+        async def fake_stream(*args, **kwargs):
+            for chunk in ["Hel", "lo", "!"]:
+                yield chunk
+
+        with (
+            patch("chat.api._route_request", return_value=mock_route_result),
+            patch("chat.api.ChatAgentService") as mock_service_class,
+        ):
+            mock_service = MagicMock()
+            mock_service.chat_stream = fake_stream
+            mock_service.model_used = "gpt-4o-mini"
+            mock_service_class.return_value = mock_service
+
+            response = await client.post(
+                "/api/chat/stream",
+                data={"message": "Hi"},
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            assert response["Content-Type"] == "text/event-stream"
+            events = await self._read_sse(response)
+
+        assert [name for name, _ in events] == ["start", "token", "token", "token", "done"]
+        assert "".join(data["text"] for name, data in events if name == "token") == "Hello!"
+        done = events[-1][1]
+        assert done["response"] == "Hello!"
+        assert done["conversation_id"] == events[0][1]["conversation_id"]
+
+        message = await sync_to_async(Message.objects.get)(id=done["message_id"])
+        assert message.role == "assistant"
+        assert message.content == "Hello!"
+        assert message.model_used == "gpt-4o-mini"
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_endpoint_does_not_persist_failed_reply(self, user_with_org, organization):
+        """A failure mid-stream emits an error event and saves no assistant message."""
+        from django.test import AsyncClient
+        from chat.models import Message
+        from agents.context import AgentType
+
+        client = AsyncClient()
+        await client.aforce_login(user_with_org)
+
+        mock_route_result = MagicMock()
+        mock_route_result.agent_type = AgentType.CHAT
+        mock_route_result.tools = []
+
+        async def failing_stream(*args, **kwargs):
+            yield "Partial"
+            raise RuntimeError("provider went away")
+
+        with (
+            patch("chat.api._route_request", return_value=mock_route_result),
+            patch("chat.api.ChatAgentService") as mock_service_class,
+        ):
+            mock_service = MagicMock()
+            mock_service.chat_stream = failing_stream
+            mock_service_class.return_value = mock_service
+
+            response = await client.post(
+                "/api/chat/stream",
+                data={"message": "Hi"},
+                content_type="application/json",
+            )
+            events = await self._read_sse(response)
+
+        assert [name for name, _ in events] == ["start", "token", "error"]
+        assert "provider went away" in events[-1][1]["detail"]
+        assert not await sync_to_async(
+            Message.objects.filter(role="assistant").exists
+        )()
+
     @pytest.mark.asyncio
     async def test_multiple_chats_create_separate_conversations(self, user_with_org, organization):
         """Test that each chat request creates a new conversation."""
@@ -907,3 +1006,40 @@ class TestAPIEndpoints:
             return Conversation.objects.filter(id=conversation.id).exists()
 
         assert await check_exists()
+
+
+class TestToolAgentServiceStream:
+    """Tests for ToolAgentService.chat_stream()."""
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_reports_steps_then_final_response(self):
+        from smolagents.memory import ActionStep, FinalAnswerStep, ToolCall
+        from smolagents.monitoring import Timing
+
+        from agents.tools.output_collections import InMemoryArtifactCollection
+        from chat.tool_agent_service import ToolAgentService
+
+        step = ActionStep(
+            step_number=1,
+            timing=Timing(start_time=0.0, end_time=0.5),
+            tool_calls=[ToolCall(name="web_search", arguments={"query": "zoea"}, id="call_1")],
+        )
+
+        agent = MagicMock()
+        agent.prompt_templates = {"system_prompt": "Base"}
+        agent.stream_outputs = False
+        agent.run.return_value = iter([step, FinalAnswerStep(output="Found it")])
+        agent.memory.get_full_steps.return_value = [step.dict()]
+
+        service = ToolAgentService.__new__(ToolAgentService)
+        service.agent = agent
+        service.model = object()
+        service._artifact_collection = InMemoryArtifactCollection()
+
+        events = [event async for event in service.chat_stream("Search zoea")]
+
+        assert [event.type for event in events] == ["step", "final"]
+        assert events[0].data["tools"] == ["web_search"]
+        assert events[1].response.response == "Found it"
+        assert events[1].response.tools_called == ["web_search"]
+        agent.run.assert_called_once_with("Search zoea", stream=True)
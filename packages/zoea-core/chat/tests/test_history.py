@@ -0,0 +1,205 @@
+"""
+Tests for token-budgeted chat history.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from chat import history
+from chat.history import build_history, update_history_summary
+from chat.models import Conversation, Message
+from email_gateway.models import EmailAttachment, EmailMessage
+from organizations.models import Organization
+from projects.models import Project
+
+User = get_user_model()
+
+
+@pytest.fixture
+def conversation(db):
+    organization = Organization.objects.create(name="Test Organization")
+    user = User.objects.create_user(username="testuser", password="testpass")
+    organization.add_user(user)
+    project = Project.objects.create(
+        organization=organization,
+        name="Test Project",
+        working_directory="/tmp/test",
+        created_by=user,
+    )
+    return Conversation.objects.create(
+        organization=organization, project=project, created_by=user, agent_name="TestAgent"
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_history_caches():
+    history.get_image_part_cache().clear()
+    history.reset_history_stats()
+    yield
+
+
+def _add_messages(conversation, count, chars=400):
+    messages = []
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append(
+            Message.objects.create(conversation=conversation, role=role, content=f"{i}:" + "x" * chars)
+        )
+    return messages
+
+
+def test_short_history_is_sent_unchanged(conversation):
+    _add_messages(conversation, 4)
+
+    window = build_history(conversation)
+
+    assert [msg["role"] for msg in window.messages] == ["user", "assistant", "user", "assistant"]
+    assert window.dropped == 0
+    assert window.tokens_saved == 0
+
+
+def test_budget_keeps_recent_messages_and_digests_older_ones(conversation, django_capture_on_commit_callbacks):
+    messages = _add_messages(conversation, 10)
+
+    with (
+        patch("django_q.tasks.async_task") as async_task,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        window = build_history(conversation, token_budget=350)
+
+    # Each message is ~105 tokens: three fit, the other seven are digested
+    assert window.included == 3
+    assert window.dropped == 7
+    summary, *recent = window.messages
+    assert summary["role"] == "system"
+    assert summary["content"].startswith(history.SUMMARY_PREFIX)
+    assert "- user: 0:" in summary["content"]
+    assert [msg["content"] for msg in recent] == [m.content for m in messages[7:]]
+    assert window.tokens_saved > 0
+    assert history.get_history_stats().tokens_saved == window.tokens_saved
+
+    async_task.assert_called_once()
+    assert async_task.call_args.args[1:] == (conversation.id, messages[6].id)
+
+
+def test_stored_summary_replaces_summarized_messages(conversation):
+    messages = _add_messages(conversation, 10)
+    provider = MagicMock()
+    provider.chat.return_value = MagicMock(content="They discussed the launch plan.")
+
+    with patch("llm_providers.LLMProviderRegistry.get", return_value=provider):
+        assert update_history_summary(conversation.id, messages[6].id)
+
+    conversation.refresh_from_db()
+    assert conversation.history_summary == "They discussed the launch plan."
+    assert conversation.history_summary_through == messages[6].id
+    # Already summarized through this message: nothing to do
+    assert not update_history_summary(conversation.id, messages[5].id)
+
+    with patch("chat.history._schedule_summary_update") as schedule:
+        window = build_history(conversation, token_budget=350)
+
+    assert window.messages[0]["content"] == history.SUMMARY_PREFIX + "They discussed the launch plan."
+    schedule.assert_not_called()
+
+
+def test_summary_falls_back_to_digest_when_model_fails(conversation):
+    messages = _add_messages(conversation, 4, chars=20)
+    provider = MagicMock()
+    provider.chat.side_effect = RuntimeError("no API key")
+
+    with patch("llm_providers.LLMProviderRegistry.get", return_value=provider):
+        assert update_history_summary(conversation.id, messages[1].id)
+
+    conversation.refresh_from_db()
+    assert conversation.history_summary.splitlines() == [
+        f"- user: {messages[0].content}",
+        f"- assistant: {messages[1].content}",
+    ]
+
+
+def test_summary_update_is_queued_once_per_conversation(
+    conversation, django_capture_on_commit_callbacks
+):
+    _add_messages(conversation, 10)
+
+    with (
+        patch("django_q.tasks.async_task") as async_task,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        build_history(conversation, token_budget=350)
+        _add_messages(conversation, 2)
+        build_history(conversation, token_budget=350)
+
+    summary_calls = [
+        call for call in async_task.call_args_list
+        if call.args[0] == "chat.history.update_history_summary"
+    ]
+    assert len(summary_calls) == 1
+    conversation.refresh_from_db()
+    assert conversation.history_summary_requested_at is not None
+
+
+def test_digest_covers_only_newest_dropped_messages_within_budget(conversation, settings):
+    settings.CHAT_HISTORY_SUMMARY_MAX_TOKENS = 100
+    messages = _add_messages(conversation, 30)
+
+    with patch("chat.history._schedule_summary_update"):
+        window = build_history(conversation, token_budget=350)
+
+    digest = window.messages[0]["content"]
+    assert "- user: 0:" not in digest
+    assert f"- user: {messages[26].content[:20]}" in digest
+    assert len(digest) <= len(history.SUMMARY_PREFIX) + 200 * 4
+
+
+def test_summary_update_folds_a_long_backlog_in_slices(conversation, settings):
+    settings.CHAT_HISTORY_SUMMARY_INPUT_TOKENS = 250
+    messages = _add_messages(conversation, 10)
+    provider = MagicMock()
+    provider.chat.return_value = MagicMock(content="Summary so far.")
+
+    with (
+        patch("llm_providers.LLMProviderRegistry.get", return_value=provider),
+        patch("django_q.tasks.async_task") as async_task,
+    ):
+        assert update_history_summary(conversation.id, messages[6].id)
+
+    # ~105 tokens per message: two fit in one run, the rest is queued
+    prompt = provider.chat.call_args.args[0][1].content
+    assert messages[1].content in prompt
+    assert messages[2].content not in prompt
+    conversation.refresh_from_db()
+    assert conversation.history_summary_through == messages[1].id
+    assert async_task.call_args.args[1:] == (conversation.id, messages[6].id)
+
+
+def test_image_parts_are_encoded_once(conversation, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    message = Message.objects.create(conversation=conversation, role="user", content="See attached")
+    email = EmailMessage.objects.create(
+        organization=conversation.organization,
+        chat_message=message,
+        message_id="<photo@example.com>",
+        sender="sender@example.com",
+        recipient="inbox@mail.zoea.studio",
+    )
+    EmailAttachment.objects.create(
+        email_message=email,
+        file=SimpleUploadedFile("photo.png", b"\x89PNG\r\n", content_type="image/png"),
+        filename="photo.png",
+        content_type="image/png",
+    )
+
+    first = build_history(conversation)
+    second = build_history(conversation)
+
+    text, image = first.messages[0]["content"]
+    assert text == {"type": "text", "text": "See attached"}
+    assert image["image_url"]["url"] == "data:image/png;base64,iVBORw0K"
+    assert second.messages == first.messages
+    stats = history.get_history_stats()
+    assert (stats.image_cache_misses, stats.image_cache_hits) == (1, 1)
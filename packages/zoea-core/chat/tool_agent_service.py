@@ -7,12 +7,17 @@ enabling capabilities like web search, image analysis, and more.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import AsyncGenerator, Callable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from asgiref.sync import sync_to_async
 from smolagents import CodeAgent, LiteLLMModel, OpenAIServerModel
+from smolagents.agents import RunResult
+from smolagents.memory import ActionStep, FinalAnswerStep
+from smolagents.models import ChatMessageStreamDelta
 
 from agents.registry import ToolRegistry
 from agents.tools.base import (
@@ -55,6 +60,22 @@ class ToolAgentResponse:
     artifacts: list[ToolArtifactData] = field(default_factory=list)
 
 
+@dataclass
+class ToolAgentEvent:
+    """
+    Progress event from ToolAgentService.chat_stream().
+
+    ``type`` is one of:
+        "delta": model output text as it is generated (``data["text"]``)
+        "step": a finished agent step (step number, tools called, error)
+        "final": the run finished; ``response`` holds the ToolAgentResponse
+    """
+
+    type: str
+    data: dict[str, Any] = field(default_factory=dict)
+    response: ToolAgentResponse | None = None
+
+
 class ToolAgentService:
     """
     smolagents CodeAgent configured with tools from ToolRegistry.
@@ -192,10 +213,50 @@ class ToolAgentService:
         result = await sync_to_async(self._run_agent)(message, system_prompt)
         return result
 
+    async def chat_stream(
+        self,
+        message: str,
+        system_prompt: str | None = None,
+    ) -> AsyncGenerator[ToolAgentEvent, None]:
+        """
+        Run the agent, yielding progress events as it works.
+
+        The agent runs in a worker thread; events are handed over as they
+        happen. Closing the generator (e.g. when the client disconnects)
+        interrupts the agent before its next step.
+
+        Args:
+            message: User message to process
+            system_prompt: Optional system prompt for the agent
+
+        Yields:
+            ToolAgentEvent items, ending with a "final" event
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[ToolAgentEvent] = asyncio.Queue()
+
+        def emit(event: ToolAgentEvent) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        task = asyncio.ensure_future(
+            sync_to_async(self._run_agent)(message, system_prompt, on_event=emit)
+        )
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event.type == "final":
+                    break
+        finally:
+            if not task.done():
+                logger.info("Tool agent stream closed early; interrupting agent")
+                self.agent.interrupt()
+
     def _run_agent(
         self,
         message: str,
         system_prompt: str | None = None,
+        on_event: Callable[[ToolAgentEvent], None] | None = None,
     ) -> ToolAgentResponse:
         """
         Run the agent synchronously.
@@ -203,6 +264,8 @@ class ToolAgentService:
         Args:
             message: User message to process
             system_prompt: Optional system prompt
+            on_event: Optional callback receiving ToolAgentEvents as the agent
+                runs (the agent then runs step by step in streaming mode)
 
         Returns:
             ToolAgentResponse with response and telemetry
@@ -221,7 +284,10 @@ class ToolAgentService:
                 )
 
             # Run the agent
-            result = self.agent.run(message)
+            if on_event is None:
+                result = self.agent.run(message)
+            else:
+                result = self._run_agent_streaming(message, on_event)
             self._last_run_result = result
 
             # Extract telemetry
@@ -234,12 +300,14 @@ class ToolAgentService:
             artifacts = self._collect_all_artifacts(result)
 
             # Get response text
-            if hasattr(result, "content"):
+            if isinstance(result, RunResult):
+                response_text = str(result.output)
+            elif hasattr(result, "content"):
                 response_text = str(result.content)
             else:
                 response_text = str(result)
 
-            return ToolAgentResponse(
+            response = ToolAgentResponse(
                 response=response_text,
                 tools_called=telemetry.get("tools_called", []),
                 steps=telemetry.get("steps", []),
@@ -249,13 +317,47 @@ class ToolAgentService:
 
         except Exception as e:
             logger.error(f"ToolAgentService error: {e}", exc_info=True)
-            return ToolAgentResponse(
+            response = ToolAgentResponse(
                 response=f"I encountered an error while processing your request: {str(e)}",
                 tools_called=[],
                 steps=[],
                 telemetry={"error": str(e)},
             )
 
+        if on_event is not None:
+            on_event(ToolAgentEvent(type="final", response=response))
+        return response
+
+    def _run_agent_streaming(
+        self,
+        message: str,
+        on_event: Callable[[ToolAgentEvent], None],
+    ) -> RunResult:
+        """Run the agent in streaming mode, reporting deltas and steps to ``on_event``."""
+        # Token deltas need a model that can stream
+        stream_outputs = self.agent.stream_outputs
+        self.agent.stream_outputs = hasattr(self.model, "generate_stream")
+        output = None
+        try:
+            for item in self.agent.run(message, stream=True):
+                if isinstance(item, ChatMessageStreamDelta):
+                    if item.content:
+                        on_event(ToolAgentEvent(type="delta", data={"text": item.content}))
+                elif isinstance(item, ActionStep):
+                    on_event(ToolAgentEvent(type="step", data=_summarize_step(item)))
+                elif isinstance(item, FinalAnswerStep):
+                    output = item.output
+        finally:
+            self.agent.stream_outputs = stream_outputs
+
+        return RunResult(
+            output=output,
+            state="success",
+            steps=self.agent.memory.get_full_steps(),
+            token_usage=None,
+            timing=None,
+        )
+
     def _collect_all_artifacts(self, run_result: Any) -> list[ToolArtifactData]:
         """
         Collect all artifacts from multiple sources.
@@ -501,3 +603,18 @@ class ToolAgentService:
     def model_used(self) -> str:
         """Return the model ID being used."""
         return self.model_id
+
+
+def _summarize_step(step: ActionStep) -> dict[str, Any]:
+    """Summarize a finished agent step for progress events."""
+    summary: dict[str, Any] = {
+        "step": step.step_number,
+        "tools": [tool_call.name for tool_call in step.tool_calls or []],
+    }
+    if step.timing and step.timing.duration is not None:
+        summary["duration_s"] = round(step.timing.duration, 3)
+    if step.error:
+        summary["error"] = str(step.error)
+    if step.is_final_answer:
+        summary["final"] = True
+    return summary
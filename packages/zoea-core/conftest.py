@@ -8,3 +8,44 @@ import os
 
 # Set test settings module before importing Django
 os.environ["DJANGO_SETTINGS_MODULE"] = "zoea.settings_test"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_file_search_clients():
+    """Pooled file search clients and cached results must not leak between tests."""
+    yield
+    from file_search.clients import reset_clients
+    from file_search.query_cache import get_query_cache
+
+    reset_clients()
+    get_query_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_trigger_index():
+    """The per-process trigger index must not carry triggers between tests."""
+    yield
+    from events.trigger_index import get_trigger_index
+
+    get_trigger_index().clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_organization_context_cache():
+    """Cached organization contexts must not outlive the test that created them."""
+    yield
+    from accounts.context import get_context_cache
+
+    get_context_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_tool_set_cache():
+    """Cached tool sets must not outlive the project they were built for."""
+    yield
+    from agents.registry import ToolRegistry
+
+    if ToolRegistry._instance is not None:
+        ToolRegistry._instance.tool_set_cache.clear()
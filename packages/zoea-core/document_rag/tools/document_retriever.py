@@ -10,6 +10,7 @@ import time
 from smolagents import Tool
 
 from file_search import FileSearchRegistry
+from file_search.query_cache import cached_search
 
 
 class DocumentRetrieverTool(Tool):
@@ -84,7 +85,8 @@ Use declarative statements rather than questions for better results."""
         self.telemetry["calls"] += 1
         start = time.perf_counter()
         try:
-            result = self.file_search_store.search(
+            result = cached_search(
+                self.file_search_store,
                 store_id=self.store_id,
                 query=query,
                 max_results=max_results or 5,
@@ -3,15 +3,17 @@ API endpoints for Documents.
 """
 
 from django.conf import settings
-from django.db.models import Q
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q, Window
 from django.http import HttpRequest
 from ninja import File, Form, Query, Router
 from ninja.errors import HttpError
 from ninja.files import UploadedFile
 
 from accounts.utils import get_user_organization
-from file_search import FileSearchRegistry
+from file_search import SEARCH_MODES, FileSearchRegistry
 from file_search.exceptions import StoreError
+from file_search.query_cache import cached_search
 from projects.models import Project
 
 from .models import (
@@ -27,7 +29,7 @@ from .models import (
     WordDocument,
     YooptaDocument,
 )
-from .preview_service import get_preview_data
+from .preview_service import get_list_preview_data, get_preview_data
 from .import_service import DocumentImportService, ImportLimitError, ImportValidationError
 from .schemas import (
     CreateDocumentFromArtifactRequest,
@@ -56,10 +58,28 @@ from .schemas import (
     YooptaDocumentUpdateRequest,
     YooptaExportResponse,
 )
+from .text_cache import schedule_text_extraction
 from .tool_artifact_service import ToolArtifactService
 
+User = get_user_model()
+
 router = Router()
 
+# Columns the document list never reads. Subclass columns are kept because
+# the list response includes each type's fields.
+LIST_DEFERRED_FIELDS = (
+    "gemini_file_id",
+    "gemini_synced_at",
+    "search_content_hash",
+    "search_metadata_hash",
+    "search_source_hash",
+    "trashed_at",
+    "original_folder_id",
+)
+
+# Folder columns needed for paths (tree fields) and the system-folder flag
+LIST_FOLDER_FIELDS = ("id", "name", "tree_id", "lft", "rght", "level", "parent_id", "is_system")
+
 
 @router.get("/documents", response=DocumentListResponse, tags=["documents"])
 def list_documents(
@@ -88,17 +108,17 @@ def list_documents(
     if not organization:
         return {"documents": [], "total": 0, "page": page, "page_size": page_size, "total_pages": 0}
 
+    # The organization is fixed for the whole page; folders and authors are
+    # loaded in bulk below because select_subclasses() drops related caches.
     queryset = (
         Document.objects.select_subclasses()
         .filter(organization=organization, is_trashed=False)
-        .select_related("organization", "project", "created_by", "folder")
+        .defer(*LIST_DEFERRED_FIELDS)
     )
 
     # Apply search filter
     if search:
-        queryset = queryset.filter(name__icontains=search) | queryset.filter(
-            description__icontains=search
-        )
+        queryset = queryset.filter(Q(name__icontains=search) | Q(description__icontains=search))
 
     # Apply document type filter
     # For multi-table inheritance, filter by checking the specific subclass path
@@ -141,18 +161,33 @@ def list_documents(
     if not include_system:
         queryset = queryset.filter(Q(folder__isnull=True) | Q(folder__is_system=False))
 
-    total = queryset.count()
+    # Get page of documents, with the total count computed in the same query
+    offset = (page - 1) * page_size
+    documents = list(
+        queryset.annotate(total_count=Window(expression=Count("pk")))[offset : offset + page_size]
+    )
+    if documents:
+        total = documents[0].total_count
+    else:
+        total = queryset.count() if offset else 0
 
     # Calculate pagination
     total_pages = (total + page_size - 1) // page_size
-    offset = (page - 1) * page_size
 
-    # Get page of documents
-    documents = queryset[offset : offset + page_size]
+    _attach_list_relations(documents, organization)
+    folder_paths = Folder.get_paths(document.folder for document in documents)
+    previews = get_list_preview_data(documents, request=request) if include_previews else None
 
     # Convert to response schema
     document_list = [
-        _serialize_document(doc, request, include_preview=include_previews) for doc in documents
+        _serialize_document(
+            doc,
+            request,
+            include_preview=include_previews,
+            folder_paths=folder_paths,
+            previews=previews,
+        )
+        for doc in documents
     ]
 
     return DocumentListResponse(
@@ -178,6 +213,8 @@ def query_file_search(request: HttpRequest, payload: FileSearchRequest):
     project = _get_project(payload.project_id, organization)
     if not project.gemini_store_id:
         raise HttpError(400, "Project is not synced to file search.")
+    if payload.mode and payload.mode not in SEARCH_MODES:
+        raise HttpError(400, f"Unknown search mode: {payload.mode}")
 
     try:
         store = FileSearchRegistry.get()
@@ -195,11 +232,13 @@ def query_file_search(request: HttpRequest, payload: FileSearchRequest):
         if not filters and payload.metadata_filter and backend_name == "gemini":
             filters = {"metadata_filter": payload.metadata_filter}
 
-        response = store.search(
+        response = cached_search(
+            store,
             store_id=project.gemini_store_id,
             query=payload.query,
             max_results=payload.max_results or 5,
             filters=filters,
+            mode=payload.mode,
         )
     except Exception as exc:
         raise HttpError(502, f"File search query failed: {exc}") from exc
@@ -906,6 +945,7 @@ def upload_pdf_document(
         created_by=request.user,
         folder=folder,
     )
+    schedule_text_extraction(document)
 
     return _serialize_document(document, request)
 
@@ -951,6 +991,7 @@ def upload_docx_document(
         created_by=request.user,
         folder=folder,
     )
+    schedule_text_extraction(document)
 
     return _serialize_document(document, request)
 
@@ -1016,6 +1057,7 @@ def upload_xlsx_document(
         created_by=request.user,
         folder=folder,
     )
+    schedule_text_extraction(document)
 
     return _serialize_document(document, request)
 
@@ -1279,15 +1321,45 @@ def _serialize_file_search_response(
     )
 
 
+def _attach_list_relations(documents, organization) -> None:
+    """Set organization, folder and author on a page of documents with one query each."""
+    folder_ids = {document.folder_id for document in documents if document.folder_id}
+    user_ids = {document.created_by_id for document in documents if document.created_by_id}
+    folders = Folder.objects.only(*LIST_FOLDER_FIELDS).in_bulk(folder_ids) if folder_ids else {}
+    users = User.objects.only("id", "username").in_bulk(user_ids) if user_ids else {}
+
+    for document in documents:
+        document.organization = organization
+        document.folder = folders.get(document.folder_id)
+        document.created_by = users.get(document.created_by_id)
+
+
 def _serialize_document(
-    document: Document, request: HttpRequest | None = None, *, include_preview: bool = True
+    document: Document,
+    request: HttpRequest | None = None,
+    *,
+    include_preview: bool = True,
+    folder_paths: dict[int, str] | None = None,
+    previews: dict[int, dict | None] | None = None,
 ) -> DocumentOut:
+    """
+    Build the API representation of a document.
+
+    ``folder_paths`` and ``previews`` are lookups prefetched for a whole page
+    (see list_documents); without them the folder path and preview are
+    resolved for this document alone, rendering the preview if needed.
+    """
+    if folder_paths is not None:
+        folder_path = folder_paths.get(document.folder_id)
+    else:
+        folder_path = document.folder.get_path() if document.folder else None
+
     data = {
         "id": document.id,
         "name": document.name,
         "description": document.description or "",
         "file_size": document.file_size,
-        "organization_id": document.organization.id,
+        "organization_id": document.organization_id,
         "organization_name": document.organization.name,
         "project_id": document.project_id,
         "document_type": document.get_type_name(),
@@ -1296,7 +1368,7 @@ def _serialize_document(
         "created_by_id": document.created_by.id if document.created_by else None,
         "created_by_username": document.created_by.username if document.created_by else None,
         "folder_id": document.folder_id,
-        "folder_path": document.folder.get_path() if document.folder else None,
+        "folder_path": folder_path,
     }
 
     if hasattr(document, "content"):
@@ -1350,7 +1422,9 @@ def _serialize_document(
     if hasattr(document, "yoopta_version"):
         data["yoopta_version"] = getattr(document, "yoopta_version", None)
 
-    if include_preview:
+    if include_preview and previews is not None:
+        data["preview"] = previews.get(document.id)
+    elif include_preview:
         try:
             data["preview"] = get_preview_data(document, request=request)
         except Exception:
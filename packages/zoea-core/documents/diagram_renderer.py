@@ -0,0 +1,410 @@
+"""
+Bounded, cached rendering of D2 and Excalidraw diagrams to SVG.
+
+Preview generation used to spawn a fresh ``d2`` or Node process for every
+render, with no limit on how many ran at once. DiagramRenderer puts every
+render behind a per-process concurrency limit, caches SVG output keyed by
+(renderer, source hash, theme, layout) and records queue-wait and render
+times.
+
+Excalidraw renders go to long-lived Node workers running
+``export-excalidraw.mjs --serve``, which speak one JSON object per line:
+
+    -> {"id": 1, "input": {"elements": [...], "appState": {...}}}
+    <- {"id": 1, "svg": "<svg ...>"}     or     {"id": 1, "error": "..."}
+
+so jsdom and @excalidraw/utils are loaded once per worker instead of once
+per diagram. The d2 CLI has no persistent mode, so D2 renders still run one
+process each, but within the same limit and cache.
+
+Usage:
+    from documents.diagram_renderer import get_diagram_renderer
+
+    svg = get_diagram_renderer().render_d2(source)
+    get_diagram_renderer().stats()  # per-renderer counts and timings
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import selectors
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# --theme 200 = Dark Mauve and --layout dagre match the frontend defaults
+D2_THEME = "200"
+D2_LAYOUT = "dagre"
+
+STUDIO_DIR = Path(__file__).resolve().parent.parent.parent / "zoea-studio"
+EXCALIDRAW_SCRIPT = STUDIO_DIR / "scripts" / "export-excalidraw.mjs"
+
+
+class DiagramRenderError(Exception):
+    """Raised when a diagram cannot be rendered."""
+
+
+@dataclass
+class RenderStats:
+    """Counters and cumulative timings for one renderer."""
+
+    requests: int = 0
+    cache_hits: int = 0
+    renders: int = 0
+    failures: int = 0
+    queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    render_seconds: float = 0.0
+
+    @property
+    def avg_queue_wait_seconds(self) -> float:
+        waited = self.requests - self.cache_hits
+        return self.queue_wait_seconds / waited if waited else 0.0
+
+    @property
+    def avg_render_seconds(self) -> float:
+        attempts = self.renders + self.failures
+        return self.render_seconds / attempts if attempts else 0.0
+
+
+class LineWorker:
+    """A long-lived subprocess answering one JSON request line per response line."""
+
+    def __init__(self, command: list[str], *, cwd: str | None = None):
+        self.command = command
+        self.requests = 0
+        self._next_id = 0
+        self._buffer = b""
+        self.process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, payload: dict, timeout: float) -> dict:
+        """
+        Send a request and wait for its response.
+
+        Raises:
+            DiagramRenderError: If the worker exits, times out or answers with
+                something other than a JSON object for this request. The
+                worker should be closed afterwards.
+        """
+        self._next_id += 1
+        self.requests += 1
+        request_id = self._next_id
+        line = json.dumps({"id": request_id, **payload}, separators=(",", ":")) + "\n"
+        try:
+            self.process.stdin.write(line.encode("utf-8"))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            raise DiagramRenderError(f"Renderer worker exited: {exc}") from exc
+
+        response_line = self._read_line(time.monotonic() + timeout)
+        try:
+            response = json.loads(response_line)
+        except json.JSONDecodeError as exc:
+            raise DiagramRenderError("Renderer worker returned invalid JSON") from exc
+        if not isinstance(response, dict) or response.get("id") != request_id:
+            raise DiagramRenderError("Renderer worker response out of sequence")
+        return response
+
+    def _read_line(self, deadline: float) -> bytes:
+        stdout = self.process.stdout
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            while b"\n" not in self._buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise DiagramRenderError("Renderer worker timed out")
+                chunk = os.read(stdout.fileno(), 65536)
+                if not chunk:
+                    raise DiagramRenderError("Renderer worker exited")
+                self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class WorkerPool:
+    """
+    Reusable LineWorkers for one command.
+
+    Callers must already hold a DiagramRenderer slot, so the pool never holds
+    more workers than the renderer's concurrency limit.
+    """
+
+    def __init__(self, command: list[str], *, cwd: str | None = None, max_requests: int = 200):
+        self.command = command
+        self.cwd = cwd
+        self.max_requests = max_requests
+        self._idle: list[LineWorker] = []
+        self._lock = threading.Lock()
+
+    def request(self, payload: dict, timeout: float) -> dict:
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None or not worker.alive:
+            if worker is not None:
+                worker.close()
+            worker = LineWorker(self.command, cwd=self.cwd)
+
+        try:
+            response = worker.request(payload, timeout)
+        except Exception:
+            worker.close()
+            raise
+
+        if self.max_requests and worker.requests >= self.max_requests:
+            worker.close()
+        else:
+            with self._lock:
+                self._idle.append(worker)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.close()
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+
+class DiagramRenderer:
+    """Concurrency-limited, cached diagram rendering with timing metrics."""
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        timeout: float = 30.0,
+        cache_size: int = 256,
+        max_requests: int = 200,
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.max_requests = max_requests
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: dict[str, RenderStats] = {}
+        self._pools: dict[str, WorkerPool] = {}
+
+    def render_d2(self, source: str, *, theme: str = D2_THEME, layout: str = D2_LAYOUT) -> bytes:
+        """Render D2 source to SVG bytes with the d2 CLI."""
+        d2_path = shutil.which("d2")
+        if not d2_path:
+            raise DiagramRenderError("d2 CLI not found")
+
+        def render() -> bytes:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                input_path = Path(tmpdir) / "diagram.d2"
+                output_path = Path(tmpdir) / "diagram.svg"
+                input_path.write_text(source, encoding="utf-8")
+                try:
+                    result = subprocess.run(
+                        [
+                            d2_path,
+                            "--theme",
+                            theme,
+                            "--layout",
+                            layout,
+                            str(input_path),
+                            str(output_path),
+                        ],
+                        capture_output=True,
+                        text=True,
+                        timeout=self.timeout,
+                    )
+                except subprocess.TimeoutExpired as exc:
+                    raise DiagramRenderError("d2 CLI timed out") from exc
+                if result.returncode != 0:
+                    raise DiagramRenderError(f"d2 CLI failed: {result.stderr}")
+                if not output_path.exists():
+                    raise DiagramRenderError("d2 did not produce output file")
+                return output_path.read_bytes()
+
+        return self.render("d2", source, render, theme=theme, layout=layout)
+
+    def render_excalidraw(self, source: str) -> bytes:
+        """Render Excalidraw JSON to SVG bytes with a pooled Node worker."""
+        if not EXCALIDRAW_SCRIPT.exists():
+            raise DiagramRenderError(f"Excalidraw export script not found at {EXCALIDRAW_SCRIPT}")
+        node_path = shutil.which("node")
+        if not node_path:
+            raise DiagramRenderError("Node.js not found")
+
+        def render() -> bytes:
+            pool = self._get_pool(
+                "excalidraw",
+                # Run from zoea-studio so node_modules is accessible
+                lambda: WorkerPool(
+                    [node_path, str(EXCALIDRAW_SCRIPT), "--serve"],
+                    cwd=str(STUDIO_DIR),
+                    max_requests=self.max_requests,
+                ),
+            )
+            response = pool.request({"input": json.loads(source)}, self.timeout)
+            if response.get("error") or not response.get("svg"):
+                raise DiagramRenderError(f"Excalidraw export failed: {response.get('error')}")
+            return response["svg"].encode("utf-8")
+
+        return self.render("excalidraw", source, render)
+
+    def render(
+        self,
+        kind: str,
+        source: str,
+        render: Callable[[], bytes],
+        *,
+        theme: str = "",
+        layout: str = "",
+    ) -> bytes:
+        """
+        Return cached output for a source, or call ``render`` within a slot.
+
+        Args:
+            kind: Renderer name, part of the cache key and stats
+            source: Diagram source text
+            render: Zero-argument callable producing SVG bytes; raises
+                DiagramRenderError on failure (failures are not cached)
+            theme: Theme option, part of the cache key
+            layout: Layout option, part of the cache key
+        """
+        key = (kind, hashlib.sha256(source.encode("utf-8")).hexdigest(), theme, layout)
+        with self._lock:
+            stats = self._stats.setdefault(kind, RenderStats())
+            stats.requests += 1
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                stats.cache_hits += 1
+                return cached
+
+        queued_at = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                stats.failures += 1
+            raise DiagramRenderError(f"Timed out waiting for a {kind} renderer")
+        started_at = time.monotonic()
+        try:
+            output = render()
+        except Exception:
+            self._record(stats, started_at - queued_at, time.monotonic() - started_at, failed=True)
+            raise
+        finally:
+            self._slots.release()
+
+        render_time = time.monotonic() - started_at
+        self._record(stats, started_at - queued_at, render_time)
+        logger.debug(
+            "Rendered %s diagram in %.0fms (queued %.0fms)",
+            kind,
+            render_time * 1000,
+            (started_at - queued_at) * 1000,
+        )
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[key] = output
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return output
+
+    def stats(self) -> dict[str, RenderStats]:
+        """Return a snapshot of per-renderer stats."""
+        with self._lock:
+            return {kind: RenderStats(**vars(stats)) for kind, stats in self._stats.items()}
+
+    def close(self) -> None:
+        """Stop pooled workers."""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def _get_pool(self, name: str, factory: Callable[[], WorkerPool]) -> WorkerPool:
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = self._pools[name] = factory()
+            return pool
+
+    def _record(
+        self, stats: RenderStats, queue_wait: float, render_time: float, failed: bool = False
+    ) -> None:
+        with self._lock:
+            if failed:
+                stats.failures += 1
+            else:
+                stats.renders += 1
+            stats.queue_wait_seconds += queue_wait
+            stats.max_queue_wait_seconds = max(stats.max_queue_wait_seconds, queue_wait)
+            stats.render_seconds += render_time
+
+
+_renderer: DiagramRenderer | None = None
+_renderer_lock = threading.Lock()
+
+
+def get_diagram_renderer() -> DiagramRenderer:
+    """Return the process-wide renderer configured from settings."""
+    global _renderer
+
+    options = {
+        "max_workers": int(getattr(settings, "DIAGRAM_RENDER_WORKERS", 2)),
+        "timeout": float(getattr(settings, "DIAGRAM_RENDER_TIMEOUT", 30)),
+        "cache_size": int(getattr(settings, "DIAGRAM_RENDER_CACHE_SIZE", 256)),
+        "max_requests": int(getattr(settings, "DIAGRAM_RENDER_MAX_REQUESTS", 200)),
+    }
+
+    with _renderer_lock:
+        changed = _renderer is not None and any(
+            getattr(_renderer, name) != value for name, value in options.items()
+        )
+        if _renderer is None or changed:
+            if _renderer is not None:
+                _renderer.close()
+            _renderer = DiagramRenderer(**options)
+        return _renderer
+
+
+@atexit.register
+def _close_renderer() -> None:
+    if _renderer is not None:
+        _renderer.close()
@@ -0,0 +1,155 @@
+"""
+Create folder trees in bulk.
+
+Saving an MPTT Folder rewrites the tree bounds of every node to its right,
+so creating a directory tree one Folder.save() at a time costs a tree
+update per directory. materialize_folders() takes all the relative
+directory paths up front instead: it loads the project's folders once,
+inserts the missing ones level by level with bulk inserts, then rebuilds
+each affected MPTT tree once.
+
+Usage:
+    from documents.folder_tree import materialize_folders
+
+    folders = materialize_folders(project, ["docs", "docs/api", "images"], created_by=user)
+    folders[PurePosixPath("docs/api")]  # -> Folder
+    folders[PurePosixPath(".")]         # -> the base folder (None: project root)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import PurePath, PurePosixPath
+
+from django.db import connections, router, transaction
+
+from .models import Folder
+
+ROOT = PurePosixPath(".")
+
+
+def materialize_folders(
+    project,
+    paths: Iterable[str | PurePath],
+    *,
+    parent: Folder | None = None,
+    created_by=None,
+) -> dict[PurePosixPath, Folder | None]:
+    """
+    Get or create the folders for a set of relative directory paths.
+
+    Args:
+        project: Project the folders belong to
+        paths: Directory paths relative to ``parent``; ancestors are implied
+        parent: Folder the paths are relative to (None: the project root)
+        created_by: User recorded on created folders
+
+    Returns:
+        dict mapping each path and its ancestors (as PurePosixPath, with
+        ``PurePosixPath(".")`` for ``parent`` itself) to its Folder
+    """
+    wanted: set[tuple[str, ...]] = set()
+    for path in paths:
+        parts = tuple(part for part in PurePosixPath(path).parts if part not in (".", "/"))
+        for depth in range(1, len(parts) + 1):
+            wanted.add(parts[:depth])
+
+    resolved: dict[tuple[str, ...], Folder | None] = {(): parent}
+    if wanted:
+        with transaction.atomic():
+            _resolve(project, parent, sorted(wanted, key=len), resolved, created_by)
+
+    return {PurePosixPath(*parts) if parts else ROOT: folder for parts, folder in resolved.items()}
+
+
+def _resolve(project, parent, wanted, resolved, created_by) -> None:
+    """Fill ``resolved`` for ``wanted`` (shallowest first), creating what is missing."""
+    if parent is not None:
+        existing = parent.get_descendants()
+    else:
+        existing = Folder.objects.filter(project=project)
+    by_parent_and_name = {(folder.parent_id, folder.name): folder for folder in existing}
+
+    modified_trees: set[int] = set()
+    level: list[tuple[tuple[str, ...], Folder]] = []
+    current_depth = 0
+
+    def create_level():
+        nonlocal level
+        if not level:
+            return
+        _insert(level, resolved, modified_trees)
+        level = []
+
+    for parts in wanted:
+        if len(parts) != current_depth:
+            # Children need their parents' ids: finish the previous level first
+            create_level()
+            current_depth = len(parts)
+
+        parent_folder = resolved[parts[:-1]]
+        parent_id = parent_folder.pk if parent_folder is not None else None
+        folder = by_parent_and_name.get((parent_id, parts[-1]))
+        if folder is None:
+            folder = Folder(
+                organization_id=project.organization_id,
+                project=project,
+                parent=parent_folder,
+                name=parts[-1],
+                description="",
+                created_by=created_by,
+            )
+            level.append((parts, folder))
+        resolved[parts] = folder
+    create_level()
+
+    for tree_id in modified_trees:
+        Folder._tree_manager.partial_rebuild(tree_id)
+    if modified_trees:
+        _reload_tree_fields([folder for folder in resolved.values() if folder is not None])
+
+
+def _insert(level, resolved, modified_trees) -> None:
+    """Insert one depth level of new folders."""
+    roots = [folder for _, folder in level if folder.parent is None]
+    children = [folder for _, folder in level if folder.parent is not None]
+
+    # A new top-level folder starts a new tree: let MPTT place it. That can
+    # renumber other trees, so refresh the loaded folders afterwards.
+    for folder in roots:
+        folder.save()
+    if roots:
+        _reload_tree_fields([folder for folder in resolved.values() if folder is not None])
+
+    if not children:
+        return
+
+    opts = Folder._mptt_meta
+    for folder in children:
+        parent = folder.parent
+        tree_id = getattr(parent, opts.tree_id_attr)
+        # Placeholder bounds: the tree is rebuilt once everything is inserted
+        setattr(folder, opts.tree_id_attr, tree_id)
+        setattr(folder, opts.left_attr, 0)
+        setattr(folder, opts.right_attr, 0)
+        setattr(folder, opts.level_attr, getattr(parent, opts.level_attr) + 1)
+        modified_trees.add(tree_id)
+
+    db = router.db_for_write(Folder)
+    if connections[db].features.can_return_rows_from_bulk_insert:
+        Folder.objects.bulk_create(children)
+    else:
+        with Folder._tree_manager.disable_mptt_updates():
+            for folder in children:
+                folder.save()
+
+
+def _reload_tree_fields(folders: list[Folder]) -> None:
+    """Refresh tree fields on instances after a rebuild rewrote them in the database."""
+    opts = Folder._mptt_meta
+    fields = [opts.tree_id_attr, opts.left_attr, opts.right_attr, opts.level_attr]
+    ids = [folder.pk for folder in folders]
+    rows = {row["id"]: row for row in Folder.objects.filter(id__in=ids).values("id", *fields)}
+    for folder in folders:
+        for name in fields:
+            setattr(folder, name, rows[folder.pk][name])
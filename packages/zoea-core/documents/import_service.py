@@ -3,20 +3,51 @@ Import documents from filesystem directories or archive files.
 
 Handles validation, folder creation, and document type mapping with
 configurable limits from Django settings.
+
+Entries are listed and validated first, then imported in a pipeline:
+
+- a thread pool (ZOEA_IMPORT_WORKERS) reads each file into a spooled
+  temporary file, hashing it on the way, and extracts metadata such as
+  PDF page counts, so models never re-read the bytes on save. Entries
+  larger than ZOEA_IMPORT_SPOOL_MAX_BYTES spill to disk instead of
+  memory, and only a bounded window of entries is read ahead.
+- the calling thread writes documents in entry order: text documents
+  with bulk inserts (ZOEA_IMPORT_BULK_SIZE per batch), file-backed
+  documents with save() so their files reach storage.
+- post-save work is deferred to the end and runs once per import:
+  search indexing, DOCUMENT_CREATED events and preview rendering.
+
+Usage:
+    service = DocumentImportService(
+        organization=org, project=project, created_by=user,
+        progress_callback=lambda progress: print(progress.processed, progress.total),
+    )
+    summary = service.import_archive("/imports/bundle.zip")
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import tarfile
+import tempfile
+import threading
 import zipfile
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path, PurePosixPath
+from typing import IO, Any
 
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files.base import File
+from django.db import connections, router, transaction
+from django.db.models import GeneratedField
 
+from .folder_tree import materialize_folders
 from .models import (
     CSV,
     D2Diagram,
@@ -26,6 +57,7 @@ from .models import (
     Markdown,
     PDF,
     SpreadsheetDocument,
+    TextDocument,
     WordDocument,
 )
 
@@ -66,6 +98,11 @@ DEFAULT_IGNORED_NAMES = {
 }
 
 MAX_ISSUES = 100
+READ_CHUNK_SIZE = 1024 * 1024
+PREVIEW_BATCH_SIZE = 16
+
+# PyMuPDF is not thread-safe; page counts from pool threads take turns
+_pdf_lock = threading.Lock()
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +140,56 @@ class ImportSummary:
     issues: list[ImportIssue] = field(default_factory=list)
 
 
+@dataclass
+class ImportProgress:
+    """Progress passed to DocumentImportService's progress_callback after each file."""
+
+    processed: int
+    total: int
+    bytes_processed: int
+    total_bytes: int
+    path: str
+    summary: ImportSummary
+
+
+@dataclass
+class _ImportEntry:
+    """A file to import, listed and validated but not read yet."""
+
+    rel_path: Path | PurePosixPath
+    extension: str
+    size: int
+    open: Callable[[], IO[bytes]]
+    parent_folder: Folder | None = None
+
+
+@dataclass
+class _PreparedFile:
+    """An entry after reading: its spooled content, hash and extracted metadata."""
+
+    entry: _ImportEntry
+    spool: Any = None
+    digest: str = ""
+    size: int = 0
+    text: str | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    error: tuple[str, str] | None = None
+
+    def close(self) -> None:
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+
+@dataclass
+class _PendingText:
+    """A text document counted in the summary but not inserted yet."""
+
+    document: TextDocument
+    rel_path: Path | PurePosixPath
+    overwritten: bool
+
+
 class DocumentImportService:
     """Service for importing documents into Zoea Studio."""
 
@@ -116,6 +203,7 @@ class DocumentImportService:
         create_root_folder: bool = True,
         root_folder_name: str | None = None,
         on_conflict: str = "rename",
+        progress_callback: Callable[[ImportProgress], None] | None = None,
     ):
         self.organization = organization
         self.project = project
@@ -124,8 +212,12 @@ class DocumentImportService:
         self.create_root_folder = create_root_folder
         self.root_folder_name = root_folder_name
         self.on_conflict = on_conflict
-        self.folder_cache: dict[tuple[int | None, str], Folder] = {}
+        self.progress_callback = progress_callback
         self.imported_documents: list[Document] = []
+        # Document names per folder id, loaded once and kept current during the import
+        self._folder_names: dict[int | None, set[str]] = {}
+        # Text documents waiting for the next bulk insert, by (folder id, name)
+        self._pending_text: dict[tuple[int | None, str], _PendingText] = {}
 
         if self.on_conflict not in {"skip", "rename", "overwrite"}:
             raise ImportValidationError(f"Invalid on_conflict value: {self.on_conflict}")
@@ -140,6 +232,11 @@ class DocumentImportService:
             getattr(settings, "ZOEA_IMPORT_MAX_FILE_COUNT", 100000)
         )
         self.max_depth = int(getattr(settings, "ZOEA_IMPORT_MAX_DEPTH", 10))
+        self.workers = max(1, int(getattr(settings, "ZOEA_IMPORT_WORKERS", 4)))
+        self.spool_max_bytes = int(
+            getattr(settings, "ZOEA_IMPORT_SPOOL_MAX_BYTES", 4 * 1024 * 1024)
+        )
+        self.bulk_size = max(1, int(getattr(settings, "ZOEA_IMPORT_BULK_SIZE", 200)))
 
         allowed_roots = getattr(settings, "ZOEA_IMPORT_ALLOWED_ROOTS", [])
         self.allowed_roots = [
@@ -158,6 +255,7 @@ class DocumentImportService:
             summary.root_folder_id = root_folder.id
             summary.root_folder_path = root_folder.get_path()
 
+        entries: list[_ImportEntry] = []
         for root, dirnames, filenames in os.walk(base_path, followlinks=follow_symlinks):
             current_path = Path(root)
             rel_dir = current_path.relative_to(base_path)
@@ -218,16 +316,17 @@ class DocumentImportService:
                     self._record_issue(summary, rel_path, "unsupported_extension")
                     continue
 
-                parent_folder = self._resolve_parent_folder(rel_path.parent, root_folder)
-                self._import_file_from_path(
-                    summary=summary,
-                    rel_path=rel_path,
-                    file_path=file_path,
-                    extension=extension,
-                    parent_folder=parent_folder,
+                entries.append(
+                    _ImportEntry(
+                        rel_path=rel_path,
+                        extension=extension,
+                        size=file_size,
+                        open=partial(open, file_path, "rb"),
+                    )
                 )
 
-        self._index_imported_documents()
+        self._assign_folders(entries, root_folder)
+        self._run_import(entries, summary)
         return summary
 
     def import_archive(self, archive_path: str | Path | object) -> ImportSummary:
@@ -261,6 +360,7 @@ class DocumentImportService:
                 summary.root_folder_id = root_folder.id
                 summary.root_folder_path = root_folder.get_path()
 
+            import_entries: list[_ImportEntry] = []
             for info in entries:
                 rel_path = self._clean_archive_path(info.filename, strip_prefix)
                 if rel_path is None or self._should_ignore_path(rel_path):
@@ -279,24 +379,18 @@ class DocumentImportService:
                     self._record_issue(summary, rel_path, "unsupported_extension")
                     continue
 
-                parent_folder = self._resolve_parent_folder(rel_path.parent, root_folder)
-
-                try:
-                    data = archive.read(info.filename)
-                except OSError as exc:
-                    summary.failed += 1
-                    self._record_issue(summary, rel_path, "read_failed", detail=str(exc), status="failed")
-                    continue
-
-                self._import_file_from_bytes(
-                    summary=summary,
-                    rel_path=rel_path,
-                    data=data,
-                    extension=extension,
-                    parent_folder=parent_folder,
+                # ZipFile supports reading several members from threads at once
+                import_entries.append(
+                    _ImportEntry(
+                        rel_path=rel_path,
+                        extension=extension,
+                        size=info.file_size,
+                        open=partial(archive.open, info),
+                    )
                 )
 
-        self._index_imported_documents()
+            self._assign_folders(import_entries, root_folder)
+            self._run_import(import_entries, summary)
         return summary
 
     def _import_tar_archive(
@@ -322,6 +416,7 @@ class DocumentImportService:
                 summary.root_folder_id = root_folder.id
                 summary.root_folder_path = root_folder.get_path()
 
+            import_entries: list[_ImportEntry] = []
             for member in members:
                 rel_path = self._clean_archive_path(member.name, strip_prefix)
                 if rel_path is None or self._should_ignore_path(rel_path):
@@ -340,30 +435,19 @@ class DocumentImportService:
                     self._record_issue(summary, rel_path, "unsupported_extension")
                     continue
 
-                parent_folder = self._resolve_parent_folder(rel_path.parent, root_folder)
-
-                file_obj = archive.extractfile(member)
-                if file_obj is None:
-                    summary.failed += 1
-                    self._record_issue(summary, rel_path, "read_failed", status="failed")
-                    continue
-
-                try:
-                    data = file_obj.read()
-                except OSError as exc:
-                    summary.failed += 1
-                    self._record_issue(summary, rel_path, "read_failed", detail=str(exc), status="failed")
-                    continue
-
-                self._import_file_from_bytes(
-                    summary=summary,
-                    rel_path=rel_path,
-                    data=data,
-                    extension=extension,
-                    parent_folder=parent_folder,
+                import_entries.append(
+                    _ImportEntry(
+                        rel_path=rel_path,
+                        extension=extension,
+                        size=member.size,
+                        open=partial(self._extract_tar_member, archive, member),
+                    )
                 )
 
-        self._index_imported_documents()
+            self._assign_folders(import_entries, root_folder)
+            # Tar streams (especially compressed ones) are read in order by
+            # this thread; the pool still hashes and extracts metadata
+            self._run_import(import_entries, summary, sequential_read=True)
         return summary
 
     def _validate_directory(self, base_path: Path) -> None:
@@ -414,37 +498,28 @@ class DocumentImportService:
 
         name = self.root_folder_name or default_name or "Imported Files"
         name = self._sanitize_name(name, "Imported Files")
-        return self._get_or_create_folder(name, self.base_folder)
-
-    def _get_or_create_folder(self, name: str, parent: Folder | None) -> Folder:
-        key = (parent.id if parent else None, name)
-        if key in self.folder_cache:
-            return self.folder_cache[key]
-
-        folder, _ = Folder.objects.get_or_create(
-            organization=self.organization,
-            project=self.project,
-            parent=parent,
-            name=name,
-            defaults={
-                "created_by": self.created_by,
-                "description": "",
-            },
+        folders = materialize_folders(
+            self.project, [name], parent=self.base_folder, created_by=self.created_by
         )
-        self.folder_cache[key] = folder
-        return folder
-
-    def _resolve_parent_folder(self, rel_parent: Path | PurePosixPath, root_folder: Folder | None) -> Folder | None:
-        if not rel_parent or rel_parent == Path("."):
-            return root_folder
-
-        current = root_folder
-        for part in rel_parent.parts:
-            if not part or part == ".":
-                continue
-            name = self._sanitize_name(part, "Untitled")
-            current = self._get_or_create_folder(name, current)
-        return current
+        return folders[PurePosixPath(name)]
+
+    def _assign_folders(self, entries: list[_ImportEntry], root_folder: Folder | None) -> None:
+        """Create the folders for all entries in one batch and attach them to the entries."""
+        paths = [
+            PurePosixPath(
+                *(
+                    self._sanitize_name(part, "Untitled")
+                    for part in entry.rel_path.parent.parts
+                    if part != "."
+                )
+            )
+            for entry in entries
+        ]
+        folders = materialize_folders(
+            self.project, paths, parent=root_folder, created_by=self.created_by
+        )
+        for entry, path in zip(entries, paths):
+            entry.parent_folder = folders[path]
 
     def _record_issue(
         self,
@@ -474,41 +549,161 @@ class DocumentImportService:
         if summary.total_size > self.max_total_size:
             raise ImportLimitError("Total size exceeds limit")
 
-    def _import_file_from_path(
+    def _run_import(
         self,
-        *,
+        entries: list[_ImportEntry],
         summary: ImportSummary,
-        rel_path: Path,
-        file_path: Path,
-        extension: str,
-        parent_folder: Folder | None,
+        *,
+        sequential_read: bool = False,
     ) -> None:
-        try:
-            data = file_path.read_bytes()
-        except OSError as exc:
-            summary.failed += 1
-            self._record_issue(summary, rel_path, "read_failed", detail=str(exc), status="failed")
-            return
-
-        self._import_file_from_bytes(
+        """
+        Read entries on the pool and write them here, in order.
+
+        At most a few entries per worker are read ahead, which bounds the
+        number of spooled files alive at once. With ``sequential_read`` the
+        entries are spooled by this thread before being handed to the pool.
+        """
+        progress = ImportProgress(
+            processed=0,
+            total=len(entries),
+            bytes_processed=0,
+            total_bytes=sum(entry.size for entry in entries),
+            path="",
             summary=summary,
-            rel_path=rel_path,
-            data=data,
-            extension=extension,
-            parent_folder=parent_folder,
         )
+        window: deque[Future] = deque()
+        read_ahead = self.workers * 2
 
-    def _import_file_from_bytes(
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="document-import"
+        ) as executor:
+            try:
+                for entry in entries:
+                    if sequential_read:
+                        prepared = self._spool_entry(entry)
+                        window.append(executor.submit(self._extract_metadata, prepared))
+                    else:
+                        window.append(executor.submit(self._prepare_entry, entry))
+                    if len(window) >= read_ahead:
+                        self._write_prepared(window.popleft().result(), summary, progress)
+                while window:
+                    self._write_prepared(window.popleft().result(), summary, progress)
+            finally:
+                # Close files read ahead of a failure
+                for future in window:
+                    if not future.cancel() and future.exception() is None:
+                        future.result().close()
+
+        self._flush_text_documents(summary)
+        self._index_imported_documents()
+
+    def _prepare_entry(self, entry: _ImportEntry) -> _PreparedFile:
+        """Pool task: read an entry and extract its metadata."""
+        return self._extract_metadata(self._spool_entry(entry))
+
+    def _spool_entry(self, entry: _ImportEntry) -> _PreparedFile:
+        """Copy an entry into a spooled temporary file, hashing it on the way."""
+        prepared = _PreparedFile(entry=entry)
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_max_bytes)
+        digest = hashlib.sha256()
+        try:
+            with entry.open() as source:
+                while chunk := source.read(READ_CHUNK_SIZE):
+                    digest.update(chunk)
+                    spool.write(chunk)
+                    prepared.size += len(chunk)
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as exc:
+            spool.close()
+            prepared.error = ("read_failed", str(exc))
+            return prepared
+
+        spool.seek(0)
+        prepared.spool = spool
+        prepared.digest = digest.hexdigest()
+        return prepared
+
+    def _extract_metadata(self, prepared: _PreparedFile) -> _PreparedFile:
+        """Pool task: decode text, or read counts the models would otherwise compute on save."""
+        if prepared.error:
+            return prepared
+
+        extension = prepared.entry.extension
+        if extension in TEXT_EXTENSION_MAP:
+            try:
+                prepared.text = prepared.spool.read().decode("utf-8")
+            except UnicodeDecodeError as exc:
+                prepared.error = ("decode_failed", str(exc))
+            prepared.close()
+            return prepared
+
+        doc_cls = BINARY_EXTENSION_MAP.get(extension)
+        # The spool's underlying file: reading it directly keeps small
+        # entries in memory instead of rolling them over to disk
+        source = prepared.spool._file
+        try:
+            if doc_cls is PDF:
+                from .pdf_text import count_pdf_pages
+
+                with _pdf_lock:
+                    prepared.metadata["page_count"] = count_pdf_pages(source)
+            elif doc_cls is SpreadsheetDocument:
+                from openpyxl import load_workbook
+
+                workbook = load_workbook(source, read_only=True)
+                prepared.metadata["sheet_count"] = len(workbook.sheetnames)
+                workbook.close()
+            elif doc_cls is WordDocument:
+                from docx import Document as DocxDocument
+
+                prepared.metadata["paragraph_count"] = len(DocxDocument(source).paragraphs)
+        except Exception:  # noqa: BLE001 - malformed files are still imported
+            pass
+        prepared.spool.seek(0)
+        return prepared
+
+    def _extract_tar_member(self, archive: tarfile.TarFile, member: tarfile.TarInfo) -> IO[bytes]:
+        file_obj = archive.extractfile(member)
+        if file_obj is None:
+            raise OSError(f"Cannot read archive member: {member.name}")
+        return file_obj
+
+    def _write_prepared(
         self,
-        *,
+        prepared: _PreparedFile,
         summary: ImportSummary,
-        rel_path: Path | PurePosixPath,
-        data: bytes,
-        extension: str,
-        parent_folder: Folder | None,
+        progress: ImportProgress,
     ) -> None:
-        document = None
+        entry = prepared.entry
+        try:
+            self._write_document(prepared, summary)
+        finally:
+            prepared.close()
+            progress.processed += 1
+            progress.bytes_processed += entry.size
+            progress.path = str(entry.rel_path)
+            if self.progress_callback is not None:
+                self.progress_callback(progress)
+
+    def _write_document(self, prepared: _PreparedFile, summary: ImportSummary) -> None:
+        entry = prepared.entry
+        rel_path = entry.rel_path
+        parent_folder = entry.parent_folder
+
+        if prepared.error:
+            reason, detail = prepared.error
+            summary.failed += 1
+            self._record_issue(summary, rel_path, reason, detail=detail, status="failed")
+            return
+
         doc_name = self._sanitize_name(Path(rel_path.name).stem, "Untitled")
+        if (
+            self.on_conflict == "overwrite"
+            and entry.extension in BINARY_EXTENSION_MAP
+            and self._is_unchanged(doc_name, parent_folder, prepared.digest)
+        ):
+            summary.skipped += 1
+            self._record_issue(summary, rel_path, "unchanged")
+            return
         doc_name, was_overwritten = self._handle_conflict(doc_name, parent_folder)
         if doc_name is None:
             summary.skipped += 1
@@ -516,49 +711,44 @@ class DocumentImportService:
             return
 
         try:
-            if extension in TEXT_EXTENSION_MAP:
-                content = data.decode("utf-8")
-                doc_cls = TEXT_EXTENSION_MAP[extension]
-                document = doc_cls(
-                    organization=self.organization,
-                    project=self.project,
-                                        name=doc_name,
-                    content=content,
-                    file_size=len(data),
-                    created_by=self.created_by,
-                    folder=parent_folder,
+            common = {
+                "organization": self.organization,
+                "project": self.project,
+                "name": doc_name,
+                "file_size": prepared.size,
+                "created_by": self.created_by,
+                "folder": parent_folder,
+            }
+            if entry.extension in TEXT_EXTENSION_MAP:
+                doc_cls = TEXT_EXTENSION_MAP[entry.extension]
+                if doc_cls is D2Diagram:
+                    common["diagram_type"] = "d2"  # normally set by D2Diagram.save()
+                document = doc_cls(content=prepared.text, **common)
+                self._queue_text_document(
+                    _PendingText(document, rel_path, was_overwritten), summary
                 )
-                document._skip_file_search = True
-                document.save()
-            elif extension in BINARY_EXTENSION_MAP:
-                doc_cls = BINARY_EXTENSION_MAP[extension]
-                django_file = ContentFile(data, name=rel_path.name)
-                kwargs = {
-                    "organization": self.organization,
-                    "project": self.project,
-                    "name": doc_name,
-                    "file_size": len(data),
-                    "created_by": self.created_by,
-                    "folder": parent_folder,
-                }
+            elif entry.extension in BINARY_EXTENSION_MAP:
+                doc_cls = BINARY_EXTENSION_MAP[entry.extension]
+                django_file = File(prepared.spool, name=rel_path.name)
                 if doc_cls is PDF:
-                    document = doc_cls(pdf_file=django_file, **kwargs)
+                    document = doc_cls(pdf_file=django_file, **common)
                 elif doc_cls is WordDocument:
-                    document = doc_cls(docx_file=django_file, **kwargs)
+                    document = doc_cls(docx_file=django_file, **common)
                 elif doc_cls is SpreadsheetDocument:
-                    document = doc_cls(xlsx_file=django_file, **kwargs)
+                    document = doc_cls(xlsx_file=django_file, **common)
                 else:
-                    document = doc_cls(image_file=django_file, **kwargs)
+                    document = doc_cls(image_file=django_file, **common)
+                for name, value in prepared.metadata.items():
+                    setattr(document, name, value)
+                document._pending_upload_hash = prepared.digest
                 document._skip_file_search = True
+                document._skip_event_dispatch = True
                 document.save()
+                self.imported_documents.append(document)
             else:
                 summary.skipped += 1
                 self._record_issue(summary, rel_path, "unsupported_extension")
                 return
-        except UnicodeDecodeError as exc:
-            summary.failed += 1
-            self._record_issue(summary, rel_path, "decode_failed", detail=str(exc), status="failed")
-            return
         except Exception as exc:  # noqa: BLE001 - capture unexpected import failures
             summary.failed += 1
             self._record_issue(summary, rel_path, "create_failed", detail=str(exc), status="failed")
@@ -569,39 +759,140 @@ class DocumentImportService:
         else:
             summary.created += 1
 
-        if document:
-            self.imported_documents.append(document)
+    def _queue_text_document(self, pending: _PendingText, summary: ImportSummary) -> None:
+        key = (pending.document.folder_id, pending.document.name)
+        self._pending_text[key] = pending
+        if len(self._pending_text) >= self.bulk_size:
+            self._flush_text_documents(summary)
+
+    def _flush_text_documents(self, summary: ImportSummary) -> None:
+        """
+        Insert the queued text documents in bulk.
+
+        If the batch insert fails, each document is saved on its own so one
+        bad row only fails its own file.
+        """
+        if not self._pending_text:
+            return
+        batch = list(self._pending_text.values())
+        self._pending_text = {}
+        documents = [pending.document for pending in batch]
+        try:
+            bulk_create_documents(documents)
+        except Exception as exc:  # noqa: BLE001 - retry the batch row by row
+            logger.warning("Bulk insert of %d imported documents failed: %s", len(batch), exc)
+            documents = []
+            for pending in batch:
+                document = pending.document
+                document._skip_file_search = True
+                document._skip_event_dispatch = True
+                try:
+                    with transaction.atomic():
+                        document.save()
+                except Exception as save_exc:  # noqa: BLE001 - capture per-file failures
+                    if pending.overwritten:
+                        summary.updated -= 1
+                    else:
+                        summary.created -= 1
+                    summary.failed += 1
+                    self._record_issue(
+                        summary,
+                        pending.rel_path,
+                        "create_failed",
+                        detail=str(save_exc),
+                        status="failed",
+                    )
+                    continue
+                documents.append(document)
+        self.imported_documents.extend(documents)
 
     def _index_imported_documents(self) -> None:
         if not self.imported_documents:
             return
 
+        documents, self.imported_documents = self.imported_documents, []
         try:
             from file_search.indexing import index_documents
 
-            index_documents(self.imported_documents)
+            index_documents(documents)
         except Exception as exc:  # noqa: BLE001 - best effort indexing
             logger.warning("Failed to batch index imported documents: %s", exc)
-        finally:
-            self.imported_documents = []
+
+        self._dispatch_imported_documents(documents)
+        self._queue_imported_previews(documents)
+
+    def _queue_imported_previews(self, documents: list[Document]) -> None:
+        """Queue thumbnails for the imported documents in batches."""
+        if not getattr(settings, "ZOEA_IMPORT_QUEUE_PREVIEWS", True):
+            return
+        try:
+            from .preview_service import request_previews
+
+            request_previews(
+                documents,
+                batch_size=PREVIEW_BATCH_SIZE,
+            )
+        except Exception as exc:  # noqa: BLE001 - previews render on demand instead
+            logger.warning("Failed to queue previews for imported documents: %s", exc)
+
+    def _dispatch_imported_documents(self, documents: list[Document]) -> None:
+        """Dispatch DOCUMENT_CREATED for the imported documents as one batch."""
+
+        def _dispatch():
+            try:
+                from events.dispatcher import Event, dispatch_events
+                from events.models import EventType
+
+                from .signals import document_event_data
+
+                dispatch_events(
+                    Event(
+                        event_type=EventType.DOCUMENT_CREATED,
+                        source_type="document",
+                        source_id=document.id,
+                        event_data=document_event_data(document),
+                        organization=self.organization,
+                        project=self.project,
+                    )
+                    for document in documents
+                )
+            except Exception as exc:  # noqa: BLE001 - best effort dispatch
+                logger.warning("Failed to dispatch imported document events: %s", exc)
+
+        transaction.on_commit(_dispatch)
+
+    def _is_unchanged(self, doc_name: str, parent_folder: Folder | None, digest: str) -> bool:
+        """Whether the folder already holds this file, compared by stored content hash."""
+        if doc_name not in self._names_in_folder(parent_folder):
+            return False
+        return self._documents_in_folder(parent_folder).filter(
+            name=doc_name,
+            content_hash=digest,
+        ).exists()
 
     def _handle_conflict(
         self,
         doc_name: str,
         parent_folder: Folder | None,
     ) -> tuple[str | None, bool]:
-        queryset = Document.objects.filter(
-                        folder=parent_folder,
-            name=doc_name,
-        )
-        if not queryset.exists():
+        names = self._names_in_folder(parent_folder)
+        if doc_name not in names:
+            names.add(doc_name)
             return doc_name, False
 
         if self.on_conflict == "skip":
             return None, False
 
         if self.on_conflict == "overwrite":
-            queryset.delete()
+            folder_id = parent_folder.id if parent_folder else None
+            if self._pending_text.pop((folder_id, doc_name), None) is None:
+                existing = self._documents_in_folder(parent_folder).filter(name=doc_name)
+                replaced = set(existing.values_list("id", flat=True))
+                existing.delete()
+                # Drop documents this import created earlier from the post-save work
+                self.imported_documents = [
+                    document for document in self.imported_documents if document.pk not in replaced
+                ]
             return doc_name, True
 
         # rename
@@ -609,13 +900,26 @@ class DocumentImportService:
         counter = 2
         while True:
             candidate = f"{base_name} ({counter})"
-            if not Document.objects.filter(
-                                folder=parent_folder,
-                name=candidate,
-            ).exists():
+            if candidate not in names:
+                names.add(candidate)
                 return candidate, False
             counter += 1
 
+    def _documents_in_folder(self, parent_folder: Folder | None):
+        queryset = Document.objects.filter(folder=parent_folder)
+        if parent_folder is None:
+            queryset = queryset.filter(project=self.project)
+        return queryset
+
+    def _names_in_folder(self, parent_folder: Folder | None) -> set[str]:
+        """Names taken in a folder: existing documents plus those imported so far."""
+        key = parent_folder.id if parent_folder else None
+        names = self._folder_names.get(key)
+        if names is None:
+            names = set(self._documents_in_folder(parent_folder).values_list("name", flat=True))
+            self._folder_names[key] = names
+        return names
+
     def _get_archive_name(self, archive_path: str | Path | object) -> str:
         if isinstance(archive_path, (str, Path)):
             return Path(archive_path).name
@@ -776,3 +1080,86 @@ class DocumentImportService:
         if info.create_system != 3:  # Not Unix
             return False
         return (info.external_attr >> 16) & 0o170000 == 0o120000
+
+
+def bulk_create_documents(documents: list[Document], *, batch_size: int | None = None) -> None:
+    """
+    Insert new documents in bulk, setting their primary keys.
+
+    QuerySet.bulk_create() refuses multi-table inherited models, so the
+    root Document rows go through Document's bulk_create() (which returns
+    their ids) and each child table in a model's chain (TextDocument,
+    Markdown, ...) gets a batched INSERT of its own columns. Like
+    bulk_create(), this skips save() and the model signals: callers set
+    what save() would (e.g. D2Diagram.diagram_type) and handle
+    indexing/events themselves.
+
+    Everything is inserted in one savepoint; if it fails, nothing is kept
+    and the documents are left unsaved (no primary keys), so callers can
+    fall back to save().
+    """
+    by_model: dict[type[Document], list[Document]] = {}
+    for document in documents:
+        by_model.setdefault(type(document), []).append(document)
+
+    db = router.db_for_write(Document)
+    if not connections[db].features.can_return_rows_from_bulk_insert:
+        for document in documents:
+            document.save()
+        return
+
+    try:
+        with transaction.atomic(using=db):
+            for model, objs in by_model.items():
+                chain = [*reversed(model._meta.get_parent_list()), model]
+                chain[0]._base_manager.using(db).bulk_create(objs, batch_size=batch_size)
+                for level in chain[1:]:
+                    for obj in objs:
+                        setattr(obj, level._meta.pk.attname, obj.id)
+                    _insert_table_rows(level, objs, db, batch_size)
+    except Exception:
+        for model, objs in by_model.items():
+            for obj in objs:
+                for level in [*model._meta.get_parent_list(), model]:
+                    setattr(obj, level._meta.pk.attname, None)
+                obj._state.adding = True
+                obj._state.db = None
+        raise
+
+    for document in documents:
+        document._state.adding = False
+        document._state.db = db
+
+
+def _insert_table_rows(
+    model: type[Document],
+    objs: list[Document],
+    db: str,
+    batch_size: int | None,
+) -> None:
+    """INSERT the columns ``model`` itself declares (not its parents') for ``objs``."""
+    connection = connections[db]
+    fields = [
+        field
+        for field in model._meta.get_fields(include_parents=False)
+        if field.concrete and not field.many_to_many and not isinstance(field, GeneratedField)
+    ]
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(model._meta.db_table),
+        ", ".join(quote(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    step = batch_size or len(objs)
+    with connection.cursor() as cursor:
+        for start in range(0, len(objs), step):
+            cursor.executemany(
+                sql,
+                [
+                    [
+                        field.get_db_prep_save(field.pre_save(obj, True), connection)
+                        for field in fields
+                    ]
+                    for obj in objs[start:start + step]
+                ],
+            )
@@ -0,0 +1,118 @@
+"""
+Django management command to benchmark file search chunking strategies.
+
+Reports chunks/sec, throughput and chunk sizes for each strategy, either on a
+synthetic corpus or on the text documents of a project.
+"""
+
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from documents.models import Document
+from file_search.chunking import ChunkerRegistry
+from file_search.chunking.benchmark import benchmark_chunker
+from projects.models import Project
+
+WORDS = (
+    "search index chunk token budget embedding recall document project heading "
+    "section paragraph sentence overlap vector query result store record"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Benchmark chunking strategies (chunks/sec, MB/s, tokens per chunk)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--strategy",
+            action="append",
+            help="Strategy to benchmark (repeatable; default: all registered)",
+        )
+        parser.add_argument(
+            "--project",
+            type=str,
+            help="Project name or ID whose text documents to chunk (default: synthetic corpus)",
+        )
+        parser.add_argument("--documents", type=int, default=200, help="Synthetic documents")
+        parser.add_argument("--max-tokens", type=int, default=256)
+        parser.add_argument("--overlap-tokens", type=int, default=32)
+        parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        strategies = options["strategy"] or ChunkerRegistry.list_chunkers()
+        texts = (
+            self.project_texts(options["project"])
+            if options["project"]
+            else self.synthetic_texts(options["documents"], options["seed"])
+        )
+        if not texts:
+            raise CommandError("No text to chunk.")
+
+        total_chars = sum(len(text) for text in texts)
+        self.stdout.write(
+            f"Corpus: {len(texts)} documents, {total_chars / 1_000_000:.2f} MB, "
+            f"{options['repeat']} pass(es)"
+        )
+        self.stdout.write(
+            f"{'strategy':<12} {'chunks':>8} {'chunks/s':>12} {'MB/s':>8} "
+            f"{'avg tok':>8} {'max tok':>8} {'per doc':>8}"
+        )
+
+        for name in strategies:
+            try:
+                chunker = ChunkerRegistry.get(
+                    name,
+                    max_tokens=options["max_tokens"],
+                    overlap_tokens=options["overlap_tokens"],
+                )
+            except Exception as exc:
+                raise CommandError(str(exc)) from exc
+
+            result = benchmark_chunker(chunker, texts, repeat=options["repeat"])
+            self.stdout.write(
+                f"{name:<12} {result.chunks:>8} {result.chunks_per_second:>12,.0f} "
+                f"{result.mb_per_second:>8.1f} {result.avg_chunk_tokens:>8.1f} "
+                f"{result.max_chunk_tokens:>8} {result.chunks_per_document:>8.1f}"
+            )
+
+    def project_texts(self, project_ref):
+        try:
+            if project_ref.isdigit():
+                project = Project.objects.get(id=int(project_ref))
+            else:
+                project = Project.objects.get(name=project_ref)
+        except Project.DoesNotExist:
+            raise CommandError(f"Project '{project_ref}' not found")
+
+        texts = []
+        for document in Document.objects.filter(project=project).select_subclasses():
+            if hasattr(document, "get_text_content"):
+                text = document.get_text_content()
+            else:
+                text = getattr(document, "content", "") or ""
+            if text:
+                texts.append(text)
+        return texts
+
+    def synthetic_texts(self, count, seed):
+        """Markdown-ish documents with headings, prose and a CSV-like table."""
+        rng = random.Random(seed)
+
+        def sentence():
+            return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 24))).capitalize() + "."
+
+        texts = []
+        for _ in range(count):
+            parts = []
+            for section in range(rng.randint(3, 8)):
+                parts.append(f"## Section {section}")
+                for _ in range(rng.randint(1, 5)):
+                    parts.append(" ".join(sentence() for _ in range(rng.randint(2, 8))))
+            parts.append("id,name,score")
+            parts.append(
+                "\n".join(f"{row},{rng.choice(WORDS)},{rng.random():.3f}" for row in range(50))
+            )
+            texts.append("\n\n".join(parts))
+        return texts
@@ -0,0 +1,80 @@
+"""
+Django management command to process the background file search index queue.
+
+Saves to documents, chat messages and email messages are coalesced into
+SearchIndexQueueEntry rows and indexed by a Django-Q2 worker. This command
+drains the queue on demand, reports queue depth and lag, and installs the
+periodic Django-Q2 schedule that acts as a safety net for the worker.
+"""
+
+from django.core.management.base import BaseCommand
+
+from file_search.queue import get_queue_stats, process_index_queue
+
+SCHEDULE_NAME = "file_search_index_queue"
+
+
+class Command(BaseCommand):
+    help = "Process pending file search index queue entries and report queue metrics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print queue depth and lag; do not process entries",
+        )
+        parser.add_argument(
+            "--wait",
+            action="store_true",
+            help="Wait for debounced entries to become due instead of exiting early",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Entries per batch (default: FILE_SEARCH_INDEX_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--install-schedule",
+            action="store_true",
+            help="Register a Django-Q2 schedule that drains the queue every minute",
+        )
+
+    def handle(self, *args, **options):
+        if options["install_schedule"]:
+            self.install_schedule()
+            return
+
+        if not options["stats"]:
+            run = process_index_queue(
+                batch_size=options["batch_size"],
+                wait_for_pending=options["wait"],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Processed {run.processed} entries in {run.batches} batch(es) "
+                    f"({run.failed} failed, {run.dropped} dropped); "
+                    f"lag avg {run.avg_lag_s:.2f}s, max {run.max_lag_s:.2f}s"
+                )
+            )
+
+        stats = get_queue_stats()
+        self.stdout.write(f"Queue depth: {stats.depth} ({stats.due} due)")
+        self.stdout.write(f"Oldest entry lag: {stats.oldest_lag_s:.2f}s")
+        for record_type, count in sorted(stats.by_type.items()):
+            self.stdout.write(f"  {record_type}: {count}")
+
+    def install_schedule(self):
+        from django_q.models import Schedule
+
+        Schedule.objects.update_or_create(
+            name=SCHEDULE_NAME,
+            defaults={
+                "func": "file_search.tasks.drain_index_queue",
+                "kwargs": "{'wait_for_pending': False}",
+                "schedule_type": Schedule.MINUTES,
+                "minutes": 1,
+                "repeats": -1,
+            },
+        )
+        self.stdout.write(self.style.SUCCESS(f"Installed Django-Q2 schedule '{SCHEDULE_NAME}'"))
@@ -8,7 +8,7 @@ supported document types (like Word and Excel) are properly searchable.
 from django.core.management.base import BaseCommand, CommandError
 
 from documents.models import Document
-from file_search.indexing import ensure_project_store, index_document
+from file_search.indexing import ensure_project_store, index_documents
 from projects.models import Project
 
 
@@ -45,6 +45,12 @@ class Command(BaseCommand):
             type=str,
             help="Only reindex specific document type (e.g., WordDocument, SpreadsheetDocument)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Documents per backend upsert (default: FILE_SEARCH_INDEX_BATCH_SIZE)",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("=" * 70)
@@ -73,6 +79,7 @@ class Command(BaseCommand):
                 force=options["force"],
                 dry_run=options["dry_run"],
                 type_filter=options.get("type"),
+                batch_size=options.get("batch_size"),
             )
             total_indexed += indexed
             total_skipped += skipped
@@ -113,7 +120,9 @@ class Command(BaseCommand):
         else:
             return []
 
-    def reindex_project(self, project, force=False, dry_run=False, type_filter=None):
+    def reindex_project(
+        self, project, force=False, dry_run=False, type_filter=None, batch_size=None
+    ):
         """Reindex all documents for a project."""
         self.stdout.write("-" * 70)
         self.stdout.write(self.style.HTTP_INFO(f"Project: {project.name} (ID: {project.id})"))
@@ -162,25 +171,20 @@ class Command(BaseCommand):
                 doc for doc in documents if doc.get_type_name() == type_filter
             ]
 
-        for doc in documents:
-            doc_type = doc.get_type_name()
-            try:
-                if dry_run:
-                    self.stdout.write(
-                        f"    {self.style.SUCCESS('+')} {doc.name} ({doc_type})"
-                    )
-                    indexed += 1
-                else:
-                    index_document(doc, force=force)
-                    self.stdout.write(
-                        f"    {self.style.SUCCESS('+')} {doc.name} ({doc_type})"
-                    )
-                    indexed += 1
-            except Exception as e:
+        if dry_run:
+            for doc in documents:
                 self.stdout.write(
-                    f"    {self.style.ERROR('x')} {doc.name} ({doc_type}): {e}"
+                    f"    {self.style.SUCCESS('+')} {doc.name} ({doc.get_type_name()})"
                 )
-                failed += 1
+                indexed += 1
+        else:
+            stats = index_documents(list(documents), force=force, batch_size=batch_size)
+            indexed, failed = stats.indexed, stats.failed
+            skipped = stats.skipped + stats.unchanged
+            self.stdout.write(
+                f"  {stats.batches} batch(es) in {stats.duration_s:.2f}s "
+                f"({stats.docs_per_second:.1f} docs/s)"
+            )
 
         self.stdout.write("")
         self.stdout.write(
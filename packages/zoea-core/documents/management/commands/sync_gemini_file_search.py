@@ -5,13 +5,14 @@ Creates a File Search store per Project and uploads documents for semantic
 search and RAG capabilities.
 """
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import models
 from django.utils import timezone
 from organizations.models import Organization
 
 from file_search import FileSearchRegistry
-from file_search.indexing import ensure_project_store, index_document
+from file_search.indexing import ensure_project_store, index_documents
 from documents.models import Document
 from projects.models import Project
 
@@ -59,6 +60,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be done without actually doing it'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Documents uploaded together per batch (default: FILE_SEARCH_INDEX_BATCH_SIZE)'
+        )
         parser.add_argument(
             '--delete-store',
             action='store_true',
@@ -168,7 +175,8 @@ class Command(BaseCommand):
             force=options['force'],
             dry_run=options['dry_run'],
             max_tokens_per_chunk=options['max_tokens_per_chunk'],
-            max_overlap_tokens=options['max_overlap_tokens']
+            max_overlap_tokens=options['max_overlap_tokens'],
+            batch_size=options['batch_size'],
         )
 
     def get_projects(self, options):
@@ -262,8 +270,14 @@ class Command(BaseCommand):
             )
         self.stdout.write('=' * 70)
 
-    def sync_projects(self, projects, force, dry_run, max_tokens_per_chunk, max_overlap_tokens):
+    def sync_projects(
+        self, projects, force, dry_run, max_tokens_per_chunk, max_overlap_tokens, batch_size=None
+    ):
         """Sync documents for all projects."""
+        if batch_size is None:
+            batch_size = int(getattr(settings, 'FILE_SEARCH_INDEX_BATCH_SIZE', 64))
+        batch_size = max(1, batch_size)
+
         total_docs = 0
         total_synced = 0
         total_skipped = 0
@@ -319,35 +333,41 @@ class Command(BaseCommand):
             self.stdout.write(f"  Syncing {doc_count} document(s)...")
             self.stdout.write('')
 
-            # Upload each document
+            # Upload in batches; each batch's uploads run concurrently
             synced = 0
             skipped = 0
             failed = 0
 
-            for doc in documents:
-                doc_type = doc.get_type_name()
-
-                if dry_run:
+            if dry_run:
+                for doc in documents:
                     self.stdout.write(
-                        f"    • {doc.name} ({doc_type}): "
+                        f"    • {doc.name} ({doc.get_type_name()}): "
                         f"{self.style.WARNING('[DRY RUN]')} Would upload"
                     )
                     synced += 1
-                else:
+            else:
+                documents = list(documents)
+                for offset in range(0, len(documents), batch_size):
+                    batch = documents[offset:offset + batch_size]
+                    label = f"    • Documents {offset + 1}-{offset + len(batch)}"
                     try:
-                        index_document(doc, force=force)
-
-                        self.stdout.write(
-                            f"    • {doc.name} ({doc_type}): "
-                            f"{self.style.SUCCESS('✓ Synced')}"
-                        )
-                        synced += 1
+                        stats = index_documents(batch, force=force, batch_size=batch_size)
                     except Exception as e:
-                        self.stdout.write(
-                            f"    • {doc.name} ({doc_type}): "
-                            f"{self.style.ERROR('✗ Failed')} - {e}"
-                        )
-                        failed += 1
+                        self.stdout.write(f"{label}: {self.style.ERROR('✗ Failed')} - {e}")
+                        failed += len(batch)
+                        continue
+
+                    synced += stats.indexed + stats.unchanged
+                    skipped += stats.skipped
+                    failed += stats.failed
+                    status = self.style.SUCCESS(f'✓ {stats.indexed} synced')
+                    if stats.unchanged:
+                        status += f', {stats.unchanged} unchanged'
+                    if stats.skipped:
+                        status += f', {stats.skipped} skipped'
+                    if stats.failed:
+                        status += f", {self.style.ERROR(f'✗ {stats.failed} failed')}"
+                    self.stdout.write(f"{label}: {status} ({stats.duration_s:.1f}s)")
 
             total_synced += synced
             total_skipped += skipped
@@ -4,18 +4,36 @@ Django management command to sync documents from configured sources.
 This command pulls documents from configured Source implementations
 (local filesystem, S3, R2, etc.) and creates or updates Document records
 in the database for use in projects.
+
+Syncs are incremental: each source keeps a manifest of the files it last
+synced (see sources.sync), so only files whose size or modification time
+changed are read, and only those whose content changed are re-imported.
+
+New documents are placed in folders mirroring their directory in the
+source; the folders for a sync are created in one batch at the end.
 """
 
-from pathlib import Path
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils import timezone
 from organizations.models import Organization
 
+from documents.folder_tree import materialize_folders
 from documents.models import Document, Image, PDF, Markdown, CSV, D2Diagram
 from projects.models import Project
 from sources.models import Source
+from sources.sync import (
+    ManifestWriter,
+    delete_entries,
+    find_missing,
+    load_manifest,
+    modified_timestamp,
+    scan_source,
+)
 
 
 class Command(BaseCommand):
@@ -59,6 +77,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete documents that no longer exist in source'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'SOURCE_SYNC_WORKERS', 8),
+            help='Threads used to read and hash changed files (default: 8)'
+        )
 
     def handle(self, *args, **options):
         """Main command handler."""
@@ -81,6 +105,8 @@ class Command(BaseCommand):
             sources,
             dry_run=options['dry_run'],
             delete_missing=options['delete_missing'],
+            workers=options['workers'],
+            verbosity=options['verbosity'],
         )
 
     def get_sources(self, options):
@@ -120,7 +146,7 @@ class Command(BaseCommand):
 
         return sources
 
-    def sync_sources(self, sources, dry_run, delete_missing):
+    def sync_sources(self, sources, dry_run, delete_missing, workers=8, verbosity=1):
         """Sync documents for all sources."""
         total_created = 0
         total_updated = 0
@@ -148,84 +174,105 @@ class Command(BaseCommand):
                 self.stdout.write('')
                 continue
 
-            # List documents from source
+            manifest = load_manifest(source)
+            writer = ManifestWriter(source)
+            seen_paths = set()
+            # (document id, source path) of created documents to file into folders
+            placements = []
+
+            created = 0
+            updated = 0
+            skipped = 0
+            failed = 0
+
+            # Stream the listing; changed files are read and hashed in parallel
             try:
-                doc_metas = list(source_impl.list_documents())
+                for scanned in scan_source(
+                    source_impl, manifest, max_workers=workers, read=not dry_run
+                ):
+                    doc_meta = scanned.meta
+                    seen_paths.add(doc_meta.path)
+
+                    if scanned.status in ('unchanged', 'touched'):
+                        skipped += 1
+                        if scanned.status == 'touched' and not dry_run:
+                            writer.record(scanned)
+                        if verbosity >= 2:
+                            self.stdout.write(
+                                f"    • {doc_meta.name}: "
+                                f"{self.style.WARNING('- Skipped (unchanged)')}"
+                            )
+                        continue
+
+                    try:
+                        if scanned.error is not None:
+                            raise Exception(f"Failed to read document: {scanned.error}")
+
+                        result = self.sync_document(
+                            source,
+                            source_impl,
+                            doc_meta,
+                            dry_run,
+                            scanned=scanned,
+                        )
+
+                        if result in ('created', 'updated', 'skipped') and not dry_run:
+                            writer.record(scanned)
+
+                        if result == 'created':
+                            created += 1
+                            if not dry_run:
+                                placements.append((scanned.document_id, doc_meta.path))
+                            self.stdout.write(
+                                f"    • {doc_meta.name}: "
+                                f"{self.style.SUCCESS('✓ Created')}"
+                            )
+                        elif result == 'updated':
+                            updated += 1
+                            self.stdout.write(
+                                f"    • {doc_meta.name}: "
+                                f"{self.style.SUCCESS('✓ Updated')}"
+                            )
+                        elif result == 'skipped':
+                            skipped += 1
+                            self.stdout.write(
+                                f"    • {doc_meta.name}: "
+                                f"{self.style.WARNING('- Skipped (unchanged)')}"
+                            )
+                    except Exception as e:
+                        failed += 1
+                        self.stdout.write(
+                            f"    • {doc_meta.name}: "
+                            f"{self.style.ERROR(f'✗ Failed - {e}')}"
+                        )
             except Exception as e:
+                writer.flush()
+                self.place_in_folders(source, source_impl, placements)
                 self.stdout.write(
                     self.style.ERROR(f'  ✗ Failed to list documents: {e}')
                 )
                 self.stdout.write('')
                 continue
 
-            self.stdout.write(f'  Found {len(doc_metas)} document(s) in source')
-            self.stdout.write('')
+            writer.flush()
+            self.place_in_folders(source, source_impl, placements)
 
-            if len(doc_metas) == 0:
+            self.stdout.write(f'  Found {len(seen_paths)} document(s) in source')
+            if not seen_paths:
                 self.stdout.write('  No documents to sync')
                 self.stdout.write('')
                 continue
 
-            # Track source paths for delete detection
-            source_paths = {meta.path for meta in doc_metas}
-
-            # Sync each document
-            created = 0
-            updated = 0
-            skipped = 0
-            failed = 0
-
-            for doc_meta in doc_metas:
-                try:
-                    result = self.sync_document(
-                        source,
-                        source_impl,
-                        doc_meta,
-                        dry_run
-                    )
-
-                    if result == 'created':
-                        created += 1
-                        self.stdout.write(
-                            f"    • {doc_meta.name}: "
-                            f"{self.style.SUCCESS('✓ Created')}"
-                        )
-                    elif result == 'updated':
-                        updated += 1
-                        self.stdout.write(
-                            f"    • {doc_meta.name}: "
-                            f"{self.style.SUCCESS('✓ Updated')}"
-                        )
-                    elif result == 'skipped':
-                        skipped += 1
-                        self.stdout.write(
-                            f"    • {doc_meta.name}: "
-                            f"{self.style.WARNING('- Skipped (unchanged)')}"
-                        )
-                except Exception as e:
-                    failed += 1
-                    self.stdout.write(
-                        f"    • {doc_meta.name}: "
-                        f"{self.style.ERROR(f'✗ Failed - {e}')}"
-                    )
-
-            # Handle deleted documents
+            # Handle deleted documents: manifest entries not listed this run
             deleted = 0
             if delete_missing and not dry_run:
-                existing_docs = Document.objects.filter(
-                    project=source.project,
-                ).select_subclasses()
-
-                for doc in existing_docs:
-                    # Get source path from document
-                    doc_path = self.get_document_source_path(doc)
-                    if doc_path and doc_path not in source_paths:
-                        doc.delete()
-                        deleted += 1
-                        self.stdout.write(
-                            f"    • {doc.name}: "
-                            f"{self.style.WARNING('✗ Deleted (missing from source)')}"
-                        )
+                missing = find_missing(manifest, seen_paths)
+                for entry in missing:
+                    self.stdout.write(
+                        f"    • {Path(entry.path).name}: "
+                        f"{self.style.WARNING('✗ Deleted (missing from source)')}"
+                    )
+                deleted = delete_entries(missing)
 
             total_created += created
             total_updated += updated
@@ -281,40 +328,79 @@ class Command(BaseCommand):
             )
         self.stdout.write('=' * 70)
 
-    def sync_document(self, source, source_impl, doc_meta, dry_run):
+    def place_in_folders(self, source, source_impl, placements):
+        """
+        Move created documents into folders mirroring their source directories.
+
+        All folders are materialized in one batch (see
+        documents.folder_tree), then documents are moved with one UPDATE
+        per folder. Documents at the source root stay at the project root.
+
+        Args:
+            placements: (document id, DocumentMetadata.path) pairs
+        """
+        by_directory = defaultdict(list)
+        for document_id, path in placements:
+            directory = PurePosixPath(source_impl.get_relative_path(path)).parent
+            if document_id is not None and directory != PurePosixPath('.'):
+                by_directory[directory].append(document_id)
+        if not by_directory:
+            return
+
+        folders = materialize_folders(
+            source.project,
+            by_directory,
+            created_by=source.created_by,
+        )
+        for directory, document_ids in by_directory.items():
+            Document.objects.filter(id__in=document_ids).update(folder=folders[directory])
+
+    def sync_document(self, source, source_impl, doc_meta, dry_run, scanned=None):
         """
         Sync a single document from source to database.
 
+        Args:
+            scanned: ScannedFile from scan_source() carrying the file's content
+                and manifest entry. Without it the content is read here. On
+                success its document_id is set for the manifest.
+
         Returns:
             str: 'created', 'updated', or 'skipped'
         """
-        # Check if document already exists by path
         doc_path = doc_meta.path
-        existing_doc = Document.objects.filter(
-            project=source.project,
-            name=Path(doc_path).name
-        ).select_subclasses().first()
-
-        # Determine if we need to update
-        needs_update = False
-        if existing_doc:
-            # Check if file has been modified
-            if existing_doc.updated_at.timestamp() < doc_meta.modified_at:
-                needs_update = True
-        else:
-            needs_update = True
-
-        if not needs_update:
-            return 'skipped'
+        entry = scanned.entry if scanned else None
+
+        existing_doc = None
+        if entry and entry.document_id:
+            existing_doc = Document.objects.filter(
+                id=entry.document_id
+            ).select_subclasses().first()
+        if existing_doc is None:
+            # Files synced before the manifest existed are matched by name
+            existing_doc = Document.objects.filter(
+                project=source.project,
+                name=Path(doc_path).name
+            ).select_subclasses().first()
+
+            # Check if file has been modified since
+            if existing_doc and entry is None:
+                modified_at = modified_timestamp(doc_meta)
+                if modified_at is not None and existing_doc.updated_at.timestamp() >= modified_at:
+                    if scanned:
+                        scanned.document_id = existing_doc.id
+                    return 'skipped'
 
         if dry_run:
             return 'created' if not existing_doc else 'updated'
 
         # Read document content from source
-        try:
-            content_bytes = source_impl.read_document(doc_path)
-        except Exception as e:
-            raise Exception(f"Failed to read document: {e}")
+        if scanned and scanned.content is not None:
+            content_bytes = scanned.content
+        else:
+            try:
+                content_bytes = source_impl.read_document(doc_path)
+            except Exception as e:
+                raise Exception(f"Failed to read document: {e}")
 
         # Determine document type from extension
         extension = doc_meta.extension.lower()
@@ -349,6 +435,8 @@ class Command(BaseCommand):
 
             doc.save()
 
+        if scanned:
+            scanned.document_id = doc.id
         return action
 
     def create_document_by_type(self, extension, project, organization):
@@ -387,14 +475,3 @@ class Command(BaseCommand):
                 project=project,
                 organization=organization
             )
-
-    def get_document_source_path(self, doc):
-        """
-        Get the original source path for a document.
-
-        This is a placeholder - in a real implementation, you might
-        store the source path as metadata on the document.
-        """
-        # For now, we can't reliably determine the original source path
-        # This would need to be tracked in document metadata
-        return None
@@ -0,0 +1,143 @@
+"""
+Django management command to pre-generate document previews in bulk.
+
+Cold folder views otherwise queue every thumbnail on first load. This command
+claims previews that are missing or outdated for whole projects and queues
+them for the preview workers in batches (or renders them in this process with
+--inline).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from documents.models import Document, DocumentPreview
+from documents.preview_service import generate_previews, request_previews
+from projects.models import Project
+
+CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-generate document previews for a project. Missing or outdated "
+        "previews are queued for the preview workers in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=str,
+            help="Project name or ID to warm (required unless --all is specified)",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Warm previews for all projects",
+        )
+        parser.add_argument(
+            "--kind",
+            type=str,
+            default=DocumentPreview.PreviewKind.THUMBNAIL,
+            choices=DocumentPreview.PreviewKind.values,
+            help="Preview kind to generate (default: thumbnail)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render previews even if they appear up-to-date",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Documents per queued render task (default: 10)",
+        )
+        parser.add_argument(
+            "--inline",
+            action="store_true",
+            help="Render in this process instead of queueing tasks",
+        )
+
+    def handle(self, *args, **options):
+        projects = self.get_projects(options)
+        if not projects:
+            raise CommandError("No projects found. Use --project or --all.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        total_documents = 0
+        total_queued = 0
+        for project in projects:
+            documents, queued = self.warm_project(
+                project,
+                preview_kind=options["kind"],
+                force=options["force"],
+                batch_size=options["batch_size"],
+                inline=options["inline"],
+            )
+            total_documents += documents
+            total_queued += queued
+
+        verb = "Rendered" if options["inline"] else "Queued"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {total_queued} of {total_documents} preview(s) "
+                f"across {len(projects)} project(s)"
+            )
+        )
+
+    def get_projects(self, options):
+        """Get projects based on filter arguments."""
+        if options["project"]:
+            try:
+                if options["project"].isdigit():
+                    return [Project.objects.get(id=int(options["project"]))]
+                return [Project.objects.get(name=options["project"])]
+            except Project.DoesNotExist:
+                raise CommandError(f"Project '{options['project']}' not found")
+        if options["all"]:
+            return list(Project.objects.all())
+        return []
+
+    def warm_project(self, project, *, preview_kind, force, batch_size, inline):
+        """Claim and queue (or render) previews for one project's documents."""
+        documents = (
+            Document.objects.filter(project=project, is_trashed=False)
+            .only("id", "organization_id", "project_id", "updated_at")
+            .order_by("id")
+        )
+
+        total = 0
+        queued = 0
+        chunk = []
+        for document in documents.iterator(chunk_size=CHUNK_SIZE):
+            chunk.append(document)
+            if len(chunk) >= CHUNK_SIZE:
+                queued += self.warm_chunk(chunk, preview_kind, force, batch_size, inline)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            queued += self.warm_chunk(chunk, preview_kind, force, batch_size, inline)
+            total += len(chunk)
+
+        self.stdout.write(f"  {project.name} (ID: {project.id}): {queued}/{total} preview(s)")
+        return total, queued
+
+    def warm_chunk(self, documents, preview_kind, force, batch_size, inline):
+        if inline:
+            return generate_previews(
+                [document.id for document in documents], preview_kind, force=force
+            )
+
+        before = dict(
+            DocumentPreview.objects.filter(
+                document__in=documents, preview_kind=preview_kind
+            ).values_list("document_id", "requested_at")
+        )
+        previews = request_previews(
+            documents, preview_kind=preview_kind, force=force, batch_size=batch_size
+        )
+        return sum(
+            1
+            for document_id, preview in previews.items()
+            if preview.requested_at and preview.requested_at != before.get(document_id)
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-16 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0016_rename_documents_d_project_4e7002_idx_documents_d_project_250bb8_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='search_content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the text last indexed into the file search store', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='search_metadata_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the record metadata last indexed into the file search store', max_length=64),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-16 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0017_document_search_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexQueueEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_type', models.CharField(choices=[('document', 'Document'), ('chat_message', 'Chat Message'), ('email_message', 'Email Message')], max_length=32)),
+                ('object_id', models.CharField(help_text='Primary key of the record to index', max_length=64)),
+                ('action', models.CharField(choices=[('index', 'Index'), ('remove', 'Remove')], default='index', max_length=16)),
+                ('force', models.BooleanField(default=False, help_text='Bypass content fingerprints when indexing')),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Extra data needed to process the entry (e.g. store ID for removals)')),
+                ('version', models.PositiveIntegerField(default=1, help_text='Incremented each time another save coalesces into this entry')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('enqueued_at', models.DateTimeField(help_text='When the first uncoalesced save was queued')),
+                ('available_at', models.DateTimeField(db_index=True, help_text='Earliest time a worker may process this entry')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Index Queue Entry',
+                'verbose_name_plural': 'Search Index Queue Entries',
+                'ordering': ['available_at'],
+                'unique_together': {('record_type', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-16 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0018_search_index_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchStoreVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backend', models.CharField(max_length=32)),
+                ('store_id', models.CharField(max_length=255)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Store Version',
+                'verbose_name_plural': 'Search Store Versions',
+                'unique_together': {('backend', 'store_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-16 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0019_search_store_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentpreview',
+            name='requested_at',
+            field=models.DateTimeField(blank=True, help_text='When rendering was last queued (dedups concurrent requests)', null=True),
+        ),
+    ]
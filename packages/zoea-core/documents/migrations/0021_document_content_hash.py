@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-16 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0020_document_preview_requested_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the uploaded file, computed when the file is saved', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0021_document_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='search_source_hash',
+            field=models.CharField(blank=True, default='', help_text='Fingerprint of the source file or content last indexed into the file search store', max_length=64),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.1.2 on 2026-10-16 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0022_document_search_source_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexWorkerLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('leased_until', models.DateTimeField(help_text='When the current claim lapses and another worker may be started')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Index Worker Lease',
+                'verbose_name_plural': 'Search Index Worker Leases',
+            },
+        ),
+    ]
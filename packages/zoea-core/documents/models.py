@@ -18,7 +18,10 @@ This module implements a hierarchical document model structure:
       - ExcalidrawDiagram
 """
 
+from collections.abc import Iterator
+
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from model_utils.managers import InheritanceQuerySetMixin
@@ -26,6 +29,8 @@ from mptt.models import MPTTModel, TreeForeignKey
 
 from accounts.managers import OrganizationScopedQuerySet
 
+from .pdf_text import PAGE_BREAK, PAGE_JOINER, PDFPage, iter_pdf_pages, join_pages
+
 User = get_user_model()
 
 
@@ -129,6 +134,39 @@ class Folder(MPTTModel):
         ancestors = self.get_ancestors(include_self=True)
         return "/".join(folder.name for folder in ancestors)
 
+    @classmethod
+    def get_paths(cls, folders) -> dict[int, str]:
+        """
+        Resolve get_path() for many folders with a single ancestors query.
+
+        Args:
+            folders: Folder instances with their tree fields loaded
+
+        Returns:
+            dict mapping folder ID to its slash-separated path
+        """
+        folders = {folder.pk: folder for folder in folders if folder is not None}
+        if not folders:
+            return {}
+
+        query = Q()
+        for folder in folders.values():
+            query |= Q(tree_id=folder.tree_id, lft__lte=folder.lft, rght__gte=folder.rght)
+        ancestors = list(
+            cls.objects.filter(query)
+            .order_by("tree_id", "lft")
+            .values_list("tree_id", "lft", "rght", "name")
+        )
+
+        return {
+            pk: "/".join(
+                name
+                for tree_id, lft, rght, name in ancestors
+                if tree_id == folder.tree_id and lft <= folder.lft and rght >= folder.rght
+            )
+            for pk, folder in folders.items()
+        }
+
     def list_children(self):
         return self.get_children()
 
@@ -753,6 +791,12 @@ class Document(models.Model):
         blank=True,
         help_text="File size in bytes"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the uploaded file, computed when the file is saved"
+    )
 
     # Gemini File Search integration
     gemini_file_id = models.CharField(
@@ -766,6 +810,26 @@ class Document(models.Model):
         null=True,
         help_text="Last time this document was synced to Gemini File Search"
     )
+    search_content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the text last indexed into the file search store"
+    )
+    search_metadata_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the record metadata last indexed into the file search store"
+    )
+    search_source_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text=(
+            "Fingerprint of the source file or content last indexed into the file search store"
+        ),
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -797,6 +861,9 @@ class Document(models.Model):
     # Combined manager for organization scoping and inheritance
     objects = DocumentQuerySet.as_manager()
 
+    # Name of the FileField holding the document's file (file-backed subclasses)
+    file_field_name: str | None = None
+
     class Meta:
         verbose_name = "Document"
         verbose_name_plural = "Documents"
@@ -813,6 +880,61 @@ class Document(models.Model):
         """Return the specific document type name."""
         return self.__class__.__name__
 
+    def get_file(self):
+        """Return the document's FieldFile, or None for documents without one."""
+        if not self.file_field_name:
+            return None
+        field_file = getattr(self, self.file_field_name)
+        return field_file or None
+
+    def get_content_hash(self) -> str:
+        """
+        Return the SHA-256 of the document's file ("" if it has none).
+
+        The hash is computed while an upload is saved. Documents stored before
+        it existed are hashed from storage once and the result is persisted.
+        """
+        if self.content_hash:
+            return self.content_hash
+
+        field_file = self.get_file()
+        if field_file is None:
+            return ""
+
+        from .text_cache import hash_field_file
+
+        self.content_hash = hash_field_file(field_file)
+        if self.pk:
+            Document.objects.filter(pk=self.pk).update(content_hash=self.content_hash)
+        return self.content_hash
+
+    def _save_pending_upload(self, update_fields) -> None:
+        """
+        Hash a newly assigned file while writing it to storage.
+
+        Does what FileField.pre_save() would do for an uncommitted file, hashing
+        the local upload first so the stored object never has to be read back.
+        A hash computed while the upload was being read can be passed in
+        ``_pending_upload_hash`` (the document importer does) to skip rehashing.
+        """
+        field_file = self.get_file()
+        if field_file is None:
+            self.content_hash = ""
+            return
+        if field_file._committed:
+            return
+        if update_fields is not None and self.file_field_name not in update_fields:
+            return
+
+        pending_hash = getattr(self, "_pending_upload_hash", None)
+        if pending_hash:
+            self.content_hash = pending_hash
+        else:
+            from .text_cache import hash_file
+
+            self.content_hash = hash_file(field_file.file)
+        field_file.save(field_file.name, field_file.file, save=False)
+
     def move_to_trash(self):
         """Move document to trash, preserving original folder for potential restore."""
         from django.utils import timezone
@@ -851,6 +973,11 @@ class Document(models.Model):
                 raise ValidationError("Document folder must belong to the same project")
             self.project = self.folder.project
             self.organization = self.folder.organization
+
+        update_fields = kwargs.get("update_fields")
+        self._save_pending_upload(update_fields)
+        if update_fields is not None and self.file_field_name in update_fields:
+            kwargs["update_fields"] = {*update_fields, "content_hash"}
         super().save(*args, **kwargs)
 
 
@@ -861,6 +988,8 @@ class Image(Document):
     Supports common image formats (JPEG, PNG, GIF, etc.).
     """
 
+    file_field_name = "image_file"
+
     image_file = models.ImageField(
         upload_to='images/%Y/%m/%d/',
         help_text="Image file"
@@ -936,6 +1065,8 @@ class PDF(Document):
     Supports PDF files for reports, documentation, etc.
     """
 
+    file_field_name = "pdf_file"
+
     pdf_file = models.FileField(
         upload_to='pdfs/%Y/%m/%d/',
         help_text="PDF file"
@@ -961,14 +1092,9 @@ class PDF(Document):
             # Extract page count if not already set
             if not self.page_count:
                 try:
-                    import fitz  # PyMuPDF
+                    from .pdf_text import count_pdf_pages
 
-                    self.pdf_file.seek(0)
-                    pdf_bytes = self.pdf_file.read()
-                    self.pdf_file.seek(0)  # Reset for Django to save
-
-                    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-                        self.page_count = len(doc)
+                    self.page_count = count_pdf_pages(self.pdf_file)
                 except Exception:
                     pass  # Fail gracefully if PDF is malformed
 
@@ -979,6 +1105,7 @@ class PDF(Document):
         Extract plain text from PDF for search indexing.
 
         Extracts text from all pages, suitable for Gemini File Search.
+        Results are cached by file hash (see documents.text_cache).
 
         Returns:
             str: Plain text content from all PDF pages.
@@ -987,21 +1114,31 @@ class PDF(Document):
             return ""
 
         try:
-            import fitz  # PyMuPDF
+            from .text_cache import get_or_extract_text
 
-            self.pdf_file.open("rb")
-            try:
-                pdf_bytes = self.pdf_file.read()
-                with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-                    text_parts = []
-                    for page in doc:
-                        text_parts.append(page.get_text())
-                    return "\n\n".join(text_parts)
-            finally:
-                self.pdf_file.close()
+            text = get_or_extract_text(
+                self.pdf_file, "pdf", self._extract_text_content, self.get_content_hash()
+            )
+            return text.replace(PAGE_BREAK, PAGE_JOINER)
         except Exception:
             return ""
 
+    def iter_text_pages(self) -> Iterator[PDFPage]:
+        """
+        Yield the text of each page with its 1-based page number.
+
+        Reads from the extracted-text cache when enabled; otherwise pages are
+        parsed one at a time straight from the file.
+        """
+        from .text_cache import iter_cached_pdf_pages
+
+        if not self.pdf_file:
+            return iter(())
+        return iter_cached_pdf_pages(self.pdf_file, self.get_content_hash())
+
+    def _extract_text_content(self) -> str:
+        return join_pages(iter_pdf_pages(self.pdf_file))
+
 
 class WordDocument(Document):
     """
@@ -1010,6 +1147,8 @@ class WordDocument(Document):
     Supports Microsoft Word documents for viewing and text extraction.
     """
 
+    file_field_name = "docx_file"
+
     docx_file = models.FileField(
         upload_to='docx/%Y/%m/%d/',
         help_text="Word document file (.docx)"
@@ -1050,6 +1189,8 @@ class WordDocument(Document):
         """
         Extract plain text from Word document for search indexing.
 
+        Results are cached by file hash (see documents.text_cache).
+
         Returns:
             str: Plain text content from all paragraphs.
         """
@@ -1057,27 +1198,34 @@ class WordDocument(Document):
             return ""
 
         try:
-            from docx import Document as DocxDocument
+            from .text_cache import get_or_extract_text
 
-            self.docx_file.open("rb")
-            try:
-                doc = DocxDocument(self.docx_file)
-                text_parts = []
-                for para in doc.paragraphs:
-                    if para.text.strip():
-                        text_parts.append(para.text)
-                # Also extract text from tables
-                for table in doc.tables:
-                    for row in table.rows:
-                        row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                        if row_text:
-                            text_parts.append(" | ".join(row_text))
-                return "\n\n".join(text_parts)
-            finally:
-                self.docx_file.close()
+            return get_or_extract_text(
+                self.docx_file, "docx", self._extract_text_content, self.get_content_hash()
+            )
         except Exception:
             return ""
 
+    def _extract_text_content(self) -> str:
+        from docx import Document as DocxDocument
+
+        self.docx_file.open("rb")
+        try:
+            doc = DocxDocument(self.docx_file)
+            text_parts = []
+            for para in doc.paragraphs:
+                if para.text.strip():
+                    text_parts.append(para.text)
+            # Also extract text from tables
+            for table in doc.tables:
+                for row in table.rows:
+                    row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                    if row_text:
+                        text_parts.append(" | ".join(row_text))
+            return "\n\n".join(text_parts)
+        finally:
+            self.docx_file.close()
+
     def get_html_content(self) -> str:
         """
         Convert Word document to HTML for viewing.
@@ -1164,6 +1312,8 @@ class SpreadsheetDocument(Document):
     Supports Microsoft Excel spreadsheets for viewing and data extraction.
     """
 
+    file_field_name = "xlsx_file"
+
     xlsx_file = models.FileField(
         upload_to='xlsx/%Y/%m/%d/',
         help_text="Excel spreadsheet file (.xlsx)"
@@ -1205,6 +1355,8 @@ class SpreadsheetDocument(Document):
         """
         Extract plain text from spreadsheet for search indexing.
 
+        Results are cached by file hash (see documents.text_cache).
+
         Returns:
             str: Plain text content from all cells.
         """
@@ -1212,31 +1364,38 @@ class SpreadsheetDocument(Document):
             return ""
 
         try:
-            from openpyxl import load_workbook
-
-            self.xlsx_file.open("rb")
-            try:
-                wb = load_workbook(self.xlsx_file, read_only=True, data_only=True)
-                text_parts = []
+            from .text_cache import get_or_extract_text
 
-                for sheet_name in wb.sheetnames:
-                    sheet = wb[sheet_name]
-                    text_parts.append(f"Sheet: {sheet_name}")
-                    for row in sheet.iter_rows():
-                        row_values = [
-                            str(cell.value) for cell in row
-                            if cell.value is not None
-                        ]
-                        if row_values:
-                            text_parts.append(" | ".join(row_values))
-
-                wb.close()
-                return "\n".join(text_parts)
-            finally:
-                self.xlsx_file.close()
+            return get_or_extract_text(
+                self.xlsx_file, "xlsx", self._extract_text_content, self.get_content_hash()
+            )
         except Exception:
             return ""
 
+    def _extract_text_content(self) -> str:
+        from openpyxl import load_workbook
+
+        self.xlsx_file.open("rb")
+        try:
+            wb = load_workbook(self.xlsx_file, read_only=True, data_only=True)
+            text_parts = []
+
+            for sheet_name in wb.sheetnames:
+                sheet = wb[sheet_name]
+                text_parts.append(f"Sheet: {sheet_name}")
+                for row in sheet.iter_rows():
+                    row_values = [
+                        str(cell.value) for cell in row
+                        if cell.value is not None
+                    ]
+                    if row_values:
+                        text_parts.append(" | ".join(row_values))
+
+            wb.close()
+            return "\n".join(text_parts)
+        finally:
+            self.xlsx_file.close()
+
     def get_html_content(self) -> str:
         """
         Convert spreadsheet to HTML tables for viewing.
@@ -1297,6 +1456,8 @@ class FileDocument(Document):
     more specific document subclass.
     """
 
+    file_field_name = "file"
+
     file = models.FileField(
         upload_to='files/%Y/%m/%d/',
         help_text="Uploaded file"
@@ -2085,6 +2246,11 @@ class DocumentPreview(models.Model):
     height = models.PositiveIntegerField(null=True, blank=True)
     file_size = models.PositiveIntegerField(null=True, blank=True)
     generated_at = models.DateTimeField(null=True, blank=True)
+    requested_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When rendering was last queued (dedups concurrent requests)",
+    )
     error_message = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -2109,3 +2275,117 @@ class DocumentPreview(models.Model):
         self.status = self.Status.FAILED
         self.error_message = message
         self.save(update_fields=["status", "error_message", "updated_at"])
+
+
+class SearchIndexQueueEntry(models.Model):
+    """
+    Pending file search index work for a single record.
+
+    Rows are keyed by (record_type, object_id) so repeated saves of the same
+    record coalesce into one entry. ``available_at`` is pushed forward on each
+    save (debounce) but never past ``enqueued_at`` plus the configured maximum
+    delay. ``version`` increments on every coalesced save so a worker only
+    deletes the entry if nothing changed while it was being processed.
+    """
+
+    class RecordType(models.TextChoices):
+        DOCUMENT = "document", "Document"
+        CHAT_MESSAGE = "chat_message", "Chat Message"
+        EMAIL_MESSAGE = "email_message", "Email Message"
+
+    class Action(models.TextChoices):
+        INDEX = "index", "Index"
+        REMOVE = "remove", "Remove"
+
+    record_type = models.CharField(
+        max_length=32,
+        choices=RecordType.choices,
+    )
+    object_id = models.CharField(
+        max_length=64,
+        help_text="Primary key of the record to index",
+    )
+    action = models.CharField(
+        max_length=16,
+        choices=Action.choices,
+        default=Action.INDEX,
+    )
+    force = models.BooleanField(
+        default=False,
+        help_text="Bypass content fingerprints when indexing",
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Extra data needed to process the entry (e.g. store ID for removals)",
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        help_text="Incremented each time another save coalesces into this entry",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    enqueued_at = models.DateTimeField(
+        help_text="When the first uncoalesced save was queued",
+    )
+    available_at = models.DateTimeField(
+        db_index=True,
+        help_text="Earliest time a worker may process this entry",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Index Queue Entry"
+        verbose_name_plural = "Search Index Queue Entries"
+        unique_together = [["record_type", "object_id"]]
+        ordering = ["available_at"]
+
+    def __str__(self):
+        return f"SearchIndexQueueEntry({self.record_type}:{self.object_id}, {self.action})"
+
+
+class SearchIndexWorkerLease(models.Model):
+    """
+    Claim held by the process responsible for draining the index queue.
+
+    Enqueueing kicks a drain task only when it can move ``leased_until``
+    forward from a time in the past, so at most one worker is queued or
+    running at a time and a worker that died is replaced once its lease
+    lapses.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    leased_until = models.DateTimeField(
+        help_text="When the current claim lapses and another worker may be started",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Index Worker Lease"
+        verbose_name_plural = "Search Index Worker Leases"
+
+    def __str__(self):
+        return f"SearchIndexWorkerLease({self.name}, until {self.leased_until})"
+
+
+class SearchStoreVersion(models.Model):
+    """
+    Write counter for a file search store.
+
+    Every backend write bumps ``version``. Cached search results include the
+    version in their key, so results cached in any process stop matching as
+    soon as the store changes.
+    """
+
+    backend = models.CharField(max_length=32)
+    store_id = models.CharField(max_length=255)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Store Version"
+        verbose_name_plural = "Search Store Versions"
+        unique_together = [["backend", "store_id"]]
+
+    def __str__(self):
+        return f"SearchStoreVersion({self.backend}:{self.store_id}, v{self.version})"
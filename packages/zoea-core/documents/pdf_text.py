@@ -0,0 +1,165 @@
+"""
+Page-by-page PDF text extraction.
+
+PDFs are opened from a filesystem path or a memory-mapped file handle and
+parsed one page at a time, so neither the file bytes nor a list of every
+page's text is held in Python memory. Page numbers are 1-based.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+# Separator between pages in cached extracted text (the pdftotext convention).
+PAGE_BREAK = "\f"
+
+# Separator between pages in text returned to callers.
+PAGE_JOINER = "\n\n"
+
+
+class PDFPage(NamedTuple):
+    """Text of a single PDF page."""
+
+    number: int
+    text: str
+
+
+@contextmanager
+def open_pdf(source):
+    """
+    Open a PDF with PyMuPDF without reading it into a Python bytes object.
+
+    Args:
+        source: A path, a Django File/FieldFile/UploadedFile, or a binary file
+            handle. Paths are opened directly; handles backed by a real file
+            are memory-mapped; anything else (e.g. in-memory uploads) is read.
+
+    Yields:
+        fitz.Document
+    """
+    import fitz  # PyMuPDF
+
+    path = _local_path(source)
+    if path is not None:
+        doc = fitz.open(path)
+        try:
+            yield doc
+        finally:
+            doc.close()
+        return
+
+    # Saved FieldFiles on remote storage are opened here and closed again
+    close_after = getattr(source, "_committed", False) and source.closed
+    handle = getattr(source, "file", None) or source
+    try:
+        mapped = None
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            pass
+
+        if mapped is not None:
+            view = memoryview(mapped)
+            doc = fitz.open(stream=view, filetype="pdf")
+            try:
+                yield doc
+            finally:
+                doc.close()
+                view.release()
+                mapped.close()
+            return
+
+        handle.seek(0)
+        data = handle.read()
+        handle.seek(0)
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            yield doc
+    finally:
+        if close_after:
+            source.close()
+
+
+def iter_pdf_pages(source) -> Iterator[PDFPage]:
+    """Yield the text of each page in order. See open_pdf() for sources."""
+    with open_pdf(source) as doc:
+        for index in range(doc.page_count):
+            page = doc.load_page(index)
+            yield PDFPage(index + 1, page.get_text())
+
+
+def count_pdf_pages(source) -> int:
+    """Return the number of pages without extracting any text."""
+    with open_pdf(source) as doc:
+        return doc.page_count
+
+
+def join_pages(pages: Iterable[PDFPage]) -> str:
+    """Serialize pages into one string with PAGE_BREAK between them."""
+    buffer = io.StringIO()
+    for page in pages:
+        if page.number > 1:
+            buffer.write(PAGE_BREAK)
+        buffer.write(page.text.replace(PAGE_BREAK, "\n"))
+    return buffer.getvalue()
+
+
+def split_pages(text: str) -> Iterator[PDFPage]:
+    """Lazily yield pages from text produced by join_pages()."""
+    start = 0
+    number = 1
+    while True:
+        end = text.find(PAGE_BREAK, start)
+        if end == -1:
+            yield PDFPage(number, text[start:])
+            return
+        yield PDFPage(number, text[start:end])
+        start = end + len(PAGE_BREAK)
+        number += 1
+
+
+def pages_to_text(pages: Iterable[PDFPage]) -> tuple[str, list[int]]:
+    """
+    Join pages for display/indexing and record where each page starts.
+
+    Returns:
+        tuple: (text joined with PAGE_JOINER, character offset of each page)
+    """
+    buffer = io.StringIO()
+    offsets: list[int] = []
+    position = 0
+    for page in pages:
+        if offsets:
+            buffer.write(PAGE_JOINER)
+            position += len(PAGE_JOINER)
+        offsets.append(position)
+        buffer.write(page.text)
+        position += len(page.text)
+    return buffer.getvalue(), offsets
+
+
+def _local_path(source) -> str | None:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+
+    if hasattr(source, "temporary_file_path"):
+        return source.temporary_file_path()
+
+    # Saved FieldFiles on local storage expose a path. Unsaved ones wrap the
+    # uploaded file, which may itself be on disk.
+    if getattr(source, "_committed", False):
+        try:
+            path = source.path
+        except (NotImplementedError, ValueError, AttributeError):
+            return None
+        return path if os.path.exists(path) else None
+
+    inner = getattr(source, "file", None)
+    if inner is not None and hasattr(inner, "temporary_file_path"):
+        return inner.temporary_file_path()
+
+    return None
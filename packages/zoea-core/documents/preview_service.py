@@ -6,17 +6,16 @@ import hashlib
 import html
 import io
 import logging
-import shutil
-import subprocess
-import tempfile
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Any, Optional
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.utils import timezone
 from PIL import Image as PILImage
 
+from .diagram_renderer import DiagramRenderError, get_diagram_renderer
+
 logger = logging.getLogger(__name__)
 
 from .models import (
@@ -50,22 +49,15 @@ class PreviewArtifact:
 
 
 def compute_content_hash(document: Document) -> str:
-    """Compute a stable hash for the document's previewable content."""
-    if hasattr(document, "image_file") and getattr(document, "image_file"):
-        document.image_file.open("rb")
-        try:
-            data = document.image_file.read()
-        finally:
-            document.image_file.close()
-        return hashlib.sha256(data).hexdigest()
+    """
+    Compute a stable hash for the document's previewable content.
 
-    if hasattr(document, "pdf_file") and getattr(document, "pdf_file"):
-        document.pdf_file.open("rb")
-        try:
-            data = document.pdf_file.read()
-        finally:
-            document.pdf_file.close()
-        return hashlib.sha256(data).hexdigest()
+    File-backed documents use the hash stored at upload (see
+    Document.get_content_hash()), so checking a preview never reads the file.
+    """
+    file_hash = document.get_content_hash()
+    if file_hash:
+        return file_hash
 
     if hasattr(document, "content"):
         payload = (document.content or "") + f"|{document.updated_at.isoformat()}"
@@ -239,64 +231,26 @@ def _render_text(text: str) -> PreviewArtifact:
 
 
 def _render_d2_diagram(document: D2Diagram) -> PreviewArtifact:
-    """Render D2 diagram to SVG using the d2 CLI."""
+    """Render D2 diagram to SVG using the d2 CLI (see documents.diagram_renderer)."""
     content = document.content or ""
     if not content.strip():
         return _render_text("(empty diagram)")
 
-    # Check if d2 CLI is available
-    d2_path = shutil.which("d2")
-    if not d2_path:
-        logger.warning("d2 CLI not found, falling back to text preview")
-        return _render_text(content)
-
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "diagram.d2"
-            output_path = Path(tmpdir) / "diagram.svg"
-
-            # Write D2 source to temp file
-            input_path.write_text(content, encoding="utf-8")
-
-            # Run d2 CLI to generate SVG
-            # --theme 200 = Dark Mauve (matches frontend default)
-            # --layout dagre = consistent with frontend
-            result = subprocess.run(
-                [
-                    d2_path,
-                    "--theme", "200",
-                    "--layout", "dagre",
-                    str(input_path),
-                    str(output_path),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                logger.warning(f"d2 CLI failed: {result.stderr}")
-                return _render_text(content)
-
-            if not output_path.exists():
-                logger.warning("d2 did not produce output file")
-                return _render_text(content)
-
-            svg_bytes = output_path.read_bytes()
-
-            return PreviewArtifact(
-                file_bytes=svg_bytes,
-                file_ext="svg",
-                metadata={"format": "svg", "source_lines": len(content.splitlines())},
-            )
-
-    except subprocess.TimeoutExpired:
-        logger.warning("d2 CLI timed out")
+        svg_bytes = get_diagram_renderer().render_d2(content)
+    except DiagramRenderError as exc:
+        logger.warning(f"D2 preview generation failed, falling back to text preview: {exc}")
         return _render_text(content)
     except Exception as exc:
         logger.warning(f"D2 preview generation failed: {exc}")
         return _render_text(content)
 
+    return PreviewArtifact(
+        file_bytes=svg_bytes,
+        file_ext="svg",
+        metadata={"format": "svg", "source_lines": len(content.splitlines())},
+    )
+
 
 def _render_mermaid_diagram(document: MermaidDiagram) -> PreviewArtifact:
     """Render Mermaid diagram preview as HTML for client-side rendering.
@@ -328,8 +282,9 @@ def _render_mermaid_diagram(document: MermaidDiagram) -> PreviewArtifact:
 def _render_excalidraw_diagram(document: ExcalidrawDiagram) -> PreviewArtifact:
     """Render Excalidraw diagram to SVG using Node.js export script.
 
-    Uses the @excalidraw/utils library via a Node.js script to generate
-    an SVG representation of the diagram.
+    Uses the @excalidraw/utils library via pooled Node.js workers (see
+    documents.diagram_renderer) to generate an SVG representation of the
+    diagram.
     """
     import json
 
@@ -346,71 +301,24 @@ def _render_excalidraw_diagram(document: ExcalidrawDiagram) -> PreviewArtifact:
     except json.JSONDecodeError:
         return _render_text(content[:SNIPPET_LENGTH])
 
-    # Find the export script - it's in packages/zoea-studio/scripts directory
-    # Path from zoea-core: parent.parent = packages/, then zoea-studio/scripts
-    packages_dir = Path(__file__).resolve().parent.parent.parent
-    script_path = packages_dir / "zoea-studio" / "scripts" / "export-excalidraw.mjs"
-
-    if not script_path.exists():
-        logger.warning(f"Excalidraw export script not found at {script_path}")
-        return _render_excalidraw_text_preview(data)
-
-    # Check if node is available
-    node_path = shutil.which("node")
-    if not node_path:
-        logger.warning("Node.js not found, falling back to text preview")
-        return _render_excalidraw_text_preview(data)
-
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_path = Path(tmpdir) / "diagram.json"
-            output_path = Path(tmpdir) / "diagram.svg"
-
-            # Write Excalidraw JSON to temp file
-            input_path.write_text(content, encoding="utf-8")
-
-            # Run Node.js export script
-            # Need to run from zoea-studio directory so node_modules is accessible
-            studio_dir = packages_dir / "zoea-studio"
-            result = subprocess.run(
-                [
-                    node_path,
-                    str(script_path),
-                    str(input_path),
-                    str(output_path),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=str(studio_dir),
-            )
-
-            if result.returncode != 0:
-                logger.warning(f"Excalidraw export failed: {result.stderr}")
-                return _render_excalidraw_text_preview(data)
-
-            if not output_path.exists():
-                logger.warning("Excalidraw export did not produce output file")
-                return _render_excalidraw_text_preview(data)
-
-            svg_bytes = output_path.read_bytes()
-
-            return PreviewArtifact(
-                file_bytes=svg_bytes,
-                file_ext="svg",
-                metadata={
-                    "format": "excalidraw",
-                    "element_count": len(elements),
-                },
-            )
-
-    except subprocess.TimeoutExpired:
-        logger.warning("Excalidraw export timed out")
+        svg_bytes = get_diagram_renderer().render_excalidraw(content)
+    except DiagramRenderError as exc:
+        logger.warning(f"Excalidraw preview generation failed, falling back to text preview: {exc}")
         return _render_excalidraw_text_preview(data)
     except Exception as exc:
         logger.warning(f"Excalidraw preview generation failed: {exc}")
         return _render_excalidraw_text_preview(data)
 
+    return PreviewArtifact(
+        file_bytes=svg_bytes,
+        file_ext="svg",
+        metadata={
+            "format": "excalidraw",
+            "element_count": len(elements),
+        },
+    )
+
 
 def _render_excalidraw_text_preview(data: dict) -> PreviewArtifact:
     """Generate a text-based preview for Excalidraw when SVG export fails."""
@@ -485,6 +393,251 @@ def serialize_preview(preview: Optional[DocumentPreview], request=None) -> dict[
 
 
 def get_preview_data(document: Document, *, request=None, force: bool = False) -> dict[str, Any] | None:
-    """Ensure a preview exists for the document and return serialized data."""
-    preview = ensure_preview(document, preview_kind="thumbnail", force=force)
-    return serialize_preview(preview, request=request)
+    """
+    Return serialized preview data for a document.
+
+    With PREVIEW_ASYNC enabled (the default) this never renders: missing or
+    outdated previews are queued and returned with status "pending". With it
+    disabled the preview is rendered inline as before.
+    """
+    if not getattr(settings, "PREVIEW_ASYNC", True):
+        preview = ensure_preview(document, preview_kind="thumbnail", force=force)
+        return serialize_preview(preview, request=request)
+
+    previews = request_previews([document], force=force)
+    return serialize_preview(previews.get(document.id), request=request)
+
+
+def get_cached_previews(
+    documents, *, preview_kind: str = "thumbnail"
+) -> dict[int, DocumentPreview]:
+    """
+    Bulk-read existing preview rows without hashing files or rendering.
+
+    Returns:
+        dict mapping document ID to its preview row (documents without one
+        are absent)
+    """
+    document_ids = [document.id for document in documents]
+    if not document_ids:
+        return {}
+    return {
+        preview.document_id: preview
+        for preview in DocumentPreview.objects.filter(
+            document_id__in=document_ids, preview_kind=preview_kind
+        )
+    }
+
+
+def get_list_preview_data(
+    documents, *, request=None, preview_kind: str = "thumbnail"
+) -> dict[int, dict[str, Any] | None]:
+    """
+    Serialized previews for a page of documents. See request_previews().
+
+    Returns:
+        dict mapping document ID to serialized preview data
+    """
+    previews = request_previews(documents, preview_kind=preview_kind)
+    return {
+        document.id: serialize_preview(previews.get(document.id), request=request)
+        for document in documents
+    }
+
+
+def request_previews(
+    documents,
+    *,
+    preview_kind: str = "thumbnail",
+    force: bool = False,
+    batch_size: int = 1,
+) -> dict[int, DocumentPreview]:
+    """
+    Return preview rows for documents, queuing any that need rendering.
+
+    Never reads document files or renders. Documents without a preview get a
+    PENDING row. Pending previews, previews older than their document and
+    (with ``force``) every preview are queued for generate_previews(), but
+    only if no render is already in flight for that (document, preview_kind),
+    so concurrent requests for the same preview queue it once. Renders that
+    were queued more than PREVIEW_REQUEST_TIMEOUT seconds ago are assumed
+    lost and may be queued again.
+
+    ``batch_size`` is passed to queue_preview_generation().
+
+    Returns:
+        dict mapping document ID to its preview row
+    """
+    documents = [document for document in documents if document.id]
+    if not documents:
+        return {}
+
+    previews = get_cached_previews(documents, preview_kind=preview_kind)
+
+    missing = [document for document in documents if document.id not in previews]
+    if missing:
+        DocumentPreview.objects.bulk_create(
+            [
+                DocumentPreview(
+                    document_id=document.id,
+                    organization_id=document.organization_id,
+                    project_id=document.project_id,
+                    preview_kind=preview_kind,
+                    status=DocumentPreview.Status.PENDING,
+                )
+                for document in missing
+            ],
+            ignore_conflicts=True,
+        )
+
+    wanted = [document.id for document in missing] + [
+        document.id
+        for document in documents
+        if document.id in previews and _needs_render(previews[document.id], document, force)
+    ]
+    claimed = _claim_renders(wanted, preview_kind=preview_kind, force=force)
+
+    if missing or claimed:
+        refresh = set(wanted)
+        previews.update(
+            get_cached_previews(
+                [document for document in documents if document.id in refresh],
+                preview_kind=preview_kind,
+            )
+        )
+
+    queue_preview_generation(claimed, preview_kind=preview_kind, force=force, batch_size=batch_size)
+    return previews
+
+
+def _needs_render(preview: DocumentPreview, document: Document, force: bool) -> bool:
+    if force:
+        return True
+    if preview.status in (DocumentPreview.Status.PENDING, DocumentPreview.Status.PROCESSING):
+        return True
+    return preview.updated_at < document.updated_at
+
+
+def _claim_renders(document_ids: list[int], *, preview_kind: str, force: bool = False) -> list[int]:
+    """
+    Mark previews as queued, returning the document IDs this caller claimed.
+
+    A preview can be claimed when it was never queued, its last render
+    request timed out, or its document changed after the request. Rows being
+    claimed by a concurrent request are skipped rather than waited on.
+    """
+    if not document_ids:
+        return []
+
+    from datetime import timedelta
+
+    from django.db import transaction
+    from django.db.models import F, Q
+
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=float(getattr(settings, "PREVIEW_REQUEST_TIMEOUT", 600)))
+    queryset = DocumentPreview.objects.filter(
+        document_id__in=document_ids, preview_kind=preview_kind
+    )
+    if not force:
+        queryset = queryset.filter(
+            Q(requested_at__isnull=True)
+            | Q(requested_at__lt=cutoff)
+            | Q(requested_at__lt=F("document__updated_at"))
+        )
+
+    with transaction.atomic():
+        claimed = list(
+            queryset.select_for_update(skip_locked=True, of=("self",)).values_list(
+                "id", "document_id"
+            )
+        )
+        if claimed:
+            DocumentPreview.objects.filter(id__in=[preview_id for preview_id, _ in claimed]).update(
+                requested_at=now
+            )
+    return [document_id for _, document_id in claimed]
+
+
+def generate_previews(
+    document_ids: list[int], preview_kind: str = "thumbnail", force: bool = False
+) -> int:
+    """
+    Render (or confirm) previews for a batch of documents.
+
+    Runs as a Django-Q2 task, on the PREVIEW_TASK_CLUSTER cluster when one is
+    configured. ensure_preview() skips documents whose content hash matches
+    the stored preview, so duplicate or late tasks are cheap.
+
+    Returns:
+        int: Number of previews that are ready
+    """
+    ready = 0
+    documents = Document.objects.filter(id__in=document_ids).select_subclasses()
+    for document in documents:
+        try:
+            preview = ensure_preview(document, preview_kind=preview_kind, force=force)
+        except Exception as exc:  # noqa: BLE001 - keep rendering the rest of the batch
+            logger.warning("Preview generation failed for document %s: %s", document.id, exc)
+            continue
+
+        if preview.status == DocumentPreview.Status.READY:
+            ready += 1
+            if preview.updated_at < document.updated_at:
+                # Content unchanged since the last render; record that it was checked
+                preview.save(update_fields=["updated_at"])
+    return ready
+
+
+def generate_preview(document_id: int, preview_kind: str = "thumbnail") -> bool:
+    """Render (or confirm) a single document's preview. See generate_previews()."""
+    return generate_previews([document_id], preview_kind) == 1
+
+
+def queue_preview_generation(
+    document_ids,
+    *,
+    preview_kind: str = "thumbnail",
+    force: bool = False,
+    batch_size: int = 1,
+) -> None:
+    """
+    Queue generate_previews() once the transaction commits.
+
+    Args:
+        document_ids: Documents to render
+        preview_kind: Preview kind to render
+        force: Re-render even if the content hash is unchanged
+        batch_size: Documents per task. Interactive requests use 1 so the
+            worker pool renders them in parallel; bulk warming uses larger
+            batches to cut task overhead.
+    """
+    document_ids = list(document_ids)
+    if not document_ids:
+        return
+
+    from django.db import transaction
+
+    cluster = getattr(settings, "PREVIEW_TASK_CLUSTER", None)
+    batches = [
+        document_ids[start:start + batch_size] for start in range(0, len(document_ids), batch_size)
+    ]
+
+    def _enqueue():
+        from django_q.tasks import async_task
+
+        options = {"cluster": cluster} if cluster else {}
+        for batch in batches:
+            try:
+                async_task(
+                    "documents.preview_service.generate_previews",
+                    batch,
+                    preview_kind,
+                    force,
+                    task_name=f"preview_{preview_kind}_{batch[0]}",
+                    **options,
+                )
+            except Exception as exc:  # noqa: BLE001 - the claim expires and is retried
+                logger.warning("Failed to queue previews for documents %s: %s", batch, exc)
+
+    transaction.on_commit(_enqueue)
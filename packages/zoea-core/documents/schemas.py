@@ -154,6 +154,10 @@ class FileSearchRequest(BaseModel):
         None,
         description="Backend-specific filter payload (e.g., Chroma where clause).",
     )
+    mode: str | None = Field(
+        None,
+        description="Ranking mode: vector, lexical or hybrid (backend default when omitted).",
+    )
 
 
 class FileSearchSource(BaseModel):
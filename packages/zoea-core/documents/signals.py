@@ -1,5 +1,8 @@
 """
 Signals for document indexing into the file search store.
+
+Indexing is queued via file_search.queue so saves coalesce and the request
+thread never waits on text extraction or embedding.
 """
 
 from django.db import transaction
@@ -15,13 +18,33 @@ def index_document_on_save(sender, instance: Document, **kwargs) -> None:
         return
 
     def _index():
-        from file_search.indexing import index_document
+        from file_search.queue import enqueue_document_index
 
-        index_document(instance)
+        enqueue_document_index(instance)
 
     transaction.on_commit(_index)
 
 
+def document_event_data(instance: Document) -> dict:
+    """Build the DOCUMENT_CREATED / DOCUMENT_UPDATED payload for a document."""
+    event_data = {
+        "document_id": instance.id,
+        "document_type": instance.__class__.__name__,
+        "name": instance.name,
+        "description": getattr(instance, "description", ""),
+        "created_at": instance.created_at.isoformat() if instance.created_at else None,
+        "project_id": instance.project_id,
+        "folder_id": getattr(instance, "folder_id", None),
+    }
+
+    # Add content preview for text documents
+    if hasattr(instance, "content"):
+        content = instance.content or ""
+        event_data["content_preview"] = content[:1000] if len(content) > 1000 else content
+
+    return event_data
+
+
 @receiver(post_save, sender=Document)
 def dispatch_document_event(sender, instance: Document, created: bool, **kwargs) -> None:
     """Dispatch DOCUMENT_CREATED or DOCUMENT_UPDATED event for configured triggers."""
@@ -35,27 +58,11 @@ def dispatch_document_event(sender, instance: Document, created: bool, **kwargs)
 
             event_type = EventType.DOCUMENT_CREATED if created else EventType.DOCUMENT_UPDATED
 
-            # Build event data from document
-            event_data = {
-                "document_id": instance.id,
-                "document_type": instance.__class__.__name__,
-                "name": instance.name,
-                "description": getattr(instance, "description", ""),
-                "created_at": instance.created_at.isoformat() if instance.created_at else None,
-                "project_id": instance.project_id,
-                "folder_id": getattr(instance, "folder_id", None),
-            }
-
-            # Add content preview for text documents
-            if hasattr(instance, "content"):
-                content = instance.content or ""
-                event_data["content_preview"] = content[:1000] if len(content) > 1000 else content
-
             dispatch_event(
                 event_type=event_type,
                 source_type="document",
                 source_id=instance.id,
-                event_data=event_data,
+                event_data=document_event_data(instance),
                 organization=instance.organization,
                 project=instance.project,
             )
@@ -74,9 +81,9 @@ def dispatch_document_event(sender, instance: Document, created: bool, **kwargs)
 @receiver(post_delete, sender=Document)
 def remove_document_on_delete(sender, instance: Document, **kwargs) -> None:
     def _remove():
-        from file_search.indexing import remove_document
+        from file_search.queue import enqueue_document_removal
 
-        remove_document(instance)
+        enqueue_document_removal(instance)
 
     transaction.on_commit(_remove)
 
@@ -91,11 +98,11 @@ def reindex_document_on_collection_save(sender, instance: DocumentCollectionItem
         return
 
     def _reindex():
-        from file_search.indexing import index_document
+        from file_search.queue import enqueue_document_index
 
         document = model_cls.objects.filter(id=instance.object_id).first()
         if document:
-            index_document(document)
+            enqueue_document_index(document)
 
     transaction.on_commit(_reindex)
 
@@ -110,10 +117,10 @@ def reindex_document_on_collection_delete(sender, instance: DocumentCollectionIt
         return
 
     def _reindex():
-        from file_search.indexing import index_document
+        from file_search.queue import enqueue_document_index
 
         document = model_cls.objects.filter(id=instance.object_id).first()
         if document:
-            index_document(document)
+            enqueue_document_index(document)
 
     transaction.on_commit(_reindex)
@@ -623,6 +623,187 @@ def test_list_documents_filtered_by_folder(client, organization, user):
     assert data["documents"][0]["id"] == doc.id
 
 
+@pytest.mark.django_db
+def test_list_documents_bulk_loads_folders_and_previews(client, organization, user, monkeypatch):
+    """Listing never renders previews and its query count does not grow with the page."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from documents import preview_service
+    from documents.models import DocumentPreview
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("list view must not render previews")
+
+    queued = []
+    monkeypatch.setattr(preview_service, "render_preview", fail_render)
+    monkeypatch.setattr(preview_service, "compute_content_hash", fail_render)
+    monkeypatch.setattr(
+        preview_service,
+        "queue_preview_generation",
+        lambda ids, **kwargs: queued.extend(ids),
+    )
+
+    project = Project.objects.create(
+        organization=organization,
+        name="List Project",
+        working_directory="/tmp/list",
+        created_by=user,
+    )
+    parent = Folder.objects.create(name="Parent", project=project, organization=organization)
+    child = Folder.objects.create(
+        name="Child", parent=parent, project=project, organization=organization
+    )
+
+    def make_docs(count):
+        return [
+            Markdown.objects.create(
+                organization=organization,
+                project=project,
+                name=f"Doc {i}",
+                content="Body",
+                created_by=user,
+                folder=child if i % 2 else parent,
+            )
+            for i in range(count)
+        ]
+
+    client.force_login(user)
+    docs = make_docs(2)
+    client.get("/api/documents")  # warm session/auth queries
+    DocumentPreview.objects.all().delete()
+    with CaptureQueriesContext(connection) as small:
+        resp = client.get("/api/documents")
+    make_docs(6)
+    DocumentPreview.objects.all().delete()
+    with CaptureQueriesContext(connection) as large:
+        resp = client.get("/api/documents")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 8
+    paths = {doc["id"]: doc["folder_path"] for doc in data["documents"]}
+    assert paths[docs[0].id] == "Parent"
+    assert paths[docs[1].id] == "Parent/Child"
+    assert {doc["preview"]["status"] for doc in data["documents"]} == {"pending"}
+    assert len(large.captured_queries) == len(small.captured_queries)
+    assert len(queued) == 2 + 2 + 8
+
+
+@pytest.mark.django_db
+def test_list_documents_page_past_end_reports_total(client, organization, user):
+    Markdown.objects.create(organization=organization, name="Only", content="Body", created_by=user)
+
+    client.force_login(user)
+    resp = client.get("/api/documents?page=5&include_previews=false")
+
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 1
+    assert resp.json()["documents"] == []
+
+
+@pytest.mark.django_db
+def test_preview_requests_are_queued_once(organization, user, monkeypatch, settings):
+    """Previews come back pending and concurrent requests queue one render."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from documents import preview_service
+    from documents.models import DocumentPreview
+
+    settings.PREVIEW_ASYNC = True
+    queued = []
+    monkeypatch.setattr(
+        preview_service, "render_preview", lambda *a, **k: pytest.fail("rendered inline")
+    )
+    monkeypatch.setattr(
+        preview_service,
+        "queue_preview_generation",
+        lambda ids, **kwargs: queued.extend(ids),
+    )
+    doc = Markdown.objects.create(
+        organization=organization, name="Doc", content="Body", created_by=user
+    )
+
+    first = preview_service.get_preview_data(doc)
+    second = preview_service.get_preview_data(doc)
+
+    assert first["status"] == second["status"] == DocumentPreview.Status.PENDING
+    assert queued == [doc.id]
+
+    # A lost render is retried once its claim expires
+    DocumentPreview.objects.filter(document=doc).update(
+        requested_at=timezone.now() - timedelta(seconds=settings.PREVIEW_REQUEST_TIMEOUT + 1)
+    )
+    preview_service.get_preview_data(doc)
+    assert queued == [doc.id, doc.id]
+
+
+@pytest.mark.django_db
+def test_generate_previews_renders_queued_documents(organization, user, settings):
+    from documents import preview_service
+    from documents.models import DocumentPreview
+
+    settings.PREVIEW_ASYNC = True
+    doc = Markdown.objects.create(
+        organization=organization, name="Doc", content="Body", created_by=user
+    )
+    preview_service.request_previews([doc])
+
+    assert preview_service.generate_previews([doc.id]) == 1
+
+    preview = DocumentPreview.objects.get(document=doc)
+    assert preview.status == DocumentPreview.Status.READY
+    assert preview_service.get_preview_data(doc)["status"] == DocumentPreview.Status.READY
+
+
+@pytest.mark.django_db
+def test_warm_previews_command_queues_project_documents(organization, user, monkeypatch):
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    from documents import preview_service
+    from documents.models import DocumentPreview
+
+    batches = []
+    monkeypatch.setattr(
+        preview_service,
+        "queue_preview_generation",
+        lambda ids, **kwargs: batches.append((list(ids), kwargs["batch_size"])),
+    )
+    project = Project.objects.create(
+        organization=organization,
+        name="Warm Project",
+        working_directory="/tmp/warm",
+        created_by=user,
+    )
+    docs = [
+        Markdown.objects.create(
+            organization=organization,
+            project=project,
+            name=f"Doc {i}",
+            content="Body",
+            created_by=user,
+        )
+        for i in range(3)
+    ]
+
+    out = StringIO()
+    call_command("warm_previews", project=str(project.id), batch_size=2, stdout=out)
+    call_command("warm_previews", project=project.name, stdout=out)
+
+    assert batches == [([doc.id for doc in docs], 2), ([], 10)]
+    assert "Queued 3 of 3" in out.getvalue()
+    assert "Queued 0 of 3" in out.getvalue()
+
+    call_command("warm_previews", project=project.name, inline=True, stdout=out)
+    assert DocumentPreview.objects.filter(
+        document__in=docs, status=DocumentPreview.Status.READY
+    ).count() == 3
+
+
 @pytest.mark.django_db
 def test_move_document_between_folders(client, organization, user):
     project = Project.objects.create(
@@ -773,6 +954,7 @@ def test_file_search_returns_sources(client, organization, user, settings):
         query="What is this project about?",
         max_results=5,
         filters=None,
+        mode=None,
     )
 
 
@@ -0,0 +1,118 @@
+"""
+Tests for pooled, cached diagram rendering.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from documents.diagram_renderer import DiagramRenderer, DiagramRenderError, WorkerPool
+
+# Minimal line-protocol worker: echoes the input back as the "svg", reports
+# its PID, and fails requests whose input is {"fail": true}.
+ECHO_WORKER = r"""
+import json, os, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["input"].get("fail"):
+        response = {"id": request["id"], "error": "bad diagram"}
+    elif request["input"].get("hang"):
+        continue
+    else:
+        response = {"id": request["id"], "svg": json.dumps(request["input"]), "pid": os.getpid()}
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+"""
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool([sys.executable, "-c", ECHO_WORKER], max_requests=3)
+    yield pool
+    pool.close()
+
+
+def test_worker_pool_reuses_worker_until_recycled(pool):
+    pids = [pool.request({"input": {"n": n}}, timeout=10)["pid"] for n in range(4)]
+
+    assert pids[0] == pids[1] == pids[2]
+    assert pids[3] != pids[0]
+
+
+def test_worker_pool_replaces_worker_after_timeout(pool):
+    first = pool.request({"input": {}}, timeout=10)["pid"]
+
+    with pytest.raises(DiagramRenderError, match="timed out"):
+        pool.request({"input": {"hang": True}}, timeout=0.2)
+    assert len(pool) == 0
+
+    assert pool.request({"input": {}}, timeout=10)["pid"] != first
+
+
+def test_worker_pool_returns_render_errors(pool):
+    assert pool.request({"input": {"fail": True}}, timeout=10)["error"] == "bad diagram"
+
+
+def test_render_caches_by_source_theme_and_layout():
+    renderer = DiagramRenderer(max_workers=1, cache_size=8)
+    calls = []
+
+    def render():
+        calls.append(1)
+        return b"<svg/>"
+
+    assert renderer.render("d2", "a -> b", render, theme="200") == b"<svg/>"
+    assert renderer.render("d2", "a -> b", render, theme="200") == b"<svg/>"
+    renderer.render("d2", "a -> b", render, theme="300")
+    renderer.render("d2", "a -> c", render, theme="200")
+
+    stats = renderer.stats()["d2"]
+    assert len(calls) == 3
+    assert (stats.requests, stats.cache_hits, stats.renders) == (4, 1, 3)
+
+
+def test_render_failures_are_counted_and_not_cached():
+    renderer = DiagramRenderer(max_workers=1)
+
+    def fail():
+        raise DiagramRenderError("boom")
+
+    for _ in range(2):
+        with pytest.raises(DiagramRenderError):
+            renderer.render("excalidraw", "{}", fail)
+
+    assert renderer.stats()["excalidraw"].failures == 2
+    assert renderer.render("excalidraw", "{}", lambda: b"<svg/>") == b"<svg/>"
+
+
+def test_render_limits_concurrency_and_records_queue_wait():
+    renderer = DiagramRenderer(max_workers=2, cache_size=0)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def render():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return b"<svg/>"
+
+    threads = [
+        threading.Thread(target=renderer.render, args=("d2", f"n{n}", render)) for n in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = renderer.stats()["d2"]
+    assert peak == 2
+    assert stats.renders == 6
+    assert stats.max_queue_wait_seconds > 0
+    assert stats.avg_render_seconds >= 0.05
@@ -0,0 +1,77 @@
+"""
+Tests for bulk folder tree materialization.
+"""
+
+from pathlib import PurePosixPath
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account
+from documents.folder_tree import materialize_folders
+from documents.models import Folder
+from projects.models import Project
+
+User = get_user_model()
+
+
+@pytest.fixture
+def project(db):
+    organization = Account.objects.create(name="Tree Org")
+    user = User.objects.create_user(username="tree", password="testpass123")
+    return Project.objects.create(organization=organization, name="Tree Project", created_by=user)
+
+
+def _tree(folder):
+    return sorted(child.get_path() for child in folder.get_descendants(include_self=True))
+
+
+@pytest.mark.django_db
+def test_materializes_nested_paths_with_valid_tree(project):
+    folders = materialize_folders(project, ["docs/api/v1", "docs/guides", "images"])
+
+    assert set(folders) == {
+        PurePosixPath("."),
+        PurePosixPath("docs"),
+        PurePosixPath("docs/api"),
+        PurePosixPath("docs/api/v1"),
+        PurePosixPath("docs/guides"),
+        PurePosixPath("images"),
+    }
+    assert folders[PurePosixPath(".")] is None
+    docs = Folder.objects.get(name="docs")
+    assert _tree(docs) == ["docs", "docs/api", "docs/api/v1", "docs/guides"]
+    assert folders[PurePosixPath("docs/api/v1")].get_path() == "docs/api/v1"
+    assert folders[PurePosixPath("docs/api/v1")].organization_id == project.organization_id
+
+
+@pytest.mark.django_db
+def test_reuses_existing_folders_and_keeps_other_trees_valid(project):
+    existing = Folder.objects.create(project=project, name="m")
+    Folder.objects.create(project=project, parent=existing, name="old")
+    zulu = Folder.objects.create(project=project, name="z")
+
+    folders = materialize_folders(project, ["a/x", "m/new", "z"])
+
+    assert folders[PurePosixPath("m")].pk == existing.pk
+    assert folders[PurePosixPath("z")].pk == zulu.pk
+    assert _tree(Folder.objects.get(pk=existing.pk)) == ["m", "m/new", "m/old"]
+    assert _tree(Folder.objects.get(name="a")) == ["a", "a/x"]
+    assert Folder.objects.get(pk=zulu.pk).get_descendant_count() == 0
+
+    assert materialize_folders(project, ["a/x", "m/new"])[PurePosixPath("a/x")] == folders[PurePosixPath("a/x")]
+    assert Folder.objects.filter(project=project).count() == 6
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_grow_with_siblings(project):
+    root = Folder.objects.create(project=project, name="root")
+
+    with CaptureQueriesContext(connection) as queries:
+        folders = materialize_folders(project, [f"dir-{i}/sub" for i in range(50)], parent=root)
+
+    assert len(folders) == 101
+    assert root.get_descendant_count() == 100
+    assert len(queries) < 20
@@ -20,7 +20,7 @@ from projects.models import Project
 @pytest.fixture
 def mock_genai_client():
     """Mock genai.Client for testing."""
-    with patch("file_search.backends.gemini.genai.Client") as mock_client:
+    with patch("google.genai.Client") as mock_client:
         yield mock_client
 
 
@@ -245,7 +245,7 @@ class TestGeminiFileSearchService:
         )
         gemini_service.client.operations.get.return_value = mock_operation_complete
 
-        with patch("file_search.backends.gemini.time.sleep"):  # Skip actual sleep
+        with patch("file_search.backends.gemini_uploads.time.sleep"):  # Skip actual sleep
             result = gemini_service.upload_document(markdown_document, store_id)
 
         # Verify operations.get was called to check completion
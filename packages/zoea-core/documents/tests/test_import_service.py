@@ -2,7 +2,11 @@
 Tests for document import service.
 """
 
+import hashlib
+import io
+import tarfile
 import zipfile
+from unittest.mock import patch
 
 import pytest
 from django.contrib.auth import get_user_model
@@ -10,7 +14,7 @@ from organizations.models import OrganizationUser
 
 from accounts.models import Account
 from documents.import_service import DocumentImportService, ImportLimitError
-from documents.models import Document, Folder, PDF
+from documents.models import CSV, D2Diagram, Document, Folder, Markdown, PDF
 from projects.models import Project
 
 
@@ -124,3 +128,167 @@ def test_import_directory_enforces_file_size_limit(tmp_path, organization, proje
 
     with pytest.raises(ImportLimitError):
         service.import_directory(str(root))
+
+
+@pytest.mark.django_db
+def test_import_overwrite_skips_unchanged_files(tmp_path, organization, project, user, settings):
+    settings.ZOEA_IMPORT_ALLOWED_ROOTS = [str(tmp_path)]
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+
+    root = tmp_path / "import-root"
+    root.mkdir()
+    (root / "report.pdf").write_bytes(b"%PDF-1.4\n%EOF\n")
+    (root / "notes.pdf").write_bytes(b"%PDF-1.4\n%v1\n%EOF\n")
+
+    def run_import():
+        return DocumentImportService(
+            organization=organization,
+            project=project,
+            created_by=user,
+            on_conflict="overwrite",
+        ).import_directory(str(root))
+
+    assert run_import().created == 2
+    original = PDF.objects.get(name="report")
+
+    (root / "notes.pdf").write_bytes(b"%PDF-1.4\n%v2\n%EOF\n")
+    summary = run_import()
+
+    assert summary.skipped == 1
+    assert summary.updated == 1
+    assert PDF.objects.get(name="report").pk == original.pk
+
+
+@pytest.mark.django_db
+def test_import_archive_dispatches_events_as_one_batch(
+    tmp_path, organization, project, user, settings, django_capture_on_commit_callbacks
+):
+    settings.ZOEA_IMPORT_ALLOWED_ROOTS = [str(tmp_path)]
+
+    archive_path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for i in range(3):
+            archive.writestr(f"root/note-{i}.md", f"# Note {i}")
+
+    service = DocumentImportService(organization=organization, project=project, created_by=user)
+
+    with (
+        patch("events.dispatcher.dispatch_event") as dispatch_event,
+        patch("events.dispatcher.dispatch_events") as dispatch_events,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        service.import_archive(archive_path)
+
+    dispatch_event.assert_not_called()
+    dispatch_events.assert_called_once()
+    events = list(dispatch_events.call_args.args[0])
+    assert sorted(event.event_data["name"] for event in events) == ["note-0", "note-1", "note-2"]
+    assert {event.event_type for event in events} == {"document_created"}
+
+
+
+@pytest.mark.django_db
+def test_import_tar_bulk_creates_text_documents_and_reports_progress(
+    tmp_path, organization, project, user, settings
+):
+    settings.ZOEA_IMPORT_ALLOWED_ROOTS = [str(tmp_path)]
+    settings.ZOEA_IMPORT_BULK_SIZE = 2
+
+    archive_path = tmp_path / "bundle.tar.gz"
+    files = {
+        "root/readme.md": b"# Hello",
+        "root/data/table.csv": b"a,b\n1,2",
+        "root/flow.d2": b"a -> b",
+        "root/readme.markdown": b"# Replaced",
+    }
+    with tarfile.open(archive_path, "w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    progress = []
+    service = DocumentImportService(
+        organization=organization,
+        project=project,
+        created_by=user,
+        on_conflict="overwrite",
+        progress_callback=lambda update: progress.append((update.processed, update.total, update.path)),
+    )
+
+    summary = service.import_archive(archive_path)
+
+    # readme.markdown replaces readme.md, inserted with the first batch of two
+    assert (summary.created, summary.updated) == (3, 1)
+    assert Markdown.objects.get(name="readme").content == "# Replaced"
+    assert CSV.objects.get(name="table").folder.name == "data"
+    diagram = D2Diagram.objects.get(name="flow")
+    assert diagram.diagram_type == "d2"
+    assert diagram.organization_id == organization.id
+    assert Document.objects.filter(project=project).count() == 3
+    assert progress == [
+        (1, 4, "readme.md"),
+        (2, 4, "data/table.csv"),
+        (3, 4, "flow.d2"),
+        (4, 4, "readme.markdown"),
+    ]
+
+
+@pytest.mark.django_db
+def test_import_spools_large_files_to_disk(tmp_path, organization, project, user, settings):
+    settings.ZOEA_IMPORT_ALLOWED_ROOTS = [str(tmp_path)]
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.ZOEA_IMPORT_SPOOL_MAX_BYTES = 16
+
+    data = b"%PDF-1.4\n" + b"%" * 4096 + b"\n%EOF\n"
+    archive_path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("report.pdf", data)
+
+    service = DocumentImportService(organization=organization, project=project, created_by=user)
+
+    with patch("documents.text_cache.hash_file") as hash_file:
+        assert service.import_archive(archive_path).created == 1
+
+    # Hashed while spooling, not read back on save
+    hash_file.assert_not_called()
+    pdf = PDF.objects.get(name="report")
+    assert pdf.content_hash == hashlib.sha256(data).hexdigest()
+    assert pdf.file_size == len(data)
+    with pdf.pdf_file.open("rb") as stored:
+        assert stored.read() == data
+
+
+@pytest.mark.django_db
+def test_failed_bulk_insert_falls_back_to_per_file_saves(
+    tmp_path, organization, project, user, settings
+):
+    settings.ZOEA_IMPORT_ALLOWED_ROOTS = [str(tmp_path)]
+
+    root = tmp_path / "import-root"
+    root.mkdir()
+    (root / "one.md").write_text("# One")
+    (root / "two.md").write_text("# Two")
+    (root / "table.csv").write_text("a,b\n1,2")
+
+    service = DocumentImportService(organization=organization, project=project, created_by=user)
+
+    def failing_save(self, *args, **kwargs):
+        raise RuntimeError("bad row")
+
+    with (
+        patch("documents.import_service._insert_table_rows", side_effect=RuntimeError("batch")),
+        patch.object(CSV, "save", failing_save),
+    ):
+        summary = service.import_directory(str(root))
+
+    assert (summary.created, summary.failed) == (2, 1)
+    assert [(issue.path, issue.reason) for issue in summary.issues] == [
+        ("table.csv", "create_failed")
+    ]
+    # The rolled-back batch left no orphan Document rows behind
+    assert sorted(Document.objects.filter(project=project).values_list("name", flat=True)) == [
+        "one",
+        "two",
+    ]
+    assert Markdown.objects.filter(project=project).count() == 2
@@ -0,0 +1,80 @@
+"""
+Tests for page-by-page PDF text extraction.
+"""
+
+import io
+
+import fitz
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from documents.pdf_text import (
+    PDFPage,
+    count_pdf_pages,
+    iter_pdf_pages,
+    join_pages,
+    pages_to_text,
+    split_pages,
+)
+
+
+@pytest.fixture
+def pdf_bytes():
+    with fitz.open() as doc:
+        for number in range(1, 4):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {number} text")
+        return doc.tobytes()
+
+
+def _texts(pages):
+    return [(page.number, page.text.strip()) for page in pages]
+
+
+def test_iter_pages_from_path(tmp_path, pdf_bytes):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(pdf_bytes)
+
+    assert _texts(iter_pdf_pages(path)) == [(1, "Page 1 text"), (2, "Page 2 text"), (3, "Page 3 text")]
+    assert count_pdf_pages(str(path)) == 3
+
+
+def test_iter_pages_from_file_handle(tmp_path, pdf_bytes):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(pdf_bytes)
+
+    with path.open("rb") as handle:
+        pages = _texts(iter_pdf_pages(handle))
+
+    assert pages[-1] == (3, "Page 3 text")
+
+
+def test_iter_pages_from_in_memory_upload(pdf_bytes):
+    upload = SimpleUploadedFile("report.pdf", pdf_bytes, content_type="application/pdf")
+
+    assert count_pdf_pages(upload) == 3
+    # The upload is rewound so Django can still save it
+    assert upload.read() == pdf_bytes
+
+
+def test_iter_pages_is_lazy(pdf_bytes):
+    pages = iter_pdf_pages(io.BytesIO(pdf_bytes))
+
+    assert next(pages).number == 1
+    pages.close()
+
+
+def test_join_and_split_round_trip():
+    pages = [PDFPage(1, "first"), PDFPage(2, ""), PDFPage(3, "third\fpage")]
+
+    restored = list(split_pages(join_pages(pages)))
+
+    assert restored == [PDFPage(1, "first"), PDFPage(2, ""), PDFPage(3, "third\npage")]
+
+
+def test_pages_to_text_offsets():
+    text, offsets = pages_to_text([PDFPage(1, "one"), PDFPage(2, "two"), PDFPage(3, "three")])
+
+    assert text == "one\n\ntwo\n\nthree"
+    assert offsets == [0, 5, 10]
+    assert [text[offset:].split("\n\n")[0] for offset in offsets] == ["one", "two", "three"]
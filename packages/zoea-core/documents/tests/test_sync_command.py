@@ -11,6 +11,7 @@ from django.core.management.base import CommandError
 from organizations.models import Organization
 
 from documents.models import Markdown
+from file_search.indexing import IndexingStats
 from projects.models import Project
 
 
@@ -58,7 +59,7 @@ def mock_file_search():
     with (
         patch('documents.management.commands.sync_gemini_file_search.FileSearchRegistry') as registry_cls,
         patch('documents.management.commands.sync_gemini_file_search.ensure_project_store') as ensure_store,
-        patch('documents.management.commands.sync_gemini_file_search.index_document') as index_document,
+        patch('documents.management.commands.sync_gemini_file_search.index_documents') as index_documents,
     ):
         store_instance = Mock()
         registry_cls.get.return_value = store_instance
@@ -66,7 +67,8 @@ def mock_file_search():
         store_info.store_id = 'fileSearchStores/test-store'
         store_info.display_name = 'Test Store'
         ensure_store.return_value = store_info
-        yield store_instance, ensure_store, index_document
+        index_documents.return_value = IndexingStats(indexed=1)
+        yield store_instance, ensure_store, index_documents
 
 
 @pytest.mark.django_db
@@ -170,7 +172,25 @@ class TestSyncGeminiFileSearchCommand:
 
         # Verify indexer was called despite document already being synced
         _, _, index_document = mock_file_search
-        index_document.assert_called_once_with(markdown_document, force=True)
+        index_document.assert_called_once_with([markdown_document], force=True, batch_size=64)
+
+    def test_batch_size(self, project, markdown_document, mock_file_search):
+        """Test documents are indexed in batches of --batch-size."""
+        Markdown.objects.create(
+            organization=project.organization,
+            project=project,
+            name="Second Document",
+            content="# Second",
+            created_by=markdown_document.created_by,
+        )
+        out = StringIO()
+
+        call_command('sync_gemini_file_search', '--project', 'Test Project', '--batch-size', '1', stdout=out)
+
+        _, _, index_documents = mock_file_search
+        assert index_documents.call_count == 2
+        assert all(len(call.args[0]) == 1 for call in index_documents.call_args_list)
+        assert 'Synced: 2' in out.getvalue()
 
     def test_delete_store(self, project, mock_file_search):
         """Test deleting File Search store."""
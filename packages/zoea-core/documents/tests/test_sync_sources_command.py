@@ -232,3 +232,80 @@ class TestSyncSourcesCommand:
         assert 'Skipped' in output or 'unchanged' in output.lower()
         # Count should remain the same
         assert Document.objects.count() == initial_count
+
+    def test_resync_reads_only_changed_files(self, source, temp_dir):
+        """Test that the manifest limits re-reads to files whose stat changed."""
+        import os
+
+        from documents.models import Markdown
+        from sources.local import LocalFileSystemSource
+        from sources.models import SourceFile
+
+        call_command('sync_sources', '--source', 'Test Source', stdout=StringIO())
+        assert SourceFile.objects.filter(source=source).count() == 3
+
+        md_path = Path(temp_dir) / "test.md"
+        csv_path = Path(temp_dir) / "test.csv"
+        md_path.write_text("# Changed Content")
+        stat = csv_path.stat()
+        os.utime(csv_path, (stat.st_atime, stat.st_mtime + 10))  # touched, same content
+
+        reads = []
+        original_read = LocalFileSystemSource.read_document
+
+        def tracking_read(self, path):
+            reads.append(Path(path).name)
+            return original_read(self, path)
+
+        with patch.object(LocalFileSystemSource, 'read_document', tracking_read):
+            out = StringIO()
+            call_command('sync_sources', '--source', 'Test Source', stdout=out)
+
+        assert sorted(reads) == ['test.csv', 'test.md']
+        assert 'Updated: 1' in out.getvalue()
+        assert 'Skipped: 2' in out.getvalue()
+        assert Markdown.objects.get(name='test.md').content == "# Changed Content"
+        entry = SourceFile.objects.get(source=source, path=str(csv_path))
+        assert entry.mtime == csv_path.stat().st_mtime
+
+    def test_delete_missing_removes_documents_for_deleted_files(self, source, temp_dir):
+        """Test that files missing from the source delete their documents."""
+        from documents.models import Document
+        from sources.models import SourceFile
+
+        call_command('sync_sources', '--source', 'Test Source', stdout=StringIO())
+        (Path(temp_dir) / "test.d2").unlink()
+
+        out = StringIO()
+        call_command('sync_sources', '--source', 'Test Source', '--delete-missing', stdout=out)
+
+        assert 'Deleted: 1' in out.getvalue()
+        assert not Document.objects.filter(name='test.d2').exists()
+        assert Document.objects.filter(project=source.project).count() == 2
+        assert SourceFile.objects.filter(source=source).count() == 2
+
+    def test_sync_recreates_document_deleted_in_app(self, source):
+        """Test that a manifest entry whose document was deleted is re-imported."""
+        from documents.models import Document
+
+        call_command('sync_sources', '--source', 'Test Source', stdout=StringIO())
+        Document.objects.filter(name='test.md').delete()
+
+        out = StringIO()
+        call_command('sync_sources', '--source', 'Test Source', stdout=out)
+
+        assert 'Created: 1' in out.getvalue()
+        assert Document.objects.filter(name='test.md').exists()
+
+    def test_sync_mirrors_source_directories_as_folders(self, source, temp_dir):
+        """Test that documents in subdirectories land in matching folders."""
+        from documents.models import Document
+
+        nested = Path(temp_dir) / 'guides' / 'setup'
+        nested.mkdir(parents=True)
+        (nested / 'install.md').write_text('# Install')
+
+        call_command('sync_sources', '--source', 'Test Source', stdout=StringIO())
+
+        assert Document.objects.get(name='install.md').folder.get_path() == 'guides/setup'
+        assert Document.objects.get(name='test.md').folder is None
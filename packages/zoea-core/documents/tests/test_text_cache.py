@@ -0,0 +1,210 @@
+"""
+Tests for the extracted-text cache.
+"""
+
+import os
+from unittest.mock import patch
+
+import fitz
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from organizations.models import OrganizationUser
+
+from accounts.models import Account
+from documents.models import PDF
+from documents.text_cache import ExtractedTextCache, get_text_cache
+from projects.models import Project
+
+
+User = get_user_model()
+
+
+@pytest.fixture
+def text_cache_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.EXTRACTED_TEXT_CACHE_DIR = tmp_path / "extracted_text"
+    settings.EXTRACTED_TEXT_CACHE_MAX_BYTES = 1024 * 1024
+    return settings
+
+
+@pytest.fixture
+def organization():
+    return Account.objects.create(name="Text Cache Org")
+
+
+@pytest.fixture
+def user(organization):
+    user = User.objects.create_user(
+        username="extractor",
+        email="extractor@example.com",
+        password="testpass123",
+    )
+    OrganizationUser.objects.create(organization=organization, user=user)
+    return user
+
+
+@pytest.fixture
+def project(organization, user):
+    return Project.objects.create(
+        organization=organization,
+        name="Text Cache Project",
+        created_by=user,
+    )
+
+
+def _pdf_bytes(text: str) -> bytes:
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+        return doc.tobytes()
+
+
+def _make_pdf(organization, project, user, data: bytes, name: str = "report.pdf") -> PDF:
+    pdf = PDF(
+        organization=organization,
+        project=project,
+        name=name,
+        pdf_file=ContentFile(data, name=name),
+        created_by=user,
+    )
+    pdf._skip_file_search = True
+    pdf.save()
+    return pdf
+
+
+def test_cache_round_trip(tmp_path):
+    cache = ExtractedTextCache(tmp_path, max_bytes=1024)
+
+    assert cache.get("pdf", "ab" * 32) is None
+    cache.set("pdf", "ab" * 32, "hello")
+
+    assert cache.get("pdf", "ab" * 32) == "hello"
+    assert cache.get("docx", "ab" * 32) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractedTextCache(tmp_path, max_bytes=250)
+    keys = ["a" * 64, "b" * 64, "c" * 64]
+    for index, key in enumerate(keys[:2]):
+        cache.set("pdf", key, "x" * 100)
+        os.utime(cache._path("pdf", key), (1000 + index, 1000 + index))
+
+    # Reading "a" makes "b" the least recently used entry.
+    assert cache.get("pdf", keys[0]) is not None
+    cache.set("pdf", keys[2], "x" * 100)
+
+    assert cache.get("pdf", keys[1]) is None
+    assert cache.get("pdf", keys[0]) is not None
+    assert cache.get("pdf", keys[2]) is not None
+    assert cache.size() <= 250
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ExtractedTextCache(tmp_path, max_bytes=0)
+    cache.set("pdf", "a" * 64, "text")
+
+    assert cache.get("pdf", "a" * 64) is None
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.django_db
+def test_pdf_text_is_extracted_once_per_file_content(text_cache_settings, organization, project, user):
+    data = _pdf_bytes("Quarterly revenue grew")
+    first = _make_pdf(organization, project, user, data)
+    copy = _make_pdf(organization, project, user, data, name="copy.pdf")
+    other = _make_pdf(organization, project, user, _pdf_bytes("Headcount is flat"), name="other.pdf")
+
+    with patch.object(PDF, "_extract_text_content", autospec=True, side_effect=PDF._extract_text_content) as extract:
+        assert "Quarterly revenue grew" in first.get_text_content()
+        assert "Quarterly revenue grew" in first.get_text_content()
+        assert "Quarterly revenue grew" in PDF.objects.get(pk=copy.pk).get_text_content()
+        assert "Headcount is flat" in other.get_text_content()
+
+    assert extract.call_count == 2
+    assert get_text_cache().hits == 2
+
+
+@pytest.mark.django_db
+def test_failed_extraction_is_not_cached(text_cache_settings, organization, project, user):
+    pdf = _make_pdf(organization, project, user, _pdf_bytes("Retry me"))
+
+    with patch.object(PDF, "_extract_text_content", side_effect=RuntimeError("boom")):
+        assert pdf.get_text_content() == ""
+
+    assert "Retry me" in pdf.get_text_content()
+
+
+@pytest.mark.django_db
+def test_pdf_pages_keep_numbers_through_cache(text_cache_settings, organization, project, user):
+    with fitz.open() as doc:
+        for text in ("Intro", "Results"):
+            doc.new_page().insert_text((72, 72), text)
+        data = doc.tobytes()
+    pdf = _make_pdf(organization, project, user, data)
+
+    assert pdf.page_count == 2
+    pages = [(page.number, page.text.strip()) for page in pdf.iter_text_pages()]
+    cached = [(page.number, page.text.strip()) for page in pdf.iter_text_pages()]
+
+    assert pages == cached == [(1, "Intro"), (2, "Results")]
+    assert pdf.get_text_content().replace("\n", "") == "IntroResults"
+
+
+@pytest.mark.django_db
+def test_pdf_pages_stream_into_cache_only_when_read_fully(
+    text_cache_settings, organization, project, user
+):
+    with fitz.open() as doc:
+        for text in ("Intro", "Results", "Appendix"):
+            doc.new_page().insert_text((72, 72), text)
+        data = doc.tobytes()
+    pdf = _make_pdf(organization, project, user, data)
+    cache = get_text_cache()
+
+    # A consumer that stops early leaves nothing behind.
+    next(iter(pdf.iter_text_pages()))
+    assert cache.get("pdf", pdf.get_content_hash()) is None
+    assert not list(cache.directory.glob("*/*.tmp"))
+
+    list(pdf.iter_text_pages())
+    with patch("documents.text_cache.READ_CHUNK_CHARS", 3):
+        cached = [(page.number, page.text.strip()) for page in pdf.iter_text_pages()]
+
+    assert cached == [(1, "Intro"), (2, "Results"), (3, "Appendix")]
+    assert cache.hits == 1
+
+
+@pytest.mark.django_db
+def test_content_hash_is_stored_at_upload(text_cache_settings, organization, project, user):
+    import hashlib
+
+    from documents import text_cache
+    from documents.preview_service import compute_content_hash
+
+    data = _pdf_bytes("Hashed once")
+    pdf = _make_pdf(organization, project, user, data)
+    expected = hashlib.sha256(data).hexdigest()
+
+    assert PDF.objects.get(pk=pdf.pk).content_hash == expected
+    with patch.object(text_cache, "hash_field_file", side_effect=AssertionError("file re-read")):
+        reloaded = PDF.objects.get(pk=pdf.pk)
+        assert compute_content_hash(reloaded) == expected
+        assert "Hashed once" in reloaded.get_text_content()
+
+    replacement = _pdf_bytes("Replaced")
+    reloaded.pdf_file = ContentFile(replacement, name="report.pdf")
+    reloaded.save()
+    assert PDF.objects.get(pk=pdf.pk).content_hash == hashlib.sha256(replacement).hexdigest()
+
+
+@pytest.mark.django_db
+def test_missing_content_hash_is_backfilled_once(text_cache_settings, organization, project, user):
+    data = _pdf_bytes("Legacy upload")
+    pdf = _make_pdf(organization, project, user, data)
+    PDF.objects.filter(pk=pdf.pk).update(content_hash="")
+
+    legacy = PDF.objects.get(pk=pdf.pk)
+    assert legacy.get_content_hash() == pdf.content_hash
+    assert PDF.objects.get(pk=pdf.pk).content_hash == pdf.content_hash
@@ -0,0 +1,376 @@
+"""
+Persistent cache for text extracted from binary documents.
+
+PDF, Word and spreadsheet text extraction re-parses the whole file, which is
+expensive for large uploads and happens every time indexing, search backends
+or RAG tools ask for a document's text. Extracted text is stored on disk keyed
+by the SHA-256 of the source file, so any consumer (in any process) reuses it
+until the file content changes.
+
+The cache is bounded by EXTRACTED_TEXT_CACHE_MAX_BYTES. Reads refresh an
+entry's mtime and eviction removes the least recently used entries first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+from .pdf_text import PAGE_BREAK, PDFPage, iter_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+# Bump when an extractor's output format changes so stale entries are ignored.
+EXTRACTOR_VERSION = 2
+
+# Eviction trims the cache to this fraction of the cap to avoid evicting on
+# every write once the cache is full.
+EVICTION_LOW_WATER = 0.9
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Characters read at a time when streaming pages back out of a cache entry.
+READ_CHUNK_CHARS = 64 * 1024
+
+
+class ExtractedTextCache:
+    """Size-capped, LRU-evicted directory of extracted text files."""
+
+    def __init__(self, directory: Path | str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, kind: str, content_hash: str) -> str | None:
+        """Return cached text, or None on a miss."""
+        handle = self.open(kind, content_hash)
+        if handle is None:
+            return None
+        with handle:
+            return handle.read()
+
+    def open(self, kind: str, content_hash: str):
+        """Return a text handle on a cache entry (refreshing its LRU time), or None on a miss."""
+        if not self.enabled:
+            return None
+
+        path = self._path(kind, content_hash)
+        try:
+            handle = path.open(encoding="utf-8")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError as exc:
+            logger.debug("Failed to read extracted text cache entry %s: %s", path, exc)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return handle
+
+    def set(self, kind: str, content_hash: str, text: str) -> None:
+        """Store text for a file hash, evicting old entries if over the cap."""
+        with self.writer(kind, content_hash) as handle:
+            if handle is not None:
+                handle.write(text)
+
+    @contextmanager
+    def writer(self, kind: str, content_hash: str):
+        """
+        Stream an entry into the cache.
+
+        Yields a text handle on a temporary file (or None when the cache is
+        disabled or unwritable). The entry is published only if the block
+        exits normally and the result fits under the cap; an exception or an
+        abandoned generator discards it.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        path = self._path(kind, content_hash)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError as exc:
+            logger.warning("Failed to write extracted text cache entry %s: %s", path, exc)
+            yield None
+            return
+
+        published = False
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+                yield handle
+            published = self._publish(Path(tmp_name), path)
+        finally:
+            if not published:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _publish(self, tmp_path: Path, path: Path) -> bool:
+        try:
+            size = tmp_path.stat().st_size
+            if size > self.max_bytes:
+                return False
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Failed to write extracted text cache entry %s: %s", path, exc)
+            return False
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += size - previous
+            if self._size > self.max_bytes:
+                self._evict()
+        return True
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        with self._lock:
+            for path in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._size = 0
+
+    def size(self) -> int:
+        """Return the current on-disk size of the cache in bytes."""
+        with self._lock:
+            self._size = self._scan_size()
+            return self._size
+
+    def _path(self, kind: str, content_hash: str) -> Path:
+        return self.directory / content_hash[:2] / f"{content_hash}.{kind}.v{EXTRACTOR_VERSION}.txt"
+
+    def _entries(self):
+        if not self.directory.exists():
+            return
+        yield from self.directory.glob("*/*.txt")
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+
+    def _evict(self) -> None:
+        # Other processes share the directory, so rescan rather than trusting
+        # the in-process running total.
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * EVICTION_LOW_WATER)
+        evicted = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        self._size = total
+        if evicted:
+            logger.debug("Evicted %s extracted text cache entries", evicted)
+
+
+_cache: ExtractedTextCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> ExtractedTextCache:
+    """Return the process-wide cache configured from settings."""
+    global _cache
+
+    default_directory = settings.BASE_DIR / "cache" / "extracted_text"
+    directory = Path(getattr(settings, "EXTRACTED_TEXT_CACHE_DIR", default_directory))
+    max_bytes = int(getattr(settings, "EXTRACTED_TEXT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+    with _cache_lock:
+        if _cache is None or _cache.directory != directory or _cache.max_bytes != max_bytes:
+            _cache = ExtractedTextCache(directory, max_bytes)
+        return _cache
+
+
+def hash_file(file) -> str:
+    """Compute the SHA-256 of an open Django File (e.g. a pending upload) in chunks."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    if file.seekable():
+        file.seek(0)
+    return digest.hexdigest()
+
+
+def hash_field_file(field_file) -> str:
+    """Compute the SHA-256 of a stored FieldFile's content without loading it whole."""
+    field_file.open("rb")
+    try:
+        return hash_file(field_file)
+    finally:
+        field_file.close()
+
+
+def get_or_extract_text(
+    field_file,
+    kind: str,
+    extract: Callable[[], str],
+    content_hash: str | None = None,
+) -> str:
+    """
+    Return extracted text for a file, parsing it only on a cache miss.
+
+    Args:
+        field_file: The document's FieldFile (e.g. PDF.pdf_file).
+        kind: Extractor name, part of the cache key (e.g. "pdf").
+        extract: Callable that parses the file and returns its text. Exceptions
+            propagate and nothing is cached, so transient failures are retried.
+        content_hash: SHA-256 of the file if already known (see
+            Document.get_content_hash()); otherwise the file is hashed.
+
+    Returns:
+        str: The extracted text.
+    """
+    cache = get_text_cache()
+    if not cache.enabled:
+        return extract()
+
+    content_hash = content_hash or hash_field_file(field_file)
+    text = cache.get(kind, content_hash)
+    if text is not None:
+        return text
+
+    text = extract()
+    cache.set(kind, content_hash, text)
+    return text
+
+
+def iter_cached_pdf_pages(field_file, content_hash: str | None = None) -> Iterator[PDFPage]:
+    """
+    Yield PDF pages one at a time, reading through the cache when it is enabled.
+
+    A cache hit streams pages back out of the entry. On a miss, pages are
+    parsed straight from the file and written to the cache as they are
+    yielded (in join_pages() format), so neither path holds more than a page
+    of text at once. A consumer that stops early leaves nothing cached.
+
+    Args:
+        field_file: FieldFile holding the PDF.
+        content_hash: SHA-256 of the file if already known.
+    """
+    cache = get_text_cache()
+    if not cache.enabled:
+        yield from iter_pdf_pages(field_file)
+        return
+
+    content_hash = content_hash or hash_field_file(field_file)
+    handle = cache.open("pdf", content_hash)
+    if handle is not None:
+        with handle:
+            yield from _read_cached_pages(handle)
+        return
+
+    with cache.writer("pdf", content_hash) as out:
+        for page in iter_pdf_pages(field_file):
+            if out is not None:
+                if page.number > 1:
+                    out.write(PAGE_BREAK)
+                out.write(page.text.replace(PAGE_BREAK, "\n"))
+            yield page
+
+
+def _read_cached_pages(handle) -> Iterator[PDFPage]:
+    """Yield pages from a join_pages() file, buffering at most one page plus a read."""
+    number = 1
+    buffer = ""
+    while True:
+        data = handle.read(READ_CHUNK_CHARS)
+        if not data:
+            yield PDFPage(number, buffer)
+            return
+        buffer += data
+        if PAGE_BREAK not in data:
+            continue
+        *complete, buffer = buffer.split(PAGE_BREAK)
+        for text in complete:
+            yield PDFPage(number, text)
+            number += 1
+
+
+def warm_extracted_text(document_id: int) -> bool:
+    """
+    Extract and cache text for a newly uploaded document.
+
+    Runs as a Django-Q2 task so uploads return before the file is parsed.
+
+    Returns:
+        bool: True if the document supports text extraction.
+    """
+    from .models import PDF, Document, SpreadsheetDocument, WordDocument
+
+    document = Document.objects.filter(id=document_id).select_subclasses().first()
+    if not isinstance(document, (PDF, WordDocument, SpreadsheetDocument)):
+        return False
+
+    document.get_text_content()
+    return True
+
+
+def schedule_text_extraction(document) -> None:
+    """Queue warm_extracted_text() for a document once the transaction commits."""
+    from django.db import transaction
+
+    document_id = document.id
+
+    def _enqueue():
+        try:
+            from django_q.tasks import async_task
+
+            async_task(
+                "documents.text_cache.warm_extracted_text",
+                document_id,
+                task_name=f"extract_text_{document_id}",
+            )
+        except Exception as exc:  # noqa: BLE001 - indexing will extract on demand
+            logger.warning("Failed to queue text extraction for document %s: %s", document_id, exc)
+
+    transaction.on_commit(_enqueue)
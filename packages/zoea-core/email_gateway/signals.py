@@ -17,8 +17,8 @@ def index_email_message_on_save(sender, instance: EmailMessage, **kwargs) -> Non
         return
 
     def _index():
-        from file_search.indexing import index_email_message
+        from file_search.queue import enqueue_email_message_index
 
-        index_email_message(instance)
+        enqueue_email_message_index(instance)
 
     transaction.on_commit(_index)
@@ -2,12 +2,17 @@
 Event dispatcher for routing events to matching triggers.
 
 Finds EventTriggers that match incoming events and dispatches them
-to the SkillsAgentService for execution.
+to the SkillsAgentService for execution. dispatch_events() handles many
+events at once (e.g. every document of an archive import): runs are
+created with one bulk insert and queued in a single transaction, and a
+trigger can receive all of its events as one coalesced run.
 """
 
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from django.db import transaction
@@ -16,6 +21,7 @@ from django.utils import timezone
 from execution.models import ExecutionRun
 
 from .models import EventTrigger, EventType
+from .trigger_index import compile_filters, get_trigger_index
 
 if TYPE_CHECKING:
     from organizations.models import Organization
@@ -24,6 +30,19 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class Event:
+    """One event for dispatch_events(); fields match dispatch_event()'s arguments."""
+
+    event_type: str | EventType
+    source_type: str
+    source_id: int
+    event_data: dict[str, Any]
+    organization: Organization
+    project: Project | None = None
+    user: Any = None
+
+
 class EventDispatcher:
     """
     Central event dispatcher for routing events to triggers.
@@ -101,6 +120,73 @@ class EventDispatcher:
 
         return runs
 
+    def dispatch_many(
+        self,
+        events: Iterable[Event],
+        *,
+        coalesce: bool = False,
+    ) -> list[ExecutionRun]:
+        """
+        Dispatch many events, creating their runs in bulk.
+
+        Runs are inserted with one bulk_create and async runs are queued in
+        the same transaction, with their task IDs saved by one bulk_update.
+
+        Args:
+            events: Events to dispatch
+            coalesce: Give each trigger a single run for all of its matching
+                events. Triggers can also opt in individually with
+                ``agent_config["coalesce_events"]``.
+
+        Returns:
+            List of ExecutionRun records created, one per (trigger, event)
+            or one per coalesced trigger
+        """
+        planned: list[tuple[EventTrigger, list[Event]]] = []
+        coalesced: dict[int, tuple[EventTrigger, list[Event]]] = {}
+
+        index = get_trigger_index()
+        event_count = 0
+        for event in events:
+            event_count += 1
+            event_type = event.event_type
+            if isinstance(event_type, EventType):
+                event_type = event_type.value
+            triggers = index.match(
+                event.organization.id,
+                event_type,
+                event.project.id if event.project else None,
+                event.event_data,
+            )
+            for trigger in triggers:
+                if coalesce or (trigger.agent_config or {}).get("coalesce_events"):
+                    coalesced.setdefault(trigger.id, (trigger, []))[1].append(event)
+                else:
+                    planned.append((trigger, [event]))
+        planned.extend(coalesced.values())
+
+        if not planned:
+            logger.debug(f"No triggers found for {event_count} event(s)")
+            return []
+
+        runs = [self._build_run(trigger, trigger_events) for trigger, trigger_events in planned]
+        with transaction.atomic():
+            ExecutionRun.objects.bulk_create(runs)
+            self._queue_async_executions(
+                [run for run, (trigger, _) in zip(runs, planned) if trigger.run_async]
+            )
+
+        logger.info(
+            f"Dispatched {event_count} event(s) to {len(runs)} run(s) "
+            f"({len(coalesced)} coalesced trigger(s))"
+        )
+
+        for run, (trigger, _) in zip(runs, planned):
+            if not trigger.run_async:
+                self._execute_sync(run)
+
+        return runs
+
     def _find_matching_triggers(
         self,
         event_type: str,
@@ -117,37 +203,17 @@ class EventDispatcher:
         3. Project-scoped triggers only match events from that project
         4. Org-wide triggers (no project) match all events in the org
         5. Must pass any configured filters
-        """
-        # Base query: enabled triggers for this org and event type
-        queryset = EventTrigger.objects.filter(
-            organization=organization,
-            event_type=event_type,
-            is_enabled=True,
-        )
-
-        # Get org-wide triggers (project is null)
-        org_wide_triggers = queryset.filter(project__isnull=True)
 
-        # Get project-specific triggers if project is provided
-        project_triggers = (
-            queryset.filter(project=project) if project else EventTrigger.objects.none()
+        Triggers come from the per-process trigger index, so most lookups
+        need no database query (see events.trigger_index).
+        """
+        return get_trigger_index().match(
+            organization.id,
+            event_type,
+            project.id if project else None,
+            event_data,
         )
 
-        # Combine both querysets
-        all_triggers = list(org_wide_triggers) + list(project_triggers)
-
-        # Apply filters
-        matching_triggers = []
-        for trigger in all_triggers:
-            if self._matches_filters(trigger, event_data):
-                matching_triggers.append(trigger)
-            else:
-                logger.debug(
-                    f"Trigger {trigger.id} skipped due to filter mismatch"
-                )
-
-        return matching_triggers
-
     def _matches_filters(
         self,
         trigger: EventTrigger,
@@ -161,20 +227,7 @@ class EventDispatcher:
 
         Empty filters always match.
         """
-        if not trigger.filters:
-            return True
-
-        for key, expected_value in trigger.filters.items():
-            actual_value = event_data.get(key)
-
-            if isinstance(expected_value, list):
-                # List filter: actual value must be in list
-                if actual_value not in expected_value:
-                    return False
-            elif actual_value != expected_value:
-                return False
-
-        return True
+        return compile_filters(trigger.filters)(event_data)
 
     def _dispatch_trigger(
         self,
@@ -196,23 +249,11 @@ class EventDispatcher:
             ExecutionRun record
         """
         # Create the run record
-        run = ExecutionRun.objects.create(
-            organization=trigger.organization,
-            project=trigger.project,
-            trigger=trigger,
-            trigger_type=trigger.event_type,
-            source_type=source_type,
-            source_id=source_id,
-            input_envelope={
-                "trigger_type": trigger.event_type,
-                "source_type": source_type,
-                "source_id": source_id,
-                "payload": event_data,
-            },
-            inputs=event_data,
-            status=ExecutionRun.Status.PENDING,
-            created_by=trigger.created_by,
+        run = self._build_run(
+            trigger,
+            [Event(trigger.event_type, source_type, source_id, event_data, trigger.organization)],
         )
+        run.save()
 
         logger.info(
             f"Created ExecutionRun {run.run_id} for trigger {trigger.name}"
@@ -225,6 +266,69 @@ class EventDispatcher:
 
         return run
 
+    def _build_run(self, trigger: EventTrigger, events: list[Event]) -> ExecutionRun:
+        """Build an unsaved run for a trigger and one or more (coalesced) events."""
+        first = events[0]
+        if len(events) == 1:
+            inputs = first.event_data
+            envelope = {
+                "trigger_type": trigger.event_type,
+                "source_type": first.source_type,
+                "source_id": first.source_id,
+                "payload": inputs,
+            }
+        else:
+            inputs = {
+                "events": [event.event_data for event in events],
+                "event_count": len(events),
+            }
+            envelope = {
+                "trigger_type": trigger.event_type,
+                "source_type": first.source_type,
+                "source_id": first.source_id,
+                "sources": [[event.source_type, event.source_id] for event in events],
+                "coalesced": True,
+                "payload": inputs,
+            }
+
+        return ExecutionRun(
+            organization=trigger.organization,
+            project=trigger.project,
+            trigger=trigger,
+            trigger_type=trigger.event_type,
+            source_type=first.source_type,
+            source_id=first.source_id,
+            input_envelope=envelope,
+            inputs=inputs,
+            status=ExecutionRun.Status.PENDING,
+            created_by=trigger.created_by,
+        )
+
+    def _queue_async_executions(self, runs: list[ExecutionRun]) -> None:
+        """
+        Queue many runs to background tasks.
+
+        Django-Q2 has no bulk enqueue, so tasks are sent through one shared
+        broker connection and the task IDs are written with one bulk_update.
+        """
+        if not runs:
+            return
+
+        from django_q.brokers import get_broker
+        from django_q.tasks import async_task
+
+        broker = get_broker()
+        for run in runs:
+            run.task_id = async_task(
+                "events.tasks.execute_event_trigger",
+                run.id,
+                task_name=f"event_trigger_{str(run.run_id)[:8]}",
+                timeout=600,  # 10 minute timeout
+                broker=broker,
+            )
+        ExecutionRun.objects.bulk_update(runs, ["task_id"])
+        logger.info(f"Queued {len(runs)} trigger run(s)")
+
     def _queue_async_execution(self, run: ExecutionRun) -> None:
         """Queue trigger execution to background task."""
         from django_q.tasks import async_task
@@ -232,7 +336,7 @@ class EventDispatcher:
         task_id = async_task(
             "events.tasks.execute_event_trigger",
             run.id,
-            task_name=f"event_trigger_{run.run_id[:8]}",
+            task_name=f"event_trigger_{str(run.run_id)[:8]}",
             timeout=600,  # 10 minute timeout
         )
 
@@ -291,3 +395,21 @@ def dispatch_event(
         project=project,
         user=user,
     )
+
+
+def dispatch_events(events: Iterable[Event], *, coalesce: bool = False) -> list[ExecutionRun]:
+    """
+    Dispatch many events in one pass (see EventDispatcher.dispatch_many).
+
+    Example:
+        from events.dispatcher import Event, dispatch_events
+
+        dispatch_events(
+            [
+                Event(EventType.DOCUMENT_CREATED, "document", doc.id, data, organization, project)
+                for doc, data in imported
+            ],
+            coalesce=True,
+        )
+    """
+    return EventDispatcher().dispatch_many(events, coalesce=coalesce)
@@ -463,6 +463,7 @@ class ScopedProjectAPI:
 
         try:
             from file_search import FileSearchRegistry
+            from file_search.query_cache import cached_search
             from projects.models import Project
 
             project = Project.objects.get(id=self.context.project_id)
@@ -480,18 +481,18 @@ class ScopedProjectAPI:
                 return []
 
             store = FileSearchRegistry.get()
-            results = store.search(store_id, query, top_k=limit)
+            result = cached_search(store, store_id=store_id, query=query, max_results=limit)
 
-            # Convert SearchResult objects to dicts
+            # Convert source references to dicts
             result_dicts = [
                 {
-                    "document_id": r.document_id,
-                    "title": r.title,
-                    "text": r.text,
-                    "score": r.score,
-                    "metadata": r.metadata,
+                    "document_id": source.document_id,
+                    "title": source.title,
+                    "text": source.excerpt,
+                    "score": source.relevance_score,
+                    "metadata": source.metadata,
                 }
-                for r in results
+                for source in result.sources
             ]
 
             self.audit_log.log(
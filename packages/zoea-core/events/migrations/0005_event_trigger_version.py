@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-16 19:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_alter_eventtrigger_event_type_scheduledevent'),
+        ('organizations', '0006_alter_organization_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventTriggerVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='event_trigger_version', to='organizations.organization')),
+            ],
+            options={
+                'verbose_name': 'Event Trigger Version',
+                'verbose_name_plural': 'Event Trigger Versions',
+            },
+        ),
+    ]
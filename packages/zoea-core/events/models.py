@@ -147,6 +147,31 @@ class EventTrigger(models.Model):
         return len(self.skills) if self.skills else 0
 
 
+class EventTriggerVersion(models.Model):
+    """
+    Change counter for an organization's event triggers.
+
+    Every trigger save or delete bumps ``version``. Per-process trigger
+    indexes (see events.trigger_index) compare it with the version they were
+    built from, so a change made in any process reaches every dispatcher.
+    """
+
+    organization = models.OneToOneField(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="event_trigger_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Event Trigger Version"
+        verbose_name_plural = "Event Trigger Versions"
+
+    def __str__(self):
+        return f"EventTriggerVersion(org={self.organization_id}, v{self.version})"
+
+
 class ScheduleType(models.TextChoices):
     """Types of scheduled events."""
 
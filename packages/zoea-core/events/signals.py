@@ -0,0 +1,26 @@
+"""
+Signals keeping the per-process trigger index (events.trigger_index) current.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from organizations.models import Organization
+
+from .models import EventTrigger
+from .trigger_index import bump_trigger_version, get_trigger_index
+
+
+@receiver(post_save, sender=EventTrigger)
+def invalidate_trigger_index_on_save(sender, instance: EventTrigger, **kwargs) -> None:
+    bump_trigger_version(instance.organization_id)
+
+
+@receiver(post_delete, sender=EventTrigger)
+def invalidate_trigger_index_on_delete(
+    sender, instance: EventTrigger, origin=None, **kwargs
+) -> None:
+    if isinstance(origin, Organization):
+        # The organization itself is being deleted; its version row goes with it
+        get_trigger_index().invalidate(instance.organization_id)
+        return
+    bump_trigger_version(instance.organization_id)
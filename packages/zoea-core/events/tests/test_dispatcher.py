@@ -2,14 +2,17 @@
 Tests for event dispatcher.
 """
 
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 
 from django.contrib.auth import get_user_model
 
 from accounts.models import Account
-from events.dispatcher import EventDispatcher, dispatch_event
-from events.models import EventTrigger, EventType
+from events.dispatcher import Event, EventDispatcher, dispatch_event, dispatch_events
+from events.models import EventTrigger, EventTriggerVersion, EventType
+from events.trigger_index import compile_filters, get_trigger_index
 from execution.models import ExecutionRun
 from projects.models import Project
 
@@ -244,3 +247,172 @@ class TestDispatchEventFunction:
         )
 
         assert len(runs) == 1
+
+
+@pytest.mark.django_db
+class TestTriggerIndex:
+    """Tests for the per-process compiled trigger index."""
+
+    def _match(self, organization, event_type=EventType.DOCUMENT_UPDATED, project=None, data=None):
+        return EventDispatcher()._find_matching_triggers(
+            event_type=event_type.value,
+            organization=organization,
+            project=project,
+            event_data=data or {},
+        )
+
+    def test_zero_trigger_lookup_needs_no_query(self, organization, django_assert_num_queries):
+        """Test repeated lookups are served from the index."""
+        assert self._match(organization) == []
+
+        with django_assert_num_queries(0):
+            for _ in range(5):
+                assert self._match(organization) == []
+
+    def test_trigger_changes_invalidate_index(self, organization, user):
+        """Test saves and deletes in this process apply immediately."""
+        assert self._match(organization) == []
+
+        trigger = EventTrigger.objects.create(
+            organization=organization,
+            name="Doc Trigger",
+            event_type=EventType.DOCUMENT_UPDATED,
+            skills=["test"],
+            created_by=user,
+        )
+        assert self._match(organization) == [trigger]
+
+        trigger.delete()
+        assert self._match(organization) == []
+
+    def test_version_stamp_reaches_other_processes(self, settings, organization, user):
+        """Test a change made elsewhere is picked up once the version is checked."""
+        settings.EVENT_TRIGGER_INDEX_CHECK_INTERVAL = 60
+        assert self._match(organization) == []
+
+        # Simulate another process: no signals fire here, only the version moves
+        EventTrigger.objects.bulk_create([
+            EventTrigger(
+                organization=organization,
+                name="Remote Trigger",
+                event_type=EventType.DOCUMENT_UPDATED,
+                skills=["test"],
+                created_by=user,
+            )
+        ])
+        EventTriggerVersion.objects.update_or_create(organization=organization, defaults={"version": 99})
+        assert self._match(organization) == []  # within the check interval
+
+        later = time.monotonic() + 61
+        with patch("events.trigger_index.time.monotonic", return_value=later):
+            assert [t.name for t in self._match(organization)] == ["Remote Trigger"]
+        assert get_trigger_index().loads == 2
+
+    def test_project_scope_and_filters(self, organization, project, user):
+        """Test org-wide triggers come before project triggers and filters apply."""
+        org_trigger = EventTrigger.objects.create(
+            organization=organization,
+            name="Org",
+            event_type=EventType.DOCUMENT_UPDATED,
+            skills=["test"],
+            filters={"document_type": ["Markdown", "Image"]},
+            created_by=user,
+        )
+        project_trigger = EventTrigger.objects.create(
+            organization=organization,
+            project=project,
+            name="Project",
+            event_type=EventType.DOCUMENT_UPDATED,
+            skills=["test"],
+            created_by=user,
+        )
+
+        assert self._match(organization, project=project, data={"document_type": "Markdown"}) == [
+            org_trigger,
+            project_trigger,
+        ]
+        assert self._match(organization, project=project, data={"document_type": "PDF"}) == [project_trigger]
+        assert self._match(organization, data={"document_type": "PDF"}) == []
+
+
+def test_compile_filters():
+    """Test compiled predicates match the documented filter semantics."""
+    assert compile_filters({})({"anything": 1})
+    predicate = compile_filters({"kind": "a", "tags": ["x", {"nested": 1}]})
+    assert predicate({"kind": "a", "tags": "x"})
+    assert predicate({"kind": "a", "tags": {"nested": 1}})
+    assert not predicate({"kind": "b", "tags": "x"})
+    assert not predicate({"kind": "a", "tags": "y"})
+
+
+@pytest.mark.django_db
+class TestDispatchEvents:
+    """Tests for batched dispatch_events."""
+
+    @pytest.fixture
+    def doc_triggers(self, organization, user):
+        return [
+            EventTrigger.objects.create(
+                organization=organization,
+                name=f"Doc Trigger {i}",
+                event_type=EventType.DOCUMENT_CREATED,
+                skills=["test"],
+                run_async=False,
+                created_by=user,
+            )
+            for i in range(2)
+        ]
+
+    def _events(self, organization, count):
+        return [
+            Event(EventType.DOCUMENT_CREATED, "document", i, {"document_id": i}, organization)
+            for i in range(1, count + 1)
+        ]
+
+    @patch("events.dispatcher.EventDispatcher._execute_sync")
+    def test_runs_created_in_bulk(self, mock_execute, organization, doc_triggers, django_assert_max_num_queries):
+        """Test one run per (trigger, event), inserted together."""
+        dispatch_events(self._events(organization, 1))  # warm the trigger index
+
+        with django_assert_max_num_queries(3):
+            runs = dispatch_events(self._events(organization, 3))
+
+        assert len(runs) == 6
+        assert all(run.pk for run in runs)
+        assert {run.source_id for run in runs} == {1, 2, 3}
+        assert mock_execute.call_count == 8
+
+    @patch("events.dispatcher.EventDispatcher._execute_sync")
+    def test_coalesced_run_per_trigger(self, mock_execute, organization, doc_triggers):
+        """Test coalescing gives each trigger a single run with every event."""
+        doc_triggers[1].agent_config = {"coalesce_events": True}
+        doc_triggers[1].save()
+
+        runs = dispatch_events(self._events(organization, 3))
+
+        assert len(runs) == 4  # 3 for the first trigger, 1 coalesced
+        coalesced = [run for run in runs if run.trigger == doc_triggers[1]]
+        assert len(coalesced) == 1
+        assert coalesced[0].inputs["event_count"] == 3
+        assert [event["document_id"] for event in coalesced[0].inputs["events"]] == [1, 2, 3]
+        assert coalesced[0].input_envelope["coalesced"] is True
+
+        runs = dispatch_events(self._events(organization, 2), coalesce=True)
+        assert len(runs) == 2
+
+    def test_async_runs_queued_with_task_ids(self, organization, doc_triggers):
+        """Test async runs are queued and their task IDs saved in bulk."""
+        EventTrigger.objects.filter(id__in=[t.id for t in doc_triggers]).update(run_async=True)
+        get_trigger_index().clear()
+
+        with (
+            patch("django_q.brokers.get_broker"),
+            patch("django_q.tasks.async_task", side_effect=lambda *a, **kw: f"task-{a[1]}") as mock_async,
+        ):
+            runs = dispatch_events(self._events(organization, 2))
+
+        assert mock_async.call_count == 4
+        assert all(kw["broker"] is not None for _, kw in mock_async.call_args_list)
+        for run in runs:
+            run.refresh_from_db()
+            assert run.task_id == f"task-{run.id}"
@@ -0,0 +1,230 @@
+"""
+Per-process index of enabled event triggers.
+
+Every document save, email and platform message goes through
+dispatch_event(), and almost none of them match a trigger. TriggerIndex
+loads an organization's enabled triggers once, groups them by
+(event_type, project_id) and compiles their filters into predicates, so
+matching an event is a dict lookup plus a few comparisons.
+
+Invalidation:
+- EventTrigger post_save/post_delete (events.signals) drops the
+  organization's entry in this process and bumps its EventTriggerVersion
+- other processes notice the new version the next time they check it,
+  at most every EVENT_TRIGGER_INDEX_CHECK_INTERVAL seconds; between checks
+  lookups (including the zero-trigger case) need no database query
+
+Usage:
+    from events.trigger_index import get_trigger_index
+
+    triggers = get_trigger_index().match(org_id, "document_updated", project_id, event_data)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import EventTrigger, EventTriggerVersion
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+
+def compile_filters(filters: dict[str, Any] | None) -> Predicate:
+    """
+    Compile a trigger's ``filters`` into a predicate over event data.
+
+    A scalar value must equal the event's value; a list value must contain
+    it. Empty filters always match.
+    """
+    if not filters:
+        return _always
+
+    checks = []
+    for key, expected in filters.items():
+        if isinstance(expected, list):
+            try:
+                allowed = frozenset(expected)
+            except TypeError:  # unhashable entries: fall back to list membership
+                allowed = tuple(expected)
+            checks.append((key, allowed, True))
+        else:
+            checks.append((key, expected, False))
+
+    def predicate(event_data: dict[str, Any]) -> bool:
+        for key, expected, is_list in checks:
+            actual = event_data.get(key)
+            if is_list:
+                try:
+                    if actual not in expected:
+                        return False
+                except TypeError:  # unhashable event value
+                    if actual not in list(expected):
+                        return False
+            elif actual != expected:
+                return False
+        return True
+
+    return predicate
+
+
+def _always(event_data: dict[str, Any]) -> bool:
+    return True
+
+
+@dataclass
+class _OrgEntry:
+    version: int
+    checked_at: float
+    triggers: dict[tuple[str, int | None], list[tuple[EventTrigger, Predicate]]] = field(
+        default_factory=dict
+    )
+
+
+class TriggerIndex:
+    """Thread-safe LRU of compiled triggers per organization."""
+
+    def __init__(self, check_interval: float = 5.0, maxsize: int = 1024):
+        self.check_interval = check_interval
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, _OrgEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.version_checks = 0
+
+    def match(
+        self,
+        organization_id: int,
+        event_type: str,
+        project_id: int | None,
+        event_data: dict[str, Any],
+    ) -> list[EventTrigger]:
+        """
+        Return enabled triggers matching an event: org-wide ones first, then
+        those scoped to ``project_id``, each passing its filters.
+        """
+        entry = self._entry(organization_id)
+        candidates = list(entry.triggers.get((event_type, None), ()))
+        if project_id is not None:
+            candidates += entry.triggers.get((event_type, project_id), ())
+
+        matching = []
+        for trigger, predicate in candidates:
+            if predicate(event_data):
+                matching.append(trigger)
+            else:
+                logger.debug(f"Trigger {trigger.id} skipped due to filter mismatch")
+        return matching
+
+    def invalidate(self, organization_id: int) -> None:
+        """Drop an organization's entry from this process."""
+        with self._lock:
+            self._entries.pop(organization_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.loads = self.version_checks = 0
+
+    def _entry(self, organization_id: int) -> _OrgEntry:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(organization_id)
+            if entry is not None and now - entry.checked_at < self.check_interval:
+                self._entries.move_to_end(organization_id)
+                return entry
+
+        version = get_trigger_version(organization_id)
+        with self._lock:
+            self.version_checks += 1
+            if entry is not None and entry.version == version:
+                entry.checked_at = now
+                return entry
+
+        entry = self._load(organization_id, version, now)
+        with self._lock:
+            self._entries[organization_id] = entry
+            self._entries.move_to_end(organization_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _load(self, organization_id: int, version: int, now: float) -> _OrgEntry:
+        entry = _OrgEntry(version=version, checked_at=now)
+        triggers = EventTrigger.objects.filter(
+            organization_id=organization_id, is_enabled=True
+        ).select_related("organization", "project", "created_by")
+        for trigger in triggers:
+            key = (trigger.event_type, trigger.project_id)
+            entry.triggers.setdefault(key, []).append((trigger, compile_filters(trigger.filters)))
+
+        with self._lock:
+            self.loads += 1
+        logger.debug(
+            "Loaded trigger index for org %s (v%s, %d trigger group(s))",
+            organization_id,
+            version,
+            len(entry.triggers),
+        )
+        return entry
+
+
+_index: TriggerIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_trigger_index() -> TriggerIndex:
+    """Return the process-wide trigger index configured from settings."""
+    global _index
+
+    check_interval = float(getattr(settings, "EVENT_TRIGGER_INDEX_CHECK_INTERVAL", 5))
+
+    with _index_lock:
+        if _index is None or _index.check_interval != check_interval:
+            _index = TriggerIndex(check_interval)
+        return _index
+
+
+def get_trigger_version(organization_id: int) -> int:
+    """Return an organization's trigger version (0 if its triggers never changed)."""
+    version = (
+        EventTriggerVersion.objects.filter(organization_id=organization_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_trigger_version(organization_id: int) -> None:
+    """
+    Record a trigger change so every process rebuilds the organization's entry.
+
+    This process drops its entry immediately and again once the surrounding
+    transaction commits, so a rebuild that ran mid-transaction is not kept.
+    """
+    updated = EventTriggerVersion.objects.filter(organization_id=organization_id).update(
+        version=F("version") + 1
+    )
+    if not updated:
+        _, created = EventTriggerVersion.objects.get_or_create(
+            organization_id=organization_id, defaults={"version": 1}
+        )
+        if not created:
+            EventTriggerVersion.objects.filter(organization_id=organization_id).update(
+                version=F("version") + 1
+            )
+
+    index = get_trigger_index()
+    index.invalidate(organization_id)
+    transaction.on_commit(lambda: index.invalidate(organization_id))
@@ -27,10 +27,11 @@ Example usage:
     store.delete_store(store_info.store_id)
 """
 
-from .base import FileSearchStore
+from .base import SEARCH_MODES, FileSearchStore
 from .exceptions import (
     BackendError,
     BackendNotFoundError,
+    BatchUploadError,
     ConfigurationError,
     DocumentError,
     DocumentNotFoundError,
@@ -43,7 +44,14 @@ from .exceptions import (
     UnsupportedDocumentTypeError,
 )
 from .registry import FileSearchRegistry
-from .types import DocumentContent, DocumentReference, SearchResult, SourceReference, StoreInfo
+from .types import (
+    DocumentContent,
+    DocumentReference,
+    SearchResult,
+    SourceReference,
+    StoreInfo,
+    TextRecord,
+)
 
 # Import backends to trigger registration
 from . import backends  # noqa: F401
@@ -52,12 +60,14 @@ __all__ = [
     # Core classes
     "FileSearchStore",
     "FileSearchRegistry",
+    "SEARCH_MODES",
     # Types
     "SearchResult",
     "SourceReference",
     "StoreInfo",
     "DocumentContent",
     "DocumentReference",
+    "TextRecord",
     # Exceptions
     "FileSearchError",
     "StoreError",
@@ -65,6 +75,7 @@ __all__ = [
     "StoreCreationError",
     "DocumentError",
     "DocumentUploadError",
+    "BatchUploadError",
     "DocumentNotFoundError",
     "UnsupportedDocumentTypeError",
     "SearchError",
@@ -3,16 +3,27 @@ ChromaDB File Search backend implementation.
 
 Provides a local vector database backend for document search,
 useful for development and testing without requiring external API keys.
+Chunks are also written to a local BM25 index (see file_search.lexical) so
+searches can rank by keywords or fuse both rankings.
 """
 
+import hashlib
 import logging
+from bisect import bisect_right
 from collections.abc import Generator
 
 from django.conf import settings
 
 from documents.models import Document
 
-from ..base import FileSearchStore
+from ..base import (
+    SEARCH_MODE_HYBRID,
+    SEARCH_MODE_LEXICAL,
+    SEARCH_MODE_VECTOR,
+    FileSearchStore,
+)
+from ..chunking import ChunkerRegistry
+from ..clients import HandleCache, get_chromadb_client
 from ..exceptions import (
     DocumentUploadError,
     SearchError,
@@ -20,8 +31,17 @@ from ..exceptions import (
     StoreError,
     StoreNotFoundError,
 )
+from ..hashing import hash_metadata, hash_text
+from ..lexical import RRF_K, get_lexical_index, reciprocal_rank_fusion
 from ..registry import FileSearchRegistry
-from ..types import DocumentReference, SearchResult, SourceReference, StoreInfo
+from ..types import (
+    PAGE_SEPARATOR,
+    DocumentReference,
+    SearchResult,
+    SourceReference,
+    StoreInfo,
+    TextRecord,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +67,7 @@ class ChromaDBFileSearchStore(FileSearchStore):
                               If not provided, uses in-memory storage.
         """
         try:
-            import chromadb
+            import chromadb  # noqa: F401
         except ImportError as e:
             raise StoreError("ChromaDB is not installed. Install with: pip install chromadb") from e
 
@@ -55,17 +75,26 @@ class ChromaDBFileSearchStore(FileSearchStore):
             settings, "CHROMADB_PERSIST_DIRECTORY", None
         )
 
-        if persist_directory:
-            self.client = chromadb.PersistentClient(path=str(persist_directory))
-        else:
-            self.client = chromadb.Client()
+        # Clients are shared per persist directory across the process
+        self.client = get_chromadb_client(persist_directory)
 
         self._stores: dict[str, str] = {}  # store_id -> display_name mapping
+        self._collections = HandleCache(
+            maxsize=int(getattr(settings, "CHROMADB_COLLECTION_CACHE_SIZE", 128))
+        )
+
+        # Keyword index kept in step with every collection write
+        self.lexical = get_lexical_index(persist_directory)
+        self._lexical_synced: set[str] = set()
 
     @property
     def backend_name(self) -> str:
         return "chromadb"
 
+    @property
+    def search_modes(self) -> tuple[str, ...]:
+        return (SEARCH_MODE_VECTOR, SEARCH_MODE_HYBRID, SEARCH_MODE_LEXICAL)
+
     # -------------------------------------------------------------------------
     # Store Lifecycle
     # -------------------------------------------------------------------------
@@ -82,12 +111,13 @@ class ChromaDBFileSearchStore(FileSearchStore):
             store_id = self._generate_store_id(name)
 
             # Create collection with metadata
-            self.client.get_or_create_collection(
+            collection = self.client.get_or_create_collection(
                 name=store_id,
                 metadata={"display_name": name, "ephemeral": str(ephemeral)},
             )
 
             self._stores[store_id] = name
+            self._collections.put(store_id, collection)
 
             return StoreInfo(
                 store_id=store_id,
@@ -101,7 +131,7 @@ class ChromaDBFileSearchStore(FileSearchStore):
     def get_store(self, store_id: str) -> StoreInfo | None:
         """Get store metadata by ID."""
         try:
-            collection = self.client.get_collection(name=store_id)
+            collection = self._get_collection(store_id)
             metadata = collection.metadata or {}
             return StoreInfo(
                 store_id=store_id,
@@ -111,10 +141,16 @@ class ChromaDBFileSearchStore(FileSearchStore):
                 ephemeral=metadata.get("ephemeral") == "True",
             )
         except Exception:
+            self._collections.invalidate(store_id)
             return None
 
     def delete_store(self, store_id: str, *, force: bool = True) -> None:
         """Delete a ChromaDB collection."""
+        self._collections.invalidate(store_id)
+        self.forget_store(store_id)
+        self._lexical_synced.discard(store_id)
+        self._update_lexical("drop_store", store_id)
+        self.bump_store_version(store_id)
         try:
             self.client.delete_collection(name=store_id)
             self._stores.pop(store_id, None)
@@ -152,7 +188,7 @@ class ChromaDBFileSearchStore(FileSearchStore):
         embedding function.
         """
         try:
-            collection = self.client.get_collection(name=store_id)
+            collection = self._get_collection(store_id)
         except Exception as e:
             raise DocumentUploadError(f"Collection not found: {store_id}") from e
 
@@ -202,34 +238,30 @@ class ChromaDBFileSearchStore(FileSearchStore):
         **options,
     ) -> DocumentReference:
         """Add a text record to a ChromaDB collection."""
-        if not content:
+        if not content and options.get("pages") is None:
             raise DocumentUploadError("Cannot index empty content")
 
         try:
-            collection = self.client.get_collection(name=store_id)
+            collection = self._get_collection(store_id)
         except Exception as e:
             raise DocumentUploadError(f"Collection not found: {store_id}") from e
 
-        normalized = self._normalize_metadata(metadata)
-        normalized["record_id"] = record_id
-        if display_name:
-            normalized["record_name"] = display_name
-
-        chunks = self._chunk_text(content)
-        ids = []
-        documents = []
-        metadatas = []
-        for i, chunk in enumerate(chunks):
-            ids.append(f"{record_id}-chunk-{i}")
-            documents.append(chunk)
-            chunk_meta = dict(normalized)
-            chunk_meta["chunk_index"] = str(i)
-            metadatas.append(chunk_meta)
+        ids, documents, metadatas = self._build_chunks(
+            record_id,
+            content,
+            metadata,
+            display_name,
+            page_offsets=options.get("page_offsets"),
+            pages=options.get("pages"),
+        )
 
         try:
             collection.add(ids=ids, documents=documents, metadatas=metadatas)
         except Exception as e:
+            self._collections.invalidate(store_id)
             raise DocumentUploadError(f"Failed to add record '{record_id}': {e}") from e
+        self._update_lexical("add", store_id, ids, documents, metadatas)
+        self.bump_store_version(store_id)
 
         return DocumentReference(
             document_id=None,
@@ -238,13 +270,173 @@ class ChromaDBFileSearchStore(FileSearchStore):
             display_name=display_name or record_id,
         )
 
+    def add_text_records(
+        self,
+        store_id: str,
+        records: list[TextRecord],
+        **options,
+    ) -> list[DocumentReference]:
+        """Add many text records to a ChromaDB collection with a single add() call."""
+        records = [record for record in records if record.has_content]
+        if not records:
+            return []
+
+        try:
+            collection = self._get_collection(store_id)
+        except Exception as e:
+            raise DocumentUploadError(f"Collection not found: {store_id}") from e
+
+        ids: list[str] = []
+        documents: list[str] = []
+        metadatas: list[dict] = []
+        for record in records:
+            record_ids, record_docs, record_metas = self._build_chunks(
+                record.record_id,
+                record.content,
+                record.metadata,
+                record.display_name,
+                page_offsets=record.page_offsets,
+                pages=record.pages,
+            )
+            ids.extend(record_ids)
+            documents.extend(record_docs)
+            metadatas.extend(record_metas)
+
+        try:
+            collection.add(ids=ids, documents=documents, metadatas=metadatas)
+        except Exception as e:
+            self._collections.invalidate(store_id)
+            raise DocumentUploadError(f"Failed to add {len(records)} records: {e}") from e
+        self._update_lexical("add", store_id, ids, documents, metadatas)
+        self.bump_store_version(store_id)
+
+        return [
+            DocumentReference(
+                document_id=None,
+                store_id=store_id,
+                backend_ref_id=record.record_id,
+                display_name=record.display_name or record.record_id,
+            )
+            for record in records
+        ]
+
+    def upsert_text_records(
+        self,
+        store_id: str,
+        records: list[TextRecord],
+        **options,
+    ) -> list[DocumentReference]:
+        """
+        Write records by diffing against their stored chunks.
+
+        Only chunks whose text hash is new are embedded. Chunks that are kept
+        but whose metadata changed are updated in place without re-embedding,
+        and chunks that no longer exist are deleted.
+        """
+        if not records:
+            return []
+        if any(not record.has_content for record in records):
+            raise DocumentUploadError("Cannot index empty content")
+
+        try:
+            collection = self._get_collection(store_id)
+        except Exception as e:
+            raise DocumentUploadError(f"Collection not found: {store_id}") from e
+
+        record_ids = [record.record_id for record in records]
+        try:
+            existing = collection.get(
+                where={"record_id": {"$in": record_ids}},
+                include=["metadatas"],
+            )
+        except Exception as e:
+            self._collections.invalidate(store_id)
+            raise DocumentUploadError(f"Failed to read existing records: {e}") from e
+
+        existing_metadata = dict(zip(existing["ids"], existing["metadatas"] or []))
+
+        add_ids, add_documents, add_metadatas = [], [], []
+        update_ids, update_metadatas = [], []
+        keep_ids: set[str] = set()
+        for record in records:
+            ids, documents, metadatas = self._build_chunks(
+                record.record_id,
+                record.content,
+                record.metadata,
+                record.display_name,
+                page_offsets=record.page_offsets,
+                pages=record.pages,
+            )
+            for chunk_id, chunk, chunk_meta in zip(ids, documents, metadatas):
+                keep_ids.add(chunk_id)
+                if chunk_id not in existing_metadata:
+                    add_ids.append(chunk_id)
+                    add_documents.append(chunk)
+                    add_metadatas.append(chunk_meta)
+                elif existing_metadata[chunk_id] != chunk_meta:
+                    update_ids.append(chunk_id)
+                    update_metadatas.append(chunk_meta)
+
+        stale_ids = [chunk_id for chunk_id in existing_metadata if chunk_id not in keep_ids]
+
+        try:
+            if stale_ids:
+                collection.delete(ids=stale_ids)
+            if update_ids:
+                collection.update(ids=update_ids, metadatas=update_metadatas)
+            if add_ids:
+                collection.add(ids=add_ids, documents=add_documents, metadatas=add_metadatas)
+        except Exception as e:
+            self._collections.invalidate(store_id)
+            raise DocumentUploadError(f"Failed to upsert {len(records)} records: {e}") from e
+        self._update_lexical("delete", store_id, stale_ids)
+        self._update_lexical("update_metadata", store_id, update_ids, update_metadatas)
+        self._update_lexical("add", store_id, add_ids, add_documents, add_metadatas)
+        if stale_ids or update_ids or add_ids:
+            self.bump_store_version(store_id)
+
+        logger.debug(
+            "Upserted %d records: %d chunks embedded, %d updated, %d removed",
+            len(records),
+            len(add_ids),
+            len(update_ids),
+            len(stale_ids),
+        )
+
+        return [
+            DocumentReference(
+                document_id=None,
+                store_id=store_id,
+                backend_ref_id=record.record_id,
+                display_name=record.display_name or record.record_id,
+            )
+            for record in records
+        ]
+
     def remove_text_record(self, store_id: str, record_id: str) -> None:
         """Remove a text record from a ChromaDB collection."""
         try:
-            collection = self.client.get_collection(name=store_id)
+            collection = self._get_collection(store_id)
             collection.delete(where={"record_id": record_id})
         except Exception as e:
+            self._collections.invalidate(store_id)
             logger.warning("Failed to remove record %s: %s", record_id, e)
+        self._update_lexical("delete_records", store_id, [record_id])
+        self.bump_store_version(store_id)
+
+    def remove_text_records(self, store_id: str, record_ids: list[str]) -> None:
+        """Remove many text records from a ChromaDB collection with one delete() call."""
+        if not record_ids:
+            return
+
+        try:
+            collection = self._get_collection(store_id)
+            collection.delete(where={"record_id": {"$in": list(record_ids)}})
+        except Exception as e:
+            self._collections.invalidate(store_id)
+            logger.warning("Failed to remove %d records: %s", len(record_ids), e)
+        self._update_lexical("delete_records", store_id, list(record_ids))
+        self.bump_store_version(store_id)
 
     # -------------------------------------------------------------------------
     # Search
@@ -257,56 +449,60 @@ class ChromaDBFileSearchStore(FileSearchStore):
         *,
         max_results: int = 5,
         filters: dict | None = None,
+        mode: str | None = None,
     ) -> SearchResult:
-        """Search the collection using semantic similarity."""
+        """
+        Search the collection.
+
+        Modes:
+            vector: semantic similarity from the embedding collection (the
+                default, unless FILE_SEARCH_MODE says otherwise)
+            lexical: BM25 keyword ranking from the local inverted index
+            hybrid: reciprocal rank fusion of both (opt-in), so exact
+                identifiers and subjects rank alongside semantic matches
+
+        ``filters["where"]`` is a ChromaDB where clause and applies to every mode.
+        """
+        mode = self.resolve_search_mode(mode)
         try:
-            collection = self.client.get_collection(name=store_id)
+            collection = self._get_collection(store_id)
         except Exception as e:
             raise SearchError(f"Collection not found: {store_id}") from e
 
+        where_filter = filters.get("where") if filters else None
         try:
-            # Build where filter if provided
-            where_filter = None
-            if filters:
-                where_filter = filters.get("where")
-
-            # Query the collection
-            results = collection.query(
-                query_texts=[query],
-                n_results=max_results,
-                where=where_filter,
-            )
-
-            # Convert results to SearchResult format
-            sources = []
-            seen_docs: set[str] = set()
-
-            if results["documents"] and results["documents"][0]:
-                for i, doc_text in enumerate(results["documents"][0]):
-                    metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-                    record_id = metadata.get("record_id") or metadata.get("document_id") or ""
-
-                    # Deduplicate by record/document
-                    if record_id and record_id in seen_docs:
-                        continue
-                    if record_id:
-                        seen_docs.add(record_id)
-
-                    # Calculate relevance score from distance
-                    distance = results["distances"][0][i] if results["distances"] else 0
-                    relevance = 1 - distance
-
-                    sources.append(
-                        SourceReference(
-                            document_id=int(metadata.get("document_id"))
-                            if metadata.get("document_id")
-                            else None,
-                            title=metadata.get("document_name") or metadata.get("record_name"),
-                            excerpt=doc_text[:500] if doc_text else None,
-                            relevance_score=relevance,
-                            metadata=metadata,
-                        )
+            if mode == SEARCH_MODE_VECTOR:
+                results = collection.query(
+                    query_texts=[query],
+                    n_results=max_results,
+                    where=where_filter,
+                )
+                hits = self._vector_hits(results)
+            else:
+                candidates = max_results * int(
+                    getattr(settings, "FILE_SEARCH_HYBRID_CANDIDATE_FACTOR", 4)
+                )
+                self._sync_lexical(store_id, collection)
+                lexical_hits = [
+                    (hit.chunk_id, hit.document, hit.metadata, hit.score)
+                    for hit in self.lexical.search(
+                        store_id, query, limit=candidates, where=where_filter
+                    )
+                ]
+                if mode == SEARCH_MODE_LEXICAL:
+                    results = {"lexical": lexical_hits}
+                    hits = lexical_hits
+                else:
+                    vector_results = collection.query(
+                        query_texts=[query],
+                        n_results=candidates,
+                        where=where_filter,
                     )
+                    vector_hits = self._vector_hits(vector_results)
+                    results = {"vector": vector_results, "lexical": lexical_hits}
+                    hits = self._fuse_hits(vector_hits, lexical_hits)
+
+            sources = self._build_sources(hits, max_results)
 
             # Generate a simple answer based on retrieved content
             answer = self._generate_answer(query, sources)
@@ -318,12 +514,120 @@ class ChromaDBFileSearchStore(FileSearchStore):
             )
 
         except Exception as e:
+            self._collections.invalidate(store_id)
             raise SearchError(f"Search failed: {e}") from e
 
+    def rebuild_lexical_index(self, store_id: str) -> int:
+        """
+        Rebuild a store's keyword index from its collection.
+
+        Returns:
+            int: Number of chunks indexed
+        """
+        collection = self._get_collection(store_id)
+        data = collection.get(include=["documents", "metadatas"])
+        self.lexical.drop_store(store_id)
+        self.lexical.add(store_id, data["ids"], data["documents"] or [], data["metadatas"] or [])
+        self._lexical_synced.add(store_id)
+        return len(data["ids"])
+
     # -------------------------------------------------------------------------
     # Helper methods
     # -------------------------------------------------------------------------
 
+    def _get_collection(self, store_id: str):
+        """Return a cached collection handle, looking it up on first use."""
+        return self._collections.get(store_id, lambda: self.client.get_collection(name=store_id))
+
+    def _update_lexical(self, operation: str, store_id: str, *args) -> None:
+        """Apply a write to the keyword index; failures only degrade keyword ranking."""
+        try:
+            getattr(self.lexical, operation)(store_id, *args)
+        except Exception as e:
+            self._lexical_synced.discard(store_id)
+            logger.warning("Lexical index %s failed for %s: %s", operation, store_id, e)
+
+    def _sync_lexical(self, store_id: str, collection) -> None:
+        """
+        Rebuild the keyword index once per process if it disagrees with the collection.
+
+        Covers collections indexed before the keyword index existed and writes
+        whose keyword half failed.
+        """
+        if store_id in self._lexical_synced:
+            return
+        if self.lexical.count(store_id) != collection.count():
+            logger.info("Rebuilding lexical index for %s", store_id)
+            self.rebuild_lexical_index(store_id)
+        self._lexical_synced.add(store_id)
+
+    def _vector_hits(self, results: dict) -> list[tuple[str, str, dict, float]]:
+        """Flatten a collection.query() result into (id, text, metadata, relevance) hits."""
+        hits = []
+        if not results["documents"] or not results["documents"][0]:
+            return hits
+
+        ids = results["ids"][0] if results.get("ids") else []
+        for i, doc_text in enumerate(results["documents"][0]):
+            metadata = results["metadatas"][0][i] if results["metadatas"] else {}
+            # Calculate relevance score from distance
+            distance = results["distances"][0][i] if results["distances"] else 0
+            chunk_id = ids[i] if i < len(ids) else str(i)
+            hits.append((chunk_id, doc_text, metadata or {}, 1 - distance))
+        return hits
+
+    def _fuse_hits(
+        self, *rankings: list[tuple[str, str, dict, float]]
+    ) -> list[tuple[str, str, dict, float]]:
+        """
+        Merge ranked hit lists with reciprocal rank fusion.
+
+        Fused scores are scaled so a chunk ranked first in every list scores 1.0.
+        """
+        by_id = {}
+        for ranking in rankings:
+            for hit in ranking:
+                by_id.setdefault(hit[0], hit)
+
+        best = len(rankings) / (RRF_K + 1)
+        fused = reciprocal_rank_fusion([hit[0] for hit in ranking] for ranking in rankings)
+        return [
+            (chunk_id, by_id[chunk_id][1], by_id[chunk_id][2], score / best)
+            for chunk_id, score in fused
+        ]
+
+    def _build_sources(
+        self,
+        hits: list[tuple[str, str, dict, float]],
+        max_results: int,
+    ) -> list[SourceReference]:
+        """Convert ranked chunk hits into sources, one per record."""
+        sources = []
+        seen_docs: set[str] = set()
+        for _, doc_text, metadata, relevance in hits:
+            record_id = metadata.get("record_id") or metadata.get("document_id") or ""
+
+            # Deduplicate by record/document
+            if record_id and record_id in seen_docs:
+                continue
+            if record_id:
+                seen_docs.add(record_id)
+
+            sources.append(
+                SourceReference(
+                    document_id=int(metadata.get("document_id"))
+                    if metadata.get("document_id")
+                    else None,
+                    title=metadata.get("document_name") or metadata.get("record_name"),
+                    excerpt=doc_text[:500] if doc_text else None,
+                    relevance_score=relevance,
+                    metadata=metadata,
+                )
+            )
+            if len(sources) >= max_results:
+                break
+        return sources
+
     def _generate_store_id(self, name: str) -> str:
         """Generate a unique, valid ChromaDB collection name."""
         import time
@@ -333,40 +637,79 @@ class ChromaDBFileSearchStore(FileSearchStore):
         timestamp = hex(int(time.time() * 1000))[-8:]
         return f"{base[:50]}_{timestamp}"
 
-    def _chunk_text(self, text: str, max_chunk_size: int = 1000) -> list[str]:
+    def _build_chunks(
+        self,
+        record_id: str,
+        content: str,
+        metadata: dict,
+        display_name: str | None,
+        *,
+        page_offsets: list[int] | None = None,
+        pages=None,
+    ) -> tuple[list[str], list[str], list[dict]]:
         """
-        Simple text chunking by paragraphs.
-
-        For production use, consider more sophisticated chunking strategies.
+        Split a record into chunk ids, texts and metadatas for collection.add().
+
+        Text is split with the chunker configured for the record's document
+        type. Chunk IDs are derived from the chunk text hash so that
+        re-indexing an edited record can keep (and skip re-embedding)
+        unchanged chunks. When page offsets are given, each chunk records the
+        page range it spans. When a page source is given instead of content,
+        pages are chunked one at a time and never joined.
         """
-        if not text:
-            return []
+        normalized = self._normalize_metadata(metadata)
+        normalized["record_id"] = record_id
+        if display_name:
+            normalized["record_name"] = display_name
+        normalized["metadata_hash"] = hash_metadata(metadata, display_name)
 
-        # Split by double newlines (paragraphs)
-        paragraphs = text.split("\n\n")
-        chunks = []
-        current_chunk = []
-        current_size = 0
+        chunker = ChunkerRegistry.for_document_type(metadata.get("document_type"))
+        content_digest = hashlib.sha256()
+        if pages is not None:
 
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
+            def hashed_pages():
+                for index, (number, text) in enumerate(pages()):
+                    if index:
+                        content_digest.update(PAGE_SEPARATOR.encode("utf-8"))
+                    content_digest.update(text.encode("utf-8"))
+                    yield number, text
 
-            para_size = len(para)
+            chunks = chunker.chunk_pages(hashed_pages(), PAGE_SEPARATOR)
+        else:
+            content_digest.update((content or "").encode("utf-8"))
+            chunks = chunker.chunk(content)
 
-            if current_size + para_size > max_chunk_size and current_chunk:
-                chunks.append("\n\n".join(current_chunk))
-                current_chunk = [para]
-                current_size = para_size
-            else:
-                current_chunk.append(para)
-                current_size += para_size
+        ids = []
+        documents = []
+        metadatas = []
+        seen: dict[str, int] = {}
+        for i, chunk in enumerate(chunks):
+            chunk_hash = hash_text(chunk.text)
+            occurrence = seen.get(chunk_hash, 0)
+            seen[chunk_hash] = occurrence + 1
+            chunk_id = f"{record_id}-chunk-{chunk_hash[:16]}"
+            if occurrence:
+                chunk_id = f"{chunk_id}-{occurrence}"
+
+            ids.append(chunk_id)
+            documents.append(chunk.text)
+            chunk_meta = dict(normalized)
+            chunk_meta.update(self._normalize_metadata(chunk.metadata))
+            chunk_meta["chunk_index"] = str(i)
+            chunk_meta["chunk_hash"] = chunk_hash
+            if pages is not None:
+                chunk_meta["page_end"] = chunk_meta["page_number"]
+            elif page_offsets:
+                chunk_meta["page_number"] = bisect_right(page_offsets, chunk.start)
+                chunk_meta["page_end"] = bisect_right(page_offsets, max(chunk.start, chunk.end - 1))
+            metadatas.append(chunk_meta)
 
-        if current_chunk:
-            chunks.append("\n\n".join(current_chunk))
+        # Known only once every page has been read
+        content_hash = content_digest.hexdigest()
+        for chunk_meta in metadatas:
+            chunk_meta["content_hash"] = content_hash
 
-        return chunks if chunks else [text[:max_chunk_size]]
+        return ids, documents, metadatas
 
     def _extract_document_text(self, document: Document) -> str:
         """Extract text content from a Django Document for indexing."""
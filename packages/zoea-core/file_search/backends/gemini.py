@@ -7,17 +7,18 @@ document stores and performing RAG-based retrieval.
 
 import os
 import tempfile
-import time
 from collections.abc import Generator
 
 from django.conf import settings
-from google import genai
 from google.genai import types
 
 from documents.models import Document
 
 from ..base import FileSearchStore
+from ..chunking import get_chunking_config
+from ..clients import get_gemini_client
 from ..exceptions import (
+    BatchUploadError,
     DocumentUploadError,
     SearchError,
     StoreCreationError,
@@ -25,7 +26,8 @@ from ..exceptions import (
     StoreNotFoundError,
 )
 from ..registry import FileSearchRegistry
-from ..types import DocumentReference, SearchResult, SourceReference, StoreInfo
+from ..types import DocumentReference, SearchResult, SourceReference, StoreInfo, TextRecord
+from .gemini_uploads import UploadJob, UploadScheduler
 
 
 class GeminiFileSearchStore(FileSearchStore):
@@ -45,7 +47,7 @@ class GeminiFileSearchStore(FileSearchStore):
             raise StoreError(
                 "GEMINI_API_KEY not found in settings. Please set GEMINI_API_KEY in your .env file."
             )
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_gemini_client(api_key)
 
     @property
     def backend_name(self) -> str:
@@ -88,6 +90,8 @@ class GeminiFileSearchStore(FileSearchStore):
 
     def delete_store(self, store_id: str, *, force: bool = True) -> None:
         """Delete a Gemini File Search store."""
+        self.forget_store(store_id)
+        self.bump_store_version(store_id)
         try:
             self.client.file_search_stores.delete(name=store_id, config={"force": force})
         except Exception as e:
@@ -121,54 +125,92 @@ class GeminiFileSearchStore(FileSearchStore):
             max_tokens_per_chunk: Maximum tokens per chunk (default: 200)
             max_overlap_tokens: Overlap between chunks (default: 20)
         """
-        max_tokens_per_chunk = options.get("max_tokens_per_chunk", 200)
-        max_overlap_tokens = options.get("max_overlap_tokens", 20)
-
-        # Get document content
-        content_info = self.get_document_content(document)
+        result = self._run_uploads([self._document_job(store_id, document, options)])[0]
+        if isinstance(result, Exception):
+            raise DocumentUploadError(
+                f"Failed to upload document '{document.name}': {result}"
+            ) from result
+
+        self.bump_store_version(store_id)
+        return DocumentReference(
+            document_id=document.id,
+            store_id=store_id,
+            backend_ref_id=_file_id(result) or f"doc-{document.id}",
+            display_name=document.name,
+        )
 
-        # Build metadata for Gemini format
-        metadata = self._build_gemini_metadata(document)
+    def add_documents(
+        self,
+        store_id: str,
+        documents: list[Document],
+        **options,
+    ) -> list[DocumentReference]:
+        """
+        Upload many documents concurrently (see gemini_uploads.UploadScheduler).
 
-        try:
-            if content_info["type"] == "file":
-                operation = self._upload_file(
-                    store_id=store_id,
-                    file_path=content_info["path"],
-                    display_name=document.name,
-                    metadata=metadata,
-                    max_tokens_per_chunk=max_tokens_per_chunk,
-                    max_overlap_tokens=max_overlap_tokens,
-                )
-            else:
-                operation = self._upload_text(
+        Raises:
+            BatchUploadError: If any upload failed; the documents that were
+                uploaded are listed on the exception
+        """
+        jobs = [self._document_job(store_id, document, options) for document in documents]
+        results = self._run_uploads(jobs)
+
+        references = []
+        errors = {}
+        for document, result in zip(documents, results):
+            if isinstance(result, Exception):
+                errors[f"doc-{document.id}"] = result
+                continue
+            references.append(
+                DocumentReference(
+                    document_id=document.id,
                     store_id=store_id,
-                    content=content_info["content"],
+                    backend_ref_id=_file_id(result) or f"doc-{document.id}",
                     display_name=document.name,
-                    metadata=metadata,
-                    max_tokens_per_chunk=max_tokens_per_chunk,
-                    max_overlap_tokens=max_overlap_tokens,
                 )
-
-            # Wait for upload to complete
-            while not operation.done:
-                time.sleep(2)
-                operation = self.client.operations.get(operation)
-
-            # Extract file ID from operation response
-            file_id = None
-            if hasattr(operation, "response") and operation.response:
-                file_id = getattr(operation.response, "name", None)
-
-            return DocumentReference(
-                document_id=document.id,
-                store_id=store_id,
-                backend_ref_id=file_id or f"doc-{document.id}",
-                display_name=document.name,
             )
+        return self._finish_batch(store_id, references, errors, len(documents))
 
-        except Exception as e:
-            raise DocumentUploadError(f"Failed to upload document '{document.name}': {e}") from e
+    def _document_job(self, store_id: str, document: Document, options: dict) -> UploadJob:
+        content_info = self.get_document_content(document)
+        kwargs = {
+            "store_id": store_id,
+            "display_name": document.name,
+            "metadata": self._build_gemini_metadata(document),
+            "max_tokens_per_chunk": options.get("max_tokens_per_chunk", 200),
+            "max_overlap_tokens": options.get("max_overlap_tokens", 20),
+        }
+        if content_info["type"] == "file":
+            kwargs["file_path"] = content_info["path"]
+        else:
+            kwargs["content"] = content_info["content"]
+        return UploadJob(name=document.name, kwargs=kwargs)
+
+    def _run_uploads(self, jobs: list[UploadJob]) -> list:
+        """Upload jobs with a bounded in-flight window; returns operations or exceptions."""
+        return UploadScheduler(self.client, self._start_upload).run(jobs)
+
+    def _start_upload(self, *, content: str | None = None, file_path: str | None = None, **kwargs):
+        if file_path is not None:
+            return self._upload_file(file_path=file_path, **kwargs)
+        return self._upload_text(content=content, **kwargs)
+
+    def _finish_batch(
+        self,
+        store_id: str,
+        references: list[DocumentReference],
+        errors: dict[str, Exception],
+        total: int,
+    ) -> list[DocumentReference]:
+        if references:
+            self.bump_store_version(store_id)
+        if errors:
+            raise BatchUploadError(
+                f"Failed to upload {len(errors)} of {total} record(s)",
+                references=references,
+                errors=errors,
+            )
+        return references
 
     def _upload_file(
         self,
@@ -203,28 +245,26 @@ class GeminiFileSearchStore(FileSearchStore):
         metadata: list,
         max_tokens_per_chunk: int,
         max_overlap_tokens: int,
+        pages=None,
     ):
-        """Upload text content to the store via temp file."""
+        """Upload text content (or a page source, written page by page) via temp file."""
+        record = TextRecord(record_id=display_name, content=content, pages=pages)
         with tempfile.NamedTemporaryFile(
             mode="w", suffix=".txt", delete=False, encoding="utf-8"
         ) as temp_file:
-            temp_file.write(content)
             temp_path = temp_file.name
 
         try:
-            return self.client.file_search_stores.upload_to_file_search_store(
-                file=temp_path,
-                file_search_store_name=store_id,
-                config={
-                    "display_name": display_name,
-                    "custom_metadata": metadata,
-                    "chunking_config": {
-                        "white_space_config": {
-                            "max_tokens_per_chunk": max_tokens_per_chunk,
-                            "max_overlap_tokens": max_overlap_tokens,
-                        }
-                    },
-                },
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                for piece in record.iter_text():
+                    handle.write(piece)
+            return self._upload_file(
+                store_id=store_id,
+                file_path=temp_path,
+                display_name=display_name,
+                metadata=metadata,
+                max_tokens_per_chunk=max_tokens_per_chunk,
+                max_overlap_tokens=max_overlap_tokens,
             )
         finally:
             try:
@@ -252,37 +292,83 @@ class GeminiFileSearchStore(FileSearchStore):
         display_name: str | None = None,
         **options,
     ) -> DocumentReference:
-        """Add a raw text record to a Gemini store."""
-        max_tokens_per_chunk = options.get("max_tokens_per_chunk", 200)
-        max_overlap_tokens = options.get("max_overlap_tokens", 20)
-        metadata_entries = self._build_generic_metadata(metadata)
+        """
+        Add a raw text record to a Gemini store.
 
-        try:
-            operation = self._upload_text(
-                store_id=store_id,
+        Gemini chunks server-side; the token budget defaults to the chunking
+        config for the record's document type (see file_search.chunking).
+        """
+        job = self._text_record_job(
+            store_id,
+            TextRecord(
+                record_id=record_id,
                 content=content,
-                display_name=display_name or record_id,
-                metadata=metadata_entries,
-                max_tokens_per_chunk=max_tokens_per_chunk,
-                max_overlap_tokens=max_overlap_tokens,
-            )
-
-            while not operation.done:
-                time.sleep(2)
-                operation = self.client.operations.get(operation)
+                metadata=metadata,
+                display_name=display_name,
+                pages=options.pop("pages", None),
+            ),
+            options,
+        )
+        result = self._run_uploads([job])[0]
+        if isinstance(result, Exception):
+            raise DocumentUploadError(
+                f"Failed to upload record '{record_id}': {result}"
+            ) from result
+
+        self.bump_store_version(store_id)
+        return DocumentReference(
+            document_id=None,
+            store_id=store_id,
+            backend_ref_id=_file_id(result) or record_id,
+            display_name=display_name or record_id,
+        )
 
-            file_id = None
-            if hasattr(operation, "response") and operation.response:
-                file_id = getattr(operation.response, "name", None)
+    def add_text_records(
+        self,
+        store_id: str,
+        records: list[TextRecord],
+        **options,
+    ) -> list[DocumentReference]:
+        """
+        Upload many text records concurrently (see gemini_uploads.UploadScheduler).
 
-            return DocumentReference(
-                document_id=None,
-                store_id=store_id,
-                backend_ref_id=file_id or record_id,
-                display_name=display_name or record_id,
+        Raises:
+            BatchUploadError: If any upload failed; the records that were
+                uploaded are listed on the exception
+        """
+        jobs = [self._text_record_job(store_id, record, options) for record in records]
+        results = self._run_uploads(jobs)
+
+        references = []
+        errors = {}
+        for record, result in zip(records, results):
+            if isinstance(result, Exception):
+                errors[record.record_id] = result
+                continue
+            references.append(
+                DocumentReference(
+                    document_id=None,
+                    store_id=store_id,
+                    backend_ref_id=_file_id(result) or record.record_id,
+                    display_name=record.display_name or record.record_id,
+                )
             )
-        except Exception as e:
-            raise DocumentUploadError(f"Failed to upload record '{record_id}': {e}") from e
+        return self._finish_batch(store_id, references, errors, len(records))
+
+    def _text_record_job(self, store_id: str, record: TextRecord, options: dict) -> UploadJob:
+        chunking = get_chunking_config(record.metadata.get("document_type"))
+        return UploadJob(
+            name=record.record_id,
+            kwargs={
+                "store_id": store_id,
+                "content": record.content,
+                "pages": record.pages,
+                "display_name": record.display_name or record.record_id,
+                "metadata": self._build_generic_metadata(record.metadata),
+                "max_tokens_per_chunk": options.get("max_tokens_per_chunk", chunking["max_tokens"]),
+                "max_overlap_tokens": options.get("max_overlap_tokens", chunking["overlap_tokens"]),
+            },
+        )
 
     def remove_text_record(self, store_id: str, record_id: str) -> None:
         """Remove a text record from a Gemini store."""
@@ -300,8 +386,15 @@ class GeminiFileSearchStore(FileSearchStore):
         *,
         max_results: int = 5,
         filters: dict | None = None,
+        mode: str | None = None,
     ) -> SearchResult:
-        """Search the store using Gemini's RAG capabilities."""
+        """
+        Search the store using Gemini's RAG capabilities.
+
+        Retrieval is managed by Gemini, so ``mode`` is accepted for interface
+        compatibility and always resolves to vector search.
+        """
+        self.resolve_search_mode(mode)
         file_search_config = {"file_search_store_names": [store_id]}
 
         # Add metadata filter if provided
@@ -487,5 +580,11 @@ class GeminiFileSearchStore(FileSearchStore):
         )
 
 
+def _file_id(operation) -> str | None:
+    """Return the uploaded file's name from a completed upload operation."""
+    response = getattr(operation, "response", None)
+    return getattr(response, "name", None) if response else None
+
+
 # Register as default backend
 FileSearchRegistry.register("gemini", GeminiFileSearchStore, set_default=True)
@@ -0,0 +1,286 @@
+"""
+Concurrent uploads to Gemini File Search.
+
+Each upload to a File Search store returns a long-running operation that
+has to be polled until Gemini finishes chunking and embedding the file.
+Uploading and polling one record at a time serializes bulk indexing at
+several seconds per record. UploadScheduler instead keeps a bounded window
+of uploads in flight:
+
+- uploads start on a small thread pool (the SDK call blocks while the file
+  is sent)
+- a single loop polls every pending operation in one pass per interval
+- rate-limit errors (HTTP 429 / RESOURCE_EXHAUSTED) pause new uploads with
+  exponential backoff and the affected upload is retried
+- every job has a deadline (GEMINI_UPLOAD_JOB_TIMEOUT seconds from its first
+  start); a job still uploading, pending or backing off past it fails with
+  UploadTimeoutError, so one stuck operation cannot hang the batch
+
+Usage:
+    scheduler = UploadScheduler(client, start_upload)
+    results = scheduler.run(jobs)  # operation or exception per job, in order
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_MARKERS = ("resource_exhausted", "rate limit", "too many requests", "quota")
+
+
+class UploadTimeoutError(TimeoutError):
+    """An upload did not finish before its job deadline."""
+
+
+@dataclass
+class UploadJob:
+    """One upload: the arguments for the start callable plus retry state."""
+
+    name: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    operation: Any = None
+    deadline: float | None = None
+
+
+@dataclass
+class UploadStats:
+    """Counters for one UploadScheduler.run()."""
+
+    uploaded: int = 0
+    failed: int = 0
+    rate_limited: int = 0
+    polls: int = 0
+    timed_out: int = 0
+    duration_s: float = 0.0
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    """Whether an SDK error is a rate-limit / quota response."""
+    if getattr(exc, "code", None) == 429 or getattr(exc, "status_code", None) == 429:
+        return True
+    message = str(exc).lower()
+    return "429" in message or any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+class UploadScheduler:
+    """
+    Runs many uploads with a bounded in-flight window and a single poller.
+
+    Args:
+        client: google-genai client (or a fake exposing ``operations.get``)
+        start_upload: Callable taking an UploadJob's kwargs and returning the
+            upload's operation
+    """
+
+    def __init__(
+        self,
+        client,
+        start_upload: Callable[..., Any],
+        *,
+        concurrency: int | None = None,
+        max_in_flight: int | None = None,
+        poll_interval: float | None = None,
+        max_retries: int | None = None,
+        backoff: float | None = None,
+        max_backoff: float | None = None,
+        job_timeout: float | None = None,
+    ):
+        self.client = client
+        self.start_upload = start_upload
+        self.concurrency = max(1, _setting(concurrency, "GEMINI_UPLOAD_CONCURRENCY", 4))
+        self.max_in_flight = max(
+            self.concurrency, _setting(max_in_flight, "GEMINI_UPLOAD_MAX_IN_FLIGHT", 16)
+        )
+        self.poll_interval = float(_setting(poll_interval, "GEMINI_UPLOAD_POLL_INTERVAL", 2.0))
+        self.max_retries = _setting(max_retries, "GEMINI_UPLOAD_MAX_RETRIES", 5)
+        self.backoff = float(_setting(backoff, "GEMINI_UPLOAD_BACKOFF", 2.0))
+        self.max_backoff = float(_setting(max_backoff, "GEMINI_UPLOAD_MAX_BACKOFF", 60.0))
+        self.job_timeout = float(_setting(job_timeout, "GEMINI_UPLOAD_JOB_TIMEOUT", 600.0))
+        self.stats = UploadStats()
+
+    def run(self, jobs: list[UploadJob]) -> list[Any]:
+        """
+        Upload every job and wait for its operation to finish.
+
+        Returns:
+            For each job, in order, the completed operation or the exception
+            that made it fail
+        """
+        started = time.monotonic()
+        results: list[Any] = [None] * len(jobs)
+        queue = deque(enumerate(jobs))
+        starting: dict[Future, tuple[int, UploadJob]] = {}
+        polling: list[tuple[int, UploadJob]] = []
+        paused_until = 0.0
+        delay = self.backoff
+        next_poll = 0.0
+
+        # Not a context manager: an upload that outlived its deadline may still
+        # be blocked in the SDK, and the batch must not wait for it.
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="gemini-upload"
+        )
+        try:
+            while queue or starting or polling:
+                now = time.monotonic()
+
+                # Start uploads while the window has room
+                while (
+                    queue
+                    and now >= paused_until
+                    and len(starting) + len(polling) < self.max_in_flight
+                ):
+                    index, job = queue.popleft()
+                    job.attempts += 1
+                    if job.deadline is None:
+                        job.deadline = now + self.job_timeout
+                    starting[executor.submit(self.start_upload, **job.kwargs)] = (index, job)
+
+                # Collect uploads that have been sent
+                for future in [future for future in starting if future.done()]:
+                    index, job = starting.pop(future)
+                    try:
+                        job.operation = future.result()
+                    except Exception as exc:  # noqa: BLE001 - recorded per job
+                        if is_rate_limited(exc) and job.attempts <= self.max_retries:
+                            self.stats.rate_limited += 1
+                            paused_until = time.monotonic() + delay * (1 + random.random() / 2)
+                            logger.info("Gemini upload rate limited; backing off %.1fs", delay)
+                            delay = min(delay * 2, self.max_backoff)
+                            queue.appendleft((index, job))
+                        else:
+                            self._fail(results, index, job, exc)
+                        continue
+                    delay = self.backoff
+                    if getattr(job.operation, "done", False):
+                        self._finish(results, index, job)
+                    else:
+                        polling.append((index, job))
+
+                # Poll every pending operation in one pass
+                if polling and time.monotonic() >= next_poll:
+                    polling = self._poll(polling, results)
+                    next_poll = time.monotonic() + self.poll_interval
+
+                queue, polling = self._expire(queue, starting, polling, results)
+
+                if not (queue or starting or polling):
+                    break
+
+                # Wait for the next upload to finish, the next poll, the end of a
+                # backoff or the next job deadline
+                now = time.monotonic()
+                deadlines = [
+                    job.deadline
+                    for _, job in [*queue, *starting.values(), *polling]
+                    if job.deadline is not None
+                ]
+                if polling:
+                    deadlines.append(next_poll)
+                if (
+                    queue
+                    and paused_until > now
+                    and len(starting) + len(polling) < self.max_in_flight
+                ):
+                    deadlines.append(paused_until)
+                timeout = max(0.0, min(deadlines) - now) if deadlines else None
+                if starting:
+                    wait(list(starting), timeout=timeout, return_when=FIRST_COMPLETED)
+                elif timeout:
+                    time.sleep(timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.stats.duration_s = time.monotonic() - started
+        logger.info(
+            "Uploaded %d file(s) to Gemini (%d failed, %d timed out, %d rate limited, "
+            "%d polls) in %.1fs",
+            self.stats.uploaded,
+            self.stats.failed,
+            self.stats.timed_out,
+            self.stats.rate_limited,
+            self.stats.polls,
+            self.stats.duration_s,
+        )
+        return results
+
+    def _expire(self, queue, starting, polling, results):
+        """Fail every job past its deadline; returns the remaining queue and polling list."""
+        now = time.monotonic()
+
+        def expired(job: UploadJob) -> bool:
+            return job.deadline is not None and now >= job.deadline
+
+        for future, (index, job) in list(starting.items()):
+            if expired(job):
+                del starting[future]
+                future.cancel()
+                self._time_out(results, index, job)
+        for index, job in [*queue, *polling]:
+            if expired(job):
+                self._time_out(results, index, job)
+        return (
+            deque(item for item in queue if not expired(item[1])),
+            [item for item in polling if not expired(item[1])],
+        )
+
+    def _time_out(self, results: list[Any], index: int, job: UploadJob) -> None:
+        self.stats.timed_out += 1
+        self._fail(
+            results,
+            index,
+            job,
+            UploadTimeoutError(f"Upload did not finish within {self.job_timeout:.0f}s"),
+        )
+
+    def _poll(
+        self, polling: list[tuple[int, UploadJob]], results: list[Any]
+    ) -> list[tuple[int, UploadJob]]:
+        pending = []
+        for index, job in polling:
+            self.stats.polls += 1
+            try:
+                job.operation = self.client.operations.get(job.operation)
+            except Exception as exc:  # noqa: BLE001 - transient poll failures are retried
+                if is_rate_limited(exc):
+                    pending.append((index, job))
+                    continue
+                self._fail(results, index, job, exc)
+                continue
+            if getattr(job.operation, "done", False):
+                self._finish(results, index, job)
+            else:
+                pending.append((index, job))
+        return pending
+
+    def _finish(self, results: list[Any], index: int, job: UploadJob) -> None:
+        # Operation.error is a dict ({"code", "message"}) when the import failed
+        error = getattr(job.operation, "error", None)
+        if isinstance(error, dict) and error:
+            self._fail(results, index, job, RuntimeError(str(error)))
+            return
+        self.stats.uploaded += 1
+        results[index] = job.operation
+
+    def _fail(self, results: list[Any], index: int, job: UploadJob, exc: Exception) -> None:
+        logger.warning("Gemini upload of %s failed: %s", job.name, exc)
+        self.stats.failed += 1
+        results[index] = exc
+
+
+def _setting(value, name: str, default):
+    if value is not None:
+        return value
+    return type(default)(getattr(settings, name, default))
@@ -7,15 +7,26 @@ enabling interchangeable use of different search technologies.
 
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Generator
 from typing import TYPE_CHECKING
 
-from .types import DocumentReference, SearchResult, StoreInfo
+from django.conf import settings
+
+from .exceptions import SearchError
+from .query_cache import bump_store_version
+from .types import DocumentReference, SearchResult, StoreInfo, TextRecord
 
 if TYPE_CHECKING:
     from documents.models import Document
 
+# Ranking modes for FileSearchStore.search()
+SEARCH_MODE_VECTOR = "vector"
+SEARCH_MODE_LEXICAL = "lexical"
+SEARCH_MODE_HYBRID = "hybrid"
+SEARCH_MODES = (SEARCH_MODE_VECTOR, SEARCH_MODE_LEXICAL, SEARCH_MODE_HYBRID)
+
 
 class FileSearchStore(ABC):
     """
@@ -98,6 +109,55 @@ class FileSearchStore(ABC):
         """
         pass
 
+    def get_store_cached(self, store_id: str) -> StoreInfo | None:
+        """
+        get_store() with a short-lived per-process cache of found stores.
+
+        Hot paths such as ensure_project_store() only need to know that a
+        store still exists; re-checking on every call costs a backend round
+        trip. Positive results are trusted for FILE_SEARCH_STORE_CHECK_TTL
+        seconds; misses are never cached. delete_store() implementations call
+        forget_store() so deletions are seen immediately in this process.
+
+        Args:
+            store_id: Backend-specific store identifier
+
+        Returns:
+            StoreInfo if found, None otherwise
+        """
+        ttl = float(getattr(settings, "FILE_SEARCH_STORE_CHECK_TTL", 300))
+        checked = self._checked_stores()
+        cached = checked.get(store_id)
+        if cached and time.monotonic() - cached[1] < ttl:
+            return cached[0]
+
+        store_info = self.get_store(store_id)
+        if store_info:
+            self.remember_store(store_info)
+        else:
+            checked.pop(store_id, None)
+        return store_info
+
+    def remember_store(self, store_info: StoreInfo) -> None:
+        """Record a store as known to exist (e.g. right after creating it)."""
+        self._checked_stores()[store_info.store_id] = (store_info, time.monotonic())
+
+    def forget_store(self, store_id: str) -> None:
+        """Drop a store from the get_store_cached() cache."""
+        self._checked_stores().pop(store_id, None)
+
+    def _checked_stores(self) -> dict[str, tuple[StoreInfo, float]]:
+        # Lazily created so subclasses need not call super().__init__()
+        return self.__dict__.setdefault("_store_check_cache", {})
+
+    def bump_store_version(self, store_id: str) -> None:
+        """
+        Record a write so cached search results for the store stop matching.
+
+        Backends call this after every write (see file_search.query_cache).
+        """
+        bump_store_version(self.backend_name, store_id)
+
     @abstractmethod
     def list_stores(self) -> Generator[StoreInfo]:
         """
@@ -137,6 +197,32 @@ class FileSearchStore(ABC):
         """
         pass
 
+    def add_documents(
+        self,
+        store_id: str,
+        documents: list[Document],
+        **options,
+    ) -> list[DocumentReference]:
+        """
+        Add many documents to a store.
+
+        Default implementation calls add_document() once per document.
+        Backends with slow per-upload round-trips override this to upload
+        concurrently.
+
+        Args:
+            store_id: Target store identifier
+            documents: Django Document model instances
+            **options: Backend-specific options
+
+        Returns:
+            DocumentReference for each document, in input order
+
+        Raises:
+            BatchUploadError: If only some documents were added (overrides)
+        """
+        return [self.add_document(store_id, document, **options) for document in documents]
+
     @abstractmethod
     def remove_document(self, store_id: str, backend_ref_id: str) -> None:
         """
@@ -166,6 +252,8 @@ class FileSearchStore(ABC):
         """
         Add a raw text record to a store.
 
+        Implementations call bump_store_version() once the write succeeds.
+
         Args:
             store_id: Target store identifier
             record_id: Stable identifier for the record (used for updates)
@@ -184,12 +272,117 @@ class FileSearchStore(ABC):
         """
         Remove a text record from a store by record ID.
 
+        Implementations call bump_store_version() after removing the record.
+
         Args:
             store_id: Store identifier
             record_id: Stable identifier used during indexing
         """
         pass
 
+    def add_text_records(
+        self,
+        store_id: str,
+        records: list[TextRecord],
+        **options,
+    ) -> list[DocumentReference]:
+        """
+        Add many raw text records to a store.
+
+        Default implementation calls add_text_record() once per record.
+        Backends whose APIs accept lists should override this to send the
+        whole batch in as few round-trips as possible.
+
+        Args:
+            store_id: Target store identifier
+            records: Records to add
+            **options: Backend-specific options
+
+        Returns:
+            DocumentReference for each record, in input order
+
+        Raises:
+            BatchUploadError: If only some records were added; ``references``
+                holds the ones that were written (overrides)
+        """
+        return [
+            self.add_text_record(
+                store_id,
+                record_id=record.record_id,
+                content=record.content,
+                metadata=record.metadata,
+                display_name=record.display_name,
+                **_record_options(record, options),
+            )
+            for record in records
+        ]
+
+    def remove_text_records(self, store_id: str, record_ids: list[str]) -> None:
+        """
+        Remove many text records from a store by record ID.
+
+        Default implementation calls remove_text_record() once per record.
+
+        Args:
+            store_id: Store identifier
+            record_ids: Stable identifiers used during indexing
+        """
+        for record_id in record_ids:
+            self.remove_text_record(store_id, record_id)
+
+    def upsert_text_records(
+        self,
+        store_id: str,
+        records: list[TextRecord],
+        **options,
+    ) -> list[DocumentReference]:
+        """
+        Replace many text records, adding any that do not exist yet.
+
+        Default implementation removes the records and re-adds them. Backends
+        that can diff stored chunks should override this so unchanged chunks
+        are not re-embedded and metadata-only changes skip embedding entirely.
+
+        Args:
+            store_id: Target store identifier
+            records: Records to write
+            **options: Backend-specific options
+
+        Returns:
+            DocumentReference for each record, in input order
+        """
+        try:
+            self.remove_text_records(store_id, [record.record_id for record in records])
+        except Exception:
+            pass
+        return self.add_text_records(store_id, records, **options)
+
+    def upsert_text_record(
+        self,
+        store_id: str,
+        *,
+        record_id: str,
+        content: str,
+        metadata: dict,
+        display_name: str | None = None,
+        **options,
+    ) -> DocumentReference:
+        """
+        Replace a single text record. See upsert_text_records().
+
+        Returns:
+            DocumentReference with the record's location in the store
+        """
+        record = TextRecord(
+            record_id=record_id,
+            content=content,
+            metadata=metadata,
+            display_name=display_name,
+            page_offsets=options.pop("page_offsets", None),
+            pages=options.pop("pages", None),
+        )
+        return self.upsert_text_records(store_id, [record], **options)[0]
+
     # -------------------------------------------------------------------------
     # Search
     # -------------------------------------------------------------------------
@@ -202,6 +395,7 @@ class FileSearchStore(ABC):
         *,
         max_results: int = 5,
         filters: dict | None = None,
+        mode: str | None = None,
     ) -> SearchResult:
         """
         Search the store and return results with sources.
@@ -211,6 +405,8 @@ class FileSearchStore(ABC):
             query: Search query string
             max_results: Maximum number of source documents to return
             filters: Optional metadata filters (backend-specific format)
+            mode: Ranking mode ("vector", "lexical" or "hybrid"). Defaults to
+                FILE_SEARCH_MODE; see resolve_search_mode().
 
         Returns:
             SearchResult with answer and source citations
@@ -221,6 +417,26 @@ class FileSearchStore(ABC):
         """
         pass
 
+    @property
+    def search_modes(self) -> tuple[str, ...]:
+        """Ranking modes this backend supports; the first is its default."""
+        return (SEARCH_MODE_VECTOR,)
+
+    def resolve_search_mode(self, mode: str | None = None) -> str:
+        """
+        Pick the ranking mode for a search.
+
+        Falls back to FILE_SEARCH_MODE, then to the backend default when the
+        requested mode is one this backend does not support.
+
+        Raises:
+            SearchError: If mode is not a known ranking mode
+        """
+        mode = mode or getattr(settings, "FILE_SEARCH_MODE", None) or self.search_modes[0]
+        if mode not in SEARCH_MODES:
+            raise SearchError(f"Unknown search mode: {mode}")
+        return mode if mode in self.search_modes else self.search_modes[0]
+
     # -------------------------------------------------------------------------
     # Helper Methods (optional overrides)
     # -------------------------------------------------------------------------
@@ -302,3 +518,13 @@ class FileSearchStore(ABC):
             metadata["author_id"] = document.created_by.id
 
         return metadata
+
+
+def _record_options(record: TextRecord, options: dict) -> dict:
+    """Merge per-record options (page offsets, page source) into add_text_record() kwargs."""
+    options = dict(options)
+    if record.page_offsets is not None:
+        options["page_offsets"] = record.page_offsets
+    if record.pages is not None:
+        options["pages"] = record.pages
+    return options
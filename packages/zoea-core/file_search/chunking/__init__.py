@@ -0,0 +1,42 @@
+"""
+Chunking strategies shared by file search backends.
+
+Backends that embed text themselves (ChromaDB) split records with the
+strategy configured for the record's document type; backends that chunk
+server-side (Gemini) take their token budget from the same configuration.
+
+Available strategies:
+- sentence: sentence windows with overlap (default)
+- markdown: heading-aware sections
+- yoopta: Yoopta editor blocks
+- csv_rows: header-prefixed CSV row groups
+
+Example usage:
+    from file_search.chunking import ChunkerRegistry
+
+    chunker = ChunkerRegistry.for_document_type("Markdown")
+    for chunk in chunker.chunk(text):
+        print(chunk.start, chunk.metadata.get("section"), chunk.text)
+"""
+
+from .base import CHARS_PER_TOKEN, Chunk, Chunker, estimate_tokens
+
+# Import strategies to trigger registration
+from .csv_rows import CSVRowGroupChunker
+from .markdown import MarkdownChunker
+from .registry import ChunkerRegistry, get_chunking_config
+from .sentence import SentenceWindowChunker
+from .yoopta import YooptaChunker
+
+__all__ = [
+    "CHARS_PER_TOKEN",
+    "Chunk",
+    "Chunker",
+    "ChunkerRegistry",
+    "CSVRowGroupChunker",
+    "MarkdownChunker",
+    "SentenceWindowChunker",
+    "YooptaChunker",
+    "estimate_tokens",
+    "get_chunking_config",
+]
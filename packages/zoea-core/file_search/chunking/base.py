@@ -0,0 +1,218 @@
+"""
+Base class and shared helpers for chunking strategies.
+
+Budgets are expressed in tokens and converted to characters with a fixed
+ratio, which is close enough for embedding-model limits without pulling in a
+tokenizer. Every helper walks the text once, so strategies stay linear in the
+size of the input.
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+
+DEFAULT_MAX_TOKENS = 256
+DEFAULT_OVERLAP_TOKENS = 32
+
+# End of a sentence (terminal punctuation, optional closing quote/bracket,
+# then whitespace) or a blank line.
+SENTENCE_BOUNDARY = re.compile(r"[.!?][\"')\]]*\s+|\n[ \t]*\n\s*")
+
+Span = tuple[int, int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count for a piece of text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+@dataclass
+class Chunk:
+    """
+    A chunk of a record's text.
+
+    ``start``/``end`` give the character span of the chunk in the source text
+    so callers can map chunks back to pages or lines. Strategies that add
+    context (e.g. a repeated CSV header) may return text that is not an exact
+    slice of that span.
+    """
+
+    text: str
+    start: int
+    end: int
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def token_count(self) -> int:
+        return estimate_tokens(self.text)
+
+
+class Chunker(ABC):
+    """
+    Abstract interface for chunking strategies.
+
+    Implementations split text into chunks of at most ``max_tokens`` (except
+    where a strategy documents otherwise) and should run in linear time.
+    """
+
+    name: str = ""
+
+    def __init__(
+        self,
+        *,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    @property
+    def max_chars(self) -> int:
+        return self.max_tokens * CHARS_PER_TOKEN
+
+    @property
+    def overlap_chars(self) -> int:
+        return self.overlap_tokens * CHARS_PER_TOKEN
+
+    @abstractmethod
+    def chunk(self, text: str) -> Iterator[Chunk]:
+        """
+        Split text into chunks.
+
+        Args:
+            text: Full text of the record
+
+        Yields:
+            Chunk objects in document order
+        """
+        pass
+
+    def chunk_pages(self, pages: Iterable[tuple[int, str]],
+                    separator: str = "\n\n") -> Iterator[Chunk]:
+        """
+        Chunk paginated text one page at a time.
+
+        Pages are never joined, so only one page's text is held at once and
+        chunks do not cross page boundaries. Chunk spans are offsets into the
+        pages joined with ``separator``, and each chunk's metadata records
+        its ``page_number``.
+
+        Args:
+            pages: (page_number, text) pairs in order
+
+        Yields:
+            Chunk objects in document order
+        """
+        position = 0
+        for index, (number, text) in enumerate(pages):
+            if index:
+                position += len(separator)
+            for chunk in self.chunk(text):
+                chunk.start += position
+                chunk.end += position
+                chunk.metadata["page_number"] = number
+                yield chunk
+            position += len(text)
+
+    def chunk_window(self, text: str, start: int, end: int, **metadata) -> Iterator[Chunk]:
+        """Sentence-window chunks for text[start:end], tagged with metadata."""
+        spans = iter_sentence_spans(text, start, end, self.max_chars)
+        for chunk_start, chunk_end in pack_spans(spans, self.max_chars, self.overlap_chars):
+            yield Chunk(text[chunk_start:chunk_end], chunk_start, chunk_end, dict(metadata))
+
+
+def strip_span(text: str, start: int, end: int) -> Span | None:
+    """Shrink a span to exclude surrounding whitespace; None if it is blank."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if start < end else None
+
+
+def iter_sentence_spans(text: str, start: int = 0, end: int | None = None,
+                        max_chars: int | None = None) -> Iterator[Span]:
+    """
+    Yield stripped sentence spans within text[start:end].
+
+    Sentences longer than ``max_chars`` are split at the last whitespace that
+    fits (or hard-split when there is none) so no span exceeds the budget.
+    """
+    end = len(text) if end is None else end
+    position = start
+    for match in SENTENCE_BOUNDARY.finditer(text, start, end):
+        span = strip_span(text, position, match.end())
+        position = match.end()
+        if span:
+            yield from _split_long_span(text, span, max_chars)
+    span = strip_span(text, position, end)
+    if span:
+        yield from _split_long_span(text, span, max_chars)
+
+
+def iter_block_spans(text: str, start: int = 0, end: int | None = None) -> Iterator[Span]:
+    """Yield stripped spans of blank-line separated blocks within text[start:end]."""
+    end = len(text) if end is None else end
+    position = start
+    while position < end:
+        boundary = text.find("\n\n", position, end)
+        if boundary == -1:
+            boundary = end
+        span = strip_span(text, position, boundary)
+        if span:
+            yield span
+        position = boundary + 2
+
+
+def pack_spans(spans: Iterable[Span], max_chars: int, overlap_chars: int = 0) -> Iterator[Span]:
+    """
+    Greedily pack consecutive spans into windows of at most ``max_chars``.
+
+    Consecutive windows share trailing spans covering up to ``overlap_chars``.
+    Each span enters and leaves the window once, so packing is linear.
+    """
+    window: deque[Span] = deque()
+    for span in spans:
+        if window and span[1] - window[0][0] > max_chars:
+            yield window[0][0], window[-1][1]
+            while window and window[-1][1] - window[0][0] > overlap_chars:
+                window.popleft()
+            while window and span[1] - window[0][0] > max_chars:
+                window.popleft()
+        window.append(span)
+    if window:
+        yield window[0][0], window[-1][1]
+
+
+def _split_long_span(text: str, span: Span, max_chars: int | None) -> Iterator[Span]:
+    start, end = span
+    if not max_chars or end - start <= max_chars:
+        yield span
+        return
+
+    while end - start > max_chars:
+        cut = start + max_chars
+        space = text.rfind(" ", start + 1, cut)
+        if space == -1:
+            space = text.rfind("\n", start + 1, cut)
+        if space != -1:
+            cut = space
+        piece = strip_span(text, start, cut)
+        if piece:
+            yield piece
+        start = cut
+        while start < end and text[start].isspace():
+            start += 1
+    if start < end:
+        yield start, end
@@ -0,0 +1,66 @@
+"""
+Throughput benchmark for chunking strategies.
+
+Used by the benchmark_chunkers management command and handy from a shell:
+
+    from file_search.chunking import ChunkerRegistry
+    from file_search.chunking.benchmark import benchmark_chunker
+
+    result = benchmark_chunker(ChunkerRegistry.get("markdown"), texts)
+    print(result.chunks_per_second)
+"""
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .base import Chunker
+
+
+@dataclass
+class ChunkerBenchmark:
+    """Results of running a chunker over a corpus."""
+
+    strategy: str
+    documents: int = 0
+    chunks: int = 0
+    chars: int = 0
+    tokens: int = 0
+    max_chunk_tokens: int = 0
+    duration_s: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.duration_s if self.duration_s else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.chars / 1_000_000 / self.duration_s if self.duration_s else 0.0
+
+    @property
+    def avg_chunk_tokens(self) -> float:
+        return self.tokens / self.chunks if self.chunks else 0.0
+
+    @property
+    def chunks_per_document(self) -> float:
+        return self.chunks / self.documents if self.documents else 0.0
+
+
+def benchmark_chunker(
+    chunker: Chunker, texts: Iterable[str], *, repeat: int = 1
+) -> ChunkerBenchmark:
+    """Chunk every text ``repeat`` times and report throughput."""
+    texts = list(texts)
+    result = ChunkerBenchmark(strategy=chunker.name)
+    started = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        for text in texts:
+            result.documents += 1
+            result.chars += len(text)
+            for chunk in chunker.chunk(text):
+                tokens = chunk.token_count
+                result.chunks += 1
+                result.tokens += tokens
+                result.max_chunk_tokens = max(result.max_chunk_tokens, tokens)
+    result.duration_s = time.perf_counter() - started
+    return result
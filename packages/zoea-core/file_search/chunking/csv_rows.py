@@ -0,0 +1,78 @@
+"""
+CSV row-group chunking.
+
+Rows are grouped up to the token budget and every chunk repeats the header
+row, so each chunk is a self-describing table fragment. Quoted fields that
+span lines are kept within their row, and a row larger than the budget
+becomes a chunk of its own. Chunks record the 1-based data row range they
+cover.
+"""
+
+from collections.abc import Iterator
+
+from .base import Chunk, Chunker, Span, strip_span
+from .registry import ChunkerRegistry
+
+
+class CSVRowGroupChunker(Chunker):
+    """Group CSV rows into header-prefixed chunks."""
+
+    name = "csv_rows"
+
+    def chunk(self, text: str) -> Iterator[Chunk]:
+        rows = self._iter_rows(text)
+        header_span = next(rows, None)
+        if header_span is None:
+            return
+        header = text[header_span[0]:header_span[1]]
+        budget = max(self.max_chars - len(header) - 1, 1)
+
+        group_start = group_end = None
+        first_row = row_number = 0
+        for row_number, (start, end) in enumerate(rows, start=1):
+            if group_start is not None and end - group_start > budget:
+                yield self._chunk(text, header, group_start, group_end, first_row, row_number - 1)
+                group_start = None
+            if group_start is None:
+                group_start, first_row = start, row_number
+            group_end = end
+
+        if group_start is not None:
+            yield self._chunk(text, header, group_start, group_end, first_row, row_number)
+        elif row_number == 0:
+            yield Chunk(header, header_span[0], header_span[1], {"row_start": 0, "row_end": 0})
+
+    def _chunk(self, text: str, header: str, start: int, end: int,
+               row_start: int, row_end: int) -> Chunk:
+        return Chunk(
+            f"{header}\n{text[start:end]}",
+            start,
+            end,
+            {"row_start": row_start, "row_end": row_end},
+        )
+
+    def _iter_rows(self, text: str) -> Iterator[Span]:
+        """Yield stripped spans of CSV records, joining lines inside quoted fields."""
+        row_start = 0
+        in_quotes = False
+        position = 0
+        length = len(text)
+        while position < length:
+            newline = text.find("\n", position)
+            if newline == -1:
+                newline = length
+            if text.count('"', position, newline) % 2:
+                in_quotes = not in_quotes
+            position = newline + 1
+            if not in_quotes:
+                span = strip_span(text, row_start, newline)
+                if span:
+                    yield span
+                row_start = position
+        if in_quotes:
+            span = strip_span(text, row_start, length)
+            if span:
+                yield span
+
+
+ChunkerRegistry.register("csv_rows", CSVRowGroupChunker)
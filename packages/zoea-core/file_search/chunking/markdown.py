@@ -0,0 +1,90 @@
+"""
+Markdown heading-aware chunking.
+
+Text is split into sections at ATX headings (``#`` .. ``######``) outside
+fenced code blocks. Small neighbouring sections are merged up to the budget;
+sections larger than the budget are split with the sentence window. Each
+chunk records the heading path of the section it starts in.
+"""
+
+import re
+from collections.abc import Iterator
+
+from .base import Chunk, Chunker, strip_span
+from .registry import ChunkerRegistry
+
+HEADING = re.compile(r"(#{1,6})[ \t]+(.+?)[ \t#]*$")
+FENCE = re.compile(r"(```|~~~)")
+
+
+class MarkdownChunker(Chunker):
+    """Chunk markdown along heading boundaries."""
+
+    name = "markdown"
+
+    def chunk(self, text: str) -> Iterator[Chunk]:
+        group_start = group_end = None
+        group_section = ""
+
+        for start, end, section in self._iter_sections(text):
+            if end - start > self.max_chars:
+                if group_start is not None:
+                    yield self._section_chunk(text, group_start, group_end, group_section)
+                    group_start = None
+                yield from self.chunk_window(text, start, end, section=section)
+                continue
+
+            if group_start is not None and end - group_start > self.max_chars:
+                yield self._section_chunk(text, group_start, group_end, group_section)
+                group_start = None
+
+            if group_start is None:
+                group_start, group_section = start, section
+            group_end = end
+
+        if group_start is not None:
+            yield self._section_chunk(text, group_start, group_end, group_section)
+
+    def _section_chunk(self, text: str, start: int, end: int, section: str) -> Chunk:
+        return Chunk(text[start:end], start, end, {"section": section} if section else {})
+
+    def _iter_sections(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield (start, end, heading path) for each non-blank section."""
+        path: list[tuple[int, str]] = []
+        section_start = 0
+        section_path = ""
+        in_fence = False
+        position = 0
+
+        for line in text.splitlines(keepends=True):
+            line_start = position
+            position += len(line)
+            stripped = line.strip()
+
+            if FENCE.match(stripped):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+
+            match = HEADING.match(stripped)
+            if not match:
+                continue
+
+            span = strip_span(text, section_start, line_start)
+            if span:
+                yield span[0], span[1], section_path
+
+            level = len(match.group(1))
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, match.group(2).strip()))
+            section_start = line_start
+            section_path = " > ".join(title for _, title in path)
+
+        span = strip_span(text, section_start, len(text))
+        if span:
+            yield span[0], span[1], section_path
+
+
+ChunkerRegistry.register("markdown", MarkdownChunker)
@@ -0,0 +1,97 @@
+"""
+Registry and per-document-type configuration for chunking strategies.
+
+FILE_SEARCH_CHUNKING maps a document type name (Document.get_type_name(),
+e.g. "Markdown") to a strategy and its budget. Keys missing from a type's
+entry fall back to the "default" entry, then to the built-in defaults:
+
+    FILE_SEARCH_CHUNKING = {
+        "default": {"strategy": "sentence", "max_tokens": 256, "overlap_tokens": 32},
+        "Markdown": {"strategy": "markdown"},
+    }
+"""
+
+from django.conf import settings
+
+from ..exceptions import ConfigurationError
+from .base import DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS, Chunker
+
+DEFAULT_CHUNKING = {
+    "strategy": "sentence",
+    "max_tokens": DEFAULT_MAX_TOKENS,
+    "overlap_tokens": DEFAULT_OVERLAP_TOKENS,
+}
+
+
+class ChunkerRegistry:
+    """
+    Registry for chunking strategies.
+
+    Usage:
+        ChunkerRegistry.register('sentence', SentenceWindowChunker)
+        chunker = ChunkerRegistry.get('sentence', max_tokens=128)
+        chunker = ChunkerRegistry.for_document_type('Markdown')
+    """
+
+    _chunkers: dict[str, type[Chunker]] = {}
+    _instances: dict[tuple, Chunker] = {}
+
+    @classmethod
+    def register(cls, name: str, chunker_class: type[Chunker]) -> None:
+        """
+        Register a chunking strategy.
+
+        Args:
+            name: Unique identifier for the strategy
+            chunker_class: Chunker subclass
+        """
+        if not issubclass(chunker_class, Chunker):
+            raise ConfigurationError(
+                f"Chunker class must be a subclass of Chunker, got {chunker_class.__name__}"
+            )
+        cls._chunkers[name] = chunker_class
+        cls._instances = {key: value for key, value in cls._instances.items() if key[0] != name}
+
+    @classmethod
+    def get(cls, name: str, **options) -> Chunker:
+        """
+        Get a (cached) chunker instance.
+
+        Chunkers are stateless, so one instance per (strategy, options) is
+        shared across callers.
+
+        Raises:
+            ConfigurationError: If the strategy is not registered
+        """
+        if name not in cls._chunkers:
+            available = ", ".join(cls._chunkers) or "none"
+            raise ConfigurationError(f"Chunker '{name}' not found. Available: {available}")
+
+        key = (name, tuple(sorted(options.items())))
+        if key not in cls._instances:
+            cls._instances[key] = cls._chunkers[name](**options)
+        return cls._instances[key]
+
+    @classmethod
+    def for_document_type(cls, document_type: str | None) -> Chunker:
+        """Get the chunker configured for a document type."""
+        config = get_chunking_config(document_type)
+        return cls.get(
+            config["strategy"],
+            max_tokens=config["max_tokens"],
+            overlap_tokens=config["overlap_tokens"],
+        )
+
+    @classmethod
+    def list_chunkers(cls) -> list[str]:
+        """List all registered strategy names."""
+        return list(cls._chunkers)
+
+
+def get_chunking_config(document_type: str | None) -> dict:
+    """Return the merged chunking config for a document type."""
+    configured = getattr(settings, "FILE_SEARCH_CHUNKING", None) or {}
+    config = {**DEFAULT_CHUNKING, **configured.get("default", {})}
+    if document_type:
+        config.update(configured.get(document_type, {}))
+    return config
@@ -0,0 +1,24 @@
+"""
+Sentence-window chunking with overlap.
+
+The default strategy for prose: sentences are packed into windows up to the
+token budget, and consecutive windows repeat trailing sentences so context
+that straddles a boundary is retrievable from either chunk.
+"""
+
+from collections.abc import Iterator
+
+from .base import Chunk, Chunker
+from .registry import ChunkerRegistry
+
+
+class SentenceWindowChunker(Chunker):
+    """Pack sentences into overlapping, token-budgeted windows."""
+
+    name = "sentence"
+
+    def chunk(self, text: str) -> Iterator[Chunk]:
+        yield from self.chunk_window(text, 0, len(text))
+
+
+ChunkerRegistry.register("sentence", SentenceWindowChunker)
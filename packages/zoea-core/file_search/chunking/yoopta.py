@@ -0,0 +1,84 @@
+"""
+Yoopta block-aware chunking.
+
+Works on YooptaDocument.get_text_content() output, where each editor block
+is separated by a blank line. Blocks are never split unless a single block
+exceeds the budget. Short single-line blocks without terminal punctuation
+are treated as headings: they start a new chunk once the current chunk has
+some content, and are never left dangling at the end of a chunk.
+"""
+
+from collections.abc import Iterator
+
+from .base import Chunk, Chunker, Span, iter_block_spans
+from .registry import ChunkerRegistry
+
+MAX_HEADING_CHARS = 80
+HEADING_MIN_FILL = 0.25
+
+
+class YooptaChunker(Chunker):
+    """Chunk Yoopta text along block boundaries, keeping headings with their content."""
+
+    name = "yoopta"
+
+    def chunk(self, text: str) -> Iterator[Chunk]:
+        group: list[Span] = []
+        section = ""
+        group_section = ""
+
+        for span in iter_block_spans(text):
+            start, end = span
+            heading = self._is_heading(text, span)
+
+            if end - start > self.max_chars:
+                # Split the block on its own, pulling a preceding heading along
+                if group and self._is_heading(text, group[-1]):
+                    start = group.pop()[0]
+                yield from self._flush(text, group, group_section)
+                group = []
+                yield from self.chunk_window(text, start, end, **self._meta(section))
+                continue
+
+            starts_section = heading and group and (
+                group[-1][1] - group[0][0] >= self.max_chars * HEADING_MIN_FILL
+            )
+            overflows = group and end - group[0][0] > self.max_chars
+            if starts_section or overflows:
+                carried = []
+                if (
+                    overflows
+                    and len(group) > 1
+                    and self._is_heading(text, group[-1])
+                    and end - group[-1][0] <= self.max_chars
+                ):
+                    carried = [group.pop()]
+                yield from self._flush(text, group, group_section)
+                group = carried
+                if carried:
+                    group_section = text[carried[0][0]:carried[0][1]]
+
+            if heading:
+                section = text[start:end]
+            if not group:
+                group_section = section
+            group.append(span)
+
+        yield from self._flush(text, group, group_section)
+
+    def _flush(self, text: str, group: list[Span], section: str) -> Iterator[Chunk]:
+        if group:
+            start, end = group[0][0], group[-1][1]
+            yield Chunk(text[start:end], start, end, self._meta(section))
+
+    def _meta(self, section: str) -> dict:
+        return {"section": section} if section else {}
+
+    def _is_heading(self, text: str, span: Span) -> bool:
+        start, end = span
+        if end - start > MAX_HEADING_CHARS or text.find("\n", start, end) != -1:
+            return False
+        return text[end - 1] not in ".!?:;,"
+
+
+ChunkerRegistry.register("yoopta", YooptaChunker)
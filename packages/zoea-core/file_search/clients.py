@@ -0,0 +1,115 @@
+"""
+Process-wide pool of file search backend clients and a small LRU for handles.
+
+Backend clients (ChromaDB, Gemini) are expensive to construct and safe to
+share, so every store instance in a process reuses the same client for a
+given configuration. HandleCache keeps recently used per-store handles (e.g.
+ChromaDB collections) so hot paths skip the catalog lookup.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+_clients: dict[tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(key: tuple, factory: Callable[[], Any]) -> Any:
+    """
+    Return the pooled client for ``key``, creating it with ``factory`` once.
+
+    Args:
+        key: Hashable client configuration, e.g. ("chromadb", "/data/chroma")
+        factory: Zero-argument callable that builds the client
+    """
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        return client
+
+
+def get_chromadb_client(persist_directory: str | None = None):
+    """Return the pooled ChromaDB client for a persist directory (None = in-memory)."""
+    import chromadb
+
+    if persist_directory:
+        path = str(persist_directory)
+        return get_client(("chromadb", path), lambda: chromadb.PersistentClient(path=path))
+    return get_client(("chromadb", None), chromadb.Client)
+
+
+def get_gemini_client(api_key: str):
+    """Return the pooled google-genai client for an API key."""
+    from google import genai
+
+    return get_client(("gemini", api_key), lambda: genai.Client(api_key=api_key))
+
+
+def reset_clients() -> None:
+    """Drop every pooled client (tests, or after changing backend settings)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+class HandleCache:
+    """
+    Thread-safe LRU of named handles with hit/miss counters.
+
+    Usage:
+        handles = HandleCache(maxsize=128)
+        collection = handles.get(store_id, lambda: client.get_collection(name=store_id))
+        handles.invalidate(store_id)
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._handles: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached handle for ``name``, loading it on a miss."""
+        with self._lock:
+            if name in self._handles:
+                self._handles.move_to_end(name)
+                self.hits += 1
+                return self._handles[name]
+            self.misses += 1
+
+        handle = loader()
+        self.put(name, handle)
+        return handle
+
+    def put(self, name: str, handle: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._handles[name] = handle
+            self._handles.move_to_end(name)
+            while len(self._handles) > self.maxsize:
+                self._handles.popitem(last=False)
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            self._handles.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._handles.clear()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._handles
+
+    def __len__(self) -> int:
+        return len(self._handles)
@@ -42,6 +42,15 @@ class DocumentUploadError(DocumentError):
     pass
 
 
+class BatchUploadError(DocumentUploadError):
+    """Some uploads in a batch failed; the rest were written."""
+
+    def __init__(self, message: str, references: list | None = None, errors: dict | None = None):
+        self.references = references or []
+        self.errors = errors or {}
+        super().__init__(message)
+
+
 class DocumentNotFoundError(DocumentError):
     """Document not found in the store."""
 
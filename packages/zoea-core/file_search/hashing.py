@@ -0,0 +1,27 @@
+"""
+Content and metadata fingerprints for indexed records.
+
+Fingerprints let the indexer and backends tell whether a record's text or
+metadata changed since it was last written, so unchanged content is not
+re-extracted or re-embedded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a text string."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def hash_metadata(metadata: dict, display_name: str | None = None) -> str:
+    """Return a stable SHA-256 hex digest of record metadata and display name."""
+    payload = json.dumps(
+        {"metadata": metadata or {}, "display_name": display_name},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -5,13 +5,21 @@ Helpers for indexing Zoea content into the configured file search backend.
 from __future__ import annotations
 
 import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils import timezone
 
 from . import FileSearchRegistry
+from .exceptions import BatchUploadError
+from .hashing import hash_metadata, hash_text
+from .types import TextRecord
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +55,7 @@ def ensure_project_store(project, *, backend: str | None = None):
     store_id = project.gemini_store_id
     if store_id:
         try:
-            store_info = store.get_store(store_id)
+            store_info = store.get_store_cached(store_id)
         except Exception:
             store_info = None
 
@@ -60,6 +68,7 @@ def ensure_project_store(project, *, backend: str | None = None):
 
     store_name = f"{project.name} ({project.id})"
     store_info = store.create_store(store_name, ephemeral=False)
+    store.remember_store(store_info)
     project.gemini_store_id = store_info.store_id
     project.gemini_store_name = store_info.display_name
     project.gemini_synced_at = timezone.now()
@@ -80,77 +89,242 @@ def index_document(document, *, backend: str | None = None, force: bool = False)
         store_info = ensure_project_store(document.project, backend=backend)
 
         record_id = f"doc-{document.id}"
-        content = _extract_document_text(document, force_caption=force)
-        if not content:
+        metadata = _build_document_metadata(document)
+        metadata_hash = _metadata_fingerprint(store_info.store_id, metadata, document.name)
+        source_hash = _source_fingerprint(document)
+        if not force and _source_unchanged(document, source_hash, metadata_hash):
+            logger.debug("Document %s unchanged since last index", document.id)
+            return
+
+        content, pages = _extract_document_content(document, force_caption=force)
+        if not content and pages is None:
             logger.info("Document %s has no indexable text", document.id)
             return
 
-        metadata = _build_document_metadata(document)
+        content_hash = _content_fingerprint(document, content, pages)
+        if not force and _is_unchanged(document, content_hash, metadata_hash):
+            logger.debug("Document %s unchanged since last index", document.id)
+            _mark_source_hashes([(document, source_hash)])
+            return
 
         _upsert_text_record(
             store,
             store_id=store_info.store_id,
             record_id=record_id,
-            content=content,
+            content=content or "",
             metadata=metadata,
             display_name=document.name,
+            pages=pages,
         )
 
+        document.search_content_hash = content_hash
+        document.search_metadata_hash = metadata_hash
+        document.search_source_hash = source_hash
         Document.objects.filter(id=document.id).update(
             gemini_file_id=record_id,
             gemini_synced_at=timezone.now(),
+            search_content_hash=content_hash,
+            search_metadata_hash=metadata_hash,
+            search_source_hash=source_hash,
         )
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to index document %s: %s", document.id, exc)
 
 
-def index_documents(documents, *, backend: str | None = None, force: bool = False) -> None:
-    """Index a batch of Documents into the same project store."""
+@dataclass
+class IndexingStats:
+    """Counters and timing for a batch indexing run."""
+
+    indexed: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: int = 0
+    batches: int = 0
+    duration_s: float = 0.0
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def docs_per_second(self) -> float:
+        if not self.duration_s:
+            return 0.0
+        return self.indexed / self.duration_s
+
+
+def index_documents(
+    documents,
+    *,
+    backend: str | None = None,
+    force: bool = False,
+    batch_size: int | None = None,
+) -> IndexingStats:
+    """
+    Index a batch of Documents into the same project store.
+
+    Documents are processed in batches of ``batch_size`` (default
+    ``FILE_SEARCH_INDEX_BATCH_SIZE``). Each batch prefetches collection
+    metadata in a constant number of queries, upserts all records with one
+    backend call, and stamps ``gemini_synced_at`` with a single bulk_update.
+    """
+    stats = IndexingStats()
     documents = [doc for doc in documents if doc is not None]
     if not documents:
-        return
+        return stats
 
     project = documents[0].project
     if not project:
         logger.debug("Skipping batch index; documents missing project")
-        return
+        return stats
 
     try:
         store = FileSearchRegistry.get(backend)
         store_info = ensure_project_store(project, backend=backend)
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to initialize file search backend: %s", exc)
-        return
+        stats.failed = len(documents)
+        stats.errors = {document.id: str(exc) for document in documents}
+        return stats
+
+    if batch_size is None:
+        batch_size = int(getattr(settings, "FILE_SEARCH_INDEX_BATCH_SIZE", 64))
+    batch_size = max(1, batch_size)
+
+    started = time.perf_counter()
+    for offset in range(0, len(documents), batch_size):
+        batch = documents[offset : offset + batch_size]
+        batch_started = time.perf_counter()
+        indexed = _index_document_batch(
+            store,
+            store_info.store_id,
+            batch,
+            project_id=project.id,
+            force=force,
+            stats=stats,
+        )
+        stats.batches += 1
+        elapsed = time.perf_counter() - batch_started
+        logger.info(
+            "Indexed batch %d: %d/%d documents in %.2fs (%.1f docs/s)",
+            stats.batches,
+            indexed,
+            len(batch),
+            elapsed,
+            indexed / elapsed if elapsed else 0.0,
+        )
+
+    stats.duration_s = time.perf_counter() - started
+    logger.info(
+        "Indexed %d documents (%d unchanged, %d skipped, %d failed) in %.2fs (%.1f docs/s)",
+        stats.indexed,
+        stats.unchanged,
+        stats.skipped,
+        stats.failed,
+        stats.duration_s,
+        stats.docs_per_second,
+    )
+    return stats
+
+
+def _index_document_batch(
+    store,
+    store_id: str,
+    documents: list,
+    *,
+    project_id: int,
+    force: bool,
+    stats: IndexingStats,
+) -> int:
+    """Extract, upsert and mark one batch of documents. Returns the number indexed."""
+    from documents.models import Document
 
+    candidates = []
     for document in documents:
-        if document.project_id != project.id:
+        if document.project_id != project_id:
             logger.warning("Skipping document %s from different project", document.id)
+            stats.skipped += 1
             continue
+        candidates.append(document)
+
+    collection_metadata = _prefetch_collection_metadata(candidates)
 
+    records: list[TextRecord] = []
+    indexed_documents = []
+    fingerprints = []
+    resourced = []
+    for document in candidates:
         try:
-            record_id = f"doc-{document.id}"
-            content = _extract_document_text(document, force_caption=force)
-            if not content:
+            metadata = _build_document_metadata(
+                document,
+                collection_metadata=collection_metadata.get(document.id, {}),
+            )
+            metadata_hash = _metadata_fingerprint(store_id, metadata, document.name)
+            source_hash = _source_fingerprint(document)
+            if not force and _source_unchanged(document, source_hash, metadata_hash):
+                stats.unchanged += 1
                 continue
 
-            metadata = _build_document_metadata(document)
-            _upsert_text_record(
-                store,
-                store_id=store_info.store_id,
-                record_id=record_id,
-                content=content,
-                metadata=metadata,
-                display_name=document.name,
-            )
+            content, pages = _extract_document_content(document, force_caption=force)
+            if not content and pages is None:
+                stats.skipped += 1
+                continue
 
-            from documents.models import Document
+            content_hash = _content_fingerprint(document, content, pages)
+            if not force and _is_unchanged(document, content_hash, metadata_hash):
+                stats.unchanged += 1
+                resourced.append((document, source_hash))
+                continue
 
-            Document.objects.filter(id=document.id).update(
-                gemini_file_id=record_id,
-                gemini_synced_at=timezone.now(),
+            records.append(
+                TextRecord(
+                    record_id=f"doc-{document.id}",
+                    content=content or "",
+                    metadata=metadata,
+                    display_name=document.name,
+                    pages=pages,
+                )
             )
+            indexed_documents.append(document)
+            fingerprints.append((content_hash, metadata_hash, source_hash))
         except Exception as exc:  # noqa: BLE001 - best effort batch indexing
             logger.warning("Failed to index document %s: %s", document.id, exc)
+            stats.failed += 1
+            stats.errors[document.id] = str(exc)
+
+    _mark_source_hashes(resourced)
+    if not records:
+        return 0
+
+    succeeded = _upsert_text_records(store, store_id=store_id, records=records)
+
+    synced_at = timezone.now()
+    updated = []
+    for document, record, (content_hash, metadata_hash, source_hash) in zip(
+        indexed_documents, records, fingerprints
+    ):
+        if record.record_id not in succeeded:
+            stats.failed += 1
+            stats.errors[document.id] = f"Upsert of {record.record_id} failed"
+            continue
+        document.gemini_file_id = record.record_id
+        document.gemini_synced_at = synced_at
+        document.search_content_hash = content_hash
+        document.search_metadata_hash = metadata_hash
+        document.search_source_hash = source_hash
+        updated.append(document)
+
+    if updated:
+        Document.objects.bulk_update(
+            updated,
+            [
+                "gemini_file_id",
+                "gemini_synced_at",
+                "search_content_hash",
+                "search_metadata_hash",
+                "search_source_hash",
+            ],
+        )
+
+    stats.indexed += len(updated)
+    return len(updated)
 
 
 def remove_document(document, *, backend: str | None = None) -> None:
@@ -251,22 +425,157 @@ def index_email_message(email_message, *, backend: str | None = None) -> None:
 
 
 def _upsert_text_record(store, *, store_id: str, record_id: str, content: str, metadata: dict,
-                        display_name: str | None = None) -> None:
-    """Remove a record by ID (if supported) and re-add with updated content."""
-    try:
-        store.remove_text_record(store_id, record_id)
-    except Exception:
-        pass
-
-    store.add_text_record(
+                        display_name: str | None = None,
+                        page_offsets: list[int] | None = None, pages=None) -> None:
+    """Replace a record, letting the backend skip unchanged chunks where it can."""
+    options = {"page_offsets": page_offsets} if page_offsets else {}
+    if pages is not None:
+        options["pages"] = pages
+    store.upsert_text_record(
         store_id,
         record_id=record_id,
         content=content,
         metadata=metadata,
         display_name=display_name,
+        **options,
+    )
+
+
+def _metadata_fingerprint(store_id: str, metadata: dict, display_name: str | None) -> str:
+    """
+    Return the metadata hash for a record.
+
+    The store ID is folded into the hash so that a recreated project store
+    invalidates every fingerprint recorded against the old one.
+    """
+    return hash_metadata({**metadata, "_store_id": store_id}, display_name)
+
+
+def _source_fingerprint(document) -> str:
+    """
+    Return a fingerprint of a document's source that needs no text extraction.
+
+    File-backed documents use the stored upload hash and size; inline
+    documents hash their content field.
+    """
+    if document.get_file() is not None:
+        return hash_text(f"file:{document.get_content_hash()}:{document.file_size or ''}")
+    return hash_text(f"content:{getattr(document, 'content', None) or ''}")
+
+
+def _source_unchanged(document, source_hash: str, metadata_hash: str) -> bool:
+    """Whether the source and metadata match the last indexed fingerprints."""
+    return (
+        bool(document.search_content_hash)
+        and document.search_source_hash == source_hash
+        and document.search_metadata_hash == metadata_hash
     )
 
 
+def _is_unchanged(document, content_hash: str, metadata_hash: str) -> bool:
+    return (
+        document.search_content_hash == content_hash
+        and document.search_metadata_hash == metadata_hash
+    )
+
+
+def _mark_source_hashes(pairs) -> None:
+    """Record source fingerprints for documents whose extracted text was unchanged."""
+    from documents.models import Document
+
+    updated = []
+    for document, source_hash in pairs:
+        if document.search_source_hash != source_hash:
+            document.search_source_hash = source_hash
+            updated.append(document)
+    if updated:
+        Document.objects.bulk_update(updated, ["search_source_hash"])
+
+
+def _upsert_text_records(store, *, store_id: str, records: list[TextRecord]) -> set[str]:
+    """
+    Replace many records with one batched backend upsert.
+
+    Falls back to per-record upserts if the batch fails so that one bad
+    record does not drop the whole batch. Returns the IDs that were written.
+    """
+    succeeded = set()
+    try:
+        store.upsert_text_records(store_id, records)
+        return {record.record_id for record in records}
+    except BatchUploadError as exc:
+        # Part of the batch was written; only retry the rest
+        succeeded = {record.record_id for record in records if record.record_id not in exc.errors}
+        logger.warning(
+            "Batch upsert wrote %d of %d records, retrying the rest singly",
+            len(succeeded),
+            len(records),
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Batch upsert of %d records failed, retrying singly: %s", len(records), exc)
+
+    for record in records:
+        if record.record_id in succeeded:
+            continue
+        try:
+            _upsert_text_record(
+                store,
+                store_id=store_id,
+                record_id=record.record_id,
+                content=record.content,
+                metadata=record.metadata,
+                display_name=record.display_name,
+                page_offsets=record.page_offsets,
+                pages=record.pages,
+            )
+            succeeded.add(record.record_id)
+        except Exception as exc:  # noqa: BLE001 - best effort batch indexing
+            logger.warning("Failed to index record %s: %s", record.record_id, exc)
+    return succeeded
+
+
+def _extract_document_content(
+    document, *, force_caption: bool = False
+) -> tuple[str | None, Callable | None]:
+    """
+    Return (text, pages) for a document.
+
+    PDFs are never joined into one string: ``pages`` is a callable yielding
+    their pages one at a time through the extracted-text cache, so backends
+    chunk them page by page and ``text`` is None. Other sources return their
+    text and ``pages`` is None.
+    """
+    from documents.models import PDF, FileDocument
+    from documents.text_cache import iter_cached_pdf_pages
+
+    if isinstance(document, PDF):
+        if not document.pdf_file:
+            return None, None
+        return None, document.iter_text_pages
+
+    if isinstance(document, FileDocument) and _is_pdf_file(document):
+        field_file = document.file
+        content_hash = document.get_content_hash()
+        return None, lambda: iter_cached_pdf_pages(field_file, content_hash)
+
+    return _extract_document_text(document, force_caption=force_caption), None
+
+
+def _content_fingerprint(document, content: str | None, pages) -> str:
+    """
+    Hash of a document's indexable text.
+
+    Paged sources are not read to hash them; their text is a pure function of
+    the file and extractor, so the file hash stands in for it.
+    """
+    if pages is None:
+        return hash_text(content)
+
+    from documents.text_cache import EXTRACTOR_VERSION
+
+    return hash_text(f"pages:v{EXTRACTOR_VERSION}:{document.get_content_hash()}")
+
+
 def _extract_document_text(document, *, force_caption: bool = False) -> str | None:
     from documents.image_caption_service import get_or_create_image_caption
     from documents.models import (
@@ -318,8 +627,12 @@ def _extract_file_document_text(document) -> str | None:
     if content_type.startswith("text/") or suffix in TEXT_FILE_EXTENSIONS:
         return _read_text_file(path)
 
-    if content_type == "application/pdf" or suffix == ".pdf":
-        return _extract_pdf_text(path)
+    if _is_pdf_file(document):
+        from documents.pdf_text import pages_to_text
+        from documents.text_cache import iter_cached_pdf_pages
+
+        text, _ = pages_to_text(iter_cached_pdf_pages(document.file, document.get_content_hash()))
+        return text
 
     return None
 
@@ -335,25 +648,14 @@ def _read_text_file(path: Path) -> str | None:
         return None
 
 
-def _extract_pdf_text(path: Path) -> str | None:
-    try:
-        import fitz  # PyMuPDF
-    except Exception as exc:  # noqa: BLE001
-        logger.debug("PDF extraction unavailable: %s", exc)
-        return None
-
-    try:
-        with fitz.open(path) as doc:
-            parts = []
-            for page in doc:
-                parts.append(page.get_text())
-            return "\n\n".join(parts)
-    except Exception as exc:  # noqa: BLE001
-        logger.debug("Failed to extract PDF text %s: %s", path, exc)
-        return None
+def _is_pdf_file(document) -> bool:
+    if not document.file:
+        return False
+    content_type = (document.content_type or "").lower()
+    return content_type == "application/pdf" or Path(document.file.name).suffix.lower() == ".pdf"
 
 
-def _build_document_metadata(document) -> dict:
+def _build_document_metadata(document, *, collection_metadata: dict | None = None) -> dict:
     metadata = {
         "source_type": "document",
         "document_id": str(document.id),
@@ -369,7 +671,8 @@ def _build_document_metadata(document) -> dict:
     if document.created_by_id:
         metadata["author_id"] = str(document.created_by_id)
 
-    collection_metadata = _get_collection_metadata(document)
+    if collection_metadata is None:
+        collection_metadata = _get_collection_metadata(document)
     metadata.update(collection_metadata)
 
     if hasattr(document, "content_type") and getattr(document, "content_type", None):
@@ -381,16 +684,35 @@ def _build_document_metadata(document) -> dict:
 
 
 def _get_collection_metadata(document) -> dict:
+    return _prefetch_collection_metadata([document]).get(document.id, {})
+
+
+def _prefetch_collection_metadata(documents) -> dict:
+    """
+    Resolve collection metadata for many documents in a constant number of queries.
+
+    Returns a mapping of document ID to the metadata dict that
+    _build_document_metadata merges into each record.
+    """
+    from chat.models import Conversation
     from documents.models import CollectionType, DocumentCollectionItem
+    from email_gateway.models import EmailThread
+    from execution.models import ExecutionRun
+
+    if not documents:
+        return {}
 
-    doc_ct = ContentType.objects.get_for_model(document, for_concrete_model=False)
-    items = (
-        DocumentCollectionItem.objects.select_related("collection")
-        .filter(content_type=doc_ct, object_id=str(document.id))
+    content_types = ContentType.objects.get_for_models(
+        *{type(document) for document in documents},
+        for_concrete_models=False,
     )
+    ids_by_ct: dict[int, list[str]] = defaultdict(list)
+    for document in documents:
+        ids_by_ct[content_types[type(document)].id].append(str(document.id))
 
-    if not items.exists():
-        return {}
+    ct_filter = Q()
+    for ct_id, object_ids in ids_by_ct.items():
+        ct_filter |= Q(content_type_id=ct_id, object_id__in=object_ids)
 
     # Prefer attachments, then artifacts, then notebooks.
     priority = {
@@ -399,29 +721,56 @@ def _get_collection_metadata(document) -> dict:
         CollectionType.NOTEBOOK: 2,
     }
 
-    item = min(
-        items,
-        key=lambda candidate: priority.get(candidate.collection.collection_type, 3),
-    )
-    collection = item.collection
-
-    metadata = {
-        "collection_id": str(collection.id),
-        "collection_type": collection.collection_type,
-        "collection_item_id": str(item.id),
-        "source_channel": item.source_channel,
-    }
+    best_items = {}
+    for item in DocumentCollectionItem.objects.select_related("collection").filter(ct_filter):
+        key = (item.content_type_id, item.object_id)
+        current = best_items.get(key)
+        rank = priority.get(item.collection.collection_type, 3)
+        if current is None or rank < priority.get(current.collection.collection_type, 3):
+            best_items[key] = item
 
-    conversation_id = collection.conversations.values_list("id", flat=True).first()
-    if conversation_id:
-        metadata["conversation_id"] = str(conversation_id)
+    if not best_items:
+        return {}
 
-    email_thread_id = collection.email_threads.values_list("id", flat=True).first()
-    if email_thread_id:
-        metadata["email_thread_id"] = str(email_thread_id)
+    collection_ids = {item.collection_id for item in best_items.values()}
+    conversation_ids = _first_related_ids(Conversation, "artifacts_id", collection_ids)
+    email_thread_ids = _first_related_ids(EmailThread, "attachments_id", collection_ids)
+    execution_run_ids = _first_related_ids(ExecutionRun, "artifacts_id", collection_ids)
 
-    execution_run_id = collection.execution_runs.values_list("id", flat=True).first()
-    if execution_run_id:
-        metadata["execution_run_id"] = str(execution_run_id)
+    results = {}
+    for document in documents:
+        item = best_items.get((content_types[type(document)].id, str(document.id)))
+        if item is None:
+            continue
 
-    return metadata
+        collection = item.collection
+        metadata = {
+            "collection_id": str(collection.id),
+            "collection_type": collection.collection_type,
+            "collection_item_id": str(item.id),
+            "source_channel": item.source_channel,
+        }
+
+        if collection.id in conversation_ids:
+            metadata["conversation_id"] = str(conversation_ids[collection.id])
+        if collection.id in email_thread_ids:
+            metadata["email_thread_id"] = str(email_thread_ids[collection.id])
+        if collection.id in execution_run_ids:
+            metadata["execution_run_id"] = str(execution_run_ids[collection.id])
+
+        results[document.id] = metadata
+
+    return results
+
+
+def _first_related_ids(model, fk_attname: str, collection_ids) -> dict:
+    """Map each collection ID to its lowest-pk related row ID."""
+    first_ids: dict = {}
+    rows = (
+        model.objects.filter(**{f"{fk_attname}__in": collection_ids})
+        .order_by(fk_attname, "id")
+        .values_list(fk_attname, "id")
+    )
+    for collection_id, related_id in rows:
+        first_ids.setdefault(collection_id, related_id)
+    return first_ids
@@ -0,0 +1,427 @@
+"""
+Local BM25 inverted index kept alongside vector collections.
+
+Embedding search misses exact identifiers, email subjects and code symbols,
+so backends that embed chunks locally also write them to a lexical index and
+can fuse both rankings (see reciprocal_rank_fusion()). The index is a SQLite
+database stored next to CHROMADB_PERSIST_DIRECTORY, or held in memory when
+ChromaDB itself is in memory.
+
+Usage:
+    index = get_lexical_index(settings.CHROMADB_PERSIST_DIRECTORY)
+    index.add(store_id, ids, documents, metadatas)
+    hits = index.search(store_id, "get_user_organization", limit=10)
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .clients import get_client
+
+INDEX_FILENAME = "lexical_index.sqlite3"
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or "
+    "that the this to was were will with".split()
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lexical_chunks (
+    store_id TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (store_id, chunk_id)
+);
+CREATE INDEX IF NOT EXISTS lexical_chunks_record ON lexical_chunks (store_id, record_id);
+CREATE TABLE IF NOT EXISTS lexical_postings (
+    store_id TEXT NOT NULL,
+    term TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (store_id, term, chunk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lexical_postings_chunk ON lexical_postings (store_id, chunk_id);
+CREATE TABLE IF NOT EXISTS lexical_stats (
+    store_id TEXT PRIMARY KEY,
+    chunk_count INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase index terms.
+
+    Compound identifiers are indexed whole and by their parts, so
+    ``get_user_organization`` and ``getUserOrganization`` both match a query
+    for "organization" as well as the exact symbol.
+    """
+    terms: list[str] = []
+    for word in WORD_PATTERN.findall(text):
+        lowered = word.lower()
+        if lowered in STOPWORDS:
+            continue
+        terms.append(lowered)
+
+        parts = [
+            part.lower()
+            for piece in word.split("_")
+            for part in CAMEL_BOUNDARY.split(piece)
+            if part
+        ]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if part not in STOPWORDS)
+    return terms
+
+
+@dataclass
+class LexicalHit:
+    """A chunk matched by the lexical index."""
+
+    chunk_id: str
+    score: float
+    document: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+class LexicalIndex:
+    """
+    SQLite-backed inverted index with BM25 scoring, partitioned by store id.
+
+    Chunk ids match the vector collection's ids so rankings can be fused.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def add(
+        self,
+        store_id: str,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[dict],
+    ) -> None:
+        """Index chunks, replacing any existing chunks with the same ids."""
+        if not ids:
+            return
+
+        with self._lock, self._conn:
+            self._delete_chunks(store_id, list(ids))
+            chunk_rows = []
+            posting_rows = []
+            total_length = 0
+            for chunk_id, document, metadata in zip(ids, documents, metadatas):
+                terms = Counter(tokenize(document or ""))
+                length = sum(terms.values())
+                total_length += length
+                chunk_rows.append(
+                    (
+                        store_id,
+                        chunk_id,
+                        str((metadata or {}).get("record_id", "")),
+                        length,
+                        document or "",
+                        json.dumps(metadata or {}),
+                    )
+                )
+                posting_rows.extend((store_id, term, chunk_id, tf) for term, tf in terms.items())
+
+            self._conn.executemany(
+                "INSERT INTO lexical_chunks VALUES (?, ?, ?, ?, ?, ?)", chunk_rows
+            )
+            self._conn.executemany(
+                "INSERT INTO lexical_postings VALUES (?, ?, ?, ?)", posting_rows
+            )
+            self._adjust_stats(store_id, len(chunk_rows), total_length)
+
+    def update_metadata(self, store_id: str, ids: Sequence[str], metadatas: Sequence[dict]) -> None:
+        """Replace stored metadata for existing chunks (used by filters)."""
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE lexical_chunks SET metadata = ?, record_id = ? "
+                "WHERE store_id = ? AND chunk_id = ?",
+                [
+                    (json.dumps(metadata or {}), str((metadata or {}).get("record_id", "")),
+                     store_id, chunk_id)
+                    for chunk_id, metadata in zip(ids, metadatas)
+                ],
+            )
+
+    def delete(self, store_id: str, ids: Sequence[str]) -> None:
+        """Remove chunks by id."""
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._delete_chunks(store_id, list(ids))
+
+    def delete_records(self, store_id: str, record_ids: Iterable[str]) -> None:
+        """Remove every chunk belonging to the given records."""
+        record_ids = list(record_ids)
+        if not record_ids:
+            return
+        with self._lock, self._conn:
+            chunk_ids = [
+                row[0]
+                for batch in _batched(record_ids)
+                for row in self._conn.execute(
+                    "SELECT chunk_id FROM lexical_chunks WHERE store_id = ? "
+                    f"AND record_id IN ({_placeholders(batch)})",
+                    [store_id, *batch],
+                )
+            ]
+            self._delete_chunks(store_id, chunk_ids)
+
+    def drop_store(self, store_id: str) -> None:
+        """Remove everything indexed for a store."""
+        with self._lock, self._conn:
+            for table in ("lexical_postings", "lexical_chunks", "lexical_stats"):
+                self._conn.execute(f"DELETE FROM {table} WHERE store_id = ?", (store_id,))
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def count(self, store_id: str) -> int:
+        """Return the number of chunks indexed for a store."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunk_count FROM lexical_stats WHERE store_id = ?", (store_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def search(
+        self,
+        store_id: str,
+        query: str,
+        *,
+        limit: int = 10,
+        where: dict | None = None,
+    ) -> list[LexicalHit]:
+        """
+        Rank a store's chunks against a query with BM25.
+
+        Args:
+            store_id: Store to search
+            query: Free-text query
+            limit: Maximum number of chunks to return
+            where: Optional ChromaDB-style metadata filter
+
+        Returns:
+            Hits ordered by descending score
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+
+        with self._lock:
+            stats = self._conn.execute(
+                "SELECT chunk_count, total_length FROM lexical_stats WHERE store_id = ?",
+                (store_id,),
+            ).fetchone()
+            if not stats or not stats[0]:
+                return []
+            chunk_count, total_length = stats
+            average_length = (total_length / chunk_count) or 1.0
+
+            scores: dict[str, float] = {}
+            for term in terms:
+                postings = self._conn.execute(
+                    "SELECT p.chunk_id, p.tf, c.length FROM lexical_postings p "
+                    "JOIN lexical_chunks c ON c.store_id = p.store_id AND c.chunk_id = p.chunk_id "
+                    "WHERE p.store_id = ? AND p.term = ?",
+                    (store_id, term),
+                ).fetchall()
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (chunk_count - df + 0.5) / (df + 0.5))
+                for chunk_id, tf, length in postings:
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+            if not scores:
+                return []
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            hits: list[LexicalHit] = []
+            # Filters are applied on stored metadata, so read candidates in
+            # score order until enough of them pass.
+            for offset in range(0, len(ranked), max(limit * 4, 64)):
+                window = ranked[offset:offset + max(limit * 4, 64)]
+                rows = {
+                    row[0]: row[1:]
+                    for batch in _batched([chunk_id for chunk_id, _ in window])
+                    for row in self._conn.execute(
+                        "SELECT chunk_id, document, metadata FROM lexical_chunks "
+                        f"WHERE store_id = ? AND chunk_id IN ({_placeholders(batch)})",
+                        [store_id, *batch],
+                    )
+                }
+                for chunk_id, score in window:
+                    if chunk_id not in rows:
+                        continue
+                    document, metadata_json = rows[chunk_id]
+                    metadata = json.loads(metadata_json)
+                    if where and not matches_where(metadata, where):
+                        continue
+                    hits.append(LexicalHit(chunk_id, score, document, metadata))
+                    if len(hits) >= limit:
+                        return hits
+            return hits
+
+    # -------------------------------------------------------------------------
+    # Internals (callers hold the lock and an open transaction)
+    # -------------------------------------------------------------------------
+
+    def _delete_chunks(self, store_id: str, chunk_ids: list[str]) -> None:
+        removed_count = 0
+        removed_length = 0
+        for batch in _batched(chunk_ids):
+            marks = _placeholders(batch)
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM lexical_chunks "
+                f"WHERE store_id = ? AND chunk_id IN ({marks})",
+                [store_id, *batch],
+            ).fetchone()
+            if not row[0]:
+                continue
+            removed_count += row[0]
+            removed_length += row[1]
+            self._conn.execute(
+                f"DELETE FROM lexical_postings WHERE store_id = ? AND chunk_id IN ({marks})",
+                [store_id, *batch],
+            )
+            self._conn.execute(
+                f"DELETE FROM lexical_chunks WHERE store_id = ? AND chunk_id IN ({marks})",
+                [store_id, *batch],
+            )
+        if removed_count:
+            self._adjust_stats(store_id, -removed_count, -removed_length)
+
+    def _adjust_stats(self, store_id: str, chunks: int, length: int) -> None:
+        self._conn.execute(
+            "INSERT INTO lexical_stats (store_id, chunk_count, total_length) VALUES (?, ?, ?) "
+            "ON CONFLICT(store_id) DO UPDATE SET "
+            "chunk_count = chunk_count + excluded.chunk_count, "
+            "total_length = total_length + excluded.total_length",
+            (store_id, chunks, length),
+        )
+
+
+def get_lexical_index(persist_directory: str | None = None) -> LexicalIndex:
+    """Return the pooled lexical index stored next to a ChromaDB persist directory."""
+    path = os.path.join(str(persist_directory), INDEX_FILENAME) if persist_directory else None
+    return get_client(("lexical", path), lambda: LexicalIndex(path))
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]], k: int = RRF_K
+) -> list[tuple[str, float]]:
+    """
+    Fuse ranked id lists by summing 1 / (k + rank) for each list an id is in.
+
+    Returns:
+        (id, fused score) pairs ordered by descending score
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return heapq.nlargest(len(scores), scores.items(), key=lambda item: item[1])
+
+
+def matches_where(metadata: dict, where: dict) -> bool:
+    """Evaluate a ChromaDB ``where`` clause against chunk metadata."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, operand in condition.items():
+                if not _compare(value, operator, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported where operator: {operator}")
+
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_BATCH_SIZE = 900
+
+
+def _batched(items: list[str]) -> Iterable[list[str]]:
+    for start in range(0, len(items), _BATCH_SIZE):
+        yield items[start:start + _BATCH_SIZE]
+
+
+def _placeholders(items: Sequence) -> str:
+    return ", ".join("?" * len(items))
@@ -0,0 +1,248 @@
+"""
+Cache of file search results, invalidated by per-store write versions.
+
+Agent runs issue the same search several times per task and every call
+re-embeds the query (or, for Gemini, re-runs generation). cached_search()
+keys results by (backend, store, store version, whitespace-normalized query,
+filters, max_results, mode). Backends bump the store version on every write
+(see FileSearchStore.bump_store_version), so a write in any process makes
+earlier results unreachable; the LRU bound and TTL take care of the rest.
+
+Usage:
+    from file_search.query_cache import cached_search
+
+    result = cached_search(store, store_id=store_id, query=query, max_results=5)
+    get_query_cache().stats()  # hits, misses, hit_rate, size, evictions
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db.models import F
+
+from .types import SearchResult
+
+if TYPE_CHECKING:
+    from .base import FileSearchStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryCacheStats:
+    """Counters for a QueryCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class QueryCache:
+    """Thread-safe LRU of search results with a per-entry TTL."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, SearchResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key: tuple) -> SearchResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, result: SearchResult) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_store(self, backend: str, store_id: str) -> None:
+        """Drop every cached result for a store."""
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] == (backend, store_id)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> QueryCacheStats:
+        with self._lock:
+            return QueryCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self._entries),
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: QueryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query cache configured from settings."""
+    global _cache
+
+    maxsize = int(getattr(settings, "FILE_SEARCH_QUERY_CACHE_SIZE", 512))
+    ttl = float(getattr(settings, "FILE_SEARCH_QUERY_CACHE_TTL", 300))
+
+    with _cache_lock:
+        if _cache is None or _cache.maxsize != maxsize or _cache.ttl != ttl:
+            _cache = QueryCache(maxsize, ttl)
+        return _cache
+
+
+def normalize_query(query: str) -> str:
+    """
+    Collapse whitespace so trivially different queries share an entry.
+
+    Case is kept: embeddings and generated answers can depend on it.
+    """
+    return " ".join(query.split())
+
+
+def get_store_version(backend: str, store_id: str) -> int:
+    """Return the current write version of a store (0 if never written)."""
+    from documents.models import SearchStoreVersion
+
+    version = (
+        SearchStoreVersion.objects.filter(backend=backend, store_id=store_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_store_version(backend: str, store_id: str) -> None:
+    """
+    Record a write to a store so cached results for it stop matching.
+
+    Failures are logged rather than raised so a successful backend write is
+    never reported as failed; this process's cached results are dropped
+    either way.
+    """
+    from documents.models import SearchStoreVersion
+
+    get_query_cache().invalidate_store(backend, store_id)
+    try:
+        updated = SearchStoreVersion.objects.filter(backend=backend, store_id=store_id).update(
+            version=F("version") + 1
+        )
+        if not updated:
+            _, created = SearchStoreVersion.objects.get_or_create(
+                backend=backend, store_id=store_id, defaults={"version": 1}
+            )
+            if not created:
+                SearchStoreVersion.objects.filter(backend=backend, store_id=store_id).update(
+                    version=F("version") + 1
+                )
+    except Exception as exc:  # noqa: BLE001 - never fail the write itself
+        logger.warning("Failed to bump search store version for %s: %s", store_id, exc)
+
+
+def cached_search(
+    store: FileSearchStore,
+    *,
+    store_id: str,
+    query: str,
+    max_results: int = 5,
+    filters: dict | None = None,
+    mode: str | None = None,
+) -> SearchResult:
+    """
+    Run store.search(), returning a cached result when the store is unchanged.
+
+    Arguments match FileSearchStore.search(); the search runs with the
+    normalized query, so a cached result always matches its key. Errors are
+    never cached. When the store version cannot be read the search runs
+    uncached.
+
+    Returns:
+        SearchResult (a shallow copy, so callers may modify the sources list)
+    """
+    search_kwargs = {
+        "store_id": store_id,
+        "query": normalize_query(query),
+        "max_results": max_results,
+        "filters": filters,
+        "mode": mode,
+    }
+
+    cache = get_query_cache()
+    if not cache.enabled:
+        return store.search(**search_kwargs)
+
+    backend = str(store.backend_name)
+    try:
+        version = get_store_version(backend, store_id)
+    except Exception as exc:  # noqa: BLE001 - fall back to an uncached search
+        logger.debug("Search store version unavailable for %s: %s", store_id, exc)
+        return store.search(**search_kwargs)
+
+    key = (
+        backend,
+        store_id,
+        version,
+        search_kwargs["query"],
+        _filters_key(filters),
+        max_results,
+        mode or getattr(settings, "FILE_SEARCH_MODE", None) or "",
+    )
+    result = cache.get(key)
+    if result is None:
+        result = store.search(**search_kwargs)
+        cache.put(key, result)
+    else:
+        logger.debug(
+            "File search cache hit for %s (hit rate %.2f)", store_id, cache.stats().hit_rate
+        )
+
+    return SearchResult(
+        answer=result.answer,
+        sources=list(result.sources),
+        raw_response=result.raw_response,
+    )
+
+
+def _filters_key(filters: Any) -> str:
+    if not filters:
+        return ""
+    return json.dumps(filters, sort_keys=True, default=str)
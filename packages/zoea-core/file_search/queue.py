@@ -0,0 +1,551 @@
+"""
+Debounced, coalescing background queue for file search indexing.
+
+Signal handlers enqueue work here instead of indexing in the request thread.
+Each record has at most one pending SearchIndexQueueEntry; repeated saves
+within the debounce window push the entry's ``available_at`` forward (capped
+by FILE_SEARCH_INDEX_MAX_DELAY_SECONDS) rather than queueing more work.
+
+A Django-Q2 task (file_search.tasks.drain_index_queue) drains due entries in
+batches, reusing the batch indexing engine for documents. A
+SearchIndexWorkerLease row records that a worker is queued or running; any
+enqueue that finds the lease lapsed starts a new worker, and a worker that
+exits with entries still pending (debounced or backing off) schedules a
+one-off follow-up run for the next due entry.
+
+Example:
+    from file_search.queue import enqueue_document_index, get_queue_stats
+
+    enqueue_document_index(document)
+    print(get_queue_stats().depth)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WORKER_LEASE_NAME = "file_search_index_queue"
+FOLLOW_UP_SCHEDULE_NAME = "file_search_index_queue_follow_up"
+
+
+@dataclass
+class QueueStats:
+    """Point-in-time view of the index queue."""
+
+    depth: int = 0
+    due: int = 0
+    oldest_lag_s: float = 0.0
+    by_type: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class QueueRunStats:
+    """Counters and lag measurements for one drain of the queue."""
+
+    processed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    batches: int = 0
+    max_lag_s: float = 0.0
+    total_lag_s: float = 0.0
+
+    @property
+    def avg_lag_s(self) -> float:
+        if not self.processed:
+            return 0.0
+        return self.total_lag_s / self.processed
+
+
+# -----------------------------------------------------------------------------
+# Enqueue
+# -----------------------------------------------------------------------------
+
+
+def queue_enabled() -> bool:
+    return bool(getattr(settings, "FILE_SEARCH_INDEX_QUEUE_ENABLED", True))
+
+
+def enqueue_document_index(document, *, force: bool = False) -> None:
+    """Queue a document for (re)indexing, or index inline if the queue is disabled."""
+    from documents.models import SearchIndexQueueEntry
+
+    if not queue_enabled():
+        from .indexing import index_document
+
+        index_document(document, force=force)
+        return
+
+    enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, document.id, force=force)
+
+
+def enqueue_document_removal(document) -> None:
+    """Queue removal of a deleted document's record from its project store."""
+    from documents.models import SearchIndexQueueEntry
+
+    if not queue_enabled():
+        from .indexing import remove_document
+
+        remove_document(document)
+        return
+
+    if not document.project_id:
+        return
+
+    try:
+        store_id = document.project.gemini_store_id
+    except Exception:  # noqa: BLE001 - project may already be gone
+        store_id = None
+    if not store_id:
+        return
+
+    enqueue(
+        SearchIndexQueueEntry.RecordType.DOCUMENT,
+        document.id,
+        action=SearchIndexQueueEntry.Action.REMOVE,
+        payload={"store_id": store_id, "record_id": f"doc-{document.id}"},
+    )
+
+
+def enqueue_chat_message_index(message) -> None:
+    """Queue a chat message for indexing."""
+    from documents.models import SearchIndexQueueEntry
+
+    if not queue_enabled():
+        from .indexing import index_chat_message
+
+        index_chat_message(message)
+        return
+
+    enqueue(SearchIndexQueueEntry.RecordType.CHAT_MESSAGE, message.id)
+
+
+def enqueue_email_message_index(email_message) -> None:
+    """Queue an email message for indexing."""
+    from documents.models import SearchIndexQueueEntry
+
+    if not queue_enabled():
+        from .indexing import index_email_message
+
+        index_email_message(email_message)
+        return
+
+    enqueue(SearchIndexQueueEntry.RecordType.EMAIL_MESSAGE, email_message.id)
+
+
+def enqueue(
+    record_type: str,
+    object_id,
+    *,
+    action: str | None = None,
+    force: bool = False,
+    payload: dict | None = None,
+):
+    """
+    Create or coalesce the queue entry for a record.
+
+    Returns the SearchIndexQueueEntry. A drain task is kicked only when no
+    worker holds the lease, so bursts of saves share one worker.
+    """
+    from documents.models import SearchIndexQueueEntry
+
+    action = action or SearchIndexQueueEntry.Action.INDEX
+    now = timezone.now()
+    debounce = timedelta(seconds=getattr(settings, "FILE_SEARCH_INDEX_DEBOUNCE_SECONDS", 5))
+    max_delay = timedelta(seconds=getattr(settings, "FILE_SEARCH_INDEX_MAX_DELAY_SECONDS", 60))
+
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                entry = (
+                    SearchIndexQueueEntry.objects.select_for_update()
+                    .filter(record_type=record_type, object_id=str(object_id))
+                    .first()
+                )
+                if entry is None:
+                    entry = SearchIndexQueueEntry.objects.create(
+                        record_type=record_type,
+                        object_id=str(object_id),
+                        action=action,
+                        force=force,
+                        payload=payload or {},
+                        enqueued_at=now,
+                        available_at=now + debounce,
+                    )
+                else:
+                    entry.action = action
+                    entry.force = entry.force or force
+                    entry.payload = payload or {}
+                    entry.version += 1
+                    entry.available_at = min(now + debounce, entry.enqueued_at + max_delay)
+                    entry.save(
+                        update_fields=[
+                            "action",
+                            "force",
+                            "payload",
+                            "version",
+                            "available_at",
+                            "updated_at",
+                        ]
+                    )
+            break
+        except IntegrityError:
+            # Another writer created the entry first; coalesce into it.
+            continue
+    else:
+        raise RuntimeError(f"Could not enqueue {record_type}:{object_id}")
+
+    if _claim_worker_lease(now + _worker_lease_duration()):
+        _kick_worker()
+
+    return entry
+
+
+def _worker_lease_duration() -> timedelta:
+    return timedelta(seconds=getattr(settings, "FILE_SEARCH_INDEX_WORKER_LEASE_SECONDS", 360))
+
+
+def _claim_worker_lease(until) -> bool:
+    """Take the worker lease if it has lapsed. Returns True if this caller now holds it."""
+    from documents.models import SearchIndexWorkerLease
+
+    now = timezone.now()
+    claimed = SearchIndexWorkerLease.objects.filter(
+        name=WORKER_LEASE_NAME, leased_until__lte=now
+    ).update(leased_until=until)
+    if claimed:
+        return True
+    try:
+        with transaction.atomic():
+            _, created = SearchIndexWorkerLease.objects.get_or_create(
+                name=WORKER_LEASE_NAME, defaults={"leased_until": until}
+            )
+    except IntegrityError:
+        return False
+    return created
+
+
+def _set_worker_lease(until) -> None:
+    from documents.models import SearchIndexWorkerLease
+
+    SearchIndexWorkerLease.objects.filter(name=WORKER_LEASE_NAME).update(leased_until=until)
+
+
+def _kick_worker(next_run=None) -> None:
+    """Queue a Django-Q2 task to drain the index queue, now or at ``next_run``."""
+    try:
+        if next_run is None or next_run <= timezone.now():
+            from django_q.tasks import async_task
+
+            async_task(
+                "file_search.tasks.drain_index_queue",
+                task_name="file_search_index_queue",
+            )
+            return
+
+        from django_q.models import Schedule
+
+        Schedule.objects.update_or_create(
+            name=FOLLOW_UP_SCHEDULE_NAME,
+            defaults={
+                "func": "file_search.tasks.drain_index_queue",
+                "schedule_type": Schedule.ONCE,
+                "next_run": next_run,
+                "repeats": -1,
+            },
+        )
+    except Exception as exc:  # noqa: BLE001 - the next enqueue retries once the lease lapses
+        logger.warning("Failed to queue index worker: %s", exc)
+        _set_worker_lease(timezone.now())
+
+
+def _hand_off_worker() -> None:
+    """
+    Release the worker lease, then start a follow-up for anything still queued.
+
+    Releasing before looking at the queue means an entry enqueued while this
+    worker was finishing is either seen here or kicks its own worker.
+    """
+    from documents.models import SearchIndexQueueEntry
+
+    _set_worker_lease(timezone.now())
+    next_due = SearchIndexQueueEntry.objects.values_list("available_at", flat=True).first()
+    if next_due is None:
+        return
+    if _claim_worker_lease(max(next_due, timezone.now()) + _worker_lease_duration()):
+        _kick_worker(next_run=next_due)
+
+
+# -----------------------------------------------------------------------------
+# Drain
+# -----------------------------------------------------------------------------
+
+
+def process_index_queue(
+    *,
+    batch_size: int | None = None,
+    wait_for_pending: bool = False,
+    max_runtime_s: float = 300.0,
+    hand_off: bool = False,
+) -> QueueRunStats:
+    """
+    Process due queue entries in batches.
+
+    Args:
+        batch_size: Entries per batch (default FILE_SEARCH_INDEX_BATCH_SIZE)
+        wait_for_pending: If True, sleep until debounced entries become due
+            instead of returning as soon as nothing is due
+        max_runtime_s: Upper bound on time spent waiting for pending entries
+        hand_off: If True, this run holds the worker lease; renew it while
+            running and release it (scheduling a follow-up run for entries
+            that are still pending) on exit
+
+    Returns:
+        QueueRunStats for this run
+    """
+    from documents.models import SearchIndexQueueEntry
+
+    if batch_size is None:
+        batch_size = int(getattr(settings, "FILE_SEARCH_INDEX_BATCH_SIZE", 64))
+    batch_size = max(1, batch_size)
+
+    stats = QueueRunStats()
+    deadline = time.monotonic() + max_runtime_s
+
+    try:
+        while True:
+            now = timezone.now()
+            if hand_off:
+                _set_worker_lease(now + _worker_lease_duration())
+            entries = list(
+                SearchIndexQueueEntry.objects.filter(available_at__lte=now)[:batch_size]
+            )
+            if entries:
+                _process_batch(entries, stats)
+                if time.monotonic() > deadline:
+                    break
+                continue
+
+            if not wait_for_pending:
+                break
+
+            next_due = SearchIndexQueueEntry.objects.values_list(
+                "available_at", flat=True
+            ).first()
+            if next_due is None:
+                break
+
+            delay = max((next_due - timezone.now()).total_seconds(), 0.1)
+            if time.monotonic() + delay > deadline:
+                break
+            time.sleep(delay)
+    finally:
+        if hand_off:
+            _hand_off_worker()
+
+    if stats.batches:
+        logger.info(
+            "Index queue drained: %d processed, %d failed, %d dropped in %d batch(es); "
+            "lag avg %.2fs max %.2fs",
+            stats.processed,
+            stats.failed,
+            stats.dropped,
+            stats.batches,
+            stats.avg_lag_s,
+            stats.max_lag_s,
+        )
+    return stats
+
+
+def get_queue_stats() -> QueueStats:
+    """Return queue depth, due count and the lag of the oldest entry."""
+    from django.db.models import Count, Min
+
+    from documents.models import SearchIndexQueueEntry
+
+    now = timezone.now()
+    queryset = SearchIndexQueueEntry.objects.all()
+    summary = queryset.aggregate(depth=Count("id"), oldest=Min("enqueued_at"))
+    by_type = dict(
+        queryset.order_by()
+        .values_list("record_type")
+        .annotate(count=Count("id"))
+        .values_list("record_type", "count")
+    )
+
+    return QueueStats(
+        depth=summary["depth"] or 0,
+        due=queryset.filter(available_at__lte=now).count(),
+        oldest_lag_s=(now - summary["oldest"]).total_seconds() if summary["oldest"] else 0.0,
+        by_type=by_type,
+    )
+
+
+def _process_batch(entries: list, stats: QueueRunStats) -> None:
+    from documents.models import SearchIndexQueueEntry
+
+    started = time.perf_counter()
+    grouped: dict[tuple[str, str], list] = defaultdict(list)
+    for entry in entries:
+        grouped[(entry.record_type, entry.action)].append(entry)
+
+    failed: dict[int, str] = {}
+    handlers = {
+        (SearchIndexQueueEntry.RecordType.DOCUMENT, SearchIndexQueueEntry.Action.INDEX): (
+            _index_documents
+        ),
+        (SearchIndexQueueEntry.RecordType.DOCUMENT, SearchIndexQueueEntry.Action.REMOVE): (
+            _remove_records
+        ),
+        (SearchIndexQueueEntry.RecordType.CHAT_MESSAGE, SearchIndexQueueEntry.Action.INDEX): (
+            _index_chat_messages
+        ),
+        (SearchIndexQueueEntry.RecordType.EMAIL_MESSAGE, SearchIndexQueueEntry.Action.INDEX): (
+            _index_email_messages
+        ),
+    }
+
+    for key, group in grouped.items():
+        handler = handlers.get(key)
+        if handler is None:
+            logger.warning("No index queue handler for %s", key)
+            continue
+        try:
+            errors = handler(group) or {}
+        except Exception as exc:  # noqa: BLE001 - retried with backoff
+            logger.warning("Index queue handler %s failed: %s", key, exc)
+            for entry in group:
+                failed[entry.pk] = str(exc)
+            continue
+        for entry in group:
+            if entry.object_id in errors:
+                failed[entry.pk] = errors[entry.object_id]
+
+    completed = [entry for entry in entries if entry.pk not in failed]
+    _complete_entries(completed)
+    _retry_entries([entry for entry in entries if entry.pk in failed], failed, stats)
+
+    finished = timezone.now()
+    for entry in completed:
+        lag = (finished - entry.enqueued_at).total_seconds()
+        stats.total_lag_s += lag
+        stats.max_lag_s = max(stats.max_lag_s, lag)
+    stats.processed += len(completed)
+    stats.batches += 1
+
+    logger.debug(
+        "Processed index queue batch of %d entries in %.2fs",
+        len(entries),
+        time.perf_counter() - started,
+    )
+
+
+def _complete_entries(entries: list) -> None:
+    """Delete processed entries unless another save coalesced into them meanwhile."""
+    from documents.models import SearchIndexQueueEntry
+
+    if not entries:
+        return
+
+    condition = Q()
+    for entry in entries:
+        condition |= Q(pk=entry.pk, version=entry.version)
+    SearchIndexQueueEntry.objects.filter(condition).delete()
+
+
+def _retry_entries(entries: list, errors: dict[int, str], stats: QueueRunStats) -> None:
+    from documents.models import SearchIndexQueueEntry
+
+    max_attempts = int(getattr(settings, "FILE_SEARCH_INDEX_MAX_ATTEMPTS", 5))
+    now = timezone.now()
+    for entry in entries:
+        attempts = entry.attempts + 1
+        if attempts >= max_attempts:
+            logger.error(
+                "Dropping index queue entry %s:%s after %d attempts: %s",
+                entry.record_type,
+                entry.object_id,
+                attempts,
+                errors[entry.pk],
+            )
+            SearchIndexQueueEntry.objects.filter(pk=entry.pk, version=entry.version).delete()
+            stats.dropped += 1
+            continue
+
+        backoff = timedelta(seconds=min(2**attempts * 5, 600))
+        SearchIndexQueueEntry.objects.filter(pk=entry.pk).update(
+            attempts=attempts,
+            last_error=errors[entry.pk],
+            available_at=now + backoff,
+        )
+        stats.failed += 1
+
+
+def _index_documents(entries: list) -> dict[str, str]:
+    """Index queued documents. Returns errors keyed by entry object ID."""
+    from documents.models import Document
+
+    from .indexing import index_documents
+
+    force_by_id = {int(entry.object_id): entry.force for entry in entries}
+    documents = Document.objects.filter(id__in=force_by_id).select_related("project")
+    groups: dict[tuple[int, bool], list] = defaultdict(list)
+    for document in documents.select_subclasses():
+        groups[(document.project_id, force_by_id[document.id])].append(document)
+
+    errors: dict[str, str] = {}
+    for (project_id, force), group in groups.items():
+        if project_id is None:
+            continue
+        stats = index_documents(group, force=force)
+        errors.update({str(document_id): error for document_id, error in stats.errors.items()})
+    return errors
+
+
+def _remove_records(entries: list) -> None:
+    from . import FileSearchRegistry
+
+    by_store: dict[str, list[str]] = defaultdict(list)
+    for entry in entries:
+        store_id = entry.payload.get("store_id")
+        record_id = entry.payload.get("record_id")
+        if store_id and record_id:
+            by_store[store_id].append(record_id)
+
+    if not by_store:
+        return
+
+    store = FileSearchRegistry.get()
+    for store_id, record_ids in by_store.items():
+        store.remove_text_records(store_id, record_ids)
+
+
+def _index_chat_messages(entries: list) -> None:
+    from chat.models import Message
+
+    from .indexing import index_chat_message
+
+    ids = [int(entry.object_id) for entry in entries]
+    for message in Message.objects.filter(id__in=ids).select_related("conversation__project"):
+        index_chat_message(message)
+
+
+def _index_email_messages(entries: list) -> None:
+    from email_gateway.models import EmailMessage
+
+    from .indexing import index_email_message
+
+    ids = [int(entry.object_id) for entry in entries]
+    messages = EmailMessage.objects.filter(id__in=ids).select_related("email_thread__project")
+    for email_message in messages:
+        index_email_message(email_message)
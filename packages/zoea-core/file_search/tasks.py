@@ -0,0 +1,27 @@
+"""
+Background tasks for file search indexing.
+
+Uses Django-Q2 for async task execution.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+
+logger = logging.getLogger(__name__)
+
+
+def drain_index_queue(*, wait_for_pending: bool = True) -> dict:
+    """
+    Drain the file search index queue.
+
+    Queued by file_search.queue by whichever enqueue or exiting worker takes
+    the worker lease; the run renews the lease and hands it off on exit.
+    ``manage.py process_index_queue --install-schedule`` registers a periodic
+    schedule as an extra safety net.
+    """
+    from .queue import process_index_queue
+
+    stats = process_index_queue(wait_for_pending=wait_for_pending, hand_off=True)
+    return {**asdict(stats), "avg_lag_s": stats.avg_lag_s}
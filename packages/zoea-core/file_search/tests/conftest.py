@@ -0,0 +1,123 @@
+"""
+Shared fixtures for file_search tests.
+"""
+
+import uuid
+from collections.abc import Generator
+
+import pytest
+from django.contrib.auth import get_user_model
+from organizations.models import OrganizationUser
+
+from accounts.models import Account
+from documents.models import Markdown
+from file_search import FileSearchRegistry, FileSearchStore
+from file_search.types import DocumentReference, SearchResult, StoreInfo
+from projects.models import Project
+
+User = get_user_model()
+
+
+class FakeFileSearchStore(FileSearchStore):
+    """In-memory backend that records the calls made by the indexer."""
+
+    def __init__(self):
+        self.records: dict[str, dict] = {}
+        self.add_batches: list[list[str]] = []
+        self.remove_batches: list[list[str]] = []
+        self.stores: dict[str, str] = {}
+
+    @property
+    def backend_name(self) -> str:
+        return "fake"
+
+    def create_store(self, name, *, ephemeral=False):
+        store_id = f"fake-{uuid.uuid4().hex[:8]}"
+        self.stores[store_id] = name
+        return StoreInfo(store_id=store_id, display_name=name, backend=self.backend_name)
+
+    def get_store(self, store_id):
+        if store_id not in self.stores:
+            return None
+        return StoreInfo(store_id=store_id, display_name=self.stores[store_id], backend="fake")
+
+    def delete_store(self, store_id, *, force=True):
+        self.forget_store(store_id)
+        self.stores.pop(store_id, None)
+
+    def list_stores(self) -> Generator[StoreInfo]:
+        for store_id in self.stores:
+            yield self.get_store(store_id)
+
+    def add_document(self, store_id, document, **options):
+        raise NotImplementedError
+
+    def remove_document(self, store_id, backend_ref_id):
+        self.remove_text_record(store_id, backend_ref_id)
+
+    def add_text_record(self, store_id, *, record_id, content, metadata, display_name=None,
+                        **options):
+        self.records[record_id] = {"content": content, "metadata": metadata}
+        return DocumentReference(
+            document_id=None,
+            store_id=store_id,
+            backend_ref_id=record_id,
+            display_name=display_name or record_id,
+        )
+
+    def add_text_records(self, store_id, records, **options):
+        self.add_batches.append([record.record_id for record in records])
+        return super().add_text_records(store_id, records, **options)
+
+    def remove_text_record(self, store_id, record_id):
+        self.records.pop(record_id, None)
+
+    def remove_text_records(self, store_id, record_ids):
+        self.remove_batches.append(list(record_ids))
+        super().remove_text_records(store_id, record_ids)
+
+    def search(self, store_id, query, *, max_results=5, filters=None, mode=None):
+        return SearchResult(answer="")
+
+
+@pytest.fixture
+def fake_store():
+    FileSearchRegistry.register("fake", FakeFileSearchStore)
+    try:
+        yield FileSearchRegistry.get("fake")
+    finally:
+        FileSearchRegistry.unregister("fake")
+
+
+@pytest.fixture
+def organization(db):
+    return Account.objects.create(name="Indexing Org")
+
+
+@pytest.fixture
+def user(organization):
+    user = User.objects.create_user(username="indexer", password="testpass123")
+    OrganizationUser.objects.create(organization=organization, user=user)
+    return user
+
+
+@pytest.fixture
+def project(organization, user):
+    return Project.objects.create(organization=organization, name="Index Project", created_by=user)
+
+
+@pytest.fixture
+def make_docs(organization, project, user):
+    def _make(count):
+        return [
+            Markdown.objects.create(
+                organization=organization,
+                project=project,
+                name=f"Doc {i}",
+                content=f"# Doc {i}\n\nBody {i}",
+                created_by=user,
+            )
+            for i in range(count)
+        ]
+
+    return _make
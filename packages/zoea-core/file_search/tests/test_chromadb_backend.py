@@ -0,0 +1,344 @@
+"""
+Tests for the ChromaDB backend's record writes.
+
+Uses an in-memory stand-in for the ChromaDB collection so the tests do not
+need the default embedding model.
+"""
+
+import pytest
+
+from file_search.backends.chromadb import ChromaDBFileSearchStore
+from file_search.exceptions import DocumentUploadError, SearchError
+from file_search.hashing import hash_text
+from file_search.types import TextRecord
+
+
+class FakeCollection:
+    """Dict-backed stand-in for a chromadb Collection."""
+
+    def __init__(self, name):
+        self.name = name
+        self.metadata = {"display_name": name}
+        self.rows: dict[str, tuple[str, dict]] = {}
+        self.embedded: list[str] = []
+        self.updated: list[str] = []
+
+    def _matches(self, metadata, where):
+        if not where:
+            return True
+        for key, condition in where.items():
+            if isinstance(condition, dict) and "$in" in condition:
+                if metadata.get(key) not in condition["$in"]:
+                    return False
+            elif metadata.get(key) != condition:
+                return False
+        return True
+
+    def count(self):
+        return len(self.rows)
+
+    def add(self, ids, documents, metadatas):
+        for chunk_id, document, metadata in zip(ids, documents, metadatas):
+            assert chunk_id not in self.rows, f"duplicate id {chunk_id}"
+            self.rows[chunk_id] = (document, dict(metadata))
+            self.embedded.append(chunk_id)
+
+    def update(self, ids, metadatas):
+        for chunk_id, metadata in zip(ids, metadatas):
+            document, _ = self.rows[chunk_id]
+            self.rows[chunk_id] = (document, dict(metadata))
+            self.updated.append(chunk_id)
+
+    def get(self, where=None, include=None):
+        ids = [cid for cid, (_, meta) in self.rows.items() if self._matches(meta, where)]
+        return {
+            "ids": ids,
+            "documents": [self.rows[cid][0] for cid in ids],
+            "metadatas": [dict(self.rows[cid][1]) for cid in ids],
+        }
+
+    def query(self, query_texts, n_results, where=None):
+        # Stand-in for embedding similarity: rank by shared lowercase words
+        words = set(query_texts[0].lower().split())
+        ids = self.get(where=where)["ids"]
+        ids.sort(key=lambda cid: -len(words & set(self.rows[cid][0].lower().split())))
+        ids = ids[:n_results]
+        return {
+            "ids": [ids],
+            "documents": [[self.rows[cid][0] for cid in ids]],
+            "metadatas": [[dict(self.rows[cid][1]) for cid in ids]],
+            "distances": [[0.5 for _ in ids]],
+        }
+
+    def delete(self, ids=None, where=None):
+        targets = ids if ids is not None else self.get(where=where)["ids"]
+        for chunk_id in targets:
+            self.rows.pop(chunk_id, None)
+
+
+class FakeClient:
+    def __init__(self):
+        self.collections: dict[str, FakeCollection] = {}
+        self.get_collection_calls = 0
+
+    def get_or_create_collection(self, name, metadata=None):
+        collection = self.collections.setdefault(name, FakeCollection(name))
+        collection.metadata = metadata or collection.metadata
+        return collection
+
+    def get_collection(self, name):
+        self.get_collection_calls += 1
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist")
+        return self.collections[name]
+
+    def delete_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist")
+        del self.collections[name]
+
+    def list_collections(self):
+        return list(self.collections.values())
+
+
+@pytest.fixture
+def chroma_store():
+    store = ChromaDBFileSearchStore()
+    store.client = FakeClient()
+    return store
+
+
+@pytest.fixture
+def collection(chroma_store):
+    info = chroma_store.create_store("Test Store")
+    return chroma_store.client.collections[info.store_id]
+
+
+def _record(content, **metadata):
+    return TextRecord(
+        record_id="doc-1",
+        content=content,
+        metadata={"document_id": "1", **metadata},
+        display_name="Doc",
+    )
+
+
+def test_upsert_embeds_only_changed_chunks(chroma_store, collection):
+    first = "a" * 900 + "\n\n" + "b" * 900 + "\n\n" + "c" * 900
+    chroma_store.upsert_text_records(collection.name, [_record(first)])
+    assert len(collection.embedded) == 3
+
+    collection.embedded.clear()
+    edited = "a" * 900 + "\n\n" + "B" * 900 + "\n\n" + "c" * 900
+    chroma_store.upsert_text_records(collection.name, [_record(edited)])
+
+    assert len(collection.embedded) == 1
+    texts = sorted(document for document, _ in collection.rows.values())
+    assert texts == sorted(["a" * 900, "B" * 900, "c" * 900])
+
+
+def test_upsert_metadata_only_change_skips_embedding(chroma_store, collection):
+    chroma_store.upsert_text_records(collection.name, [_record("Some text", folder_id="1")])
+    collection.embedded.clear()
+
+    chroma_store.upsert_text_records(collection.name, [_record("Some text", folder_id="2")])
+
+    assert collection.embedded == []
+    assert len(collection.updated) == 1
+    (_, metadata), = collection.rows.values()
+    assert metadata["folder_id"] == "2"
+
+
+def test_upsert_unchanged_record_is_noop(chroma_store, collection):
+    chroma_store.upsert_text_records(collection.name, [_record("Same")])
+    collection.embedded.clear()
+
+    chroma_store.upsert_text_records(collection.name, [_record("Same")])
+
+    assert collection.embedded == []
+    assert collection.updated == []
+
+
+def test_upsert_handles_repeated_chunks(chroma_store, collection):
+    repeated = "x" * 900 + "\n\n" + "y" * 900 + "\n\n" + "x" * 900
+    chroma_store.upsert_text_records(collection.name, [_record(repeated)])
+
+    assert len(collection.rows) == 3
+    assert all(meta["content_hash"] for _, meta in collection.rows.values())
+
+
+def test_chunks_record_page_range(chroma_store, collection):
+    pages = ["a" * 900, "b" * 300 + "\n\n" + "c" * 300, "d" * 900]
+    content = "\n\n".join(pages)
+    offsets = [0, 902, 902 + len(pages[1]) + 2]
+    record = _record(content)
+    record.page_offsets = offsets
+
+    chroma_store.upsert_text_records(collection.name, [record])
+
+    page_ranges = {
+        document[0]: (meta["page_number"], meta["page_end"])
+        for document, meta in collection.rows.values()
+    }
+    assert page_ranges == {"a": (1, 1), "b": (2, 2), "d": (3, 3)}
+
+
+def test_paged_record_is_chunked_page_by_page(chroma_store, collection):
+    pages = ["a" * 900, "b" * 300 + "\n\n" + "c" * 300, "d" * 900]
+    record = TextRecord(
+        record_id="doc-1",
+        content="",
+        metadata={"document_type": "PDF"},
+        pages=lambda: iter(enumerate(pages, start=1)),
+    )
+
+    chroma_store.upsert_text_records(collection.name, [record])
+
+    page_ranges = {
+        document[0]: (meta["page_number"], meta["page_end"])
+        for document, meta in collection.rows.values()
+    }
+    assert page_ranges == {"a": (1, 1), "b": (2, 2), "d": (3, 3)}
+    content_hash = hash_text("\n\n".join(pages))
+    assert {meta["content_hash"] for _, meta in collection.rows.values()} == {content_hash}
+
+
+def test_collection_handles_are_cached_until_store_deleted(chroma_store, collection):
+    chroma_store.client.get_collection_calls = 0
+    for _ in range(3):
+        chroma_store.upsert_text_records(collection.name, [_record("Some text")])
+    assert chroma_store.client.get_collection_calls == 0  # primed by create_store
+
+    chroma_store.delete_store(collection.name)
+
+    assert collection.name not in chroma_store._collections
+    with pytest.raises(DocumentUploadError):
+        chroma_store.upsert_text_records(collection.name, [_record("Some text")])
+    assert chroma_store.client.get_collection_calls == 1
+
+
+def test_collection_cache_is_bounded(chroma_store):
+    chroma_store._collections.maxsize = 2
+    store_ids = [chroma_store.create_store(f"Store {i}").store_id for i in range(3)]
+
+    assert len(chroma_store._collections) == 2
+    assert store_ids[0] not in chroma_store._collections
+
+
+def test_pooled_client_is_shared(settings, tmp_path):
+    from file_search.clients import get_client
+
+    built = []
+    first = get_client(("test", str(tmp_path)), lambda: built.append(1) or object())
+    second = get_client(("test", str(tmp_path)), lambda: built.append(1) or object())
+
+    assert first is second
+    assert built == [1]
+
+
+def _text_record(record_id, content, **metadata):
+    return TextRecord(record_id=record_id, content=content, metadata={"record_id": record_id, **metadata})
+
+
+def test_lexical_index_follows_collection_writes(chroma_store, collection):
+    chroma_store.upsert_text_records(
+        collection.name,
+        [
+            _text_record("doc-1", "Quarterly invoice for ACME-4471"),
+            _text_record("doc-2", "Notes about the design review"),
+        ],
+    )
+    assert chroma_store.lexical.count(collection.name) == 2
+
+    chroma_store.upsert_text_records(
+        collection.name, [_text_record("doc-1", "Renamed invoice ACME-9000")]
+    )
+    assert [hit.metadata["record_id"] for hit in chroma_store.lexical.search(collection.name, "9000")] == ["doc-1"]
+    assert chroma_store.lexical.search(collection.name, "4471") == []
+
+    chroma_store.remove_text_records(collection.name, ["doc-2"])
+    assert chroma_store.lexical.search(collection.name, "design review") == []
+
+    chroma_store.delete_store(collection.name)
+    assert chroma_store.lexical.count(collection.name) == 0
+
+
+def test_hybrid_search_surfaces_exact_identifier(chroma_store, collection):
+    records = [
+        _text_record(f"doc-{i}", f"general project planning notes number {i}") for i in range(6)
+    ]
+    records.append(_text_record("doc-symbol", "calls get_user_organization() before saving"))
+    chroma_store.upsert_text_records(collection.name, records)
+
+    vector = chroma_store.search(collection.name, "get_user_organization", max_results=3, mode="vector")
+    hybrid = chroma_store.search(collection.name, "get_user_organization", max_results=3, mode="hybrid")
+
+    assert "doc-symbol" not in [source.metadata["record_id"] for source in vector.sources]
+    hybrid_ids = [source.metadata["record_id"] for source in hybrid.sources]
+    assert hybrid_ids[0] == "doc-symbol"
+    assert len(set(hybrid_ids)) == 3
+
+
+def test_search_defaults_to_vector_ranking(chroma_store, collection, settings):
+    settings.FILE_SEARCH_MODE = None
+    records = [
+        _text_record(f"doc-{i}", f"general project planning notes number {i}") for i in range(6)
+    ]
+    records.append(_text_record("doc-symbol", "calls get_user_organization() before saving"))
+    chroma_store.upsert_text_records(collection.name, records)
+
+    default = chroma_store.search(collection.name, "get_user_organization", max_results=3)
+    vector = chroma_store.search(
+        collection.name, "get_user_organization", max_results=3, mode="vector"
+    )
+
+    assert [source.metadata["record_id"] for source in default.sources] == [
+        source.metadata["record_id"] for source in vector.sources
+    ]
+
+    settings.FILE_SEARCH_MODE = "hybrid"
+    opted_in = chroma_store.search(collection.name, "get_user_organization", max_results=3)
+    assert opted_in.sources[0].metadata["record_id"] == "doc-symbol"
+
+
+def test_lexical_search_applies_where_filter(chroma_store, collection):
+    chroma_store.upsert_text_records(
+        collection.name,
+        [
+            _text_record("doc-1", "deployment checklist", folder_id="1"),
+            _text_record("doc-2", "deployment runbook", folder_id="2"),
+        ],
+    )
+
+    result = chroma_store.search(
+        collection.name, "deployment", mode="lexical", filters={"where": {"folder_id": "2"}}
+    )
+
+    assert [source.metadata["record_id"] for source in result.sources] == ["doc-2"]
+
+
+def test_lexical_index_backfilled_from_existing_collection(chroma_store, collection):
+    chroma_store.upsert_text_records(collection.name, [_text_record("doc-1", "legacy subject line")])
+    chroma_store.lexical.drop_store(collection.name)
+
+    result = chroma_store.search(collection.name, "legacy", mode="lexical")
+
+    assert [source.metadata["record_id"] for source in result.sources] == ["doc-1"]
+    assert chroma_store.lexical.count(collection.name) == 1
+
+
+def test_unknown_search_mode_rejected(chroma_store, collection):
+    with pytest.raises(SearchError):
+        chroma_store.search(collection.name, "anything", mode="fuzzy")
+
+
+@pytest.mark.django_db
+def test_record_writes_bump_store_version(chroma_store, collection):
+    from file_search.query_cache import get_store_version
+
+    chroma_store.upsert_text_records(collection.name, [_text_record("doc-1", "first")])
+    chroma_store.upsert_text_records(collection.name, [_text_record("doc-1", "first")])
+    assert get_store_version("chromadb", collection.name) == 1  # unchanged upsert
+
+    chroma_store.remove_text_record(collection.name, "doc-1")
+    assert get_store_version("chromadb", collection.name) == 2
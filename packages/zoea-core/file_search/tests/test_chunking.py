@@ -0,0 +1,145 @@
+"""
+Tests for file_search chunking strategies.
+"""
+
+import pytest
+
+from file_search.chunking import (
+    ChunkerRegistry,
+    CSVRowGroupChunker,
+    MarkdownChunker,
+    SentenceWindowChunker,
+    YooptaChunker,
+)
+from file_search.chunking.benchmark import benchmark_chunker
+from file_search.exceptions import ConfigurationError
+
+
+def _sentences(count, word="alpha"):
+    return " ".join(f"{word.capitalize()} sentence number {i} ends here." for i in range(count))
+
+
+def test_sentence_chunks_respect_budget_and_overlap():
+    chunker = SentenceWindowChunker(max_tokens=32, overlap_tokens=12)
+    text = _sentences(40)
+
+    chunks = list(chunker.chunk(text))
+
+    assert len(chunks) > 1
+    assert all(len(chunk.text) <= chunker.max_chars for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.start < previous.end  # windows overlap
+        assert text[current.start:previous.end].strip()
+    assert chunks[-1].end == len(text)
+
+
+def test_sentence_chunker_splits_oversized_sentence():
+    chunker = SentenceWindowChunker(max_tokens=16, overlap_tokens=0)
+    text = "word " * 200
+
+    chunks = list(chunker.chunk(text))
+
+    assert all(len(chunk.text) <= chunker.max_chars for chunk in chunks)
+    assert "".join(chunk.text.replace(" ", "") for chunk in chunks) == "word" * 200
+
+
+def test_chunk_pages_keeps_offsets_in_joined_text():
+    chunker = SentenceWindowChunker(max_tokens=32, overlap_tokens=0)
+    pages = [(1, _sentences(6)), (2, _sentences(6, word="beta"))]
+    joined = "\n\n".join(text for _, text in pages)
+
+    chunks = list(chunker.chunk_pages(iter(pages)))
+
+    assert {chunk.metadata["page_number"] for chunk in chunks} == {1, 2}
+    assert all(joined[chunk.start:chunk.end] == chunk.text for chunk in chunks)
+    assert all(
+        ("Beta" in chunk.text) == (chunk.metadata["page_number"] == 2) for chunk in chunks
+    )
+
+
+def test_markdown_chunks_follow_headings():
+    chunker = MarkdownChunker(max_tokens=64, overlap_tokens=0)
+    text = (
+        "# Guide\n\nShort intro.\n\n"
+        "## Install\n\n" + _sentences(20, "install") + "\n\n"
+        "```\n# not a heading\n```\n\n"
+        "## Usage\n\nRun it."
+    )
+
+    chunks = list(chunker.chunk(text))
+    sections = [chunk.metadata.get("section") for chunk in chunks]
+
+    assert sections[0] == "Guide"
+    assert "Guide > Install" in sections
+    assert sections[-1] == "Guide > Usage"
+    assert "not a heading" not in sections
+    assert chunks[-1].text.startswith("## Usage")
+
+
+def test_markdown_merges_small_sections():
+    chunker = MarkdownChunker(max_tokens=256, overlap_tokens=0)
+    text = "# A\n\none.\n\n# B\n\ntwo.\n\n# C\n\nthree."
+
+    chunks = list(chunker.chunk(text))
+
+    assert len(chunks) == 1
+    assert chunks[0].text == text
+
+
+def test_yoopta_keeps_headings_with_following_blocks():
+    chunker = YooptaChunker(max_tokens=32, overlap_tokens=0)
+    blocks = ["Overview", "First paragraph of text.", "Second paragraph, a bit longer than the first."]
+    blocks += ["Details", "Details body paragraph one.", "Details body paragraph two."]
+    text = "\n\n".join(blocks)
+
+    chunks = list(chunker.chunk(text))
+
+    for chunk in chunks:
+        assert not chunk.text.endswith(("Overview", "Details"))
+    assert any(chunk.text.startswith("Details") for chunk in chunks)
+    assert chunks[-1].metadata == {"section": "Details"}
+
+
+def test_csv_row_groups_repeat_header():
+    chunker = CSVRowGroupChunker(max_tokens=16, overlap_tokens=0)
+    rows = [f"{i},item-{i}" for i in range(1, 21)]
+    text = "id,name\n" + "\n".join(rows) + '\n21,"multi\nline"\n'
+
+    chunks = list(chunker.chunk(text))
+
+    assert len(chunks) > 1
+    assert all(chunk.text.startswith("id,name\n") for chunk in chunks)
+    assert chunks[0].metadata["row_start"] == 1
+    assert chunks[-1].metadata["row_end"] == 21
+    assert chunks[-1].text.endswith('21,"multi\nline"')
+    covered = [(c.metadata["row_start"], c.metadata["row_end"]) for c in chunks]
+    assert all(end + 1 == start for (_, end), (start, _) in zip(covered, covered[1:]))
+
+
+def test_registry_uses_per_type_config(settings):
+    settings.FILE_SEARCH_CHUNKING = {
+        "default": {"strategy": "sentence", "max_tokens": 100},
+        "Markdown": {"strategy": "markdown", "overlap_tokens": 0},
+    }
+
+    markdown = ChunkerRegistry.for_document_type("Markdown")
+    other = ChunkerRegistry.for_document_type("PDF")
+
+    assert isinstance(markdown, MarkdownChunker)
+    assert (markdown.max_tokens, markdown.overlap_tokens) == (100, 0)
+    assert isinstance(other, SentenceWindowChunker)
+    assert ChunkerRegistry.for_document_type("PDF") is other
+
+
+def test_registry_rejects_unknown_strategy():
+    with pytest.raises(ConfigurationError):
+        ChunkerRegistry.get("nope")
+
+
+def test_benchmark_reports_throughput():
+    result = benchmark_chunker(SentenceWindowChunker(max_tokens=32, overlap_tokens=8), [_sentences(50)] * 3)
+
+    assert result.documents == 3
+    assert result.chunks > 3
+    assert result.chunks_per_second > 0
+    assert result.max_chunk_tokens <= 32
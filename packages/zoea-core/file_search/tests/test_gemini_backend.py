@@ -0,0 +1,186 @@
+"""Tests for concurrent Gemini File Search uploads against a local fake client."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+
+from file_search.backends.gemini import GeminiFileSearchStore
+from file_search.backends.gemini_uploads import UploadTimeoutError
+from file_search.exceptions import BatchUploadError
+from file_search.indexing import _upsert_text_records
+from file_search.types import TextRecord
+
+
+class RateLimitError(Exception):
+    code = 429
+
+
+class FakeOperation:
+    def __init__(self, name, polls_needed):
+        self.name = name
+        self.polls_left = polls_needed
+        self.done = polls_needed == 0
+        self.error = None
+        self.response = SimpleNamespace(name=f"files/{name}") if self.done else None
+
+
+class FakeGeminiClient:
+    """Stand-in for google.genai.Client's file_search_stores/operations APIs."""
+
+    def __init__(self, polls_needed=2, rate_limit_first=0, fail=()):
+        self.polls_needed = polls_needed
+        self.rate_limits_left = rate_limit_first
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.uploads = []
+        self.poll_rounds: list[set[str]] = []
+        self._current_round: set[str] = set()
+        self.file_search_stores = SimpleNamespace(upload_to_file_search_store=self._upload)
+        self.operations = SimpleNamespace(get=self._get)
+
+    def _upload(self, *, file, file_search_store_name, config):
+        with self.lock:
+            if self.rate_limits_left:
+                self.rate_limits_left -= 1
+                raise RateLimitError("429 RESOURCE_EXHAUSTED")
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            name = config["display_name"]
+            self.uploads.append(name)
+        with open(file, encoding="utf-8") as handle:
+            handle.read()
+        return FakeOperation(name, self.polls_needed)
+
+    def _get(self, operation):
+        with self.lock:
+            if operation.name in self._current_round:
+                self.poll_rounds.append(self._current_round)
+                self._current_round = set()
+            self._current_round.add(operation.name)
+            operation.polls_left -= 1
+            if operation.polls_left <= 0:
+                operation.done = True
+                self.active -= 1
+                if operation.name in self.fail:
+                    operation.error = {"code": 13, "message": "import failed"}
+                else:
+                    operation.response = SimpleNamespace(name=f"files/{operation.name}")
+            return operation
+
+
+@pytest.fixture
+def gemini_store(settings):
+    settings.GEMINI_API_KEY = "test-key"
+    settings.GEMINI_UPLOAD_CONCURRENCY = 2
+    settings.GEMINI_UPLOAD_MAX_IN_FLIGHT = 4
+    settings.GEMINI_UPLOAD_POLL_INTERVAL = 0
+    settings.GEMINI_UPLOAD_BACKOFF = 0
+    with patch("file_search.backends.gemini.get_gemini_client"):
+        store = GeminiFileSearchStore()
+    with patch.object(GeminiFileSearchStore, "bump_store_version"):
+        yield store
+
+
+def _records(count):
+    return [
+        TextRecord(record_id=f"doc-{i}", content=f"Body {i}", metadata={"document_type": "Markdown"})
+        for i in range(count)
+    ]
+
+
+def test_add_text_records_bounds_in_flight_and_shares_poller(gemini_store):
+    client = FakeGeminiClient(polls_needed=3)
+    gemini_store.client = client
+
+    refs = gemini_store.add_text_records("fileSearchStores/s1", _records(10))
+
+    assert [ref.backend_ref_id for ref in refs] == [f"files/doc-{i}" for i in range(10)]
+    assert sorted(client.uploads) == sorted(f"doc-{i}" for i in range(10))
+    assert client.max_active <= settings.GEMINI_UPLOAD_MAX_IN_FLIGHT
+    # Pending operations are polled together rather than one upload at a time
+    assert max(len(round_) for round_ in client.poll_rounds) > 1
+    gemini_store.bump_store_version.assert_called_once_with("fileSearchStores/s1")
+
+
+def test_rate_limited_uploads_are_retried(gemini_store):
+    client = FakeGeminiClient(polls_needed=1, rate_limit_first=3)
+    gemini_store.client = client
+
+    refs = gemini_store.add_text_records("fileSearchStores/s1", _records(4))
+
+    assert len(refs) == 4
+    assert sorted(client.uploads) == [f"doc-{i}" for i in range(4)]
+
+
+def test_partial_failure_raises_batch_error(gemini_store):
+    gemini_store.client = FakeGeminiClient(polls_needed=1, fail={"doc-1"})
+
+    with pytest.raises(BatchUploadError) as excinfo:
+        gemini_store.add_text_records("fileSearchStores/s1", _records(3))
+
+    assert set(excinfo.value.errors) == {"doc-1"}
+    assert [ref.backend_ref_id for ref in excinfo.value.references] == ["files/doc-0", "files/doc-2"]
+
+
+def test_upsert_only_retries_failed_records(gemini_store):
+    client = FakeGeminiClient(polls_needed=1, fail={"doc-1"})
+    gemini_store.client = client
+
+    succeeded = _upsert_text_records(gemini_store, store_id="fileSearchStores/s1", records=_records(3))
+
+    assert succeeded == {"doc-0", "doc-2"}
+    # doc-1 was retried on its own; the written records were not re-uploaded
+    assert sorted(client.uploads) == ["doc-0", "doc-1", "doc-1", "doc-2"]
+
+
+def test_stuck_operation_times_out_into_batch_error(gemini_store, settings):
+    settings.GEMINI_UPLOAD_JOB_TIMEOUT = 0.2
+    settings.GEMINI_UPLOAD_POLL_INTERVAL = 0.01
+    client = FakeGeminiClient(polls_needed=1)
+    stuck = FakeOperation("doc-1", polls_needed=10**9)
+    upload = client._upload
+
+    def upload_or_stick(**kwargs):
+        operation = upload(**kwargs)
+        return stuck if operation.name == "doc-1" else operation
+
+    client.file_search_stores.upload_to_file_search_store = upload_or_stick
+    gemini_store.client = client
+
+    with pytest.raises(BatchUploadError) as excinfo:
+        gemini_store.add_text_records("fileSearchStores/s1", _records(3))
+
+    assert isinstance(excinfo.value.errors["doc-1"], UploadTimeoutError)
+    assert [ref.backend_ref_id for ref in excinfo.value.references] == [
+        "files/doc-0",
+        "files/doc-2",
+    ]
+
+
+def test_paged_record_is_uploaded_page_by_page(gemini_store):
+    client = FakeGeminiClient(polls_needed=0)
+    uploaded = []
+    upload = client._upload
+
+    def capture(*, file, **kwargs):
+        with open(file, encoding="utf-8") as handle:
+            uploaded.append(handle.read())
+        return upload(file=file, **kwargs)
+
+    client.file_search_stores.upload_to_file_search_store = capture
+    gemini_store.client = client
+
+    gemini_store.add_text_record(
+        "fileSearchStores/s1",
+        record_id="doc-1",
+        content="",
+        metadata={"document_type": "PDF"},
+        pages=lambda: iter([(1, "Intro"), (2, "Results")]),
+    )
+
+    assert uploaded == ["Intro\n\nResults"]
@@ -0,0 +1,175 @@
+"""
+Tests for batch indexing helpers in file_search.indexing.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from chat.models import Conversation
+from documents.models import (
+    CollectionType,
+    DocumentCollection,
+    DocumentCollectionItem,
+    Markdown,
+)
+from file_search.indexing import (
+    _prefetch_collection_metadata,
+    ensure_project_store,
+    index_document,
+    index_documents,
+)
+
+
+def _attach(document, collection):
+    item = DocumentCollectionItem(collection=collection, position=document.id)
+    item.content_object = document
+    item.save()
+    return item
+
+
+@pytest.mark.django_db
+def test_index_documents_batches_upserts_and_marks_synced(fake_store, make_docs):
+    docs = make_docs(5)
+
+    stats = index_documents(docs, backend="fake", batch_size=2)
+
+    assert stats.indexed == 5
+    assert stats.failed == 0
+    assert stats.batches == 3
+    assert [len(batch) for batch in fake_store.add_batches] == [2, 2, 1]
+    assert [len(batch) for batch in fake_store.remove_batches] == [2, 2, 1]
+    assert set(fake_store.records) == {f"doc-{doc.id}" for doc in docs}
+
+    for doc in Markdown.objects.filter(id__in=[doc.id for doc in docs]):
+        assert doc.gemini_file_id == f"doc-{doc.id}"
+        assert doc.gemini_synced_at is not None
+
+
+@pytest.mark.django_db
+def test_index_documents_includes_collection_metadata(
+    fake_store, make_docs, organization, project, user
+):
+    docs = make_docs(2)
+    collection = DocumentCollection.objects.create(
+        organization=organization,
+        project=project,
+        collection_type=CollectionType.ARTIFACT,
+        name="Artifacts",
+    )
+    conversation = Conversation.objects.create(
+        organization=organization,
+        project=project,
+        created_by=user,
+        artifacts=collection,
+    )
+    item = _attach(docs[0], collection)
+
+    index_documents(docs, backend="fake")
+
+    metadata = fake_store.records[f"doc-{docs[0].id}"]["metadata"]
+    assert metadata["collection_id"] == str(collection.id)
+    assert metadata["collection_item_id"] == str(item.id)
+    assert metadata["conversation_id"] == str(conversation.id)
+    assert "collection_id" not in fake_store.records[f"doc-{docs[1].id}"]["metadata"]
+
+
+@pytest.mark.django_db
+def test_prefetch_collection_metadata_query_count_is_constant(
+    make_docs, organization, project, django_assert_num_queries
+):
+    collection = DocumentCollection.objects.create(
+        organization=organization,
+        project=project,
+        collection_type=CollectionType.ATTACHMENT,
+        name="Attachments",
+    )
+    few = make_docs(2)
+    many = make_docs(8)
+    for doc in few + many:
+        _attach(doc, collection)
+
+    # Warm the ContentType cache so both runs are measured the same way.
+    _prefetch_collection_metadata(few)
+
+    # One item query plus one per related model (conversation, email thread, run).
+    with django_assert_num_queries(4):
+        small = _prefetch_collection_metadata(few)
+    with django_assert_num_queries(4):
+        large = _prefetch_collection_metadata(many)
+
+    assert len(small) == 2
+    assert len(large) == 8
+    assert all(meta["collection_type"] == CollectionType.ATTACHMENT for meta in large.values())
+
+
+@pytest.mark.django_db
+def test_index_documents_skips_unchanged_documents(fake_store, make_docs):
+    docs = make_docs(3)
+    index_documents(docs, backend="fake")
+    fake_store.add_batches.clear()
+
+    docs = list(Markdown.objects.filter(id__in=[doc.id for doc in docs]))
+    stats = index_documents(docs, backend="fake")
+
+    assert stats.unchanged == 3
+    assert stats.indexed == 0
+    assert fake_store.add_batches == []
+
+
+@pytest.mark.django_db
+def test_index_documents_skips_extraction_when_source_unchanged(fake_store, make_docs):
+    docs = make_docs(2)
+    index_documents(docs, backend="fake")
+
+    docs = list(Markdown.objects.filter(id__in=[doc.id for doc in docs]))
+    with patch("file_search.indexing._extract_document_content") as extract:
+        stats = index_documents(docs, backend="fake")
+
+    extract.assert_not_called()
+    assert stats.unchanged == 2
+
+
+@pytest.mark.django_db
+def test_index_documents_reindexes_changed_documents(fake_store, make_docs):
+    docs = make_docs(3)
+    index_documents(docs, backend="fake")
+    fake_store.add_batches.clear()
+
+    docs = list(Markdown.objects.filter(id__in=[doc.id for doc in docs]).order_by("id"))
+    docs[0].name = "Renamed"
+    docs[1].content = "# Edited"
+    stats = index_documents(docs, backend="fake")
+
+    assert stats.unchanged == 1
+    assert stats.indexed == 2
+    assert sorted(fake_store.add_batches[0]) == sorted([f"doc-{docs[0].id}", f"doc-{docs[1].id}"])
+
+
+@pytest.mark.django_db
+def test_index_document_force_bypasses_fingerprints(fake_store, make_docs):
+    (doc,) = make_docs(1)
+    index_document(doc, backend="fake")
+    fake_store.records.clear()
+
+    index_document(doc, backend="fake")
+    assert fake_store.records == {}
+
+    index_document(doc, backend="fake", force=True)
+    assert f"doc-{doc.id}" in fake_store.records
+
+
+@pytest.mark.django_db
+def test_ensure_project_store_reuses_existence_check(fake_store, project):
+    first = ensure_project_store(project, backend="fake")
+
+    with patch.object(fake_store, "get_store", wraps=fake_store.get_store) as get_store:
+        for _ in range(3):
+            assert ensure_project_store(project, backend="fake").store_id == first.store_id
+        assert get_store.call_count == 0
+
+        fake_store.delete_store(first.store_id)
+        recreated = ensure_project_store(project, backend="fake")
+
+    assert get_store.call_count == 1
+    assert recreated.store_id != first.store_id
@@ -0,0 +1,76 @@
+"""Tests for the BM25 lexical index and rank fusion."""
+
+from file_search.lexical import LexicalIndex, matches_where, reciprocal_rank_fusion, tokenize
+
+
+def _add(index, store_id, rows):
+    ids = [chunk_id for chunk_id, _, _ in rows]
+    documents = [document for _, document, _ in rows]
+    metadatas = [{"record_id": record_id} for _, _, record_id in rows]
+    index.add(store_id, ids, documents, metadatas)
+
+
+def test_tokenize_splits_identifiers():
+    terms = tokenize("Call getUserOrganization and get_user_default_project")
+
+    assert "getuserorganization" in terms
+    assert "get_user_default_project" in terms
+    assert {"get", "user", "organization", "default", "project"} <= set(terms)
+    assert "and" not in terms
+
+
+def test_bm25_prefers_rarer_terms_and_shorter_chunks():
+    index = LexicalIndex()
+    _add(
+        index,
+        "store",
+        [
+            ("c1", "invoice invoice payment", "r1"),
+            ("c2", "invoice payment reminder for the account team", "r2"),
+            ("c3", "payment schedule", "r3"),
+        ],
+    )
+
+    hits = index.search("store", "invoice")
+    assert [hit.chunk_id for hit in hits] == ["c1", "c2"]
+    assert hits[0].score > hits[1].score
+
+
+def test_index_is_partitioned_by_store_and_persists(tmp_path):
+    path = str(tmp_path / "lexical.sqlite3")
+    index = LexicalIndex(path)
+    _add(index, "a", [("c1", "alpha beta", "r1")])
+    _add(index, "b", [("c1", "gamma", "r1")])
+
+    reopened = LexicalIndex(path)
+    assert [hit.chunk_id for hit in reopened.search("a", "alpha")] == ["c1"]
+    assert reopened.search("b", "alpha") == []
+    assert reopened.count("a") == 1
+
+
+def test_readding_chunk_replaces_postings_and_stats():
+    index = LexicalIndex()
+    _add(index, "store", [("c1", "first version", "r1")])
+    _add(index, "store", [("c1", "second version", "r1")])
+
+    assert index.count("store") == 1
+    assert index.search("store", "first") == []
+
+    index.delete_records("store", ["r1"])
+    assert index.count("store") == 0
+
+
+def test_matches_where_operators():
+    metadata = {"folder_id": "2", "page_number": 3}
+
+    assert matches_where(metadata, {"folder_id": "2"})
+    assert matches_where(metadata, {"folder_id": {"$in": ["1", "2"]}})
+    assert matches_where(metadata, {"$and": [{"folder_id": "2"}, {"page_number": {"$gte": 3}}]})
+    assert not matches_where(metadata, {"$or": [{"folder_id": "1"}, {"page_number": {"$lt": 2}}]})
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["d", "b", "c"]])
+
+    assert fused[0][0] == "b"
+    assert {item_id for item_id, _ in fused} == {"a", "b", "c", "d"}
@@ -0,0 +1,130 @@
+"""Tests for the file search query result cache."""
+
+import pytest
+
+from file_search.query_cache import (
+    QueryCache,
+    bump_store_version,
+    cached_search,
+    get_query_cache,
+    get_store_version,
+)
+from file_search.types import SearchResult, SourceReference
+
+
+class CountingStore:
+    backend_name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, store_id, query, *, max_results=5, filters=None, mode=None):
+        self.calls += 1
+        return SearchResult(answer=f"answer {self.calls}", sources=[SourceReference(title=query)])
+
+
+@pytest.mark.django_db
+def test_repeated_queries_hit_cache():
+    store = CountingStore()
+
+    first = cached_search(store, store_id="s1", query="Quarterly  Report", max_results=5)
+    second = cached_search(store, store_id="s1", query=" Quarterly Report\n", max_results=5)
+
+    assert store.calls == 1
+    assert second.answer == first.answer
+    assert second.sources[0].title == "Quarterly Report"
+    stats = get_query_cache().stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_rate == 0.5
+
+
+@pytest.mark.django_db
+def test_case_variants_are_searched_separately():
+    store = CountingStore()
+
+    cached_search(store, store_id="s1", query="Apple")
+    result = cached_search(store, store_id="s1", query="apple")
+
+    assert store.calls == 2
+    assert result.sources[0].title == "apple"
+
+
+@pytest.mark.django_db
+def test_key_includes_filters_and_max_results():
+    store = CountingStore()
+
+    cached_search(store, store_id="s1", query="q", filters={"where": {"a": "1"}})
+    cached_search(store, store_id="s1", query="q", filters={"where": {"a": "2"}})
+    cached_search(store, store_id="s1", query="q", max_results=10)
+    cached_search(store, store_id="s2", query="q")
+
+    assert store.calls == 4
+
+
+@pytest.mark.django_db
+def test_store_write_invalidates_cached_results():
+    store = CountingStore()
+    cached_search(store, store_id="s1", query="q")
+
+    bump_store_version("counting", "s1")
+    result = cached_search(store, store_id="s1", query="q")
+
+    assert store.calls == 2
+    assert result.answer == "answer 2"
+    assert get_store_version("counting", "s1") == 1
+
+
+@pytest.mark.django_db
+def test_version_bump_from_another_process_is_seen():
+    from documents.models import SearchStoreVersion
+
+    store = CountingStore()
+    cached_search(store, store_id="s1", query="q")
+
+    # Simulate a write in another process: the local cache is untouched
+    SearchStoreVersion.objects.create(backend="counting", store_id="s1", version=7)
+    cached_search(store, store_id="s1", query="q")
+
+    assert store.calls == 2
+
+
+@pytest.mark.django_db
+def test_errors_are_not_cached():
+    class FailingStore(CountingStore):
+        def search(self, *args, **kwargs):
+            super().search(*args, **kwargs)
+            raise RuntimeError("backend down")
+
+    store = FailingStore()
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cached_search(store, store_id="s1", query="q")
+
+    assert store.calls == 2
+
+
+@pytest.mark.django_db
+def test_cache_disabled(settings):
+    settings.FILE_SEARCH_QUERY_CACHE_SIZE = 0
+    store = CountingStore()
+
+    cached_search(store, store_id="s1", query="q")
+    cached_search(store, store_id="s1", query="q")
+
+    assert store.calls == 2
+
+
+def test_cache_is_bounded_and_expires(monkeypatch):
+    cache = QueryCache(maxsize=2, ttl=10)
+    for i in range(3):
+        cache.put(("b", "s", i), SearchResult(answer=str(i)))
+
+    assert len(cache) == 2
+    assert cache.get(("b", "s", 0)) is None
+    assert cache.stats().evictions == 1
+
+    now = [1000.0]
+    monkeypatch.setattr("file_search.query_cache.time.monotonic", lambda: now[0])
+    cache.put(("b", "s", 9), SearchResult(answer="9"))
+    now[0] += 11
+    assert cache.get(("b", "s", 9)) is None
@@ -0,0 +1,219 @@
+"""
+Tests for the debounced file search index queue.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from documents.models import Document, SearchIndexQueueEntry, SearchIndexWorkerLease
+from file_search import indexing
+from file_search.queue import (
+    _complete_entries,
+    enqueue,
+    enqueue_document_index,
+    get_queue_stats,
+    process_index_queue,
+)
+
+
+@pytest.fixture(autouse=True)
+def queue_settings(settings):
+    settings.FILE_SEARCH_INDEX_QUEUE_ENABLED = True
+    settings.FILE_SEARCH_INDEX_DEBOUNCE_SECONDS = 5
+    settings.FILE_SEARCH_INDEX_MAX_DELAY_SECONDS = 60
+    return settings
+
+
+@pytest.fixture
+def kick():
+    with patch("file_search.queue._kick_worker") as kick:
+        yield kick
+
+
+def _make_due(*entries):
+    SearchIndexQueueEntry.objects.filter(pk__in=[e.pk for e in entries]).update(
+        available_at=timezone.now() - timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+def test_repeated_saves_coalesce_into_one_entry(kick, make_docs):
+    (doc,) = make_docs(1)
+
+    enqueue_document_index(doc)
+    first = SearchIndexQueueEntry.objects.get()
+    enqueue_document_index(doc)
+    enqueue_document_index(doc, force=True)
+
+    entry = SearchIndexQueueEntry.objects.get()
+    assert entry.pk == first.pk
+    assert entry.version == 3
+    assert entry.force is True
+    kick.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_debounce_is_capped_by_max_delay(kick, make_docs, settings):
+    settings.FILE_SEARCH_INDEX_DEBOUNCE_SECONDS = 30
+    settings.FILE_SEARCH_INDEX_MAX_DELAY_SECONDS = 10
+    (doc,) = make_docs(1)
+
+    entry = enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, doc.id)
+    entry = enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, doc.id)
+
+    assert entry.available_at == entry.enqueued_at + timedelta(seconds=10)
+
+
+@pytest.mark.django_db
+def test_process_indexes_only_due_entries(kick, fake_store, make_docs, settings):
+    settings.FILE_SEARCH_BACKEND = "fake"
+    due_doc, pending_doc = make_docs(2)
+    due = enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, due_doc.id)
+    enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, pending_doc.id)
+    _make_due(due)
+
+    stats = process_index_queue()
+
+    assert stats.processed == 1
+    assert stats.batches == 1
+    assert f"doc-{due_doc.id}" in fake_store.records
+    assert f"doc-{pending_doc.id}" not in fake_store.records
+    assert list(SearchIndexQueueEntry.objects.values_list("object_id", flat=True)) == [
+        str(pending_doc.id)
+    ]
+
+
+@pytest.mark.django_db
+def test_entry_saved_again_during_processing_is_kept(kick, make_docs):
+    (doc,) = make_docs(1)
+    entry = enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, doc.id)
+    enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, doc.id)
+
+    # The worker read version 1; a later save bumped it to 2.
+    _complete_entries([entry])
+
+    assert SearchIndexQueueEntry.objects.filter(pk=entry.pk).exists()
+
+
+@pytest.mark.django_db
+def test_removal_uses_stored_payload(kick, fake_store, make_docs, settings):
+    settings.FILE_SEARCH_BACKEND = "fake"
+    (doc,) = make_docs(1)
+    entry = enqueue(
+        SearchIndexQueueEntry.RecordType.DOCUMENT,
+        doc.id,
+        action=SearchIndexQueueEntry.Action.REMOVE,
+        payload={"store_id": "store-1", "record_id": f"doc-{doc.id}"},
+    )
+    _make_due(entry)
+
+    process_index_queue()
+
+    assert fake_store.remove_batches == [[f"doc-{doc.id}"]]
+    assert not SearchIndexQueueEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_queue_stats_report_depth_and_lag(kick, make_docs):
+    docs = make_docs(3)
+    for doc in docs:
+        enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, doc.id)
+    SearchIndexQueueEntry.objects.update(enqueued_at=timezone.now() - timedelta(seconds=30))
+
+    stats = get_queue_stats()
+
+    assert stats.depth == 3
+    assert stats.due == 0
+    assert stats.oldest_lag_s >= 30
+    assert stats.by_type == {SearchIndexQueueEntry.RecordType.DOCUMENT: 3}
+
+
+@pytest.mark.django_db
+def test_document_save_enqueues_after_commit(kick, organization, project, user,
+                                             django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        doc = Document.objects.create(
+            organization=organization,
+            project=project,
+            name="Autosaved",
+            created_by=user,
+        )
+
+    entry = SearchIndexQueueEntry.objects.get()
+    assert entry.object_id == str(doc.id)
+    assert entry.action == SearchIndexQueueEntry.Action.INDEX
+
+
+@pytest.mark.django_db
+def test_disabled_queue_indexes_inline(kick, make_docs, settings):
+    settings.FILE_SEARCH_INDEX_QUEUE_ENABLED = False
+    (doc,) = make_docs(1)
+
+    with patch("file_search.indexing.index_document") as index_document:
+        enqueue_document_index(doc)
+
+    index_document.assert_called_once_with(doc, force=False)
+    assert not SearchIndexQueueEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_enqueue_kicks_worker_once_lease_lapses(kick, make_docs):
+    first, second = make_docs(2)
+
+    enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, first.id)
+    enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, second.id)
+    assert kick.call_count == 1
+
+    # The worker died without handing off; the queue is not empty.
+    SearchIndexWorkerLease.objects.update(leased_until=timezone.now() - timedelta(seconds=1))
+    enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, second.id)
+
+    assert kick.call_count == 2
+
+
+@pytest.mark.django_db
+def test_exiting_worker_schedules_follow_up_for_pending_entries(kick, fake_store, make_docs,
+                                                                 settings):
+    settings.FILE_SEARCH_BACKEND = "fake"
+    due_doc, pending_doc = make_docs(2)
+    due = enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, due_doc.id)
+    pending = enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, pending_doc.id)
+    _make_due(due)
+    kick.reset_mock()
+
+    process_index_queue(hand_off=True)
+
+    kick.assert_called_once_with(next_run=pending.available_at)
+    lease = SearchIndexWorkerLease.objects.get()
+    assert lease.leased_until > pending.available_at
+
+
+@pytest.mark.django_db
+def test_failed_document_is_retried_with_backoff(kick, fake_store, make_docs, settings):
+    settings.FILE_SEARCH_BACKEND = "fake"
+    good_doc, bad_doc = make_docs(2)
+    entries = [
+        enqueue(SearchIndexQueueEntry.RecordType.DOCUMENT, doc.id) for doc in (good_doc, bad_doc)
+    ]
+    _make_due(*entries)
+
+    real_extract = indexing._extract_document_content
+
+    def extract(document, **kwargs):
+        if document.id == bad_doc.id:
+            raise ValueError("unreadable")
+        return real_extract(document, **kwargs)
+
+    with patch("file_search.indexing._extract_document_content", side_effect=extract):
+        stats = process_index_queue()
+
+    assert stats.processed == 1
+    assert stats.failed == 1
+    entry = SearchIndexQueueEntry.objects.get()
+    assert entry.object_id == str(bad_doc.id)
+    assert entry.attempts == 1
+    assert entry.last_error == "unreadable"
+    assert entry.available_at > timezone.now()
@@ -5,10 +5,14 @@ These dataclasses provide a standardized representation of search results,
 source references, and store metadata across all backend implementations.
 """
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+# Separator between pages when a paged record is treated as one text.
+PAGE_SEPARATOR = "\n\n"
+
 
 @dataclass
 class SourceReference:
@@ -83,3 +87,41 @@ class DocumentReference:
     store_id: str
     backend_ref_id: str  # Backend-specific reference ID
     display_name: str
+
+
+@dataclass
+class TextRecord:
+    """
+    A raw text record queued for a batch upsert.
+
+    Mirrors the keyword arguments of FileSearchStore.add_text_record so that
+    backends can accept many records in a single call.
+    """
+
+    record_id: str
+    content: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+    display_name: str | None = None
+    # Character offset in ``content`` where each page starts (page 1 first),
+    # for paginated sources such as PDFs. Backends use it to tag chunks with
+    # page numbers.
+    page_offsets: list[int] | None = None
+    # Lazy page source for paginated records that should not be held as one
+    # string. Each call returns a fresh iterable of (page_number, text) pairs;
+    # when set, ``content`` is left empty and chunking backends read pages
+    # one at a time.
+    pages: Callable[[], Iterable[tuple[int, str]]] | None = None
+
+    @property
+    def has_content(self) -> bool:
+        return bool(self.content) or self.pages is not None
+
+    def iter_text(self) -> Iterable[str]:
+        """Yield the record's text in pieces (pages joined by PAGE_SEPARATOR)."""
+        if self.pages is None:
+            yield self.content
+            return
+        for index, (_, text) in enumerate(self.pages()):
+            if index:
+                yield PAGE_SEPARATOR
+            yield text
@@ -5,10 +5,32 @@ Each adapter handles parsing inbound messages and sending outbound messages
 for a specific platform type.
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from .base import BasePlatformAdapter
 from .webhook import GenericWebhookAdapter
 
+if TYPE_CHECKING:
+    from platform_adapters.models import PlatformConnection
+
 __all__ = [
     "BasePlatformAdapter",
     "GenericWebhookAdapter",
+    "get_adapter",
 ]
+
+
+def get_adapter(connection: PlatformConnection) -> BasePlatformAdapter:
+    """Get the appropriate adapter for a connection's platform type."""
+    from platform_adapters.models import PlatformType
+
+    if connection.platform_type == PlatformType.WEBHOOK:
+        return GenericWebhookAdapter(connection)
+    # TODO: Add other adapters as they're implemented
+    # elif connection.platform_type == PlatformType.SLACK:
+    #     return SlackAdapter(connection)
+    else:
+        # Fall back to generic webhook for now
+        return GenericWebhookAdapter(connection)
@@ -162,6 +162,22 @@ class BasePlatformAdapter(ABC):
         """
         pass
 
+    def extract_external_id(self, payload: dict[str, Any]) -> str:
+        """
+        Return the platform's message id from a validated payload.
+
+        Used to deduplicate retried deliveries before the payload is parsed.
+        The default parses the whole payload; adapters should override it
+        with a cheaper lookup.
+
+        Args:
+            payload: The validated webhook payload (JSON).
+
+        Returns:
+            The external message id, or "" if the payload has none.
+        """
+        return self.parse_inbound(payload).external_id
+
     def get_config(self, key: str, default: Any = None) -> Any:
         """Get a configuration value from the connection config."""
         return self.connection.config.get(key, default)
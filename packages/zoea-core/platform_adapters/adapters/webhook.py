@@ -190,6 +190,12 @@ class GenericWebhookAdapter(BasePlatformAdapter):
             ignore_reason=ignore_reason,
         )
 
+    def extract_external_id(self, payload: dict[str, Any]) -> str:
+        """Look up only the mapped external id field."""
+        field_mappings = self.get_config("field_mappings", self.DEFAULT_FIELD_MAPPINGS)
+        external_id = self._extract_field(payload, field_mappings.get("external_id", "id"))
+        return str(external_id) if external_id else ""
+
     def send_message(
         self,
         channel_id: str,
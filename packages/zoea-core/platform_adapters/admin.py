@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import PlatformMessage, PlatformConnection
+from .models import PlatformMessage, PlatformConnection, WebhookInbox
 
 
 @admin.register(PlatformConnection)
@@ -103,3 +103,22 @@ class PlatformMessageAdmin(admin.ModelAdmin):
             },
         ),
     ]
+
+
+@admin.register(WebhookInbox)
+class WebhookInboxAdmin(admin.ModelAdmin):
+    """Admin interface for WebhookInbox."""
+
+    list_display = [
+        "id",
+        "connection",
+        "external_id",
+        "status",
+        "received_at",
+        "processed_at",
+        "lag_seconds",
+    ]
+    list_filter = ["status", "connection__platform_type"]
+    search_fields = ["external_id"]
+    readonly_fields = ["received_at", "claimed_at", "processed_at", "message"]
+    ordering = ["-received_at"]
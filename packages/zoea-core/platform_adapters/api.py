@@ -12,6 +12,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 from ninja import Query, Router, Schema
 from ninja.errors import HttpError
@@ -19,7 +20,8 @@ from pydantic import Field
 
 from accounts.utils import get_user_organization
 
-from .adapters import GenericWebhookAdapter
+from .adapters import get_adapter
+from .inbox import accept_webhook, event_type_for_platform
 from .models import (
     PlatformMessage,
     ConnectionStatus,
@@ -345,6 +347,11 @@ def receive_webhook(
     3. Creates a PlatformMessage record
     4. Dispatches to the event system (if configured)
 
+    With PLATFORM_WEBHOOK_INGEST_MODE = "inbox" (the default) only step 1
+    runs here: the payload is appended to the webhook inbox, deduplicated
+    on the platform's message id, and steps 2-4 run in a background task
+    (see platform_adapters.inbox).
+
     Args:
         platform: Platform type (slack, discord, webhook, etc.)
         connection_id: UUID of the platform connection
@@ -368,7 +375,7 @@ def receive_webhook(
         return HttpResponse(status=200, content="Connection is not active")
 
     # Get the appropriate adapter
-    adapter = _get_adapter(connection)
+    adapter = get_adapter(connection)
 
     # Validate the webhook
     validation = adapter.validate_webhook(request)
@@ -376,6 +383,14 @@ def receive_webhook(
         logger.warning(f"Webhook validation failed: {validation.error_message}")
         raise HttpError(401, validation.error_message)
 
+    # Acknowledge now, process later
+    if getattr(settings, "PLATFORM_WEBHOOK_INGEST_MODE", "inbox") == "inbox":
+        _, created = accept_webhook(adapter, validation.payload)
+        return {
+            "success": True,
+            "status": "queued" if created else "duplicate",
+        }
+
     # Parse the message
     parsed = adapter.parse_inbound(validation.payload)
 
@@ -453,38 +468,17 @@ def list_connection_messages(
 # =============================================================================
 
 
-def _get_adapter(connection: PlatformConnection):
-    """Get the appropriate adapter for a connection's platform type."""
-    if connection.platform_type == PlatformType.WEBHOOK:
-        return GenericWebhookAdapter(connection)
-    # TODO: Add other adapters as they're implemented
-    # elif connection.platform_type == PlatformType.SLACK:
-    #     return SlackAdapter(connection)
-    else:
-        # Fall back to generic webhook for now
-        return GenericWebhookAdapter(connection)
-
-
 def _dispatch_to_event_system(message: PlatformMessage) -> None:
     """Dispatch a channel message to the event system."""
     try:
         from events.dispatcher import dispatch_event
-        from events.models import EventType
-
-        event_type = EventType.CHAT_MESSAGE
-        if message.connection.platform_type == PlatformType.WEBHOOK:
-            event_type = EventType.WEBHOOK_RECEIVED
-        elif message.connection.platform_type == PlatformType.SLACK:
-            event_type = EventType.SLACK_MESSAGE
-        elif message.connection.platform_type == PlatformType.DISCORD:
-            event_type = EventType.DISCORD_MESSAGE
-        elif message.connection.platform_type == PlatformType.NOTION:
-            event_type = EventType.NOTION_PAGE_UPDATED
+
+        event_type = event_type_for_platform(message.connection.platform_type)
 
         dispatch_event(
             event_type=event_type,
             source_type="platform_message",
-            source_id=str(message.message_id),
+            source_id=message.id,
             organization=message.organization,
             project=message.project,
             event_data=message.to_trigger_envelope(),
@@ -0,0 +1,277 @@
+"""
+Webhook inbox: acknowledge deliveries first, process them in batches.
+
+Handling a webhook inline means parsing it, saving the PlatformMessage,
+updating connection stats and dispatching triggers (a sync trigger runs
+right there) before the platform gets its response. Slack and Discord
+retry deliveries that aren't answered within a few seconds, and every
+retry became another message and another run.
+
+In "inbox" mode (PLATFORM_WEBHOOK_INGEST_MODE) the endpoint only validates
+the signature and calls accept_webhook(), which appends the payload to
+WebhookInbox - deduplicated on the platform's message id - and queues
+process_webhook_inbox() once the transaction commits. The task claims up
+to PLATFORM_WEBHOOK_BATCH_SIZE entries, creates their messages with one
+bulk insert, updates each connection's stats once, dispatches the batch
+through dispatch_events() and reports the ingest-to-dispatch lag.
+
+Entries are marked processed in the same transaction that creates their
+messages, and an entry that already has a message is never claimed
+again, so a task that outlives CLAIM_TIMEOUT (or dies while dispatching)
+cannot turn a delivery into a second message and run.
+
+Usage:
+    from platform_adapters.inbox import accept_webhook
+
+    entry, created = accept_webhook(adapter, validation.payload)
+    # created is False for a retried delivery that was already accepted
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from .adapters import get_adapter
+from .models import (
+    InboxStatus,
+    MessageStatus,
+    PlatformConnection,
+    PlatformMessage,
+    PlatformType,
+    WebhookInbox,
+)
+
+if TYPE_CHECKING:
+    from .adapters import BasePlatformAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+# Entries claimed longer ago than this belong to a worker that died; matches
+# the Django-Q2 retry window so a task still running is never double-processed.
+CLAIM_TIMEOUT = timedelta(seconds=900)
+
+
+def event_type_for_platform(platform_type: str) -> str:
+    """Map a connection's platform type to the event type its messages raise."""
+    from events.models import EventType
+
+    return {
+        PlatformType.WEBHOOK: EventType.WEBHOOK_RECEIVED,
+        PlatformType.SLACK: EventType.SLACK_MESSAGE,
+        PlatformType.DISCORD: EventType.DISCORD_MESSAGE,
+        PlatformType.NOTION: EventType.NOTION_PAGE_UPDATED,
+    }.get(platform_type, EventType.CHAT_MESSAGE)
+
+
+def accept_webhook(
+    adapter: BasePlatformAdapter, payload: dict[str, Any]
+) -> tuple[WebhookInbox | None, bool]:
+    """
+    Append a validated webhook payload to the inbox.
+
+    Args:
+        adapter: Adapter for the connection that received the webhook
+        payload: The validated webhook payload
+
+    Returns:
+        (entry, created). A delivery whose external id is already in the
+        inbox for this connection is dropped and returns (None, False).
+    """
+    connection = adapter.connection
+    external_id = adapter.extract_external_id(payload)[:255]
+
+    try:
+        with transaction.atomic():
+            entry = WebhookInbox.objects.create(
+                connection=connection,
+                external_id=external_id,
+                payload=payload,
+            )
+    except IntegrityError:
+        if not external_id:
+            raise
+        logger.info(
+            f"Dropped duplicate webhook delivery {external_id} for connection {connection.id}"
+        )
+        return None, False
+
+    schedule_inbox_processing()
+    return entry, True
+
+
+def schedule_inbox_processing() -> None:
+    """Queue process_webhook_inbox() once the current transaction commits."""
+
+    def _enqueue():
+        try:
+            from django_q.tasks import async_task
+
+            async_task(
+                "platform_adapters.inbox.process_webhook_inbox",
+                task_name="process_webhook_inbox",
+            )
+        except Exception as exc:  # noqa: BLE001 - the next delivery drains the inbox
+            logger.warning(f"Failed to queue webhook inbox processing: {exc}")
+
+    transaction.on_commit(_enqueue)
+
+
+def process_webhook_inbox(batch_size: int | None = None) -> dict[str, Any]:
+    """
+    Turn one batch of pending inbox entries into messages and dispatch them.
+
+    Runs as a Django-Q2 task. When the batch is full another task is queued
+    for the rest of the inbox.
+
+    Args:
+        batch_size: Maximum entries to claim (default PLATFORM_WEBHOOK_BATCH_SIZE)
+
+    Returns:
+        dict with processed/failed/dispatched counts and the batch's
+        ingest-to-dispatch lag in seconds (avg_lag_seconds, max_lag_seconds)
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "PLATFORM_WEBHOOK_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+    entries = _claim_batch(batch_size)
+    stats: dict[str, Any] = {
+        "processed": 0,
+        "failed": 0,
+        "dispatched": 0,
+        "avg_lag_seconds": None,
+        "max_lag_seconds": None,
+    }
+    if not entries:
+        return stats
+
+    adapters: dict[int, BasePlatformAdapter] = {}
+    created: list[tuple[WebhookInbox, PlatformMessage, bool]] = []
+    for entry in entries:
+        adapter = adapters.get(entry.connection_id)
+        if adapter is None:
+            adapter = adapters[entry.connection_id] = get_adapter(entry.connection)
+        try:
+            parsed = adapter.parse_inbound(entry.payload)
+            message = adapter.create_channel_message(parsed, entry.payload)
+        except Exception as e:
+            logger.warning(f"Failed to parse webhook inbox entry {entry.id}: {e}")
+            entry.status = InboxStatus.FAILED
+            entry.error = str(e)
+            continue
+        created.append((entry, message, parsed.should_process))
+
+    now = timezone.now()
+    with transaction.atomic():
+        PlatformMessage.objects.bulk_create([message for _, message, _ in created])
+        for connection_id, count in Counter(entry.connection_id for entry, _, _ in created).items():
+            PlatformConnection.objects.filter(id=connection_id).update(
+                message_count=models.F("message_count") + count,
+                last_message_at=now,
+            )
+        for entry, message, _ in created:
+            entry.message = message
+            entry.status = InboxStatus.PROCESSED
+            entry.error = ""
+        for entry in entries:
+            entry.processed_at = now
+        WebhookInbox.objects.bulk_update(entries, ["status", "error", "message", "processed_at"])
+
+    to_dispatch = [message for _, message, should_process in created if should_process]
+    if to_dispatch:
+        _dispatch_messages(to_dispatch)
+
+    # Report the lag up to dispatch, not just up to the insert
+    processed_at = timezone.now()
+    WebhookInbox.objects.filter(id__in=[entry.id for entry, _, _ in created]).update(
+        processed_at=processed_at
+    )
+    for entry, _, _ in created:
+        entry.processed_at = processed_at
+
+    stats.update(
+        processed=len(created),
+        failed=len(entries) - len(created),
+        dispatched=len(to_dispatch),
+    )
+    lags = [entry.lag_seconds for entry, _, _ in created]
+    if lags:
+        stats.update(avg_lag_seconds=sum(lags) / len(lags), max_lag_seconds=max(lags))
+        logger.info(
+            f"Processed {stats['processed']} webhook(s) from the inbox "
+            f"({stats['failed']} failed, {stats['dispatched']} dispatched); "
+            f"ingest-to-dispatch lag avg {stats['avg_lag_seconds']:.2f}s, "
+            f"max {stats['max_lag_seconds']:.2f}s"
+        )
+    else:
+        logger.warning(f"All {stats['failed']} claimed webhook inbox entries failed to parse")
+
+    if len(entries) >= batch_size:
+        schedule_inbox_processing()
+    return stats
+
+
+def _claim_batch(batch_size: int) -> list[WebhookInbox]:
+    """
+    Mark up to batch_size pending (or abandoned) entries as ours and load them.
+
+    Entries that already have a message were turned into one by an earlier
+    run and are never claimed again.
+    """
+    now = timezone.now()
+    claimable = (
+        models.Q(status=InboxStatus.PENDING)
+        | models.Q(status=InboxStatus.PROCESSING, claimed_at__lt=now - CLAIM_TIMEOUT)
+    ) & models.Q(message__isnull=True)
+    with transaction.atomic():
+        ids = list(
+            WebhookInbox.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .order_by("received_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        WebhookInbox.objects.filter(id__in=ids).update(
+            status=InboxStatus.PROCESSING, claimed_at=now
+        )
+    return list(
+        WebhookInbox.objects.filter(id__in=ids)
+        .select_related("connection__organization", "connection__project")
+        .order_by("received_at")
+    )
+
+
+def _dispatch_messages(messages: list[PlatformMessage]) -> None:
+    """Dispatch messages to the event system in one batch."""
+    from events.dispatcher import Event, dispatch_events
+
+    ids = [message.id for message in messages]
+    try:
+        dispatch_events(
+            Event(
+                event_type=event_type_for_platform(message.connection.platform_type),
+                source_type="platform_message",
+                source_id=message.id,
+                event_data=message.to_trigger_envelope(),
+                organization=message.organization,
+                project=message.project,
+            )
+            for message in messages
+        )
+    except Exception as e:
+        logger.error(f"Failed to dispatch {len(messages)} inbox message(s): {e}", exc_info=True)
+        PlatformMessage.objects.filter(id__in=ids).update(
+            status=MessageStatus.FAILED, status_message=str(e)
+        )
+        return
+
+    PlatformMessage.objects.filter(id__in=ids).update(status=MessageStatus.PROCESSING)
+    for message in messages:
+        message.status = MessageStatus.PROCESSING
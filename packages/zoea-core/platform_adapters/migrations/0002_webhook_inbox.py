@@ -0,0 +1,35 @@
+# Generated by Django 6.1.2 on 2026-10-16 21:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('platform_adapters', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('external_id', models.CharField(blank=True, help_text="Platform's unique identifier for the message (deduplication key)", max_length=255)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Validated webhook payload')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('error', models.TextField(blank=True, help_text='Processing error, if any')),
+                ('received_at', models.DateTimeField(auto_now_add=True, help_text='When the webhook was accepted')),
+                ('claimed_at', models.DateTimeField(blank=True, help_text='When a worker picked the entry up', null=True)),
+                ('processed_at', models.DateTimeField(blank=True, help_text='When the message was stored and dispatched', null=True)),
+                ('connection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='platform_adapters.platformconnection')),
+                ('message', models.ForeignKey(blank=True, help_text='Message created from this delivery', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='platform_adapters.platformmessage')),
+            ],
+            options={
+                'verbose_name_plural': 'webhook inbox',
+                'ordering': ['received_at'],
+                'indexes': [models.Index(fields=['status', 'received_at'], name='platform_ad_status_6aa012_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('external_id', ''), _negated=True), fields=('connection', 'external_id'), name='unique_webhook_inbox_external_id')],
+            },
+        ),
+    ]
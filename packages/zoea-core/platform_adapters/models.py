@@ -5,6 +5,7 @@ This module defines:
 - PlatformType: Enum of supported external platforms
 - PlatformConnection: Configuration for connecting to external platforms
 - ChannelMessage: Unified message format from any platform
+- WebhookInbox: Raw webhook deliveries awaiting background processing
 """
 
 from __future__ import annotations
@@ -405,3 +406,102 @@ class PlatformMessage(models.Model):
             "organization_id": self.organization_id,
             "project_id": self.project_id,
         }
+
+
+class InboxStatus(models.TextChoices):
+    """Processing status of a webhook inbox entry."""
+
+    PENDING = "pending", "Pending"
+    PROCESSING = "processing", "Processing"
+    PROCESSED = "processed", "Processed"
+    FAILED = "failed", "Failed"
+
+
+class WebhookInbox(models.Model):
+    """
+    A validated webhook delivery waiting to be turned into a PlatformMessage.
+
+    The webhook endpoint only checks the signature and appends the payload
+    here, so platforms get their 200 before any parsing or trigger runs.
+    Entries are deduplicated on the platform's message id: a retried
+    delivery of a message we already accepted is dropped.
+    """
+
+    connection = models.ForeignKey(
+        PlatformConnection,
+        on_delete=models.CASCADE,
+        related_name="inbox_entries",
+    )
+
+    external_id = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Platform's unique identifier for the message (deduplication key)",
+    )
+
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Validated webhook payload",
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=InboxStatus.choices,
+        default=InboxStatus.PENDING,
+    )
+
+    error = models.TextField(
+        blank=True,
+        help_text="Processing error, if any",
+    )
+
+    message = models.ForeignKey(
+        PlatformMessage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Message created from this delivery",
+    )
+
+    received_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the webhook was accepted",
+    )
+
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a worker picked the entry up",
+    )
+
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the message was stored and dispatched",
+    )
+
+    class Meta:
+        ordering = ["received_at"]
+        verbose_name_plural = "webhook inbox"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["connection", "external_id"],
+                condition=~models.Q(external_id=""),
+                name="unique_webhook_inbox_external_id",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["status", "received_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.connection_id}:{self.external_id or self.pk} ({self.status})"
+
+    @property
+    def lag_seconds(self) -> float | None:
+        """Seconds between accepting the webhook and dispatching its message."""
+        if self.processed_at is None:
+            return None
+        return (self.processed_at - self.received_at).total_seconds()
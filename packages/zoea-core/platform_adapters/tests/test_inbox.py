@@ -0,0 +1,272 @@
+"""Tests for the webhook inbox (fast-ack ingestion and batched processing)."""
+
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.utils import timezone
+
+from accounts.models import Account
+from events.models import EventTrigger, EventType
+from execution.models import ExecutionRun
+from platform_adapters.adapters.webhook import GenericWebhookAdapter
+from platform_adapters.inbox import process_webhook_inbox
+from platform_adapters.models import (
+    ConnectionStatus,
+    InboxStatus,
+    MessageStatus,
+    PlatformConnection,
+    PlatformMessage,
+    PlatformType,
+    WebhookInbox,
+)
+from projects.models import Project
+
+User = get_user_model()
+
+
+@pytest.fixture
+def organization(db):
+    """Create a test organization."""
+    return Account.objects.create(name="Test Organization", slug="test-org")
+
+
+@pytest.fixture
+def user(db, organization):
+    """Create a test user."""
+    return User.objects.create_user(
+        username="testuser",
+        email="testuser@example.com",
+        password="testpass123",
+    )
+
+
+@pytest.fixture
+def project(db, organization, user):
+    """Create a test project."""
+    return Project.objects.create(
+        organization=organization,
+        name="Test Project",
+        working_directory="/tmp/test-project",
+        created_by=user,
+    )
+
+
+@pytest.fixture
+def webhook_connection(db, organization, project, user):
+    """Create a webhook connection for testing."""
+    return PlatformConnection.objects.create(
+        organization=organization,
+        project=project,
+        platform_type=PlatformType.WEBHOOK,
+        name="Test Webhook",
+        status=ConnectionStatus.ACTIVE,
+        webhook_secret="test-secret-key-12345",
+        config={"require_signature": True},
+        created_by=user,
+    )
+
+
+@pytest.fixture
+def webhook_trigger(organization, user):
+    """Create a synchronous trigger for webhook messages."""
+    return EventTrigger.objects.create(
+        organization=organization,
+        name="Webhook Trigger",
+        event_type=EventType.WEBHOOK_RECEIVED,
+        skills=["test"],
+        run_async=False,
+        created_by=user,
+    )
+
+
+def _post_webhook(connection, payload):
+    body = json.dumps(payload).encode()
+    signature = hmac.new(connection.webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+    return Client().post(
+        f"/api/platform/webhooks/{connection.platform_type}/{connection.connection_id}",
+        data=body,
+        content_type="application/json",
+        headers={"X-Webhook-Signature": signature},
+    )
+
+
+@pytest.mark.django_db
+class TestWebhookIngestion:
+    """Tests for the fast-ack webhook endpoint."""
+
+    def test_webhook_is_stored_and_queued(self, webhook_connection, django_capture_on_commit_callbacks):
+        """Test the endpoint only stores the payload and queues processing."""
+        with (
+            patch("django_q.tasks.async_task") as mock_async,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            response = _post_webhook(webhook_connection, {"id": "msg-1", "content": "Hello"})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "queued"
+        entry = WebhookInbox.objects.get()
+        assert entry.external_id == "msg-1"
+        assert entry.status == InboxStatus.PENDING
+        assert not PlatformMessage.objects.exists()
+        assert mock_async.call_args.args == ("platform_adapters.inbox.process_webhook_inbox",)
+
+    def test_retried_delivery_is_dropped(self, webhook_connection):
+        """Test a retry of an accepted message id is acknowledged but not stored."""
+        payload = {"id": "msg-1", "content": "Hello"}
+        with patch("django_q.tasks.async_task"):
+            _post_webhook(webhook_connection, payload)
+            response = _post_webhook(webhook_connection, payload)
+            # Messages without an id can't be deduplicated
+            _post_webhook(webhook_connection, {"content": "No id"})
+            _post_webhook(webhook_connection, {"content": "No id"})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "duplicate"
+        assert WebhookInbox.objects.count() == 3
+
+    def test_invalid_signature_is_rejected(self, webhook_connection):
+        """Test unsigned deliveries never reach the inbox."""
+        response = Client().post(
+            f"/api/platform/webhooks/webhook/{webhook_connection.connection_id}",
+            data=json.dumps({"id": "msg-1"}),
+            content_type="application/json",
+            headers={"X-Webhook-Signature": "bogus"},
+        )
+
+        assert response.status_code == 401
+        assert not WebhookInbox.objects.exists()
+
+    @patch("events.dispatcher.EventDispatcher._execute_sync")
+    def test_inline_mode_processes_in_request(self, mock_execute, webhook_connection, webhook_trigger, settings):
+        """Test PLATFORM_WEBHOOK_INGEST_MODE=inline keeps the synchronous path."""
+        settings.PLATFORM_WEBHOOK_INGEST_MODE = "inline"
+
+        response = _post_webhook(webhook_connection, {"id": "msg-1", "content": "Hello"})
+
+        assert response.status_code == 200
+        assert PlatformMessage.objects.get().status == MessageStatus.PROCESSING
+        assert not WebhookInbox.objects.exists()
+        assert mock_execute.call_count == 1
+
+
+@pytest.mark.django_db
+class TestProcessWebhookInbox:
+    """Tests for the batched inbox worker."""
+
+    def _accept(self, connection, *payloads):
+        return [
+            WebhookInbox.objects.create(
+                connection=connection, external_id=str(payload.get("id", "")), payload=payload
+            )
+            for payload in payloads
+        ]
+
+    @patch("events.dispatcher.EventDispatcher._execute_sync")
+    def test_batch_creates_messages_and_dispatches(self, mock_execute, webhook_connection, webhook_trigger):
+        """Test entries become messages, stats and one run per message."""
+        self._accept(
+            webhook_connection,
+            {"id": "1", "content": "Hello"},
+            {"id": "2", "content": "World"},
+            {"id": "3", "content": ""},  # ignored: empty
+        )
+
+        stats = process_webhook_inbox()
+
+        assert (stats["processed"], stats["failed"], stats["dispatched"]) == (3, 0, 2)
+        assert stats["max_lag_seconds"] >= stats["avg_lag_seconds"] >= 0
+        messages = {m.external_id: m for m in PlatformMessage.objects.all()}
+        assert messages["1"].status == MessageStatus.PROCESSING
+        assert messages["3"].status == MessageStatus.IGNORED
+        assert ExecutionRun.objects.filter(trigger=webhook_trigger).count() == 2
+
+        webhook_connection.refresh_from_db()
+        assert webhook_connection.message_count == 3
+        assert webhook_connection.last_message_at is not None
+
+        for entry in WebhookInbox.objects.all():
+            assert entry.status == InboxStatus.PROCESSED
+            assert entry.message.external_id == entry.external_id
+            assert entry.lag_seconds is not None
+
+        # Processed entries are not picked up again
+        assert process_webhook_inbox()["processed"] == 0
+
+    def test_full_batch_queues_follow_up(self, webhook_connection, django_capture_on_commit_callbacks):
+        """Test a full batch leaves the rest of the inbox to another task."""
+        self._accept(webhook_connection, *({"id": str(i), "content": "x"} for i in range(3)))
+
+        with (
+            patch("django_q.tasks.async_task") as mock_async,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            first = process_webhook_inbox(batch_size=2)
+            second = process_webhook_inbox(batch_size=2)
+
+        assert (first["processed"], second["processed"]) == (2, 1)
+        assert mock_async.call_count == 1
+
+    def test_parse_failure_marks_entry_failed(self, webhook_connection):
+        """Test one unparseable payload doesn't hold back the batch."""
+        bad, good = self._accept(
+            webhook_connection, {"id": "bad", "content": "x"}, {"id": "good", "content": "y"}
+        )
+        parse = GenericWebhookAdapter.parse_inbound
+
+        def flaky_parse(adapter, payload):
+            if payload["id"] == "bad":
+                raise ValueError("unexpected payload")
+            return parse(adapter, payload)
+
+        with patch.object(GenericWebhookAdapter, "parse_inbound", flaky_parse):
+            stats = process_webhook_inbox()
+
+        assert (stats["processed"], stats["failed"]) == (1, 1)
+        bad.refresh_from_db()
+        good.refresh_from_db()
+        assert bad.status == InboxStatus.FAILED
+        assert "unexpected payload" in bad.error
+        assert good.status == InboxStatus.PROCESSED
+
+    def test_message_failure_marks_entry_failed(self, webhook_connection):
+        """Test a payload that can't become a message doesn't abort the batch."""
+        bad, good = self._accept(
+            webhook_connection, {"id": "bad", "content": "x"}, {"id": "good", "content": "y"}
+        )
+        create = GenericWebhookAdapter.create_channel_message
+
+        def flaky_create(adapter, parsed, payload):
+            if payload["id"] == "bad":
+                raise ValueError("no channel")
+            return create(adapter, parsed, payload)
+
+        with patch.object(GenericWebhookAdapter, "create_channel_message", flaky_create):
+            stats = process_webhook_inbox()
+
+        assert (stats["processed"], stats["failed"]) == (1, 1)
+        bad.refresh_from_db()
+        assert bad.status == InboxStatus.FAILED
+        assert PlatformMessage.objects.get().external_id == "good"
+
+    def test_entries_are_marked_processed_before_dispatch(self, webhook_connection):
+        """Test an entry whose message exists is not reclaimed after a stalled dispatch."""
+        (entry,) = self._accept(webhook_connection, {"id": "1", "content": "Hello"})
+
+        def stalled_dispatch(messages):
+            # Another worker reclaiming after CLAIM_TIMEOUT finds nothing to do
+            WebhookInbox.objects.filter(id=entry.id).update(
+                status=InboxStatus.PROCESSING, claimed_at=timezone.now() - timedelta(hours=1)
+            )
+            assert WebhookInbox.objects.get(id=entry.id).message_id is not None
+            assert process_webhook_inbox()["processed"] == 0
+
+        with patch("platform_adapters.inbox._dispatch_messages", side_effect=stalled_dispatch):
+            assert process_webhook_inbox()["processed"] == 1
+
+        assert PlatformMessage.objects.count() == 1
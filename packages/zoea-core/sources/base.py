@@ -154,6 +154,22 @@ class SourceInterface(ABC):
         """
         pass
 
+    def get_relative_path(self, path: str) -> str:
+        """
+        Get a document's path relative to the source root.
+
+        Used to mirror the source's directory structure as folders. The
+        default treats DocumentMetadata.path as already relative (e.g. an
+        object key); sources listing absolute paths should override this.
+
+        Args:
+            path: Document path/identifier (from DocumentMetadata.path)
+
+        Returns:
+            Slash-separated path relative to the source root.
+        """
+        return path.lstrip('/')
+
     def get_source_type(self) -> str:
         """
         Get the source type identifier.
@@ -5,10 +5,11 @@ This module implements a source that reads documents from the local filesystem
 using glob patterns to filter files.
 """
 
+import fnmatch
+import mimetypes
 import os
 from pathlib import Path
 from typing import Iterator, List
-import mimetypes
 
 from .base import SourceInterface, DocumentMetadata
 from .registry import SourceRegistry
@@ -77,6 +78,10 @@ class LocalFileSystemSource(SourceInterface):
         """
         List all documents matching the configured pattern.
 
+        Recursive patterns are walked with os.scandir, one directory at a
+        time, so large trees stream instead of being collected and sorted up
+        front. Entries are yielded in sorted order within each directory.
+
         Yields:
             DocumentMetadata: Metadata for each matching document.
         """
@@ -85,13 +90,16 @@ class LocalFileSystemSource(SourceInterface):
         recursive = self.config.get('recursive', True)
         follow_symlinks = self.config.get('follow_symlinks', False)
 
-        # Use rglob for recursive patterns, glob for non-recursive
         if recursive and '**' in pattern:
-            files = base_path.rglob(pattern.replace('**/', ''))
-        else:
-            files = base_path.glob(pattern)
-
-        for file_path in sorted(files):
+            name_pattern = pattern.replace('**/', '')
+            for entry in self._walk(base_path, follow_symlinks):
+                if fnmatch.fnmatchcase(entry.name, name_pattern):
+                    metadata = self._entry_metadata(entry, follow_symlinks)
+                    if metadata:
+                        yield metadata
+            return
+
+        for file_path in sorted(base_path.glob(pattern)):
             # Skip if not following symlinks and this is a symlink
             if not follow_symlinks and file_path.is_symlink():
                 continue
@@ -117,6 +125,80 @@ class LocalFileSystemSource(SourceInterface):
                 extension=file_path.suffix.lower()
             )
 
+    def _walk(self, base_path: Path, follow_symlinks: bool) -> Iterator[os.DirEntry]:
+        """
+        Yield file entries under base_path, skipping unreadable directories.
+
+        Each directory's files are yielded before its subdirectories are walked.
+        """
+        root = base_path.stat()
+        visited = {(root.st_dev, root.st_ino)}
+        stack = [str(base_path)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if follow_symlinks:
+                            # Guard against symlink loops
+                            stat = entry.stat()
+                            key = (stat.st_dev, stat.st_ino)
+                            if key in visited:
+                                continue
+                            visited.add(key)
+                        subdirectories.append(entry.path)
+                    else:
+                        yield entry
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirectories))
+
+    def _entry_metadata(self, entry: os.DirEntry, follow_symlinks: bool) -> DocumentMetadata | None:
+        if not follow_symlinks and entry.is_symlink():
+            return None
+        extension = os.path.splitext(entry.name)[1].lower()
+        if extension not in self.DOCUMENT_EXTENSIONS:
+            return None
+        try:
+            if not entry.is_file():
+                return None
+            stat = entry.stat()
+        except OSError:
+            return None
+
+        return DocumentMetadata(
+            path=entry.path,  # Absolute path
+            name=entry.name,  # File name only
+            size=stat.st_size,
+            modified_at=stat.st_mtime,
+            content_type=mimetypes.guess_type(entry.name)[0],
+            extension=extension
+        )
+
+    def get_relative_path(self, path: str) -> str:
+        """
+        Get a document's path relative to the configured base path.
+
+        Args:
+            path: Absolute path to the document.
+
+        Returns:
+            Slash-separated path relative to the base path (the file name
+            if the document lies outside it).
+        """
+        file_path = Path(path)
+        try:
+            return file_path.relative_to(self.config['path']).as_posix()
+        except ValueError:
+            return file_path.name
+
     def read_document(self, path: str) -> bytes:
         """
         Read document content from the filesystem.
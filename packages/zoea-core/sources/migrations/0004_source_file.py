@@ -0,0 +1,33 @@
+# Generated by Django 6.1.2 on 2026-10-16 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0021_document_content_hash'),
+        ('sources', '0003_alter_source_created_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Path of the file within the source (DocumentMetadata.path)', max_length=1024)),
+                ('size', models.BigIntegerField(blank=True, help_text='File size in bytes when last synced', null=True)),
+                ('mtime', models.FloatField(blank=True, help_text='File modification time (POSIX timestamp) when last synced', null=True)),
+                ('content_hash', models.CharField(blank=True, help_text='SHA-256 of the file content when last synced', max_length=64)),
+                ('synced_at', models.DateTimeField(help_text='When this entry was last written')),
+                ('document', models.ForeignKey(blank=True, help_text='Document created from this file', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='source_files', to='documents.document')),
+                ('source', models.ForeignKey(help_text='Source the file was listed from', on_delete=django.db.models.deletion.CASCADE, related_name='files', to='sources.source')),
+            ],
+            options={
+                'verbose_name': 'Source File',
+                'verbose_name_plural': 'Source Files',
+                'unique_together': {('source', 'path')},
+            },
+        ),
+    ]
@@ -282,3 +282,60 @@ class Source(models.Model):
             return source.get_display_name()
         except Exception:
             return f"{self.name} (error: cannot create source instance)"
+
+
+class SourceFile(models.Model):
+    """
+    Manifest entry for a file last seen in a source.
+
+    sync_sources compares each listed file's size and modification time
+    against its manifest entry and only reads files that differ; files whose
+    content hash is unchanged are not re-imported. The entry also links a
+    source path to the Document created from it, which is how files removed
+    from the source are detected.
+    """
+
+    source = models.ForeignKey(
+        Source,
+        on_delete=models.CASCADE,
+        related_name='files',
+        help_text="Source the file was listed from"
+    )
+    path = models.CharField(
+        max_length=1024,
+        help_text="Path of the file within the source (DocumentMetadata.path)"
+    )
+    size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="File size in bytes when last synced"
+    )
+    mtime = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="File modification time (POSIX timestamp) when last synced"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="SHA-256 of the file content when last synced"
+    )
+    document = models.ForeignKey(
+        'documents.Document',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='source_files',
+        help_text="Document created from this file"
+    )
+    synced_at = models.DateTimeField(
+        help_text="When this entry was last written"
+    )
+
+    class Meta:
+        verbose_name = "Source File"
+        verbose_name_plural = "Source Files"
+        unique_together = [['source', 'path']]
+
+    def __str__(self):
+        return f"{self.source_id}:{self.path}"
@@ -250,3 +250,21 @@ class TestLocalFileSystemSource:
         assert len(docs) == 2
         names = {d.name for d in docs}
         assert names == {'real.md', 'link.md'}
+
+    def test_list_documents_walks_tree_in_order(self, tmp_path):
+        """Test that recursive listing is ordered and survives symlink loops."""
+        (tmp_path / "b.md").write_text("# B")
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "z.md").write_text("# Z")
+        (tmp_path / "a" / "notes.txt").write_text("notes")
+        (tmp_path / "a" / "loop").symlink_to(tmp_path)
+
+        source = LocalFileSystemSource({
+            'path': str(tmp_path),
+            'pattern': '**/*.md',
+            'follow_symlinks': True,
+        })
+        paths = [Path(d.path).relative_to(tmp_path).as_posix() for d in source.list_documents()]
+
+        assert paths == ['b.md', 'a/z.md']
+
@@ -86,6 +86,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.context.OrganizationContextMiddleware',  # request.org_context / aorg_context()
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',  # Required by django-allauth
@@ -209,24 +210,82 @@ OPENAI_CHAT_MODEL_ID = os.getenv("OPENAI_CHAT_MODEL_ID", "gpt-4o-mini")
 # Gemini Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL_ID = os.getenv("GEMINI_MODEL_ID", "gemini-2.5-flash")
+# Concurrent File Search uploads (see file_search.backends.gemini_uploads):
+# uploads started in parallel, uploads pending at once, seconds between polls
+# of the pending operations, retries/backoff on rate-limit errors, and seconds
+# an upload may take (including retries and polling) before it is failed.
+GEMINI_UPLOAD_CONCURRENCY = int(os.getenv("GEMINI_UPLOAD_CONCURRENCY", 4))
+GEMINI_UPLOAD_MAX_IN_FLIGHT = int(os.getenv("GEMINI_UPLOAD_MAX_IN_FLIGHT", 16))
+GEMINI_UPLOAD_POLL_INTERVAL = float(os.getenv("GEMINI_UPLOAD_POLL_INTERVAL", 2))
+GEMINI_UPLOAD_MAX_RETRIES = int(os.getenv("GEMINI_UPLOAD_MAX_RETRIES", 5))
+GEMINI_UPLOAD_BACKOFF = float(os.getenv("GEMINI_UPLOAD_BACKOFF", 2))
+GEMINI_UPLOAD_MAX_BACKOFF = float(os.getenv("GEMINI_UPLOAD_MAX_BACKOFF", 60))
+GEMINI_UPLOAD_JOB_TIMEOUT = float(os.getenv("GEMINI_UPLOAD_JOB_TIMEOUT", 600))
 
 # File Search Configuration
 # Available backends: 'chromadb', 'gemini'
 # The registry will use this value to select the default backend
 FILE_SEARCH_BACKEND = os.getenv("FILE_SEARCH_BACKEND", "chromadb")
 CHROMADB_PERSIST_DIRECTORY = os.getenv("CHROMADB_PERSIST_DIRECTORY")
+# Open collection handles kept per process (LRU)
+CHROMADB_COLLECTION_CACHE_SIZE = int(os.getenv("CHROMADB_COLLECTION_CACHE_SIZE", 128))
+# Seconds a successful "store exists" check is reused by ensure_project_store
+FILE_SEARCH_STORE_CHECK_TTL = float(os.getenv("FILE_SEARCH_STORE_CHECK_TTL", 300))
+# Search ranking: "vector", "lexical" (BM25) or "hybrid" (rank fusion of both).
+# Unset uses the backend default (vector); hybrid and lexical are opt-in here or
+# per request. ChromaDB keeps its BM25 index next to the persist directory,
+# Gemini always ranks server-side.
+FILE_SEARCH_MODE = os.getenv("FILE_SEARCH_MODE") or None
+# Hybrid/lexical searches rank this many candidates per requested result
+FILE_SEARCH_HYBRID_CANDIDATE_FACTOR = int(os.getenv("FILE_SEARCH_HYBRID_CANDIDATE_FACTOR", 4))
+# Search results cached per process, keyed by store write version (0 disables)
+FILE_SEARCH_QUERY_CACHE_SIZE = int(os.getenv("FILE_SEARCH_QUERY_CACHE_SIZE", 512))
+FILE_SEARCH_QUERY_CACHE_TTL = float(os.getenv("FILE_SEARCH_QUERY_CACHE_TTL", 300))
 
 # Image captioning (used for image indexing)
 IMAGE_CAPTION_PROVIDER = os.getenv("IMAGE_CAPTION_PROVIDER", "openai")
 IMAGE_CAPTION_MODEL = os.getenv("IMAGE_CAPTION_MODEL", "gpt-4o")
 IMAGE_CAPTION_PROMPT = os.getenv("IMAGE_CAPTION_PROMPT")
 FILE_SEARCH_MAX_TEXT_BYTES = int(os.getenv("FILE_SEARCH_MAX_TEXT_BYTES", 2 * 1024 * 1024))
+# Text extracted from PDF/Word/spreadsheet files, keyed by file hash and
+# shared by indexing, search backends and RAG tools. Set max bytes to 0 to disable.
+EXTRACTED_TEXT_CACHE_DIR = Path(
+    os.getenv("EXTRACTED_TEXT_CACHE_DIR", BASE_DIR / "cache" / "extracted_text")
+)
+EXTRACTED_TEXT_CACHE_MAX_BYTES = int(os.getenv("EXTRACTED_TEXT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# Chunking strategy and token budget per document type (see file_search.chunking)
+FILE_SEARCH_CHUNKING = {
+    "default": {"strategy": "sentence", "max_tokens": 256, "overlap_tokens": 32},
+    "Markdown": {"strategy": "markdown"},
+    "YooptaDocument": {"strategy": "yoopta"},
+    "CSV": {"strategy": "csv_rows", "overlap_tokens": 0},
+}
+# Documents per backend upsert when bulk indexing (imports, reindex_documents)
+FILE_SEARCH_INDEX_BATCH_SIZE = int(os.getenv("FILE_SEARCH_INDEX_BATCH_SIZE", 64))
+# Background index queue: saves are coalesced per record and indexed by a
+# Django-Q2 worker instead of in the request thread.
+FILE_SEARCH_INDEX_QUEUE_ENABLED = os.getenv("FILE_SEARCH_INDEX_QUEUE_ENABLED", "True") == "True"
+FILE_SEARCH_INDEX_DEBOUNCE_SECONDS = float(os.getenv("FILE_SEARCH_INDEX_DEBOUNCE_SECONDS", 5))
+FILE_SEARCH_INDEX_MAX_DELAY_SECONDS = float(os.getenv("FILE_SEARCH_INDEX_MAX_DELAY_SECONDS", 60))
+FILE_SEARCH_INDEX_MAX_ATTEMPTS = int(os.getenv("FILE_SEARCH_INDEX_MAX_ATTEMPTS", 5))
 
 # LLM Provider Configuration
 # Default provider and model for chat/agent workflows
 DEFAULT_LLM_PROVIDER = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
 DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-4o-mini")
 
+# Chat history sent per turn (see chat.history): token budget for recent
+# messages (older ones are summarized), summary length, messages sent per
+# background summary run, seconds before a queued summary update counts as
+# lost, estimated tokens per image, and bytes of encoded image attachments
+# cached per process.
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", 8000))
+CHAT_HISTORY_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_HISTORY_SUMMARY_MAX_TOKENS", 500))
+CHAT_HISTORY_SUMMARY_INPUT_TOKENS = int(os.getenv("CHAT_HISTORY_SUMMARY_INPUT_TOKENS", 4000))
+CHAT_HISTORY_SUMMARY_TASK_TIMEOUT = int(os.getenv("CHAT_HISTORY_SUMMARY_TASK_TIMEOUT", 600))
+CHAT_HISTORY_IMAGE_TOKENS = int(os.getenv("CHAT_HISTORY_IMAGE_TOKENS", 765))
+CHAT_HISTORY_IMAGE_CACHE_BYTES = int(os.getenv("CHAT_HISTORY_IMAGE_CACHE_BYTES", 64 * 1024 * 1024))
+
 # Local model endpoint (for Ollama, LM Studio, etc.)
 LOCAL_MODEL_ENDPOINT = os.getenv("LOCAL_MODEL_ENDPOINT", "http://localhost:11434")
 
@@ -237,6 +296,22 @@ MAILGUN_DOMAIN = os.getenv("MAILGUN_DOMAIN")
 # Zoea Studio Settings
 ZOEA_DEFAULT_THEME = os.getenv("ZOEA_DEFAULT_THEME", "ocean")
 
+# Seconds a user's organization, account and default project are cached per
+# process (see accounts.context); 0 disables the cache.
+ORGANIZATION_CONTEXT_CACHE_TTL = float(os.getenv("ORGANIZATION_CONTEXT_CACHE_TTL", 30))
+# Seconds between checks of the shared context version, after which changes
+# made in other processes are seen.
+ORGANIZATION_CONTEXT_CACHE_CHECK_INTERVAL = float(
+    os.getenv("ORGANIZATION_CONTEXT_CACHE_CHECK_INTERVAL", 5)
+)
+
+# Seconds a project's instantiated agent tools are reused per process (see
+# agents.registry). 0 disables.
+TOOL_SET_CACHE_TTL = float(os.getenv("TOOL_SET_CACHE_TTL", 300))
+# Seconds between checks of a project's ToolSetVersion, i.e. how long other
+# processes may keep using tools built before a config or project change.
+TOOL_SET_CACHE_CHECK_INTERVAL = float(os.getenv("TOOL_SET_CACHE_CHECK_INTERVAL", 5))
+
 # Document Import Limits
 ZOEA_IMPORT_MAX_FILE_SIZE_BYTES = int(
     os.getenv("ZOEA_IMPORT_MAX_FILE_SIZE_BYTES", 50 * 1024 * 1024)
@@ -249,6 +324,17 @@ ZOEA_IMPORT_MAX_FILE_COUNT = int(
 )
 ZOEA_IMPORT_MAX_DEPTH = int(os.getenv("ZOEA_IMPORT_MAX_DEPTH", 10))
 
+# Document Import Pipeline (see documents.import_service): threads reading
+# files ahead of the writer, the size above which a file being imported is
+# spooled to disk instead of memory, rows per bulk insert of text documents,
+# and whether thumbnails are queued for imported documents.
+ZOEA_IMPORT_WORKERS = int(os.getenv("ZOEA_IMPORT_WORKERS", 4))
+ZOEA_IMPORT_SPOOL_MAX_BYTES = int(
+    os.getenv("ZOEA_IMPORT_SPOOL_MAX_BYTES", 4 * 1024 * 1024)
+)
+ZOEA_IMPORT_BULK_SIZE = int(os.getenv("ZOEA_IMPORT_BULK_SIZE", 200))
+ZOEA_IMPORT_QUEUE_PREVIEWS = os.getenv("ZOEA_IMPORT_QUEUE_PREVIEWS", "true").lower() == "true"
+
 _import_roots_raw = os.getenv("ZOEA_IMPORT_ALLOWED_ROOTS", "").strip()
 if _import_roots_raw:
     _import_roots = (
@@ -289,6 +375,14 @@ if _skill_dirs_raw:
 else:
     AGENT_SKILLS_DIRS = [REPO_ROOT / "skills"]
 
+# Seconds between checks of the skill directories for added, removed or
+# edited skills (see agents.skills.registry), and the size of the in-memory
+# cache of skill file contents.
+AGENT_SKILLS_RESCAN_INTERVAL = float(os.getenv("AGENT_SKILLS_RESCAN_INTERVAL", 2))
+AGENT_SKILLS_FILE_CACHE_BYTES = int(
+    os.getenv("AGENT_SKILLS_FILE_CACHE_BYTES", 8 * 1024 * 1024)
+)
+
 # CORS settings
 # When using credentials (cookies), we cannot use CORS_ALLOW_ALL_ORIGINS
 # Must specify exact origins when credentials are included
@@ -413,8 +507,50 @@ Q_CLUSTER = {
     'compress': True,  # Compress large payloads
     'catch_up': False,  # Don't run missed scheduled tasks on startup
     'label': 'Background Tasks',
+    # Optional dedicated preview renderer pool:
+    #   Q_CLUSTER_NAME=previews python manage.py qcluster
+    # with PREVIEW_TASK_CLUSTER=previews routing render tasks to it.
+    'ALT_CLUSTERS': {
+        'previews': {
+            'workers': int(os.getenv('PREVIEW_WORKERS', 4)),
+            'timeout': 120,
+            'retry': 180,
+        },
+    },
 }
 
+# Document previews render in Django-Q2 workers; API responses return a
+# "pending" preview until the render finishes. Set PREVIEW_ASYNC=False to
+# render inline (e.g. when no cluster is running).
+PREVIEW_ASYNC = os.getenv('PREVIEW_ASYNC', 'True') == 'True'
+PREVIEW_TASK_CLUSTER = os.getenv('PREVIEW_TASK_CLUSTER') or None
+# Seconds before a queued render is presumed lost and may be queued again
+PREVIEW_REQUEST_TIMEOUT = int(os.getenv('PREVIEW_REQUEST_TIMEOUT', 600))
+
+# D2/Excalidraw preview rendering (documents.diagram_renderer). Renders run at
+# most DIAGRAM_RENDER_WORKERS at a time per process; Excalidraw workers are
+# long-lived and recycled after DIAGRAM_RENDER_MAX_REQUESTS renders.
+DIAGRAM_RENDER_WORKERS = int(os.getenv('DIAGRAM_RENDER_WORKERS', 2))
+DIAGRAM_RENDER_TIMEOUT = int(os.getenv('DIAGRAM_RENDER_TIMEOUT', 30))
+DIAGRAM_RENDER_CACHE_SIZE = int(os.getenv('DIAGRAM_RENDER_CACHE_SIZE', 256))
+DIAGRAM_RENDER_MAX_REQUESTS = int(os.getenv('DIAGRAM_RENDER_MAX_REQUESTS', 200))
+
+# Threads used by sync_sources to read and hash changed source files
+SOURCE_SYNC_WORKERS = int(os.getenv('SOURCE_SYNC_WORKERS', 8))
+
+# Event dispatch matches against a per-process trigger index. Changes made in
+# this process apply immediately; other processes re-check the organization's
+# trigger version at most this often (seconds, 0 = on every event).
+EVENT_TRIGGER_INDEX_CHECK_INTERVAL = float(os.getenv('EVENT_TRIGGER_INDEX_CHECK_INTERVAL', 5))
+
+# Platform webhooks. In "inbox" mode the endpoint validates the signature,
+# stores the payload (deduplicated on the platform's message id) and answers
+# immediately; Django-Q2 workers parse and dispatch up to
+# PLATFORM_WEBHOOK_BATCH_SIZE deliveries at a time. "inline" handles the
+# whole webhook inside the request.
+PLATFORM_WEBHOOK_INGEST_MODE = os.getenv('PLATFORM_WEBHOOK_INGEST_MODE', 'inbox')
+PLATFORM_WEBHOOK_BATCH_SIZE = int(os.getenv('PLATFORM_WEBHOOK_BATCH_SIZE', 100))
+
 # =============================================================================
 # Django Sites Framework Configuration
 # =============================================================================
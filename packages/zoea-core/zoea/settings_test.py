@@ -23,3 +23,9 @@ DATABASES = {
         },
     }
 }
+
+# Keep extracted-text cache entries out of the working tree
+import tempfile  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+EXTRACTED_TEXT_CACHE_DIR = Path(tempfile.mkdtemp(prefix="zoea-extracted-text-"))
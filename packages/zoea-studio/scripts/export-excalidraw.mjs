@@ -5,11 +5,18 @@
  * Usage:
  *   node export-excalidraw.mjs <input.json> <output.svg>
  *   echo '{"elements":[],"appState":{}}' | node export-excalidraw.mjs - output.svg
+ *   node export-excalidraw.mjs --serve
+ *
+ * With --serve the script stays running and renders one request per line of
+ * stdin, answering each with one line on stdout:
+ *   {"id": 1, "input": {"elements": [...]}}  ->  {"id": 1, "svg": "<svg ..."}
+ *                                            or  {"id": 1, "error": "..."}
  *
  * Requires: @excalidraw/utils, jsdom
  */
 
 import { readFileSync, writeFileSync } from 'fs';
+import { createInterface } from 'readline';
 import { JSDOM } from 'jsdom';
 
 // Set up browser globals BEFORE importing @excalidraw/utils
@@ -65,11 +72,70 @@ globalThis.matchMedia = () => ({
 // Now import @excalidraw/utils
 const { exportToSvg } = await import('@excalidraw/utils');
 
+async function renderSvg(data) {
+  // Extract elements, appState, and files from the Excalidraw data
+  const elements = data.elements || [];
+  const appState = data.appState || {};
+  const files = data.files || {};
+
+  if (elements.length === 0) {
+    throw new Error('No elements in diagram');
+  }
+
+  // Export to SVG
+  const svg = await exportToSvg({
+    elements,
+    appState: {
+      ...appState,
+      exportWithDarkMode: false,
+      exportBackground: true,
+      viewBackgroundColor: appState.viewBackgroundColor || '#ffffff',
+    },
+    files,
+  });
+
+  // Get the SVG string
+  const serializer = new XMLSerializer();
+  return serializer.serializeToString(svg);
+}
+
+async function serve() {
+  const lines = createInterface({ input: process.stdin, crlfDelay: Infinity });
+
+  // Requests are handled one at a time; callers run one worker per concurrent render
+  for await (const line of lines) {
+    if (!line.trim()) {
+      continue;
+    }
+
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (e) {
+      process.stdout.write(JSON.stringify({ id: null, error: `Invalid request: ${e.message}` }) + '\n');
+      continue;
+    }
+
+    let response;
+    try {
+      response = { id: request.id, svg: await renderSvg(request.input || {}) };
+    } catch (e) {
+      response = { id: request.id, error: e.message };
+    }
+    process.stdout.write(JSON.stringify(response) + '\n');
+  }
+}
+
 async function main() {
   const args = process.argv.slice(2);
 
+  if (args[0] === '--serve') {
+    await serve();
+    return;
+  }
+
   if (args.length < 2) {
-    console.error('Usage: export-excalidraw.mjs <input.json|-|-> <output.svg>');
+    console.error('Usage: export-excalidraw.mjs <input.json|-|-> <output.svg> | --serve');
     process.exit(1);
   }
 
@@ -92,32 +158,14 @@ async function main() {
     process.exit(1);
   }
 
-  // Extract elements, appState, and files from the Excalidraw data
   const elements = data.elements || [];
-  const appState = data.appState || {};
-  const files = data.files || {};
-
   if (elements.length === 0) {
     console.error('No elements in diagram');
     process.exit(1);
   }
 
   try {
-    // Export to SVG
-    const svg = await exportToSvg({
-      elements,
-      appState: {
-        ...appState,
-        exportWithDarkMode: false,
-        exportBackground: true,
-        viewBackgroundColor: appState.viewBackgroundColor || '#ffffff',
-      },
-      files,
-    });
-
-    // Get the SVG string
-    const serializer = new XMLSerializer();
-    const svgString = serializer.serializeToString(svg);
+    const svgString = await renderSvg(data);
 
     // Write output
     if (outputPath === '-') {